@@ -1,19 +1,35 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
-"""This module implements functions needed for the autocompleter."""
+"""This module implements functions needed for the autocompleter.
+
+:py:obj:`search_autocomplete`:
+  Returns the suggestions of an autocomplete backend, the answers of the
+  backends are cached in the :py:obj:`AutocompleteCache` (:ref:`settings search
+  autocomplete_cache`) and the backend can be raced against a second backend
+  (:ref:`autocomplete_race <settings search autocomplete_race>`).
+
+----
+"""
 
 # pylint: disable=use-dict-literal
 import string
 import random
 
 import json
+import pickle
+import threading
+import time
 import typing as t
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from urllib.parse import urlencode
 
 import lxml.etree
 import lxml.html
 from httpx import HTTPError
 
+from searx import logger
 from searx import settings
+from searx import valkeydb
 from searx.engines import (
     engines,
     google,
@@ -21,10 +37,13 @@ from searx.engines import (
 from searx.network import get as http_get, post as http_post
 from searx.exceptions import SearxEngineResponseException
 from searx.utils import extr, gen_useragent
+from searx.valkeylib import secret_hash
 
 if t.TYPE_CHECKING:
     from searx.extended_types import SXNG_Response
 
+logger = logger.getChild('autocomplete')
+
 
 def update_kwargs(**kwargs) -> None:  # type: ignore
     if 'timeout' not in kwargs:
@@ -372,11 +391,198 @@ backends: dict[str, t.Callable[[str, str], list[str]]] = {
 }
 
 
-def search_autocomplete(backend_name: str, query: str, sxng_locale: str) -> list[str]:
-    backend = backends.get(backend_name)
-    if backend is None:
-        return []
+class CacheEntry(t.NamedTuple):
+    """Suggestions of a backend stored in the :py:obj:`AutocompleteCache`."""
+
+    results: list[str]
+
+    complete: bool
+    """The suggestions are *all* completions of the prefix: each suggestion
+    starts with the prefix and the backend returned less suggestions than it
+    is known to return at most.  The suggestions of a longer prefix are then a
+    subset of these suggestions."""
+
+
+class AutocompleteCache:
+    """TTL cache of the suggestions by (backend, locale, prefix), the values are
+    stored in a process-local LRU (``storage: memory``) or in the Valkey DB
+    shared by all workers (``storage: valkey``).
+
+    A query that is not in the cache is answered from the cached suggestions of
+    a shorter prefix when the entry of the prefix is :py:obj:`complete
+    <CacheEntry.complete>`: the suggestions of the prefix that start with the
+    query are the suggestions of the query.  Typing ``sear`` after ``sea``
+    needs no request to the backend when the backend returned less suggestions
+    for ``sea`` than its maximum.
+    """
+
+    VALKEY_PREFIX: str = "SearXNG_autocomplete_"
+
+    MAX_PREFIX_LEN: int = 64
+    """Queries longer than this are neither cached nor derived from a prefix."""
+
+    def __init__(self, ttl: int, size: int, storage: t.Literal["memory", "valkey"] = "memory"):
+        self.ttl: int = ttl
+        self.size: int = size
+        self.storage: t.Literal["memory", "valkey"] = storage
+        self._items: OrderedDict[str, tuple[float, CacheEntry]] = OrderedDict()
+        self._max_results: dict[str, int] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def key(backend_name: str, sxng_locale: str, query: str) -> str:
+        """Returns the key of the suggestions, the key is a secret hash, the
+        query is not readable in the storage."""
+        return secret_hash(repr((backend_name, sxng_locale, query)))
+
+    def _get_many(self, keys: list[str]) -> list[CacheEntry | None]:
+        valkey_client = valkeydb.client() if self.storage == "valkey" else None
+        if valkey_client is not None:
+            values: list[bytes | None] = valkey_client.mget([self.VALKEY_PREFIX + k for k in keys])  # type: ignore
+            return [None if v is None else CacheEntry(*pickle.loads(v)) for v in values]
+
+        ret: list[CacheEntry | None] = []
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                item = self._items.get(key)
+                if item is not None and item[0] <= now:
+                    del self._items[key]
+                    item = None
+                if item is not None:
+                    self._items.move_to_end(key)
+                ret.append(None if item is None else item[1])
+        return ret
+
+    def get(self, backend_name: str, sxng_locale: str, query: str) -> list[str] | None:
+        """Returns the cached suggestions of ``query`` or ``None``.  The
+        prefixes of the query are looked up in one go (one ``MGET`` in the
+        Valkey DB), the longest prefix with a complete entry is used."""
+        if len(query) > self.MAX_PREFIX_LEN:
+            return None
+        prefixes = [query[:i] for i in range(len(query), 0, -1)]
+        entries = self._get_many([self.key(backend_name, sxng_locale, p) for p in prefixes])
+
+        if entries[0] is not None:
+            return entries[0].results
+        q = query.lower()
+        for entry in entries[1:]:
+            if entry is not None and entry.complete:
+                return [r for r in entry.results if r.lower().startswith(q)]
+        return None
+
+    def set(self, backend_name: str, sxng_locale: str, query: str, results: list[str]):
+        """Stores the ``results`` of the backend for ``query`` for the next
+        :py:obj:`ttl <AutocompleteCache.ttl>` seconds.
+
+        The maximum number of suggestions a backend returns is not known, the
+        largest number of suggestions seen from the backend (by this process)
+        is taken as a lower bound: when a backend returns less suggestions, it
+        has no more suggestions for the prefix."""
+        if len(query) > self.MAX_PREFIX_LEN:
+            return
+        with self._lock:
+            max_results = max(self._max_results.get(backend_name, 0), len(results))
+            self._max_results[backend_name] = max_results
+        q = query.lower()
+        complete = len(results) < max_results and all(r.lower().startswith(q) for r in results)
+        if not results:
+            complete = True
+        entry = CacheEntry(results, complete)
+
+        key = self.key(backend_name, sxng_locale, query)
+        valkey_client = valkeydb.client() if self.storage == "valkey" else None
+        if valkey_client is not None:
+            valkey_client.set(self.VALKEY_PREFIX + key, pickle.dumps(tuple(entry)), ex=self.ttl)
+            return
+        with self._lock:
+            self._items[key] = (time.time() + self.ttl, entry)
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+CACHE: AutocompleteCache | None = None
+"""Global cache of the suggestions, ``None`` if the cache is not enabled."""
+
+RACE_EXECUTOR: ThreadPoolExecutor | None = None
+"""Threads of the backends raced against each other, ``None`` if the race is
+not enabled."""
+
+
+def initialize() -> AutocompleteCache | None:
+    """Initialize the global :py:obj:`CACHE` from the :ref:`settings search
+    autocomplete_cache` and the :py:obj:`RACE_EXECUTOR`."""
+    global CACHE, RACE_EXECUTOR  # pylint: disable=global-statement
+
+    cfg = settings['search']['autocomplete_cache']
+    CACHE = None
+    if cfg['enabled']:
+        if cfg['storage'] == 'valkey' and valkeydb.client() is None:
+            logger.warning("autocomplete cache: no Valkey DB configured, fall back to storage in memory")
+        CACHE = AutocompleteCache(ttl=cfg['ttl'], size=cfg['size'], storage=cfg['storage'])
+
+    race = settings['search']['autocomplete_race']
+    if race and race not in backends:
+        logger.error("autocomplete_race: unknown backend %s", race)
+    if race in backends and RACE_EXECUTOR is None:
+        RACE_EXECUTOR = ThreadPoolExecutor(thread_name_prefix="autocomplete_race")
+    return CACHE
+
+
+def _query_backend(backend_name: str, query: str, sxng_locale: str) -> list[str] | None:
+    """Sends the query to the backend, the answer is stored in the
+    :py:obj:`CACHE`.  Returns ``None`` if the backend failed (a failure is not
+    cached)."""
+    try:
+        results = backends[backend_name](query, sxng_locale)
+    except (HTTPError, SearxEngineResponseException) as exc:
+        logger.debug("backend %s failed: %s", backend_name, exc)
+        return None
+    if CACHE is not None:
+        CACHE.set(backend_name, sxng_locale, query, results)
+    return results
+
+
+def _race(backend_names: list[str], query: str, sxng_locale: str) -> list[str]:
+    """Sends the query to all backends, the first non-empty answer is returned.
+    The backends that lose the race are not canceled, their answers are
+    stored in the cache."""
+    assert RACE_EXECUTOR is not None
+    futures = [RACE_EXECUTOR.submit(_query_backend, name, query, sxng_locale) for name in backend_names]
     try:
-        return backend(query, sxng_locale)
-    except (HTTPError, SearxEngineResponseException):
+        for future in as_completed(futures, timeout=settings['outgoing']['request_timeout']):
+            results = future.result()
+            if results:
+                return results
+    except FuturesTimeoutError:
+        pass
+    return []
+
+
+def search_autocomplete(backend_name: str, query: str, sxng_locale: str) -> list[str]:
+    """Returns the suggestions of the backend ``backend_name`` for ``query``.
+
+    If :ref:`autocomplete_race <settings search autocomplete_race>` is set to a
+    second backend, the query is sent to both backends and the first non-empty
+    answer is returned (the cache is looked up for both backends first)."""
+    if backend_name not in backends:
         return []
+
+    backend_names = [backend_name]
+    race = settings['search']['autocomplete_race']
+    if RACE_EXECUTOR is not None and race in backends and race != backend_name:
+        backend_names.append(race)
+
+    if CACHE is not None:
+        cached = [CACHE.get(name, sxng_locale, query) for name in backend_names]
+        for results in cached:
+            if results:
+                return results
+        backend_names = [name for name, results in zip(backend_names, cached) if results is None]
+        if not backend_names:
+            return []
+
+    if len(backend_names) > 1:
+        return _race(backend_names, query, sxng_locale)
+    return _query_backend(backend_names[0], query, sxng_locale) or []
@@ -5,9 +5,10 @@
 ----
 """
 
-__all__ = ["ExpireCacheCfg", "ExpireCacheStats", "ExpireCache", "ExpireCacheSQLite"]
+__all__ = ["ExpireCacheCfg", "ExpireCacheStats", "ExpireCache", "ExpireCacheSQLite", "ExpireCacheMemoryTier"]
 
 import abc
+from collections import OrderedDict
 from collections.abc import Iterator
 import dataclasses
 import datetime
@@ -18,6 +19,7 @@ import pickle
 import sqlite3
 import string
 import tempfile
+import threading
 import time
 import typing
 
@@ -57,13 +59,25 @@ class ExpireCacheCfg(msgspec.Struct):  # pylint: disable=too-few-public-methods
 
     ``auto``:
       Maintenance is carried out automatically as part of the maintenance
-      intervals (:py:obj:`MAINTENANCE_PERIOD`); no external process is required.
+      intervals (:py:obj:`MAINTENANCE_PERIOD`) by the background
+      :py:obj:`scheduler <searx.sqlitedb.MaintenanceScheduler>`; no external
+      process is required.
 
     ``off``:
       Maintenance is switched off and must be carried out by an external process
       if required.
     """
 
+    MEMORY_SIZE: int = 0
+    """Max number of key/value pairs in the process-local memory tier in front
+    of the DB (:py:obj:`ExpireCacheMemoryTier`), ``0`` disables the memory
+    tier."""
+
+    MEMORY_TTL: int = 5
+    """Time (sec.) a value from the memory tier is used without a lookup in the
+    DB.  After this time, the value is revalidated against the row in the DB
+    (which might have been changed by another process)."""
+
     password: bytes = get_setting("server.secret_key").encode()
     """Password used by :py:obj:`ExpireCache.secret_hash`.
 
@@ -121,6 +135,68 @@ class ExpireCacheStats:
         return "\n".join(lines)
 
 
+class MemoryItem(typing.NamedTuple):
+    """Item in the :py:obj:`ExpireCacheMemoryTier`."""
+
+    value: typing.Any
+    expire: int
+    valid_until: float
+
+
+class ExpireCacheMemoryTier:
+    """Bounded, process-local LRU of key/value pairs read from (or written to)
+    an :py:obj:`ExpireCache`.
+
+    An item is never used after its ``expire`` time and only for
+    :py:obj:`ExpireCacheCfg.MEMORY_TTL` seconds without a revalidation: the
+    caller compares the item with the row in the DB, if they differ, the value
+    was changed (or deleted) by another worker.
+
+    .. hint::
+
+       The :py:obj:`ExpireCacheSQLite` stores the serialized values in the
+       memory tier, each ``get`` returns a new copy of the value which the
+       caller can modify.
+    """
+
+    def __init__(self, size: int, ttl: int):
+        self.size: int = size
+        self.ttl: int = ttl
+        self._items: OrderedDict[tuple[str, str], MemoryItem] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, table: str, key: str) -> MemoryItem | None:
+        """Returns the item of ``key`` in ``table`` or ``None``.  An item whose
+        ``expire`` time has been reached is removed."""
+        with self._lock:
+            item = self._items.get((table, key))
+            if item is None:
+                return None
+            if item.expire <= time.time():
+                del self._items[(table, key)]
+                return None
+            self._items.move_to_end((table, key))
+            return item
+
+    def set(self, table: str, key: str, value: typing.Any, expire: int):
+        """Sets ``key`` in ``table`` to ``value``, the value is valid without a
+        revalidation for the next :py:obj:`ExpireCacheCfg.MEMORY_TTL`
+        seconds."""
+        with self._lock:
+            self._items[(table, key)] = MemoryItem(value, expire, time.time() + self.ttl)
+            self._items.move_to_end((table, key))
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def discard(self, table: str, key: str):
+        with self._lock:
+            self._items.pop((table, key), None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
 class ExpireCache(abc.ABC):
     """Abstract base class for the implementation of a key/value cache
     with expire date."""
@@ -222,6 +298,15 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
     - :py:obj:`ExpireCacheCfg.MAXHOLD_TIME`
     - :py:obj:`ExpireCacheCfg.MAINTENANCE_PERIOD`
     - :py:obj:`ExpireCacheCfg.MAINTENANCE_MODE`
+    - :py:obj:`ExpireCacheCfg.MEMORY_SIZE`
+    - :py:obj:`ExpireCacheCfg.MEMORY_TTL`
+
+    The maintenance is not carried out on the request path, it is scheduled in
+    the :py:obj:`searx.sqlitedb.SCHEDULER`.  The names of the key/value tables
+    and the time of the next maintenance are memorized in the process.  With a
+    memory tier (:py:obj:`MEMORY_SIZE <ExpireCacheCfg.MEMORY_SIZE>`), a hot
+    :py:obj:`ExpireCacheSQLite.get` is a lookup in a dict (and the
+    deserialization of the value).
     """
 
     DB_SCHEMA: int = 1
@@ -236,6 +321,11 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         :py:obj:`config <ExpireCacheCfg>`."""
 
         self.cfg: ExpireCacheCfg = cfg
+        self.memory: ExpireCacheMemoryTier | None = None
+        if cfg.MEMORY_SIZE > 0:
+            self.memory = ExpireCacheMemoryTier(cfg.MEMORY_SIZE, cfg.MEMORY_TTL)
+        self._table_names: set[str] = set()
+        self._next_maintenance_time: int = 0
         if cfg.db_url == ":memory:":
             log.critical("don't use SQLite DB in :memory: in production!!")
         super().__init__(cfg.db_url)
@@ -257,25 +347,36 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
 
     def maintenance(self, force: bool = False, truncate: bool = False) -> bool:
 
-        if not force and int(time.time()) < self.next_maintenance_time:
-            # log.debug("no maintenance required yet, next maintenance interval is in the future")
-            return False
+        if not force:
+            now = int(time.time())
+            if now < self._next_maintenance_time:
+                return False
+            # the memorized time has been reached, maybe another process has
+            # already done the maintenance in the meantime.
+            self._next_maintenance_time = self.next_maintenance_time
+            if now < self._next_maintenance_time:
+                # log.debug("no maintenance required yet, next maintenance interval is in the future")
+                return False
 
         # Prevent parallel DB maintenance cycles from other DB connections
         # (e.g. in multi thread or process environments).
         self.properties.set("LAST_MAINTENANCE", "")  # hint: this (also) sets the m_time of the property!
+        self._next_maintenance_time = int(time.time()) + self.cfg.MAINTENANCE_PERIOD
 
         if truncate:
             self.truncate_tables(self.table_names)
             return True
 
         # drop items by expire time stamp ..
-        expire = int(time.time())
+        start_time = time.time()
+        expire = int(start_time)
+        rows_removed = 0
 
         with self.connect() as conn:
             for table in self.table_names:
                 res = conn.execute(f"DELETE FROM {table} WHERE expire < ?", (expire,))
                 log.debug("deleted %s keys from table %s (expire date reached)", res.rowcount, table)
+                rows_removed += res.rowcount
 
         # Vacuuming the WALs
         # https://www.theunterminatedstring.com/sqlite-vacuuming/
@@ -283,13 +384,14 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         conn.close()
 
+        self.record_maintenance(start_time, rows_removed)
         return True
 
     def create_table(self, table: str) -> bool:
         """Create DB ``table`` if it has not yet been created, no recreates are
         initiated if the table already exists.
         """
-        if table in self.table_names:
+        if self.has_table(table):
             # log.debug("key/value table %s exists in DB (no need to recreate)", table)
             return False
 
@@ -310,6 +412,7 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         conn.close()
 
         self.properties.set(f"{self.CACHE_TABLE_PREFIX}-{table}", table)
+        self._table_names.add(table)
         return True
 
     @property
@@ -319,8 +422,20 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         rows = self.DB.execute(sql).fetchall() or []
         return [r[0] for r in rows]
 
+    def has_table(self, table: str) -> bool:
+        """``True`` if the key/value ``table`` has been created in the DB.  The
+        table names are memorized, tables are never dropped, the DB is only
+        queried for tables not yet known (e.g. tables created by another
+        process)."""
+        if table in self._table_names:
+            return True
+        self._table_names = set(self.table_names)
+        return table in self._table_names
+
     def truncate_tables(self, table_names: list[str]):
         log.debug("truncate table: %s", ",".join(table_names))
+        if self.memory is not None:
+            self.memory.clear()
         with self.connect() as conn:
             for table in table_names:
                 conn.execute(f"DELETE FROM {table}")
@@ -383,7 +498,8 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
     ) -> tuple[int, list[str]]:
 
         table = ctx
-        self.maintenance()
+        if self.cfg.MAINTENANCE_MODE == "auto":
+            self.schedule_maintenance()
 
         table_name = table
         if not table_name:
@@ -407,11 +523,14 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         ] = []
 
         err_msg_list: list[str] = []
+        memory_items: list[tuple[str, bytes, int]] = []
         for key, _val, expire in opt_list:
 
             value: bytes = self.serialize(value=_val)
             if len(value) > self.cfg.MAX_VALUE_LEN:
                 err_msg_list.append(f"{table}.key='{key}' - serialized value too big to cache (len: {len(value)}) ")
+                if self.memory is not None:
+                    self.memory.discard(table_name, key)
                 continue
 
             if not expire:
@@ -421,6 +540,7 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
             # positional arguments of the INSERT INTO statement
             sql_args = (key, value, expire, value, expire)
             sql_rows.append(sql_args)
+            memory_items.append((key, value, expire))
 
         if not sql_rows:
             return 0, err_msg_list
@@ -433,6 +553,10 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
                 conn.executemany(sql_str, sql_rows)
             conn.close()
 
+        if self.memory is not None:
+            for key, value, expire in memory_items:
+                self.memory.set(table_name, key, value, expire)
+
         return len(sql_rows), err_msg_list
 
     def get(self, key: str, default: typing.Any = None, ctx: str | None = None) -> typing.Any:
@@ -443,19 +567,36 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
 
         """
         table = ctx
-        self.maintenance()
+        if self.cfg.MAINTENANCE_MODE == "auto":
+            self.schedule_maintenance()
 
         if not table:
             table = self.normalize_name(self.cfg.name)
 
-        if table not in self.table_names:
+        item = None
+        if self.memory is not None:
+            item = self.memory.get(table, key)
+            if item is not None:
+                if time.time() < item.valid_until:
+                    return self.deserialize(item.value)
+                # revalidate the item: the value may have been set by another
+                # process (in the same second with the same expire time)
+                row = self.DB.execute(f"SELECT value, expire FROM {table} WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] == item.expire and row[0] == item.value:
+                    self.memory.set(table, key, item.value, item.expire)
+                    return self.deserialize(item.value)
+                self.memory.discard(table, key)
+
+        if item is None and not self.has_table(table):
             return default
 
-        sql = f"SELECT value FROM {table} WHERE key = ?"
+        sql = f"SELECT value, expire FROM {table} WHERE key = ?"
         row = self.DB.execute(sql, (key,)).fetchone()
         if row is None:
             return default
 
+        if self.memory is not None and row[1] is not None:
+            self.memory.set(table, key, row[0], row[1])
         return self.deserialize(row[0])
 
     def pairs(self, ctx: str) -> Iterator[tuple[str, typing.Any]]:
@@ -463,12 +604,13 @@ class ExpireCacheSQLite(sqlitedb.SQLiteAppl, ExpireCache):
         If ``ctx`` argument is ``None`` (the default), a table name is
         generated from the :py:obj:`ExpireCacheCfg.name`."""
         table = ctx
-        self.maintenance()
+        if self.cfg.MAINTENANCE_MODE == "auto":
+            self.schedule_maintenance()
 
         if not table:
             table = self.normalize_name(self.cfg.name)
 
-        if table in self.table_names:
+        if self.has_table(table):
             for row in self.DB.execute(f"SELECT key, value FROM {table}"):
                 yield row[0], self.deserialize(row[1])
 
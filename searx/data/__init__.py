@@ -9,10 +9,13 @@ make data.all
 __all__ = ["ahmia_blacklist_loader", "gsa_useragents_loader", "data_dir", "get_cache"]
 
 import json
+import sqlite3
 import typing as t
 
 from .core import log, data_dir, get_cache
+from .compiled import CompiledData
 from .currencies import CurrenciesDB
+from .external_bangs import ExternalBangsIndex
 from .tracker_patterns import TrackerPatternsDB
 
 
@@ -40,16 +43,17 @@ class LocalesType(t.TypedDict):
 
 
 USER_AGENTS: UserAgentType
-WIKIDATA_UNITS: dict[str, WikiDataUnitType]
+WIKIDATA_UNITS: t.Mapping[str, WikiDataUnitType]
 TRACKER_PATTERNS: TrackerPatternsDB
 LOCALES: LocalesType
 CURRENCIES: CurrenciesDB
 
 EXTERNAL_URLS: dict[str, dict[str, dict[str, str | dict[str, str]]]]
-EXTERNAL_BANGS: dict[str, dict[str, t.Any]]
-OSM_KEYS_TAGS: dict[str, dict[str, t.Any]]
-ENGINE_DESCRIPTIONS: dict[str, dict[str, t.Any]]
-ENGINE_TRAITS: dict[str, dict[str, t.Any]]
+EXTERNAL_BANGS: t.Mapping[str, t.Mapping[str, t.Any]]
+EXTERNAL_BANGS_INDEX: ExternalBangsIndex
+OSM_KEYS_TAGS: t.Mapping[str, t.Mapping[str, t.Any]]
+ENGINE_DESCRIPTIONS: t.Mapping[str, t.Mapping[str, t.Any]]
+ENGINE_TRAITS: t.Mapping[str, dict[str, t.Any]]
 
 
 lazy_globals = {
@@ -58,6 +62,7 @@ lazy_globals = {
     "EXTERNAL_URLS": None,
     "WIKIDATA_UNITS": None,
     "EXTERNAL_BANGS": None,
+    "EXTERNAL_BANGS_INDEX": ExternalBangsIndex(),
     "OSM_KEYS_TAGS": None,
     "ENGINE_DESCRIPTIONS": None,
     "ENGINE_TRAITS": None,
@@ -77,6 +82,18 @@ data_json_files = {
     "LOCALES": "locales.json",
 }
 
+compiled_datasets: dict[str, int | None] = {
+    "EXTERNAL_BANGS": None,
+    "OSM_KEYS_TAGS": None,
+    "ENGINE_DESCRIPTIONS": 2,
+    "ENGINE_TRAITS": 1,
+    "WIKIDATA_UNITS": 1,
+}
+"""The large datasets are accessed from a compact, read-only store shared by all
+workers (:py:obj:`searx.data.compiled`), the value is the number of levels in the
+JSON document that are stored as nodes (``None`` for all levels).  The other
+datasets are loaded by ``json.load``."""
+
 
 def __getattr__(name: str) -> t.Any:
     # lazy init of the global objects
@@ -89,6 +106,13 @@ def __getattr__(name: str) -> t.Any:
 
     log.debug("init searx.data.%s", name)
 
+    if name in compiled_datasets:
+        try:
+            lazy_globals[name] = CompiledData.load(name, data_json_files[name], compiled_datasets[name]).root
+            return lazy_globals[name]
+        except (OSError, sqlite3.Error) as exc:
+            log.warning("can't compile searx.data.%s, fall back to json.load: %s", name, exc)
+
     with open(data_dir / data_json_files[name], encoding='utf-8') as f:
         lazy_globals[name] = json.load(f)
 
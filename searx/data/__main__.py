@@ -4,6 +4,9 @@
 import typer
 
 from .core import get_cache
+from .compiled import CompiledData
+from .external_bangs import ExternalBangsIndex
+from . import data_json_files, compiled_datasets
 
 app = typer.Typer()
 
@@ -17,4 +20,15 @@ def state():
             print(f"cache table {table} holds {row[0]} key/value pairs")
 
 
+@app.command()
+def compile():  # pylint: disable=redefined-builtin
+    """compile the large datasets into the compact store shared by the workers"""
+    for name, depth in compiled_datasets.items():
+        data = CompiledData.load(name, data_json_files[name], depth, force=True)
+        print(f"{name}: {data.db_file} ({data.db_file.stat().st_size} bytes)")
+    bangs_index = ExternalBangsIndex()
+    bangs_index.build()
+    print(f"EXTERNAL_BANGS_INDEX: {bangs_index.idx_file} ({bangs_index.idx_file.stat().st_size} bytes)")
+
+
 app()
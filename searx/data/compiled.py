@@ -0,0 +1,215 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Compact, read-only store of the large JSON datasets in :origin:`searx/data`.
+
+A dataset like ``external_bangs.json`` or ``osm_keys_tags.json`` is compiled
+once into a SQLite file (:py:obj:`CompiledData`).  The workers open the file
+read-only and memory mapped, all workers share the pages of the file in the
+page cache of the OS instead of holding their own tree of Python objects.
+
+A dataset is accessed by :py:obj:`DataNode` objects, a read-only mapping with
+the lookup semantics of the ``dict`` from ``json.load``.  Only the items that
+are looked up are decoded::
+
+    from searx.data import OSM_KEYS_TAGS
+
+    OSM_KEYS_TAGS['tags'].get('amenity', {}).get('bench', {})
+
+The files are compiled by the build step ``python -m searx.data compile`` and
+are rebuilt when the JSON file of a dataset has been changed (e.g. by ``make
+data.all``).  If a file is missing, the first worker that needs the dataset
+compiles it.
+
+----
+"""
+
+__all__ = ["CompiledData", "DataNode", "compile_json"]
+
+import typing as t
+
+import json
+import os
+import pathlib
+import sqlite3
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextlib import closing
+
+from .core import log, data_dir
+
+SCHEMA_VERSION = 1
+
+DDL_CREATE_TABLES = [
+    "CREATE TABLE node (id INTEGER PRIMARY KEY, parent INTEGER NOT NULL, key TEXT NOT NULL, value TEXT)",
+    "CREATE UNIQUE INDEX node_parent_key ON node (parent, key)",
+    "CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)",
+]
+"""A node with ``value IS NULL`` is a mapping, the value of a leaf is a JSON
+string.  The root node of a dataset has the ``id`` 0 and is not stored."""
+
+ROOT_ID = 0
+
+
+def compile_json(json_file: pathlib.Path, db_file: pathlib.Path, depth: int | None = None):
+    """Compiles ``json_file`` into the SQLite file ``db_file``.
+
+    The dicts in the first ``depth`` levels of the JSON document are stored as
+    nodes (``None``: all levels), deeper values are stored as JSON leaves.  The
+    file is written to a temporary file first and then moved to ``db_file``,
+    readers never see a partially written file.
+    """
+    with open(json_file, encoding="utf-8") as f:
+        data = json.load(f)
+
+    tmp_file = db_file.with_name(f"{db_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_file.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp_file)
+    try:
+        for sql in DDL_CREATE_TABLES:
+            conn.execute(sql)
+        rows: list[tuple[int, int, str, str | None]] = []
+        next_id = ROOT_ID + 1
+
+        # breadth-first, the children of a node have consecutive IDs (the
+        # order of the items in the JSON document)
+        queue: deque[tuple[int, dict[str, t.Any], int]] = deque([(ROOT_ID, data, 1)])
+        while queue:
+            parent_id, node, level = queue.popleft()
+            for key, value in node.items():
+                if isinstance(value, dict) and (depth is None or level < depth):
+                    rows.append((next_id, parent_id, key, None))
+                    queue.append((next_id, value, level + 1))  # type: ignore
+                else:
+                    rows.append((next_id, parent_id, key, json.dumps(value, ensure_ascii=False)))
+                next_id += 1
+
+        conn.executemany("INSERT INTO node (id, parent, key, value) VALUES (?, ?, ?, ?)", rows)
+        conn.execute(
+            "INSERT INTO meta (name, value) VALUES (?, ?)", ("source", CompiledData.source_signature(json_file, depth))
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+    os.replace(tmp_file, db_file)
+
+
+class DataNode(Mapping[str, t.Any]):
+    """Read-only mapping of a node in a :py:obj:`CompiledData` file.  The
+    value of a key is a :py:obj:`DataNode` (if the value is a mapping) or the
+    decoded JSON value."""
+
+    __slots__ = ("_data", "_node_id")
+
+    def __init__(self, data: "CompiledData", node_id: int = ROOT_ID):
+        self._data = data
+        self._node_id = node_id
+
+    def _decode(self, node_id: int, value: str | None) -> t.Any:
+        if value is None:
+            return DataNode(self._data, node_id)
+        return json.loads(value)
+
+    def __getitem__(self, key: str) -> t.Any:
+        rows = self._data.execute("SELECT id, value FROM node WHERE parent=? AND key=?", (self._node_id, key))
+        if not rows:
+            raise KeyError(key)
+        return self._decode(*rows[0])
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        return bool(self._data.execute("SELECT 1 FROM node WHERE parent=? AND key=?", (self._node_id, key)))
+
+    def __iter__(self) -> Iterator[str]:
+        for (key,) in self._data.execute("SELECT key FROM node WHERE parent=? ORDER BY id", (self._node_id,)):
+            yield key
+
+    def __len__(self) -> int:
+        return self._data.execute("SELECT count(*) FROM node WHERE parent=?", (self._node_id,))[0][0]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self._data.name}:{self._node_id}>"
+
+    def copy(self) -> dict[str, t.Any]:
+        """Returns a (shallow) ``dict`` of the items in the node."""
+        rows = self._data.execute("SELECT key, id, value FROM node WHERE parent=? ORDER BY id", (self._node_id,))
+        return {key: self._decode(node_id, value) for key, node_id, value in rows}
+
+    def items(self) -> t.ItemsView[str, t.Any]:  # type: ignore[override]
+        # one query for all items of the node
+        return self.copy().items()
+
+    def values(self) -> t.ValuesView[t.Any]:  # type: ignore[override]
+        return self.copy().values()
+
+    def to_dict(self) -> dict[str, t.Any]:
+        """Returns the node and its sub-nodes as ``dict``."""
+        return {key: value.to_dict() if isinstance(value, DataNode) else value for key, value in self.copy().items()}
+
+
+class CompiledData:
+    """A dataset compiled into a SQLite file, opened read-only by the workers.
+    The connections are thread-local and are not shared with forked child
+    processes."""
+
+    def __init__(self, name: str, db_file: pathlib.Path):
+        self.name: str = name
+        self.db_file: pathlib.Path = db_file
+        self._local: threading.local = threading.local()
+
+    @staticmethod
+    def default_db_file(json_file: pathlib.Path) -> pathlib.Path:
+        """Location of the compiled file of ``json_file``, the files are stored
+        in the temp folder (like the :py:obj:`cache DBs
+        <searx.cache.ExpireCacheCfg.db_url>`)."""
+        return pathlib.Path(tempfile.gettempdir()) / f"sxng_data_{json_file.stem}.db"
+
+    @staticmethod
+    def source_signature(json_file: pathlib.Path, depth: int | None) -> str:
+        """Signature of the JSON file a compiled file has been built from."""
+        stat = json_file.stat()
+        return f"{SCHEMA_VERSION}:{depth}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    @classmethod
+    def load(cls, name: str, json_file: str, depth: int | None = None, force: bool = False) -> "CompiledData":
+        """Returns the compiled dataset ``name`` of ``json_file`` (in
+        :py:obj:`searx.data.data_dir`).  The file is compiled if it does not
+        exist, the JSON file has been changed or ``force`` is set."""
+        src = data_dir / json_file
+        db_file = cls.default_db_file(src)
+        obj = cls(name, db_file)
+        if force or not obj.is_up_to_date(cls.source_signature(src, depth)):
+            log.debug("compile searx.data.%s --> %s", name, db_file)
+            compile_json(src, db_file, depth)
+        return obj
+
+    def is_up_to_date(self, signature: str) -> bool:
+        if not self.db_file.exists():
+            return False
+        try:
+            with closing(sqlite3.connect(f"file:{self.db_file}?mode=ro", uri=True)) as conn:
+                rows = conn.execute("SELECT value FROM meta WHERE name='source'").fetchall()
+        except sqlite3.DatabaseError:
+            return False
+        return bool(rows) and rows[0][0] == signature
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            uri = f"file:{self.db_file}?mode=ro&immutable=1"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size = {self.db_file.stat().st_size}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def execute(self, sql: str, params: tuple[t.Any, ...] = ()) -> list[tuple[t.Any, ...]]:
+        return self.connection.execute(sql, params).fetchall()
+
+    @property
+    def root(self) -> DataNode:
+        """The root node of the dataset."""
+        return DataNode(self)
@@ -0,0 +1,267 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Memory-mapped index of the external bangs from ``external_bangs.json``.
+
+The bangs are stored in a file as sorted array, one file is shared by all
+workers (the pages are in the page cache of the OS).  The index answers the
+two questions of :py:obj:`searx.external_bang`:
+
+- :py:obj:`ExternalBangsIndex.get`: the definition of a bang
+- :py:obj:`ExternalBangsIndex.complete`: the bangs starting with a prefix,
+  ordered by rank (the *top-k*)
+
+Layout of the file (native byte order, 4-byte items)::
+
+    header:     MAGIC, VERSION, count, len(signature), signature (padded)
+    hash_size:  number of slots in the hash table (a power of 2)
+    hash:       hash table (CRC32 of the bang) of the indexes + 1 (0 is empty)
+    key_offs:   count + 1 offsets of the bangs in the *keys* blob
+    def_offs:   count + 1 offsets of the definitions in the *defs* blob
+    ranks:      count ranks
+    by_rank:    count indexes of the bangs, ordered by (-rank, bang)
+    keys:       the bangs (UTF-8), sorted
+    defs:       the definitions (UTF-8)
+
+The file is built by ``python -m searx.data compile`` or by the first worker
+that needs the index (see :py:obj:`searx.data.compiled`).
+
+----
+"""
+
+__all__ = ["ExternalBangsIndex", "build_index", "flatten_trie"]
+
+import typing as t
+
+import bisect
+import json
+import mmap
+import os
+import pathlib
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections.abc import Mapping
+
+from .core import log, data_dir
+from .compiled import CompiledData
+
+MAGIC = b"SXNGBANG"
+VERSION = 2
+HEADER = struct.Struct("=8sIII")
+
+LEAF_KEY = chr(16)
+"""Key of the definition in a node of the trie (:py:obj:`searx.external_bang.LEAF_KEY`)."""
+
+
+def flatten_trie(trie: Mapping[str, t.Any]) -> dict[str, str]:
+    """Returns the bangs of the ``trie`` (from ``external_bangs.json``) as
+    ``{bang: definition}``."""
+    bangs: dict[str, str] = {}
+    stack: list[tuple[str, t.Any]] = [("", trie)]
+    while stack:
+        prefix, node = stack.pop()
+        if isinstance(node, str):
+            bangs[prefix] = node
+            continue
+        if not isinstance(node, Mapping):
+            continue
+        for key, value in node.items():
+            if key == LEAF_KEY:
+                if isinstance(value, str):
+                    bangs[prefix] = value
+            else:
+                stack.append((prefix + key, value))
+    return bangs
+
+
+def bang_rank(definition: str) -> int:
+    rank = definition.rsplit(chr(1), 1)[-1]
+    return int(rank) if rank.isdigit() else 0
+
+
+def build_index(bangs: dict[str, str], idx_file: pathlib.Path, signature: str = ""):
+    """Writes the index of ``bangs`` to ``idx_file`` (by a temporary file that
+    is moved to ``idx_file`` when it is complete)."""
+
+    names = sorted(bangs, key=lambda b: b.encode("utf-8"))
+    ranks = array("i", [bang_rank(bangs[name]) for name in names])
+    by_rank = array("I", sorted(range(len(names)), key=lambda i: (-ranks[i], names[i])))
+
+    key_offs, keys = array("I", [0]), bytearray()
+    def_offs, defs = array("I", [0]), bytearray()
+    for name in names:
+        keys += name.encode("utf-8")
+        key_offs.append(len(keys))
+        defs += bangs[name].encode("utf-8")
+        def_offs.append(len(defs))
+
+    # open addressing, linear probing
+    hash_size = 1 << max(1, (2 * len(names) - 1).bit_length())
+    hash_table = array("I", [0]) * hash_size
+    for i, name in enumerate(names):
+        slot = zlib.crc32(name.encode("utf-8")) & (hash_size - 1)
+        while hash_table[slot]:
+            slot = (slot + 1) & (hash_size - 1)
+        hash_table[slot] = i + 1
+
+    sig = signature.encode("utf-8")
+    sig += b"\0" * (-len(sig) % 4)
+
+    tmp_file = idx_file.with_name(f"{idx_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(names), len(sig)))
+        f.write(sig)
+        f.write(array("I", [hash_size]).tobytes())
+        for arr in (hash_table, key_offs, def_offs, ranks, by_rank):
+            f.write(arr.tobytes())
+        f.write(keys)
+        f.write(defs)
+    os.replace(tmp_file, idx_file)
+
+
+class _Keys:
+    """Sequence of the (UTF-8 encoded) bangs in the index, for bisect."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("buf", "offs", "base")
+
+    def __init__(self, buf: memoryview, offs: memoryview, base: int):
+        self.buf = buf
+        self.offs = offs
+        self.base = base
+
+    def __len__(self) -> int:
+        return len(self.offs) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self.buf[self.base + self.offs[i] : self.base + self.offs[i + 1]])
+
+
+@t.final
+class ExternalBangsIndex:
+    """Lazy loaded index of the external bangs (:py:obj:`searx.data.EXTERNAL_BANGS_INDEX`)."""
+
+    json_file: pathlib.Path = data_dir / "external_bangs.json"
+
+    def __init__(self, idx_file: pathlib.Path | None = None):
+        self.idx_file: pathlib.Path = idx_file or CompiledData.default_db_file(self.json_file).with_suffix(".idx")
+        self._lock: threading.Lock = threading.Lock()
+        self._mm: mmap.mmap | None = None
+        self._keys: _Keys = None  # type: ignore
+        self._hash: memoryview = None  # type: ignore
+        self._def_offs: memoryview = None  # type: ignore
+        self._defs_base: int = 0
+        self._ranks: memoryview = None  # type: ignore
+        self._by_rank: memoryview = None  # type: ignore
+
+    @property
+    def signature(self) -> str:
+        return f"{sys.byteorder}:{CompiledData.source_signature(self.json_file, None)}"
+
+    def build(self):
+        """Builds the index file from :py:obj:`json_file`."""
+        log.debug("compile searx.data.EXTERNAL_BANGS_INDEX --> %s", self.idx_file)
+        with open(self.json_file, encoding="utf-8") as f:
+            trie = json.load(f)["trie"]
+        build_index(flatten_trie(trie), self.idx_file, self.signature)
+
+    def read_signature(self) -> str | None:
+        try:
+            with open(self.idx_file, "rb") as f:
+                magic, version, _, sig_len = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != VERSION:
+                    return None
+                return f.read(sig_len).rstrip(b"\0").decode("utf-8")
+        except (OSError, struct.error, UnicodeDecodeError):
+            return None
+
+    def init(self):
+        if self._mm is not None:
+            return
+        with self._lock:
+            if self._mm is not None:
+                return
+            if self.read_signature() != self.signature:
+                self.build()
+            self.open()
+
+    def open(self):
+        """Maps the index file into memory."""
+        with open(self.idx_file, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(mm)
+        _, _, count, sig_len = HEADER.unpack_from(buf)
+        pos = HEADER.size + sig_len
+
+        def section(fmt: str, items: int) -> memoryview:
+            nonlocal pos
+            view = buf[pos : pos + 4 * items].cast(fmt)
+            pos += 4 * items
+            return view
+
+        hash_size = section("I", 1)[0]
+        self._hash = section("I", hash_size)
+        key_offs = section("I", count + 1)
+        self._def_offs = section("I", count + 1)
+        self._ranks = section("i", count)
+        self._by_rank = section("I", count)
+        self._keys = _Keys(buf, key_offs, pos)
+        self._defs_base = pos + key_offs[count]
+        self._mm = mm
+
+    def __len__(self) -> int:
+        self.init()
+        return len(self._keys)
+
+    def _range(self, prefix: bytes) -> tuple[int, int]:
+        lo = bisect.bisect_left(self._keys, prefix)
+        # 0xff is not a valid byte in UTF-8, all bangs with the prefix are
+        # smaller than prefix + 0xff
+        hi = bisect.bisect_left(self._keys, prefix + b"\xff", lo)
+        return lo, hi
+
+    def _definition(self, i: int) -> str:
+        buf = self._keys.buf
+        return str(buf[self._defs_base + self._def_offs[i] : self._defs_base + self._def_offs[i + 1]], "utf-8")
+
+    def get(self, bang: str) -> str | None:
+        """Returns the definition of ``bang`` or ``None``."""
+        self.init()
+        key = bang.encode("utf-8")
+        hash_table, mask = self._hash, len(self._hash) - 1
+        keys, offs, base = self._keys.buf, self._keys.offs, self._keys.base
+        slot = zlib.crc32(key) & mask
+        while i := hash_table[slot]:
+            i -= 1
+            if keys[base + offs[i] : base + offs[i + 1]] == key:
+                return self._definition(i)
+            slot = (slot + 1) & mask
+        return None
+
+    def complete(self, prefix: str, limit: int | None = None) -> list[str]:
+        """Returns the bangs that start with ``prefix`` (without the ``prefix``
+        itself), ordered by rank (and name).  With ``limit``, only the top
+        ``limit`` bangs are returned."""
+        self.init()
+        key = prefix.encode("utf-8")
+        lo, hi = self._range(key)
+        if lo < hi and self._keys[lo] == key:
+            lo += 1
+        if lo >= hi:
+            return []
+
+        if limit is None or (hi - lo) <= 8 * limit:
+            # small range: sort the range by rank
+            ranked = sorted(range(lo, hi), key=lambda i: (-self._ranks[i], self._keys[i]))
+            selected = ranked[:limit] if limit is not None else ranked
+        else:
+            # large range: the first bangs of the range in the rank order
+            selected = []
+            for i in self._by_rank:
+                if lo <= i < hi:
+                    selected.append(i)
+                    if len(selected) >= limit:
+                        break
+        return [self._keys[i].decode("utf-8") for i in selected]
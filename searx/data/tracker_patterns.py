@@ -7,7 +7,9 @@ import typing as t
 __all__ = ["TrackerPatternsDB"]
 
 import re
-from collections.abc import Iterator
+import time
+import uuid
+from collections.abc import Iterable, Iterator
 from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
 
 from httpx import HTTPError
@@ -21,6 +23,129 @@ if t.TYPE_CHECKING:
 
 RuleType = tuple[str, list[str], list[str]]
 
+# Pattern of a ClearURLs ``urlPattern`` which starts with a literal host label,
+# e.g. ``^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}`` starts
+# with the label ``amazon``.
+_HOST_LABEL_PATTERN = re.compile(r"^\^https\?:\\/\\/(?:\(\?:\[a-z0-9-\]\+\\\.\)\*\??)?(?P<label>[a-z0-9-]+)")
+_NETLOC_SEPARATORS = re.compile(r"[.@:]")
+
+
+_GLOBAL_FLAGS = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def _scoped(pattern: str) -> str:
+    """Returns ``pattern`` as a group, the global inline flags at the start of
+    the pattern (e.g. ``(?i)``) are only valid at the start of the whole
+    expression and are converted into the flags of the group (``(?i:...)``)."""
+    m = _GLOBAL_FLAGS.match(pattern)
+    if m:
+        return f"(?{m.group(1)}:{pattern[m.end():]})"
+    return f"(?:{pattern})"
+
+
+def _any_match(patterns: list[str]) -> re.Pattern[str] | None:
+    """Compiles a list of regular expressions into one expression which
+    matches (:py:obj:`re.match`) if one of the expressions in the list
+    matches."""
+    if not patterns:
+        return None
+    return re.compile("|".join(_scoped(p) for p in patterns))
+
+
+def _has_alternation(pattern: str) -> bool:
+    """``True`` if there is an alternation ``|`` on the top level of the regular
+    expression ``pattern``."""
+    depth = 0
+    escaped = False
+    in_class = False
+    for c in pattern:
+        if escaped:
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "(":
+            depth += 1
+        elif c == ")":
+            depth -= 1
+        elif c == "|" and depth == 0:
+            return True
+    return False
+
+
+def host_label_prefix(url_regexp: str) -> str | None:
+    """Returns the literal prefix of a host label which is required by the
+    ``urlPattern`` of a rule or ``None`` if the rule can match any host."""
+
+    m = _HOST_LABEL_PATTERN.match(url_regexp)
+    if not m or _has_alternation(url_regexp):
+        return None
+    label = m.group("label")
+    if url_regexp[m.end() : m.end() + 1] in ("?", "*", "{"):
+        # the last character of the label is quantified and can be missing
+        label = label[:-1]
+    return label or None
+
+
+class CompiledRule(t.NamedTuple):
+    """A rule of the :py:obj:`TrackerPatternsDB` with compiled regular
+    expressions."""
+
+    url_regexp: re.Pattern[str]
+    url_ignore: re.Pattern[str] | None
+    del_args: re.Pattern[str] | None
+
+
+class CompiledRules:  # pylint: disable=too-few-public-methods
+    """In-memory set of the compiled rules.  The rules are indexed by the literal
+    host label their ``urlPattern`` requires, to clean an URL only the
+    candidate rules of the labels in URL's *netloc* and the rules which can
+    match any host are tested (in the order of the rule list)."""
+
+    MAX_NETLOCS: int = 1024
+    """Size of the memo which maps a *netloc* to its candidate rules."""
+
+    def __init__(self, rules: Iterable[RuleType]):
+        self.rules: list[CompiledRule] = []
+        self.any_host: list[int] = []
+        self.by_label: dict[str, list[int]] = {}
+        self._netlocs: dict[str, list[CompiledRule]] = {}
+
+        for url_regexp, url_ignore, del_args in rules:
+            try:
+                rule = CompiledRule(re.compile(url_regexp), _any_match(url_ignore), _any_match(del_args))
+            except re.error as exc:
+                log.error("TRACKER_PATTERNS: ignore invalid rule %s (%s)", url_regexp, exc)
+                continue
+            idx = len(self.rules)
+            self.rules.append(rule)
+            label = host_label_prefix(url_regexp)
+            if label is None:
+                self.any_host.append(idx)
+            else:
+                self.by_label.setdefault(label, []).append(idx)
+
+    def candidates(self, netloc: str) -> list[CompiledRule]:
+        """Returns the rules which might match an URL with this ``netloc``."""
+
+        rules = self._netlocs.get(netloc)
+        if rules is not None:
+            return rules
+
+        idx_list: set[int] = set(self.any_host)
+        for label in _NETLOC_SEPARATORS.split(netloc.lower()):
+            for i in range(1, len(label) + 1):
+                idx_list.update(self.by_label.get(label[:i], ()))
+        rules = [self.rules[i] for i in sorted(idx_list)]
+
+        if len(self._netlocs) >= self.MAX_NETLOCS:
+            self._netlocs.clear()
+        self._netlocs[netloc] = rules
+        return rules
+
 
 @t.final
 class TrackerPatternsDB:
@@ -41,8 +166,17 @@ class TrackerPatternsDB:
         url_ignore: t.Final = 1  # URL (regular expression) to ignore
         del_args: t.Final = 2  # list of URL arguments (regular expression) to delete
 
+    version_name = "tracker_patterns version"
+
+    CHECK_INTERVAL: int = 60
+    """Interval (sec.) in which the compiled rules are checked against the
+    (version of the) rules in the cache."""
+
     def __init__(self):
         self.cache = get_cache()
+        self._compiled: CompiledRules | None = None
+        self._compiled_version: str | None = None
+        self._next_check: float = 0
 
     def init(self):
         if self.cache.properties("tracker_patterns loaded") != "OK":
@@ -66,6 +200,7 @@ class TrackerPatternsDB:
             rows.append((key, value, None))
 
         self.cache.setmany(rows, ctx=self.ctx_name)
+        self.new_version()
 
     def add(self, rule: RuleType):
         key = rule[self.Fields.url_regexp]
@@ -74,6 +209,29 @@ class TrackerPatternsDB:
             rule[self.Fields.del_args],
         )
         self.cache.set(key=key, value=value, ctx=self.ctx_name, expire=None)
+        self.new_version()
+
+    def new_version(self):
+        """Marks the rules in the cache as modified, the compiled rules of all
+        processes are rebuild."""
+        self.cache.properties.set(self.version_name, uuid.uuid4().hex)
+        self._next_check = 0
+
+    def compiled_rules(self) -> CompiledRules:
+        """Returns the :py:obj:`CompiledRules`, they are only rebuild when the
+        rules in the cache have been changed."""
+
+        now = time.monotonic()
+        if self._compiled is not None and now < self._next_check:
+            return self._compiled
+        self._next_check = now + self.CHECK_INTERVAL
+
+        self.init()
+        version = self.cache.properties(self.version_name)
+        if self._compiled is None or version != self._compiled_version:
+            self._compiled = CompiledRules(self.rules())
+            self._compiled_version = version
+        return self._compiled
 
     def rules(self) -> Iterator[RuleType]:
         self.init()
@@ -115,10 +273,15 @@ class TrackerPatternsDB:
         If URL should be modified, the returned string is the new URL to use.
         """
 
+        if "?" not in url:
+            # There are no query arguments in the URL on which rules can be
+            # applied.
+            return True
+
         new_url = url
         parsed_new_url = urlparse(url=new_url)
 
-        for rule in self.rules():
+        for rule in self.compiled_rules().candidates(parsed_new_url.netloc):
 
             query_str: str = parsed_new_url.query
             if not query_str:
@@ -126,17 +289,11 @@ class TrackerPatternsDB:
                 # which rules can be applied, stop iterating over the rules.
                 break
 
-            if not re.match(rule[self.Fields.url_regexp], new_url):
+            if not rule.url_regexp.match(new_url):
                 # no match / ignore pattern
                 continue
 
-            do_ignore = False
-            for pattern in rule[self.Fields.url_ignore]:
-                if re.match(pattern, new_url):
-                    do_ignore = True
-                    break
-
-            if do_ignore:
+            if rule.url_ignore and rule.url_ignore.match(new_url):
                 # pattern is in the list of exceptions / ignore pattern
                 # HINT:
                 #    we can't break the outer pattern loop since we have
@@ -148,12 +305,9 @@ class TrackerPatternsDB:
                 # remove tracker arguments from the url-query part
                 for name, val in query_args.copy():
                     # remove URL arguments
-                    for pattern in rule[self.Fields.del_args]:
-                        if re.match(pattern, name):
-                            log.debug(
-                                "TRACKER_PATTERNS: %s remove tracker arg: %s='%s'", parsed_new_url.netloc, name, val
-                            )
-                            query_args.remove((name, val))
+                    if rule.del_args and rule.del_args.match(name):
+                        log.debug("TRACKER_PATTERNS: %s remove tracker arg: %s='%s'", parsed_new_url.netloc, name, val)
+                        query_args.remove((name, val))
 
                 parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
                 new_url = urlunparse(parsed_new_url)
@@ -163,12 +317,10 @@ class TrackerPatternsDB:
                 # - 'http://example.org?q='       --> query_str is 'q=' and query_args is []
                 # - 'http://example.org?/foo/bar' --> query_str is 'foo/bar' and  query_args is []
                 # is a simple string and not a key/value dict.
-                for pattern in rule[self.Fields.del_args]:
-                    if re.match(pattern, query_str):
-                        log.debug("TRACKER_PATTERNS: %s remove tracker arg: '%s'", parsed_new_url.netloc, query_str)
-                        parsed_new_url = parsed_new_url._replace(query="")
-                        new_url = urlunparse(parsed_new_url)
-                        break
+                if rule.del_args and rule.del_args.match(query_str):
+                    log.debug("TRACKER_PATTERNS: %s remove tracker arg: '%s'", parsed_new_url.netloc, query_str)
+                    parsed_new_url = parsed_new_url._replace(query="")
+                    new_url = urlunparse(parsed_new_url)
 
         if new_url != url:
             return new_url
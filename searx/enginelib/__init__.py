@@ -46,11 +46,14 @@ ENGINES_CACHE: ExpireCacheSQLite = ExpireCacheSQLite.build_cache(
         name="ENGINES_CACHE",
         MAXHOLD_TIME=60 * 60 * 24 * 7,  # 7 days
         MAINTENANCE_PERIOD=60 * 60,  # 2h
+        MEMORY_SIZE=1024,
     )
 )
 """Global :py:obj:`searx.cache.ExpireCacheSQLite` instance where the cached
 values from all engines are stored.  The `MAXHOLD_TIME` is 7 days and the
-`MAINTENANCE_PERIOD` is set to two hours."""
+`MAINTENANCE_PERIOD` is set to two hours.  The values (e.g. tokens) are read on
+every request of an engine, a memory tier of 1024 items is in front of the
+DB."""
 
 app = typer.Typer()
 
@@ -63,6 +66,7 @@ def state():
     print(title)
     print("=" * len(title))
     print(ENGINES_CACHE.state().report())
+    print(ENGINES_CACHE.maintenance_stats().report())
     print()
     title = f"properties of {ENGINES_CACHE.cfg.name}"
     print(title)
@@ -302,6 +306,11 @@ class Engine(abc.ABC):  # pylint: disable=too-few-public-methods
     selected by the user is used to build and send a ``Accept-Language`` header
     in the request to the origin search engine."""
 
+    offload_parsing: bool
+    """Call the ``response`` function of this engine in a worker process of the
+    :py:obj:`parse executor <searx.search.parse_executor>` (:ref:`settings search
+    parse_executor`)."""
+
     tokens: list[str]
     """A list of secret tokens to make this engine *private*, more details see
     :ref:`private engines`."""
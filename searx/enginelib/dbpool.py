@@ -0,0 +1,177 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Bounded pool of DB connections for the :ref:`SQL engines <sql engines>`.
+
+A :py:obj:`ConnectionPool` holds max. ``size`` connections of an engine, the
+search threads of the engine run their queries concurrently, each on its own
+connection.  The pool is also used for other long-lived resources of an engine
+(e.g. the co-processes of the :ref:`command engine <command coprocess>`).
+The pool ..
+
+- checks the health of a connection that has been idle for a while before it
+  is reused (:py:obj:`ConnectionPool.check_interval`),
+- discards a connection that raised an exception and opens a new one on the
+  next query,
+- retries a query once on a new connection if a reused connection has been
+  dropped by the server (:py:obj:`ConnectionPool.reconnect_errors`).
+
+The events of a pool are counted in :py:obj:`searx.metrics` (``engine,
+<name>, pool, <event>``): ``connect`` (new connections), ``discard`` (broken
+connections) and ``timeout`` (no free connection in time).
+
+Usage in an engine:
+
+.. code:: python
+
+   _pool: ConnectionPool | None = None
+
+   def init(engine_settings):
+       global _pool
+       _pool = ConnectionPool(engine_settings['name'], connect=_connect, size=pool_size)
+
+   def search(query, params):
+       return _pool.call(lambda conn: _query(conn, query, params), timeout=timeout)
+
+----
+"""
+
+__all__ = ["ConnectionPool"]
+
+import typing as t
+
+import os
+import threading
+import time
+
+from searx import logger
+from searx.metrics import configure_pool, counter_inc
+
+logger = logger.getChild('enginelib.dbpool')
+
+C = t.TypeVar("C")
+T = t.TypeVar("T")
+
+
+class ConnectionPool(t.Generic[C]):
+    """Pool of the DB connections of the engine ``name``, the connections are
+    opened on demand by ``connect``.  The optional ``check`` function is called
+    with a connection that has been idle longer than :py:obj:`check_interval`,
+    it returns ``False`` (or raises) if the connection is no longer usable."""
+
+    check_interval: float = 30
+    """A connection that has been idle longer than this interval (sec.) is
+    checked before it is reused."""
+
+    def __init__(
+        self,
+        name: str,
+        connect: t.Callable[[], C],
+        size: int = 4,
+        check: t.Callable[[C], bool] | None = None,
+        reconnect_errors: tuple[type[BaseException], ...] = (),
+    ):
+        self.name: str = name
+        self.connect: t.Callable[[], C] = connect
+        self.size: int = size
+        self.check: t.Callable[[C], bool] | None = check
+        self.reconnect_errors: tuple[type[BaseException], ...] = reconnect_errors
+        """A query that raised one of these exceptions (e.g. the connection has
+        been closed by the server) is retried once on a new connection."""
+
+        self._lock: threading.Lock = threading.Lock()
+        self._idle: list[tuple[C, float]] = []
+        self._slots: threading.BoundedSemaphore = threading.BoundedSemaphore(size)
+        self._pid: int = os.getpid()
+        configure_pool(name)
+
+    def _count(self, event: str):
+        counter_inc('engine', self.name, 'pool', event)
+
+    def _reset_after_fork(self):
+        # the connections of the parent process can't be used in a child
+        # process, they are dropped (not closed) and new ones are opened
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._idle = []
+                    self._slots = threading.BoundedSemaphore(self.size)
+                    self._pid = os.getpid()
+
+    def _close(self, conn: C):
+        try:
+            conn.close()  # type: ignore
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass
+
+    def _is_healthy(self, conn: C) -> bool:
+        if self.check is None:
+            return True
+        try:
+            return bool(self.check(conn))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.debug("%s: connection check failed: %s", self.name, exc)
+            return False
+
+    def acquire(self, timeout: float) -> tuple[C, bool]:
+        """Returns a connection and a flag that is ``True`` if the connection
+        has been reused from the pool.  Waits max. ``timeout`` seconds for a free
+        connection, if there is none a :py:obj:`TimeoutError` is raised."""
+        self._reset_after_fork()
+        if not self._slots.acquire(timeout=timeout):  # pylint: disable=consider-using-with
+            self._count('timeout')
+            raise TimeoutError(f"{self.name}: no free DB connection after {timeout:.2f} sec")
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    conn, idle_since = self._idle.pop()
+                if time.monotonic() - idle_since < self.check_interval or self._is_healthy(conn):
+                    return conn, True
+                self._count('discard')
+                self._close(conn)
+            conn = self.connect()
+            self._count('connect')
+            return conn, False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: C, discard: bool = False):
+        """Returns ``conn`` to the pool, a connection in an unknown state
+        (``discard``) is closed."""
+        if discard:
+            self._count('discard')
+            self._close(conn)
+        else:
+            with self._lock:
+                self._idle.append((conn, time.monotonic()))
+        self._slots.release()
+
+    def call(self, func: t.Callable[[C], T], timeout: float) -> T:
+        """Calls ``func`` with a connection from the pool."""
+        conn, reused = self.acquire(timeout)
+        try:
+            value = func(conn)
+        except self.reconnect_errors as exc:
+            self.release(conn, discard=True)
+            if not reused:
+                raise
+            logger.debug("%s: reconnect after error: %s", self.name, exc)
+            conn, _ = self.acquire(timeout)
+            try:
+                value = func(conn)
+            except BaseException:
+                self.release(conn, discard=True)
+                raise
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+        return value
+
+    def close(self):
+        """Closes the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close(conn)
@@ -11,8 +11,11 @@ usage::
 import typing as t
 
 import sys
+import ast
 import copy
-from os.path import realpath, dirname
+import functools
+import threading
+from os.path import realpath, dirname, join
 
 import types
 import inspect
@@ -46,6 +49,7 @@ ENGINE_DEFAULT_ARGS: dict[str, int | str | list[t.Any] | dict[str, t.Any] | bool
     "send_accept_language_header": True,
     "tokens": [],
     "max_page": 0,
+    "offload_parsing": False,
 }
 # set automatically when an engine does not have any tab category
 DEFAULT_CATEGORY = 'other'
@@ -66,6 +70,265 @@ engine_shortcuts = {}
 """
 
 
+class EngineProps(t.NamedTuple):
+    """Attributes of a registered engine that are needed in the hot loops of
+    the :py:obj:`ResultContainer <searx.results.ResultContainer>` (scoring,
+    grouping and merging of the results)."""
+
+    weight: float
+    """The ``weight`` of the engine (default ``1.0``)."""
+
+    category: str
+    """The first of the engine's categories (or an empty string)."""
+
+    paging: bool
+    """The engine supports paging."""
+
+
+engine_props: dict[str, EngineProps] = {}
+"""Lookup table of the registered engines, the properties of an engine are
+resolved once when the engine is registered (see :py:obj:`update_engine_props`).
+
+::
+
+    engine_props[engine.name] = EngineProps(weight, category, paging)
+
+:meta hide-value:
+"""
+
+
+def get_engine_props(engine: "Engine | types.ModuleType") -> EngineProps:
+    """Resolves the :py:obj:`EngineProps` of an ``engine``."""
+    return EngineProps(
+        weight=float(getattr(engine, "weight", 1)),
+        category=engine.categories[0] if len(engine.categories) > 0 else "",
+        paging=bool(engine.paging),
+    )
+
+
+def update_engine_props(*names: str):
+    """Updates the lookup table :py:obj:`engine_props` for the engines in
+    ``names`` (all registered :py:obj:`engines` if no name is given), to be
+    called when the attributes of the engines have been changed after the
+    engines have been registered (e.g. by the ``init`` function of the engine,
+    see :py:obj:`searx.search.processors.ProcessorMap.register_processor`)."""
+    for name in names or list(engines):
+        engine = engines.get(name)
+        if engine is None:
+            engine_props.pop(name, None)
+        elif not isinstance(engine, LazyEngine):
+            engine_props[name] = get_engine_props(engine)
+
+
+class LazyEngine:
+    """Stub of a disabled engine (:ref:`settings search lazy_engines`) that is
+    registered instead of the engine module.  The attributes of the stub are
+    the settings of the engine (``engine_data``), the module of the engine is
+    loaded (:py:func:`load_engine`) on first access to an attribute that is not
+    in the settings.
+
+    Once the module is loaded, the stub is replaced by the engine in the
+    registries (:py:obj:`engines`, :py:obj:`categories`) and all attributes of
+    the stub are delegated to the engine.  If the engine can't be loaded, the
+    stub is removed from the registries and an :py:obj:`AttributeError` is
+    raised.
+
+    The read-only attributes in :py:obj:`LazyEngine.preview_attributes` (shown
+    in the preferences and by ``/config``) are answered without loading the
+    module, see :py:obj:`engine_preview`.
+    """
+
+    preview_attributes: t.ClassVar[frozenset[str]] = frozenset(
+        {
+            "about",
+            "display_error_messages",
+            "enable_http",
+            "engine_type",
+            "language_support",
+            "max_page",
+            "paging",
+            "private",
+            "safesearch",
+            "send_accept_language_header",
+            "time_range_support",
+            "traits",
+            "using_tor_proxy",
+            "weight",
+        }
+    )
+
+    def __init__(self, engine_data: dict[str, t.Any]):
+        attrs = self.__dict__
+        attrs['_lazy_data'] = engine_data
+        attrs['_lazy_lock'] = threading.Lock()
+        attrs['_lazy_engine'] = None
+        attrs['_lazy_failed'] = False
+        attrs['_lazy_preview'] = None
+        attrs['timeout'] = ENGINE_DEFAULT_ARGS['timeout']
+        attrs['tokens'] = []
+        for name, value in engine_data.items():
+            if name == 'about':
+                continue
+            if name == 'categories':
+                value = _split_categories(value)
+            attrs[name] = value
+        if not any(cat in settings['categories_as_tabs'] for cat in attrs['categories']):
+            attrs['categories'].append(DEFAULT_CATEGORY)
+
+    @staticmethod
+    def can_stub(engine_data: dict[str, t.Any]) -> bool:
+        """An engine is stubbed if it is disabled and its settings contain the
+        attributes that are needed to register the engine (``categories`` and
+        ``shortcut``)."""
+        name = engine_data.get('name')
+        engine_categories = engine_data.get('categories')
+        return bool(
+            engine_data.get('disabled') is True
+            and engine_data.get('engine')
+            and 'shortcut' in engine_data
+            and name
+            and name == name.lower()
+            and '_' not in name
+            and engine_categories
+            and 'onions' not in _split_categories(engine_categories)
+        )
+
+    def __getattr__(self, name: str) -> t.Any:
+        attrs = self.__dict__
+        if name in self.preview_attributes and attrs['_lazy_engine'] is None and not attrs['_lazy_failed']:
+            if attrs['_lazy_preview'] is None:
+                attrs['_lazy_preview'] = engine_preview(attrs['_lazy_data'])
+            return getattr(attrs['_lazy_preview'], name)
+        engine = resolve_engine(self)
+        if engine is None:
+            raise AttributeError(f"engine {self.__dict__.get('name')} could not be loaded")
+        return getattr(engine, name)
+
+    def __setattr__(self, name: str, value: t.Any):
+        engine = resolve_engine(self)
+        if engine is None:
+            raise AttributeError(f"engine {self.__dict__.get('name')} could not be loaded")
+        setattr(engine, name, value)
+
+    def __delattr__(self, name: str):
+        engine = resolve_engine(self)
+        if engine is None:
+            raise AttributeError(f"engine {self.__dict__.get('name')} could not be loaded")
+        delattr(engine, name)
+
+    def __repr__(self):
+        return f"<LazyEngine {self.__dict__.get('name')}>"
+
+
+def resolve_engine(engine: "Engine | types.ModuleType | LazyEngine") -> "Engine | types.ModuleType | None":
+    """Returns the engine of a :py:obj:`LazyEngine`, the module of the engine is
+    loaded on the first call.  The result is cached, ``None`` is returned if the
+    engine can't be loaded.  Any other ``engine`` is returned as it is."""
+    if not isinstance(engine, LazyEngine):
+        return engine
+
+    attrs = engine.__dict__
+    if attrs['_lazy_engine'] is not None or attrs['_lazy_failed']:
+        return attrs['_lazy_engine']
+
+    with attrs['_lazy_lock']:
+        if attrs['_lazy_engine'] is not None or attrs['_lazy_failed']:
+            return attrs['_lazy_engine']
+
+        engine_data = attrs['_lazy_data']
+        name = engine_data['name']
+        logger.debug("load lazy engine %s", name)
+        loaded = load_engine(engine_data)
+
+        if engines.get(name) is not engine:
+            # the engines have been reloaded, the stub is no longer registered
+            pass
+        elif loaded is None:
+            logger.error("loading engine %s failed: set engine to inactive!", name)
+            engine_data["inactive"] = True
+            del engines[name]
+            if engine_shortcuts.get(attrs['shortcut']) == name:
+                del engine_shortcuts[attrs['shortcut']]
+            for engine_list in categories.values():
+                if engine in engine_list:
+                    engine_list.remove(engine)
+        else:
+            engines[name] = loaded
+            engine_props[name] = get_engine_props(loaded)
+            for engine_list in categories.values():
+                engine_list[:] = [loaded if e is engine else e for e in engine_list]
+            # pylint: disable=import-outside-toplevel, cyclic-import
+            from searx.network.network import add_engine_network
+
+            add_engine_network(name, loaded)
+
+        # from now on all attributes are delegated to the engine (or fail)
+        for attr_name in list(attrs):
+            if not attr_name.startswith('_lazy_'):
+                del attrs[attr_name]
+        attrs['_lazy_preview'] = None
+        attrs['_lazy_failed'] = loaded is None
+        attrs['_lazy_engine'] = loaded
+    return loaded
+
+
+@functools.cache
+def _module_constants(module_name: str) -> dict[str, t.Any]:
+    # the names in the source of the engine module that are assigned to a
+    # literal at module level (e.g. ``paging = True`` or ``about = {..}``)
+    try:
+        with open(join(ENGINE_DIR, module_name + '.py'), encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+    except (OSError, SyntaxError, ValueError):
+        return {}
+
+    constants: dict[str, t.Any] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets = node.targets
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets = [node.target]
+        else:
+            continue
+        try:
+            value = ast.literal_eval(node.value)  # type: ignore
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            continue
+        for target in targets:
+            if isinstance(target, ast.Name):
+                constants[target.id] = value
+    return constants
+
+
+@functools.cache
+def _traits_map():
+    # pylint: disable=import-outside-toplevel
+    from searx.enginelib.traits import EngineTraitsMap
+
+    return EngineTraitsMap.from_data()
+
+
+def engine_preview(engine_data: dict[str, t.Any]) -> types.SimpleNamespace:
+    """Namespace of the engine in ``engine_data`` without loading the module
+    of the engine: the literals assigned at the module level in the source of
+    the engine, updated like in :py:obj:`load_engine` (settings, defaults and
+    traits).  Attributes that are computed by the module (or its ``setup``
+    function) are missing."""
+    # pylint: disable=import-outside-toplevel
+    from searx.enginelib.traits import EngineTraits
+
+    preview = types.SimpleNamespace(**copy.deepcopy(_module_constants(engine_data['engine'])))
+    update_engine_attributes(preview, engine_data)
+    try:
+        _traits_map().set_traits(preview)
+    except ValueError:
+        # the language or region in the settings is not supported, the engine
+        # won't load
+        preview.traits = EngineTraits(data_type="traits_v1")
+        preview.language_support = False
+    return preview
+
+
 def check_engine_module(module: types.ModuleType):
     # probe unintentional name collisions / for example name collisions caused
     # by import statements in the engine module ..
@@ -179,9 +442,7 @@ def update_engine_attributes(engine: "Engine | types.ModuleType", engine_data: d
     # set engine attributes from engine_data
     for param_name, param_value in engine_data.items():
         if param_name == 'categories':
-            if isinstance(param_value, str):
-                param_value = list(map(str.strip, param_value.split(',')))
-            engine.categories = param_value  # type: ignore
+            engine.categories = _split_categories(param_value)  # type: ignore
         elif hasattr(engine, 'about') and param_name == 'about':
             engine.about = {**engine.about, **engine_data['about']}  # type: ignore
         else:
@@ -193,6 +454,12 @@ def update_engine_attributes(engine: "Engine | types.ModuleType", engine_data: d
             setattr(engine, arg_name, copy.deepcopy(arg_value))
 
 
+def _split_categories(value: str | list[str]) -> list[str]:
+    if isinstance(value, str):
+        return list(map(str.strip, value.split(',')))
+    return list(value)
+
+
 def update_attributes_for_tor(engine: "Engine | types.ModuleType"):
     if using_tor_proxy(engine) and hasattr(engine, 'onion_url'):
         engine.search_url = engine.onion_url + getattr(engine, 'search_path', '')  # type: ignore
@@ -248,11 +515,14 @@ def call_engine_setup(engine: "Engine | types.ModuleType", engine_data: dict[str
     return setup_ok
 
 
-def register_engine(engine: "Engine | types.ModuleType"):
+def register_engine(engine: "Engine | types.ModuleType | LazyEngine"):
     if engine.name in engines:
         logger.error('Engine config error: ambiguous name: {0}'.format(engine.name))
         sys.exit(1)
     engines[engine.name] = engine
+    if not isinstance(engine, LazyEngine):
+        # the props of a lazy engine are resolved when the engine is loaded
+        engine_props[engine.name] = get_engine_props(engine)
 
     if engine.shortcut in engine_shortcuts:
         logger.error('Engine config error: ambiguous shortcut: {0}'.format(engine.shortcut))
@@ -264,14 +534,23 @@ def register_engine(engine: "Engine | types.ModuleType"):
 
 
 def load_engines(engine_list: list[dict[str, t.Any]]):
-    """usage: ``engine_list = settings['engines']``"""
+    """usage: ``engine_list = settings['engines']``
+
+    With :ref:`settings search lazy_engines`, a disabled engine is registered
+    as a :py:obj:`LazyEngine` (see :py:obj:`LazyEngine.can_stub`).
+    """
+    lazy = settings['search']['lazy_engines']
     engines.clear()
+    engine_props.clear()
     engine_shortcuts.clear()
     categories.clear()
     categories['general'] = []
     for engine_data in engine_list:
         if engine_data.get("inactive") is True:
             continue
+        if lazy and LazyEngine.can_stub(engine_data):
+            register_engine(LazyEngine(engine_data))
+            continue
         engine = load_engine(engine_data)
         if engine:
             register_engine(engine)
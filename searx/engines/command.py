@@ -53,6 +53,13 @@ The following options are available:
 ``result_separator``:
   The character that separates results. Default: ``\\n``.
 
+``coprocess``:
+  Run the command as long-lived co-process (see :ref:`command coprocess`).
+  Default: ``false``.
+
+``coprocess_workers``:
+  Max. number of co-processes of the engine.  Default: ``2``.
+
 Example
 =======
 
@@ -70,17 +77,55 @@ configured working directory:
         chars: ' '
         keys: ['line']
 
+.. _command coprocess:
+
+Co-process
+==========
+
+By default, the command is started for each search.  A tool with a heavy
+startup (e.g. one that loads an index) can be run as long-lived co-process
+(``coprocess: true``), the engine starts max. ``coprocess_workers`` processes
+of the command and sends the queries to the processes:
+
+- The query is written as one line to ``stdin`` of the process (the command has
+  no ``{{QUERY}}`` token).
+- The process writes the results to ``stdout``, each result is terminated by
+  the ``result_separator``.
+- An empty result (a ``result_separator`` only) ends the response to the query.
+
+The engine reads the results until the response has ended (also after the
+results of the requested page) and then sends the next query to the process.
+If the response does not end in the ``timeout`` of the engine, the process is
+killed and a new one is started for the next query.
+
+.. code:: yaml
+
+  - name: my index
+    engine: command
+    command: ['my-index-lookup', '--stdin']
+    coprocess: true
+    coprocess_workers: 4
+    delimiter:
+        chars: ' '
+        keys: ['line']
+
 Implementations
 ===============
 """
 
+import typing as t
+
+import codecs
+import queue
 import re
+import time
 from os.path import expanduser, isabs, realpath, commonprefix
 from shlex import split as shlex_split
-from subprocess import Popen, PIPE
-from threading import Thread
+from subprocess import Popen, PIPE, DEVNULL
+from threading import Event, Thread
 
 from searx import logger
+from searx.enginelib.dbpool import ConnectionPool
 from searx.result_types import EngineResults
 
 
@@ -95,9 +140,15 @@ environment_variables = {}
 working_dir = realpath('.')
 result_separator = '\n'
 timeout = 4.0
+coprocess = False
+coprocess_workers = 2
 
 _command_logger = logger.getChild('command')
 _compiled_parse_regex = {}
+_coprocess_pool: "ConnectionPool[CoProcess] | None" = None
+
+_READ_SIZE = 64 * 1024
+_MAX_QUEUED_RESULTS = 1000
 
 
 def init(engine_settings):
@@ -125,16 +176,34 @@ def init(engine_settings):
     if 'environment_variables' in engine_settings:
         environment_variables = engine_settings['environment_variables']
 
+    if coprocess:
+        global _coprocess_pool  # pylint: disable=global-statement
+        _coprocess_pool = ConnectionPool(
+            engine_settings.get('name', 'command'),
+            connect=CoProcess,
+            size=coprocess_workers,
+            check=lambda proc: proc.process.poll() is None,
+        )
+
 
 def search(query, params) -> EngineResults:
     res = EngineResults()
+    if coprocess:
+        _search_coprocess(res, query, params['pageno'])
+        return res
+
     cmd = _get_command_to_run(query)
     if not cmd:
         return res
 
-    reader_thread = Thread(target=_get_results_from_process, args=(res, cmd, params['pageno']))
-    reader_thread.start()
-    reader_thread.join(timeout=timeout)
+    with Popen(cmd, stdout=PIPE, stderr=PIPE, env=environment_variables) as process:
+        reader_thread = Thread(target=_get_results_from_process, args=(res, process, params['pageno']))
+        reader_thread.start()
+        reader_thread.join(timeout=timeout)
+        if reader_thread.is_alive():
+            _command_logger.debug('kill command after timeout: %s', cmd)
+            process.kill()
+            reader_thread.join()
 
     return res
 
@@ -153,38 +222,132 @@ def _get_command_to_run(query):
     return cmd
 
 
-def _get_results_from_process(res: EngineResults, cmd, pageno):
+def _read_results(stream: t.IO[bytes]) -> t.Iterator[str]:
+    """Yields the raw results from ``stream`` separated by the
+    :py:obj:`result_separator`.  The stream is read in chunks, a non-blank rest
+    at the end of the stream is the last result."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
     leftover = ''
+    while chunk := stream.read1(_READ_SIZE):  # type: ignore
+        raw_results = (leftover + decoder.decode(chunk)).split(result_separator)
+        leftover = raw_results.pop()
+        yield from raw_results
+    leftover += decoder.decode(b'', final=True)
+    if leftover.strip():
+        yield leftover
+
+
+def _get_results_from_process(res: EngineResults, process: Popen, pageno):
     count = 0
     start, end = __get_results_limits(pageno)
-    with Popen(cmd, stdout=PIPE, stderr=PIPE, env=environment_variables) as process:
-        line = process.stdout.readline()
-        while line:
-            buf = leftover + line.decode('utf-8')
-            raw_results = buf.split(result_separator)
-            if raw_results[-1]:
-                leftover = raw_results[-1]
-            raw_results = raw_results[:-1]
-
-            for raw_result in raw_results:
-                result = __parse_single_result(raw_result)
-                if result is None:
-                    _command_logger.debug('skipped result:', raw_result)
-                    continue
-
-                if start <= count and count <= end:  # pylint: disable=chained-comparison
-                    res.add(res.types.KeyValue(kvmap=result))
 
+    for raw_result in _read_results(process.stdout):  # type: ignore
+        result = __parse_single_result(raw_result)
+        if result is None:
+            _command_logger.debug('skipped result:', raw_result)
+            continue
+
+        if start <= count and count <= end:  # pylint: disable=chained-comparison
+            res.add(res.types.KeyValue(kvmap=result))
+
+        count += 1
+        if end < count:
+            # don't wait for the rest of the output of the command
+            process.kill()
+            return
+
+    return_code = process.wait(timeout=timeout)
+    if return_code != 0:
+        raise RuntimeError('non-zero return code when running command', process.args, return_code)
+
+
+class CoProcess:
+    """A long-lived process of the :py:obj:`command` (see :ref:`command
+    coprocess`).  A reader thread puts the results from ``stdout`` of the
+    process into a bounded queue, ``None`` marks the end of the output.  The
+    reader stops once the process has been closed, even if the queue is
+    full."""
+
+    def __init__(self):
+        self.process: Popen = Popen(  # pylint: disable=consider-using-with
+            command, stdin=PIPE, stdout=PIPE, stderr=DEVNULL, env=environment_variables
+        )
+        self.results: queue.Queue[str | None] = queue.Queue(maxsize=_MAX_QUEUED_RESULTS)
+        self.closed: Event = Event()
+        self.reader: Thread = Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def _put(self, raw_result: str | None) -> bool:
+        while not self.closed.is_set():
+            try:
+                self.results.put(raw_result, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read(self):
+        try:
+            for raw_result in _read_results(self.process.stdout):  # type: ignore
+                if not self._put(raw_result):
+                    return
+        finally:
+            self._put(None)
+
+    def query(self, query: str, deadline: float) -> t.Iterator[str]:
+        """Sends ``query`` to the process and yields the raw results of the
+        response.  Raises a :py:obj:`TimeoutError` if the response has not
+        ended at the ``deadline`` (:py:obj:`time.monotonic`)."""
+        self.process.stdin.write(query.replace('\n', ' ').encode('utf-8') + b'\n')  # type: ignore
+        self.process.stdin.flush()  # type: ignore
+        while True:
+            try:
+                raw_result = self.results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty as e:
+                raise TimeoutError('no response from the co-process') from e
+            if raw_result is None:
+                raise RuntimeError('co-process exited', self.process.args, self.process.poll())
+            if not raw_result:
+                return
+            yield raw_result
+
+    def close(self):
+        self.closed.set()
+        self.process.kill()
+        self.process.wait()
+        self.reader.join(timeout=1)
+        for stream in (self.process.stdin, self.process.stdout):
+            stream.close()  # type: ignore
+
+
+def _search_coprocess(res: EngineResults, query: str, pageno: int):
+    __check_query_params(shlex_split(query))
+    assert _coprocess_pool is not None
+
+    deadline = time.monotonic() + timeout
+    start, end = __get_results_limits(pageno)
+    proc, _ = _coprocess_pool.acquire(timeout)
+    complete = False
+    try:
+        count = 0
+        for raw_result in proc.query(query, deadline):
+            # read the rest of the response (after the requested page), the
+            # process is ready for the next query
+            if count > end:
+                continue
+            result = __parse_single_result(raw_result)
+            if result:
+                if count >= start:
+                    res.add(res.types.KeyValue(kvmap=result))
                 count += 1
-                if end < count:
-                    return res
-
-            line = process.stdout.readline()
-
-        return_code = process.wait(timeout=timeout)
-        if return_code != 0:
-            raise RuntimeError('non-zero return code when running command', cmd, return_code)
-        return None
+        complete = True
+    except TimeoutError:
+        _command_logger.debug('kill co-process after timeout: %s', command)
+        if count <= end:
+            raise
+    finally:
+        # a process that did not end its response in time is killed
+        _coprocess_pool.release(proc, discard=not complete)
 
 
 def __get_results_limits(pageno):
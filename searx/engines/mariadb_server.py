@@ -20,6 +20,11 @@ This is an example configuration for querying a MariaDB server:
      password: password
      limit: 5
      query_str: 'SELECT * from my_table WHERE my_column=%(query)s'
+     pool_size: 4
+
+The queries run on a pool of connections (:py:obj:`pool_size`), a query is
+canceled by the server if it runs longer than the ``timeout`` of the engine
+(``max_statement_time``).
 
 Implementations
 ===============
@@ -33,6 +38,7 @@ except ImportError:
     # the engine
     pass
 
+from searx.enginelib.dbpool import ConnectionPool
 from searx.result_types import EngineResults
 
 engine_type = 'offline'
@@ -57,11 +63,30 @@ query_str = ""
 
 limit = 10
 paging = True
-_connection = None
+
+pool_size = 4
+"""Max. number of connections to the DB (:py:obj:`ConnectionPool
+<searx.enginelib.dbpool.ConnectionPool>`)."""
+
+timeout: float
+"""Timeout (sec.) of a query: the max. time to wait for a connection of the
+pool and the statement timeout of the DB server (``timeout`` of the
+engine, by default :ref:`outgoing.request_timeout <settings outgoing>`)."""
+
+_pool: ConnectionPool | None = None
+
+
+def _connect():
+    return mariadb.connect(database=database, user=username, password=password, host=host, port=port)
+
+
+def _check(conn) -> bool:
+    conn.ping()
+    return True
 
 
 def init(engine_settings):
-    global _connection  # pylint: disable=global-statement
+    global _pool  # pylint: disable=global-statement
 
     if 'query_str' not in engine_settings:
         raise ValueError('query_str cannot be empty')
@@ -69,19 +94,31 @@ def init(engine_settings):
     if not engine_settings['query_str'].lower().startswith('select '):
         raise ValueError('only SELECT query is supported')
 
-    _connection = mariadb.connect(database=database, user=username, password=password, host=host, port=port)
+    _pool = ConnectionPool(
+        engine_settings['name'],
+        connect=_connect,
+        size=pool_size,
+        check=_check,
+        reconnect_errors=(mariadb.OperationalError, mariadb.InterfaceError),
+    )
+    # open the first connection, a misconfiguration fails on startup
+    _pool.release(_pool.acquire(timeout)[0])  # pylint: disable=undefined-variable
 
 
 def search(query, params) -> EngineResults:
     query_params = {'query': query}
     query_to_run = query_str + ' LIMIT {0} OFFSET {1}'.format(limit, (params['pageno'] - 1) * limit)
     logger.debug("SQL Query: %s", query_to_run)
-    res = EngineResults()
-
-    with _connection.cursor() as cur:
-        cur.execute(query_to_run, query_params)
-        col_names = [i[0] for i in cur.description]
-        for row in cur:
-            kvmap = dict(zip(col_names, map(str, row)))
-            res.add(res.types.KeyValue(kvmap=kvmap))
-    return res
+
+    def _query(conn) -> EngineResults:
+        res = EngineResults()
+        with conn.cursor() as cur:
+            cur.execute('SET SESSION max_statement_time = %s', (timeout,))
+            cur.execute(query_to_run, query_params)
+            col_names = [i[0] for i in cur.description]
+            for row in cur:
+                kvmap = dict(zip(col_names, map(str, row)))
+                res.add(res.types.KeyValue(kvmap=kvmap))
+        return res
+
+    return _pool.call(_query, timeout=timeout)  # type: ignore
@@ -19,12 +19,18 @@ This is an example configuration for querying a MySQL server:
      password: password
      limit: 5
      query_str: 'SELECT * from my_table WHERE my_column=%(query)s'
+     pool_size: 4
+
+The queries run on a pool of connections (:py:obj:`pool_size`), a query is
+canceled by the server if it runs longer than the ``timeout`` of the engine
+(``MAX_EXECUTION_TIME``).
 
 Implementations
 ===============
 
 """
 
+from searx.enginelib.dbpool import ConnectionPool
 from searx.result_types import EngineResults
 
 try:
@@ -57,19 +63,21 @@ query_str = ""
 
 limit = 10
 paging = True
-_connection = None
 
+pool_size = 4
+"""Max. number of connections to the DB (:py:obj:`ConnectionPool
+<searx.enginelib.dbpool.ConnectionPool>`)."""
 
-def init(engine_settings):
-    global _connection  # pylint: disable=global-statement
+timeout: float
+"""Timeout (sec.) of a query: the max. time to wait for a connection of the
+pool and the statement timeout of the DB server (``timeout`` of the
+engine, by default :ref:`outgoing.request_timeout <settings outgoing>`)."""
 
-    if 'query_str' not in engine_settings:
-        raise ValueError('query_str cannot be empty')
+_pool: ConnectionPool | None = None
 
-    if not engine_settings['query_str'].lower().startswith('select '):
-        raise ValueError('only SELECT query is supported')
 
-    _connection = mysql.connector.connect(
+def _connect():
+    return mysql.connector.connect(
         database=database,
         user=username,
         password=password,
@@ -79,15 +87,42 @@ def init(engine_settings):
     )
 
 
+def _check(conn) -> bool:
+    return conn.is_connected()
+
+
+def init(engine_settings):
+    global _pool  # pylint: disable=global-statement
+
+    if 'query_str' not in engine_settings:
+        raise ValueError('query_str cannot be empty')
+
+    if not engine_settings['query_str'].lower().startswith('select '):
+        raise ValueError('only SELECT query is supported')
+
+    _pool = ConnectionPool(
+        engine_settings['name'],
+        connect=_connect,
+        size=pool_size,
+        check=_check,
+        reconnect_errors=(mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError),
+    )
+    # open the first connection, a misconfiguration fails on startup
+    _pool.release(_pool.acquire(timeout)[0])  # pylint: disable=undefined-variable
+
+
 def search(query, params) -> EngineResults:
-    res = EngineResults()
     query_params = {'query': query}
     query_to_run = query_str + ' LIMIT {0} OFFSET {1}'.format(limit, (params['pageno'] - 1) * limit)
 
-    with _connection.cursor() as cur:
-        cur.execute(query_to_run, query_params)
-        for row in cur:
-            kvmap = dict(zip(cur.column_names, map(str, row)))
-            res.add(res.types.KeyValue(kvmap=kvmap))
-
-    return res
+    def _query(conn) -> EngineResults:
+        res = EngineResults()
+        with conn.cursor() as cur:
+            cur.execute('SET SESSION MAX_EXECUTION_TIME = %s', (int(timeout * 1000),))
+            cur.execute(query_to_run, query_params)
+            for row in cur:
+                kvmap = dict(zip(cur.column_names, map(str, row)))
+                res.add(res.types.KeyValue(kvmap=kvmap))
+        return res
+
+    return _pool.call(_query, timeout=timeout)  # type: ignore
@@ -15,6 +15,11 @@ Below is an example configuration:
      username: searxng
      password: password
      query_str: 'SELECT * from my_table WHERE my_column = %(query)s'
+     pool_size: 4
+
+The queries run on a pool of connections (:py:obj:`pool_size`), a query is
+canceled by the server if it runs longer than the ``timeout`` of the engine
+(``statement_timeout``).
 
 Implementations
 ===============
@@ -28,6 +33,7 @@ except ImportError:
     # manually to use the engine.
     pass
 
+from searx.enginelib.dbpool import ConnectionPool
 from searx.result_types import EngineResults
 
 engine_type = 'offline'
@@ -52,19 +58,21 @@ query_str = ""
 
 limit = 10
 paging = True
-_connection = None
 
+pool_size = 4
+"""Max. number of connections to the DB (:py:obj:`ConnectionPool
+<searx.enginelib.dbpool.ConnectionPool>`)."""
 
-def init(engine_settings):
-    global _connection  # pylint: disable=global-statement
+timeout: float
+"""Timeout (sec.) of a query: the max. time to wait for a connection of the
+pool and the statement timeout of the DB server (``timeout`` of the
+engine, by default :ref:`outgoing.request_timeout <settings outgoing>`)."""
 
-    if 'query_str' not in engine_settings:
-        raise ValueError('query_str cannot be empty')
+_pool: ConnectionPool | None = None
 
-    if not engine_settings['query_str'].lower().startswith('select '):
-        raise ValueError('only SELECT query is supported')
 
-    _connection = psycopg2.connect(
+def _connect():
+    return psycopg2.connect(
         database=database,
         user=username,
         password=password,
@@ -73,14 +81,47 @@ def init(engine_settings):
     )
 
 
+def _check(conn) -> bool:
+    if conn.closed:
+        return False
+    with conn:
+        with conn.cursor() as cur:
+            cur.execute('SELECT 1')
+    return True
+
+
+def init(engine_settings):
+    global _pool  # pylint: disable=global-statement
+
+    if 'query_str' not in engine_settings:
+        raise ValueError('query_str cannot be empty')
+
+    if not engine_settings['query_str'].lower().startswith('select '):
+        raise ValueError('only SELECT query is supported')
+
+    _pool = ConnectionPool(
+        engine_settings['name'],
+        connect=_connect,
+        size=pool_size,
+        check=_check,
+        reconnect_errors=(psycopg2.OperationalError, psycopg2.InterfaceError),
+    )
+    # open the first connection, a misconfiguration fails on startup
+    _pool.release(_pool.acquire(timeout)[0])  # pylint: disable=undefined-variable
+
+
 def search(query, params) -> EngineResults:
     query_params = {'query': query}
     query_to_run = query_str + ' LIMIT {0} OFFSET {1}'.format(limit, (params['pageno'] - 1) * limit)
 
-    with _connection:
-        with _connection.cursor() as cur:
-            cur.execute(query_to_run, query_params)
-            return _fetch_results(cur)
+    def _query(conn) -> EngineResults:
+        with conn:
+            with conn.cursor() as cur:
+                cur.execute('SET LOCAL statement_timeout = %s', (int(timeout * 1000),))
+                cur.execute(query_to_run, query_params)
+                return _fetch_results(cur)
+
+    return _pool.call(_query, timeout=timeout)  # type: ignore
 
 
 def _fetch_results(cur) -> EngineResults:
@@ -8,6 +8,12 @@ Configuration
 The engine has the following (additional) settings:
 
 - :py:obj:`result_type`
+- :py:obj:`fts_table`, :py:obj:`fts_source` & :py:obj:`fts_snippet_tokens`
+- :py:obj:`pool_size` & :py:obj:`mmap_size`
+
+The DB is opened read-only, the connections are reused by the queries (a pool
+of max. :py:obj:`pool_size` connections per engine) and the DB file is memory
+mapped (:py:obj:`mmap_size`).
 
 
 Example
@@ -40,6 +46,49 @@ Query to test: ``!mediathekview concert``
        WHERE title LIKE :wildcard OR description LIKE :wildcard
        ORDER BY duration DESC
 
+Full-text search
+================
+
+A query with ``LIKE :wildcard`` scans the whole table, on a large table this
+takes seconds.  With a FTS5_ index, the engine looks up the terms of the query
+in the index, the results are ranked by relevance (bm25_) and the ``content``
+of a result is the snippet of the text that matches the query.
+
+.. _FTS5: https://www.sqlite.org/fts5.html
+.. _bm25: https://www.sqlite.org/fts5.html#the_bm25_function
+
+The index over the columns of a table is built by :py:obj:`create_fts_index`,
+e.g. for the MediathekView_ example::
+
+  $ python -c "from searx.engines.sqlite import create_fts_index; \\
+      create_fts_index('searx/data/filmliste-v2.db', 'film_fts', 'film', ['title', 'description'])"
+
+Triggers on the table keep the index up to date when the table is modified.
+If :py:obj:`fts_table` is set and there is no ``query_str``, the engine builds
+the query from the FTS settings:
+
+.. code:: yaml
+
+  - name: mediathekview
+    engine: sqlite
+    shortcut: mediathekview
+    categories: [general, videos]
+    database: searx/data/filmliste-v2.db
+    fts_table: film_fts
+    fts_source: film
+
+In a ``query_str`` of your own, use the parameter ``:match`` (the terms of the
+search query as FTS5 query) and the FTS5 functions:
+
+.. code:: yaml
+
+    query_str: >-
+      SELECT film.title AS title, film.url_video AS url,
+             snippet(film_fts, -1, '', '', '…', 32) AS content
+        FROM film_fts JOIN film ON film.rowid = film_fts.rowid
+       WHERE film_fts MATCH :match
+       ORDER BY rank
+
 Implementations
 ===============
 
@@ -48,6 +97,7 @@ import typing as t
 import sqlite3
 import contextlib
 
+from searx.enginelib.dbpool import ConnectionPool
 from searx.result_types import EngineResults
 from searx.result_types import MainResult, KeyValue
 
@@ -62,35 +112,133 @@ query_str = ""
 result_type: t.Literal["MainResult", "KeyValue"] = "KeyValue"
 """The result type can be :py:obj:`MainResult` or :py:obj:`KeyValue`."""
 
+fts_table = ""
+"""Name of the FTS5 table (see :py:obj:`create_fts_index`), if set the search
+query is passed as FTS5 query in the parameter ``:match``."""
+
+fts_source = ""
+"""Name of the table the FTS5 index has been built from (the *external
+content* table).  The default query joins the rows of this table."""
+
+fts_snippet_tokens = 32
+"""Max. number of tokens in the snippet of the default FTS query."""
+
 limit = 10
 paging = True
 
+pool_size = 4
+"""Max. number of (read-only) connections to the DB."""
+
+timeout: float
+"""Max. time (sec.) to wait for a connection of the pool (``timeout`` of the
+engine, by default :ref:`outgoing.request_timeout <settings outgoing>`)."""
+
+mmap_size = 256 * 1024 * 1024
+"""Max. number of bytes of the DB file that are memory mapped (``PRAGMA
+mmap_size``), ``0`` disables memory mapped I/O."""
+
+_pool: ConnectionPool[sqlite3.Connection] | None = None
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def fts_query_str() -> str:
+    """Returns the default SQL query of the FTS mode: the rows that match
+    ``:match``, ranked by bm25 and with the snippet of the match in ``content``."""
+    fts = _quote_identifier(fts_table)
+    snippet = f"snippet({fts}, -1, '', '', '…', {int(fts_snippet_tokens)}) AS content"
+    if fts_source:
+        src = _quote_identifier(fts_source)
+        return (
+            f"SELECT {src}.*, {snippet} FROM {fts} JOIN {src} ON {src}.rowid = {fts}.rowid"
+            f" WHERE {fts} MATCH :match ORDER BY {fts}.rank"
+        )
+    return f"SELECT *, {snippet} FROM {fts} WHERE {fts} MATCH :match ORDER BY rank"
+
+
+def fts_match(query: str) -> str:
+    """Returns the terms of ``query`` as FTS5 query.  The terms are quoted, the
+    FTS5 syntax (``AND``, ``NEAR``, ``col:`` ...) of a search query is not
+    evaluated."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+def create_fts_index(db_file: str, table: str, source: str, columns: list[str]):
+    """Creates the FTS5 ``table`` over the ``columns`` of the table ``source``
+    in the SQLite DB ``db_file`` and (re-) builds the index.  The index is an
+    *external content* index, the text is not copied into the index.  Triggers
+    on ``source`` maintain the index when rows are inserted, updated or
+    deleted."""
+
+    fts, src = _quote_identifier(table), _quote_identifier(source)
+    cols = ", ".join(_quote_identifier(c) for c in columns)
+    new = ", ".join("new." + _quote_identifier(c) for c in columns)
+    old = ", ".join("old." + _quote_identifier(c) for c in columns)
+    trigger = _quote_identifier
+
+    with contextlib.closing(sqlite3.connect(db_file)) as conn:
+        with conn:
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content={src}, content_rowid=rowid)"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger(table + '_ai')} AFTER INSERT ON {src} BEGIN"
+                f" INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger(table + '_ad')} AFTER DELETE ON {src} BEGIN"
+                f" INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old}); END"
+            )
+            conn.execute(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger(table + '_au')} AFTER UPDATE ON {src} BEGIN"
+                f" INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old});"
+                f" INSERT INTO {fts}(rowid, {cols}) VALUES (new.rowid, {new}); END"
+            )
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('optimize')")
+
+
+def _connect() -> sqlite3.Connection:
+    # Open database in read only mode: if the database doesn't exist.  The
+    # default mode creates an empty file on the file system.  See:
+    # - https://docs.python.org/3/library/sqlite3.html#sqlite3.connect
+    # - https://www.sqlite.org/uri.html
+    uri = 'file:' + database + '?mode=ro'
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {int(mmap_size)}")
+    return conn
+
 
 def init(engine_settings):
-    if 'query_str' not in engine_settings:
+    global _pool, query_str  # pylint: disable=global-statement
+
+    if 'query_str' in engine_settings:
+        if not engine_settings['query_str'].lower().startswith('select '):
+            raise ValueError('only SELECT query is supported')
+    elif fts_table:
+        query_str = fts_query_str()
+    else:
         raise ValueError('query_str cannot be empty')
 
-    if not engine_settings['query_str'].lower().startswith('select '):
-        raise ValueError('only SELECT query is supported')
+    _pool = ConnectionPool(engine_settings['name'], connect=_connect, size=pool_size)
 
 
 @contextlib.contextmanager
 def sqlite_cursor():
     """Implements a :py:obj:`Context Manager <contextlib.contextmanager>` for a
-    :py:obj:`sqlite3.Cursor`.
-
-    Open database in read only mode: if the database doesn't exist.  The default
-    mode creates an empty file on the file system.  See:
-
-    * https://docs.python.org/3/library/sqlite3.html#sqlite3.connect
-    * https://www.sqlite.org/uri.html
-
-    """
-    uri = 'file:' + database + '?mode=ro'
-    with contextlib.closing(sqlite3.connect(uri, uri=True)) as connect:
-        connect.row_factory = sqlite3.Row
-        with contextlib.closing(connect.cursor()) as cursor:
+    :py:obj:`sqlite3.Cursor` of a (read-only) connection from the pool."""
+    assert _pool is not None
+    conn, _ = _pool.acquire(timeout)  # pylint: disable=undefined-variable
+    try:
+        with contextlib.closing(conn.cursor()) as cursor:
             yield cursor
+    except BaseException:
+        _pool.release(conn, discard=True)
+        raise
+    _pool.release(conn)
 
 
 def search(query, params) -> EngineResults:
@@ -98,6 +246,7 @@ def search(query, params) -> EngineResults:
     query_params = {
         'query': query,
         'wildcard': r'%' + query.replace(' ', r'%') + r'%',
+        'match': fts_match(query),
         'limit': limit,
         'offset': (params['pageno'] - 1) * limit,
     }
@@ -10,6 +10,13 @@ Select a database to search in and set its index in the option ``db``.  You can
 either look for exact matches or use partial keywords to find what you are
 looking for by configuring ``exact_match_only``.
 
+With ``exact_match_only: false``, the engine scans the keys that contain the
+query.  The values of the keys are fetched in batches (one round trip per
+:py:obj:`batch_size` keys) and the search stops when :py:obj:`limit` results
+are found, or :py:obj:`max_keys` keys or :py:obj:`max_bytes` bytes have been
+fetched.  With :py:obj:`use_lua` the type and the value of the keys of a batch
+are fetched by a Lua script on the server.
+
 Example
 =======
 
@@ -34,9 +41,13 @@ Implementations
 
 """
 
+import itertools
+import typing as t
+
 import valkey  # pylint: disable=import-error
 
 from searx.result_types import EngineResults
+from searx.valkeylib import lua_script_storage
 
 engine_type = 'offline'
 
@@ -50,8 +61,50 @@ db = 0
 paging = False
 exact_match_only = True
 
+limit = 10
+"""Max. number of results of a key scan."""
+
+max_keys = 1000
+"""Max. number of matching keys whose values are fetched in a key scan."""
+
+max_bytes = 1024 * 1024
+"""Max. number of bytes (keys & values) fetched in a key scan."""
+
+max_items = 100
+"""Max. number of items (fields of a hash, elements of a list) fetched from a
+key."""
+
+batch_size = 50
+"""Number of keys whose values are fetched in one round trip."""
+
+scan_count = 1000
+"""``COUNT`` hint of the ``SCAN`` command (number of keys the server checks in
+one round trip)."""
+
+use_lua = False
+"""Fetch the type and the value of the keys of a batch by the Lua script
+:py:obj:`FETCH_KEYS` (one round trip per batch instead of two)."""
+
 _valkey_client = None
 
+FETCH_KEYS = """
+local max_items = tonumber(ARGV[1])
+local ret = {}
+for i, key in ipairs(KEYS) do
+    local key_type = redis.call('TYPE', key)['ok']
+    if key_type == 'hash' then
+        ret[i] = {key_type, redis.call('HSCAN', key, 0, 'COUNT', max_items)[2]}
+    elseif key_type == 'list' then
+        ret[i] = {key_type, redis.call('LRANGE', key, 0, max_items - 1)}
+    else
+        ret[i] = {key_type, {}}
+    end
+end
+return ret
+"""
+"""Lua script that returns the type and the items of the ``KEYS`` (a hash as
+flat list of fields and values)."""
+
 
 def init(_engine_settings):
     global _valkey_client  # pylint: disable=global-statement
@@ -82,18 +135,61 @@ def search(query, _params) -> EngineResults:
     return res
 
 
-def search_keys(query) -> list[dict]:
-    ret = []
-    for key in _valkey_client.scan_iter(match='*{}*'.format(query)):
-        key_type = _valkey_client.type(key)
-        res = None
+def _fetch_pipelined(keys: list[str]) -> list[dict | None]:
+    pipe = _valkey_client.pipeline(transaction=False)
+    for key in keys:
+        pipe.type(key)
+    key_types = pipe.execute()
 
+    for key, key_type in zip(keys, key_types):
         if key_type == 'hash':
-            res = _valkey_client.hgetall(key)
+            pipe.hscan(key, 0, count=max_items)
         elif key_type == 'list':
-            res = dict(enumerate(_valkey_client.lrange(key, 0, -1)))
+            pipe.lrange(key, 0, max_items - 1)
+    values = iter(pipe.execute())
 
-        if res:
+    ret: list[dict | None] = []
+    for key_type in key_types:
+        if key_type == 'hash':
+            ret.append(next(values)[1])
+        elif key_type == 'list':
+            ret.append(dict(enumerate(next(values))))
+        else:
+            ret.append(None)
+    return ret
+
+
+def _fetch_lua(keys: list[str]) -> list[dict | None]:
+    script = lua_script_storage(_valkey_client, FETCH_KEYS)
+    ret: list[dict | None] = []
+    for key_type, items in script(keys=keys, args=[max_items]):
+        if key_type == 'hash':
+            it = iter(items)
+            ret.append(dict(zip(it, it)))
+        elif key_type == 'list':
+            ret.append(dict(enumerate(items)))
+        else:
+            ret.append(None)
+    return ret
+
+
+def _size(kvmap: dict[t.Any, str]) -> int:
+    return sum(len(str(k)) + len(v) for k, v in kvmap.items())
+
+
+def search_keys(query) -> list[dict]:
+    ret = []
+    fetch = _fetch_lua if use_lua else _fetch_pipelined
+    fetched_bytes = 0
+
+    keys = itertools.islice(_valkey_client.scan_iter(match='*{}*'.format(query), count=scan_count), max_keys)
+    while batch := list(itertools.islice(keys, batch_size)):
+        for key, res in zip(batch, fetch(batch)):
+            if not res:
+                continue
+            fetched_bytes += _size(res)
             res['valkey_key'] = key
             ret.append(res)
+            if len(ret) >= limit or fetched_bytes >= max_bytes:
+                return ret
     return ret
@@ -64,6 +64,10 @@ class SXNG_Request(flask.Request):
 
     remote_addr: str
 
+    favicon_urls: dict[str, str]
+    """The favicon URLs of the result page by authority, resolved in one batch
+    by :py:obj:`searx.favicons.favicon_urls` before the page is rendered."""
+
 
 #: A replacement for :py:obj:`flask.request` with type cast :py:`SXNG_Request`.
 sxng_request = typing.cast(SXNG_Request, flask.request)
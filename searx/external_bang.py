@@ -5,8 +5,9 @@ __all__ = ["get_bang_url"]
 
 import typing as t
 
+from collections.abc import Mapping
 from urllib.parse import quote_plus, urlparse
-from searx.data import EXTERNAL_BANGS
+from searx.data import EXTERNAL_BANGS, EXTERNAL_BANGS_INDEX  # pylint: disable=unused-import
 
 LEAF_KEY = chr(16)
 
@@ -14,20 +15,20 @@ if t.TYPE_CHECKING:
     from searx.search.models import SearchQuery
 
 
-def get_node(external_bangs_db: dict[str, t.Any], bang: str):
+def get_node(external_bangs_db: Mapping[str, t.Any], bang: str):
     node = external_bangs_db['trie']
     after = ''
     before = ''
     for bang_letter in bang:
         after += bang_letter
-        if after in node and isinstance(node, dict):
+        if after in node and isinstance(node, Mapping):
             node = node[after]
             before += after
             after = ''
     return node, before, after
 
 
-def get_bang_definition_and_ac(external_bangs_db: dict[str, t.Any], bang: str):
+def get_bang_definition_and_ac(external_bangs_db: Mapping[str, t.Any], bang: str):
     node, before, after = get_node(external_bangs_db, bang)
 
     bang_definition = None
@@ -36,7 +37,7 @@ def get_bang_definition_and_ac(external_bangs_db: dict[str, t.Any], bang: str):
         for k in node:
             if k.startswith(after):
                 bang_ac_list.append(before + k)
-    elif isinstance(node, dict):
+    elif isinstance(node, Mapping):
         bang_definition = node.get(LEAF_KEY)
         bang_ac_list = [before + k for k in node.keys() if k != LEAF_KEY]
     elif isinstance(node, str):
@@ -62,10 +63,17 @@ def resolve_bang_definition(bang_definition: str, query: str) -> tuple[str, int]
 
 
 def get_bang_definition_and_autocomplete(
-    bang: str, external_bangs_db: dict[str, t.Any] | None = None
+    bang: str, external_bangs_db: Mapping[str, t.Any] | None = None, limit: int | None = None
 ):  # pylint: disable=invalid-name
+    """Returns the definition of ``bang`` (or ``None``) and the list of the
+    bangs starting with ``bang``, ordered by rank.  With ``limit`` only the top
+    ``limit`` bangs are returned.
+
+    Without ``external_bangs_db`` (a trie like :py:obj:`EXTERNAL_BANGS`), the
+    :py:obj:`EXTERNAL_BANGS_INDEX <searx.data.external_bangs.ExternalBangsIndex>`
+    is used."""
     if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
+        return EXTERNAL_BANGS_INDEX.get(bang), EXTERNAL_BANGS_INDEX.complete(bang, limit)
 
     bang_definition, bang_ac_list = get_bang_definition_and_ac(external_bangs_db, bang)
 
@@ -86,11 +94,13 @@ def get_bang_definition_and_autocomplete(
 
     new_autocomplete.sort(key=lambda t: (-t[1], t[0]))
     new_autocomplete = list(map(lambda t: t[0], new_autocomplete))
+    if limit is not None:
+        new_autocomplete = new_autocomplete[:limit]
 
     return bang_definition, new_autocomplete
 
 
-def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any] | None = None) -> str | None:
+def get_bang_url(search_query: "SearchQuery", external_bangs_db: Mapping[str, t.Any] | None = None) -> str | None:
     """
     Redirects if the user supplied a correct bang search.
     :param search_query: This is a search_query object which contains preferences and the submitted queries.
@@ -98,11 +108,11 @@ def get_bang_url(search_query: "SearchQuery", external_bangs_db: dict[str, t.Any
     """
     ret_val = None
 
-    if external_bangs_db is None:
-        external_bangs_db = EXTERNAL_BANGS
-
     if search_query.external_bang:
-        bang_definition, _ = get_bang_definition_and_ac(external_bangs_db, search_query.external_bang)
+        if external_bangs_db is None:
+            bang_definition = EXTERNAL_BANGS_INDEX.get(search_query.external_bang)
+        else:
+            bang_definition, _ = get_bang_definition_and_ac(external_bangs_db, search_query.external_bang)
         if bang_definition and isinstance(bang_definition, str):
             ret_val = resolve_bang_definition(bang_definition, search_query.query)[0]
 
@@ -10,6 +10,9 @@
 :py:obj:`FaviconCacheSQLite`:
   Favicon cache that manages the favicon BLOBs in a SQLite DB.
 
+:py:obj:`FaviconCacheFiles`:
+  Favicon cache with the index in a SQLite DB and the BLOBs in files.
+
 :py:obj:`FaviconCacheNull`:
   Fallback solution if the configured cache cannot be used for system reasons.
 
@@ -21,6 +24,7 @@ import typing as t
 
 import os
 import abc
+import pathlib
 import dataclasses
 import hashlib
 import logging
@@ -46,6 +50,8 @@ app = typer.Typer()
 def state():
     """show state of the cache"""
     print(CACHE.state().report())
+    if isinstance(CACHE, FaviconCacheSQLite):
+        print(CACHE.maintenance_stats().report())
 
 
 @app.command()
@@ -67,6 +73,8 @@ def maintenance(force: bool = True, debug: bool = False):
     state_delta = state_t0 - state_t1
     print("The cache has been reduced by:")
     print(state_delta.report("\n- {descr}: {val}").lstrip("\n"))
+    if isinstance(CACHE, FaviconCacheSQLite):
+        print(CACHE.maintenance_stats().report())
 
 
 def init(cfg: "FaviconCacheConfig"):
@@ -82,6 +90,15 @@ def init(cfg: "FaviconCacheConfig"):
             CACHE = FaviconCacheNull(cfg)
         else:
             CACHE = FaviconCacheSQLite(cfg)
+    elif cfg.db_type == "files":
+        if sqlite3.sqlite_version_info <= (3, 35):
+            logger.critical(
+                "Disable favicon caching completely: SQLite library (%s) is too old! (require >= 3.35)",
+                sqlite3.sqlite_version,
+            )
+            CACHE = FaviconCacheNull(cfg)
+        else:
+            CACHE = FaviconCacheFiles(cfg)
     elif cfg.db_type == "mem":
         logger.error("Favicons are cached in memory, don't use this in production!")
         CACHE = FaviconCacheMEM(cfg)
@@ -93,12 +110,15 @@ def init(cfg: "FaviconCacheConfig"):
 class FaviconCacheConfig(msgspec.Struct):  # pylint: disable=too-few-public-methods
     """Configuration of the favicon cache."""
 
-    db_type: t.Literal["sqlite", "mem"] = "sqlite"
+    db_type: t.Literal["sqlite", "files", "mem"] = "sqlite"
     """Type of the database:
 
     ``sqlite``:
       :py:obj:`.cache.FaviconCacheSQLite`
 
+    ``files``:
+      :py:obj:`.cache.FaviconCacheFiles`
+
     ``mem``:
       :py:obj:`.cache.FaviconCacheMEM` (not recommended)
     """
@@ -106,6 +126,9 @@ class FaviconCacheConfig(msgspec.Struct):  # pylint: disable=too-few-public-meth
     db_url: str = tempfile.gettempdir() + os.sep + "faviconcache.db"
     """URL of the SQLite DB, the path to the database file."""
 
+    blob_dir: str = tempfile.gettempdir() + os.sep + "faviconcache"
+    """Folder of the BLOB files (only used by ``db_type = "files"``)."""
+
     HOLD_TIME: int = 60 * 60 * 24 * 30  # 30 days
     """Hold time (default in sec.), after which a BLOB is removed from the cache."""
 
@@ -130,7 +153,9 @@ class FaviconCacheConfig(msgspec.Struct):  # pylint: disable=too-few-public-meth
 
     ``auto``:
       Maintenance is carried out automatically as part of the maintenance
-      intervals (:py:obj:`MAINTENANCE_PERIOD`); no external process is required.
+      intervals (:py:obj:`MAINTENANCE_PERIOD`) by the background
+      :py:obj:`scheduler <searx.sqlitedb.MaintenanceScheduler>`; no external
+      process is required.
 
     ``off``:
       Maintenance is switched off and must be carried out by an external process
@@ -193,11 +218,30 @@ class FaviconCache(abc.ABC):
         registered in the cache.  The ``None`` indicates that there was no entry
         in the cache."""
 
+    def get_many(self, resolver: str, authorities: list[str]) -> dict[str, tuple[None | bytes, None | str]]:
+        """Returns the ``(data, mime)`` tuples of the ``authorities`` that have
+        been registered in the cache (by ``authority``).  An authority that is
+        not in the cache is not in the returned dictionary."""
+        ret = {}
+        for authority in authorities:
+            data_mime = self(resolver, authority)
+            if data_mime is not None:
+                ret[authority] = data_mime
+        return ret
+
     @abc.abstractmethod
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
         """Set data and mime-type in the cache.  If data is None, the
         :py:obj:`FALLBACK_ICON` is registered. in the cache."""
 
+    def blob_file(  # pylint: disable=unused-argument
+        self, resolver: str, authority: str
+    ) -> None | tuple[pathlib.Path, str, str]:
+        """Returns ``(path, mime, sha256)`` of the file that contains the
+        favicon of ``authority``.  Returns ``None`` if the cache does not store
+        the favicons in files or the favicon is not in the cache."""
+        return None
+
     @abc.abstractmethod
     def state(self) -> FaviconCacheStats:
         """Returns a :py:obj:`FaviconCacheStats` (key/values) with information
@@ -232,7 +276,6 @@ class FaviconCacheNull(FaviconCache):
         pass
 
 
-@t.final
 class FaviconCacheSQLite(sqlitedb.SQLiteAppl, FaviconCache):  # pyright: ignore[reportUnsafeMultipleInheritance]
     """Favicon cache that manages the favicon BLOBs in a SQLite DB.  The DB
     model in the SQLite DB is implemented using the abstract class
@@ -335,11 +378,33 @@ CREATE TABLE IF NOT EXISTS blob_map (
             data, mime = res
         return data, mime
 
+    SQL_SELECT_MANY = (
+        "SELECT bm.authority, bm.sha256, b.data, b.mime FROM blob_map bm"
+        "  LEFT JOIN blobs b"
+        "    ON b.sha256 = bm.sha256"
+        " WHERE bm.resolver = ? AND bm.authority IN ({})"
+    )
+
+    MAX_SQL_VARIABLES = 500
+    """Max. number of authorities in one query of :py:obj:`get_many`."""
+
+    def get_many(self, resolver: str, authorities: list[str]) -> dict[str, tuple[None | bytes, None | str]]:
+
+        ret: dict[str, tuple[None | bytes, None | str]] = {}
+        for i in range(0, len(authorities), self.MAX_SQL_VARIABLES):
+            chunk = authorities[i : i + self.MAX_SQL_VARIABLES]
+            sql = self.SQL_SELECT_MANY.format(", ".join("?" * len(chunk)))
+            for authority, sha256, data, mime in self.DB.execute(sql, (resolver, *chunk)):
+                if sha256 == FALLBACK_ICON or data is None:
+                    ret[authority] = (None, None)
+                else:
+                    ret[authority] = (data, mime)
+        return ret
+
     def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
 
-        if self.cfg.MAINTENANCE_MODE == "auto" and int(time.time()) > self.next_maintenance_time:
-            # Should automatic maintenance be moved to a new thread?
-            self.maintenance()
+        if self.cfg.MAINTENANCE_MODE == "auto":
+            self.schedule_maintenance()
 
         if data is not None and mime is None:
             logger.error(
@@ -387,6 +452,8 @@ CREATE TABLE IF NOT EXISTS blob_map (
             logger.debug("no maintenance required yet, next maintenance interval is in the future")
             return
         self.properties.set("LAST_MAINTENANCE", "")  # hint: this (also) sets the m_time of the property!
+        start_time = time.time()
+        rows_removed = 0
 
         # Do maintenance tasks.  This can be take a little more time, to avoid
         # DB locks, establish a new DB connection.
@@ -399,8 +466,10 @@ CREATE TABLE IF NOT EXISTS blob_map (
                 f" WHERE cast(m_time as integer) < cast(strftime('%s', 'now') as integer) - {self.cfg.HOLD_TIME}"
             )
             logger.debug("dropped %s obsolete blob_map items from db", res.rowcount)
+            rows_removed += res.rowcount
             res = conn.execute(self.SQL_DROP_LEFTOVER_BLOBS)
             logger.debug("dropped %s obsolete BLOBS from db", res.rowcount)
+            rows_removed += res.rowcount
 
             # drop old items to be in LIMIT_TOTAL_BYTES
             total_bytes = conn.execute("SELECT SUM(bytes_c) FROM blobs").fetchone()[0] or 0
@@ -416,8 +485,10 @@ CREATE TABLE IF NOT EXISTS blob_map (
                     if c > x:
                         break
                 if sha_list:
-                    conn.execute("DELETE FROM blobs WHERE sha256 IN ('%s')" % "','".join(sha_list))
-                    conn.execute("DELETE FROM blob_map WHERE sha256 IN ('%s')" % "','".join(sha_list))
+                    res = conn.execute("DELETE FROM blobs WHERE sha256 IN ('%s')" % "','".join(sha_list))
+                    rows_removed += res.rowcount
+                    res = conn.execute("DELETE FROM blob_map WHERE sha256 IN ('%s')" % "','".join(sha_list))
+                    rows_removed += res.rowcount
                     logger.debug("dropped %s blobs with total size of %s bytes", len(sha_list), c)
 
         # Vacuuming the WALs
@@ -426,6 +497,8 @@ CREATE TABLE IF NOT EXISTS blob_map (
         conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
         conn.close()
 
+        self.record_maintenance(start_time, rows_removed)
+
     def _query_val(self, sql: str, default: t.Any = None):
         val = self.DB.execute(sql).fetchone()
         if val is not None:
@@ -443,6 +516,130 @@ CREATE TABLE IF NOT EXISTS blob_map (
         )
 
 
+@t.final
+class FaviconCacheFiles(FaviconCacheSQLite):
+    """Favicon cache that manages the index of the favicons in a SQLite DB (see
+    :py:obj:`FaviconCacheSQLite`) and stores the BLOBs in files, named by their
+    sha256 hash value.  The favicon proxy sends the files without reading them
+    into memory (:py:obj:`FaviconCache.blob_file`).
+
+    The ``blobs`` table holds the size and mime-type of the BLOBs (the ``data``
+    column is empty), the maintenance of the SQLite cache (:py:obj:`HOLD_TIME
+    <FaviconCacheConfig.HOLD_TIME>`, :py:obj:`LIMIT_TOTAL_BYTES
+    <FaviconCacheConfig.LIMIT_TOTAL_BYTES>`) is used unchanged, afterwards the
+    files that are no longer in the ``blobs`` table are removed (except the
+    files modified in the last :py:obj:`BLOB_FILE_GRACE` seconds, whose row may
+    not be inserted yet).
+
+    The following configurations are required / supported in addition:
+
+    - :py:obj:`FaviconCacheConfig.blob_dir`
+    """
+
+    SQL_SELECT_BLOB = (
+        "SELECT b.sha256, b.mime FROM blob_map bm"
+        "  JOIN blobs b"
+        "    ON b.sha256 = bm.sha256"
+        " WHERE bm.resolver = ? AND bm.authority = ?"
+    )
+
+    BLOB_FILE_GRACE: int = 60 * 10
+    """Seconds after its last modification a file is not removed by the
+    maintenance, even if it is not in the ``blobs`` table."""
+
+    def __init__(self, cfg: FaviconCacheConfig):
+        super().__init__(cfg)
+        self.blob_dir: pathlib.Path = pathlib.Path(cfg.blob_dir)
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+
+    def blob_path(self, sha256: str) -> pathlib.Path:
+        """Path of the BLOB file with the hash value ``sha256``."""
+        return self.blob_dir / sha256[:2] / sha256
+
+    def _read_blob(self, sha256: str) -> bytes | None:
+        try:
+            return self.blob_path(sha256).read_bytes()
+        except OSError:
+            return None
+
+    def blob_file(self, resolver: str, authority: str) -> None | tuple[pathlib.Path, str, str]:
+        res = self.DB.execute(self.SQL_SELECT_BLOB, (resolver, authority)).fetchone()
+        if res is None:
+            return None
+        sha256, mime = res
+        path = self.blob_path(sha256)
+        if not path.is_file():
+            return None
+        return path, mime, sha256
+
+    def __call__(self, resolver: str, authority: str) -> None | tuple[None | bytes, None | str]:
+        return self.get_many(resolver, [authority]).get(authority)
+
+    def get_many(self, resolver: str, authorities: list[str]) -> dict[str, tuple[None | bytes, None | str]]:
+
+        ret: dict[str, tuple[None | bytes, None | str]] = {}
+        for i in range(0, len(authorities), self.MAX_SQL_VARIABLES):
+            chunk = authorities[i : i + self.MAX_SQL_VARIABLES]
+            sql = self.SQL_SELECT_MANY.replace("b.data", "NULL").format(", ".join("?" * len(chunk)))
+            for authority, sha256, _, mime in self.DB.execute(sql, (resolver, *chunk)):
+                if sha256 == FALLBACK_ICON or mime is None:
+                    ret[authority] = (None, None)
+                    continue
+                data = self._read_blob(sha256)
+                if data is not None:
+                    # a missing BLOB file is a cache miss
+                    ret[authority] = (data, mime)
+        return ret
+
+    def set(self, resolver: str, authority: str, mime: str | None, data: bytes | None) -> bool:
+
+        if data is None or mime is None or len(data) > self.cfg.BLOB_MAX_BYTES:
+            return super().set(resolver, authority, mime, data)
+
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(sha256)
+        try:
+            # protect the file from the maintenance until the row is inserted
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(exist_ok=True)
+            tmp_file = path.with_name(f"{sha256}.{os.getpid()}.tmp")
+            tmp_file.write_bytes(data)
+            os.replace(tmp_file, path)
+
+        if self.cfg.MAINTENANCE_MODE == "auto":
+            self.schedule_maintenance()
+
+        with self.connect() as conn:
+            conn.execute(self.SQL_INSERT_BLOBS, (sha256, len(data), mime, b""))
+            conn.execute(self.SQL_INSERT_BLOB_MAP, (sha256, resolver, authority))
+        conn.close()
+        return True
+
+    def maintenance(self, force: bool = False):
+
+        last_maintenance = self.properties.m_time("LAST_MAINTENANCE")
+        super().maintenance(force=force)
+        if self.properties.m_time("LAST_MAINTENANCE") == last_maintenance and not force:
+            return
+
+        # remove the files that are no longer in the blobs table
+        grace_time = time.time() - self.BLOB_FILE_GRACE
+        known = {row[0] for row in self.DB.execute("SELECT sha256 FROM blobs")}
+        removed = 0
+        for path in self.blob_dir.glob("??/*"):
+            if path.name in known or path.name.endswith(".tmp"):
+                continue
+            try:
+                if path.stat().st_mtime > grace_time:
+                    continue
+            except FileNotFoundError:
+                continue
+            path.unlink(missing_ok=True)
+            removed += 1
+        logger.debug("dropped %s obsolete BLOB files", removed)
+
+
 @t.final
 class FaviconCacheMEM(FaviconCache):
     """Favicon cache in process' memory.  Its just a POC that stores the
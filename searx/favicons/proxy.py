@@ -2,18 +2,23 @@
 """Implementations for a favicon proxy"""
 
 
-from typing import Callable
+from typing import Callable, Iterable
 
 import importlib
 import base64
+import hashlib
 import pathlib
+import threading
+import time
 import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import flask
 from httpx import HTTPError
 import msgspec
 
-from searx import get_setting
+from searx import get_setting, logger
 
 from searx.webutils import new_hmac, is_hmac_of
 from searx.exceptions import SearxEngineResponseException
@@ -22,13 +27,19 @@ from searx.extended_types import sxng_request
 from .resolvers import DEFAULT_RESOLVER_MAP
 from . import cache
 
+logger = logger.getChild('favicons.proxy')
+
 DEFAULT_FAVICON_URL = {}
 CFG: "FaviconProxyConfig" = None  # type: ignore
+DATA_URLS: "DataURLCache" = None  # type: ignore
+PREFETCH: "FaviconPrefetch" = None  # type: ignore
 
 
 def init(cfg: "FaviconProxyConfig"):
-    global CFG  # pylint: disable=global-statement
+    global CFG, DATA_URLS, PREFETCH  # pylint: disable=global-statement
     CFG = cfg
+    DATA_URLS = DataURLCache(cfg.data_url_cache_size, cfg.data_url_ttl)
+    PREFETCH = FaviconPrefetch(cfg.prefetch_workers)
 
 
 def _initial_resolver_map():
@@ -80,6 +91,27 @@ class FaviconProxyConfig(msgspec.Struct):
             raise ValueError(f"resolver {fqn} is not implemented")
         return func
 
+    x_accel_redirect: str = ""
+    """Internal location of the :py:obj:`FaviconCacheConfig.blob_dir
+    <.cache.FaviconCacheConfig.blob_dir>` in the web server (e.g. nginx_).  If
+    set, the favicon files are sent by the web server (``X-Accel-Redirect``
+    header), not by SearXNG.
+
+    .. _nginx: https://nginx.org/en/docs/http/ngx_http_core_module.html#internal
+    """
+
+    data_url_cache_size: int = 4096
+    """Number of favicons whose data URL is held in the LRU of the process
+    (:py:obj:`DataURLCache`)."""
+
+    data_url_ttl: int = 60 * 60  # one hour
+    """Seconds a data URL is held in the :py:obj:`DataURLCache`, after this
+    time the favicon is read from the cache (DB) again."""
+
+    prefetch_workers: int = 2
+    """Number of threads that fetch the favicons of a result page that are not
+    in the cache (:py:obj:`FaviconPrefetch`), ``0`` disables the prefetch."""
+
     favicon_path: str = get_setting("ui.static_path") + "/themes/{theme}/img/empty_favicon.svg"  # type: ignore
     favicon_mime_type: str = "image/svg+xml"
 
@@ -109,6 +141,154 @@ class FaviconProxyConfig(msgspec.Struct):
         return data_url
 
 
+class DataURLCache:
+    """LRU of the ready-made data URLs of the favicons by ``(resolver,
+    authority)``.  An empty string is the marker of an authority without a
+    favicon (the default favicon of the theme is used).  The entries expire
+    after ``ttl`` seconds."""
+
+    def __init__(self, size: int, ttl: float):
+        self.size: int = size
+        self.ttl: float = ttl
+        self._items: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, resolver: str, authority: str) -> str | None:
+        key = (resolver, authority)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            url, expire = item
+            if expire <= time.monotonic():
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return url
+
+    def set(self, resolver: str, authority: str, url: str):
+        with self._lock:
+            self._items[(resolver, authority)] = (url, time.monotonic() + self.ttl)
+            self._items.move_to_end((resolver, authority))
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+
+class FaviconPrefetch:
+    """Fetches favicons that are not in the cache in background threads, a
+    later result page gets the favicons as data URLs (instead of routes to the
+    :py:obj:`favicon_proxy`).  A request to the :py:obj:`favicon_proxy` for a
+    favicon that is being fetched waits for the prefetch (:py:obj:`wait`)
+    instead of sending a second request to the resolver."""
+
+    max_pending: int = 256
+    """Max. number of favicons waiting to be fetched, more favicons are not
+    prefetched."""
+
+    def __init__(self, workers: int):
+        self.workers: int = workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: dict[tuple[str, str], threading.Event] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def _fetch(self, resolver: str, authority: str):
+        try:
+            search_favicon(resolver, authority)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            logger.debug("prefetch of favicon %s failed: %s", authority, exc)
+        finally:
+            with self._lock:
+                event = self._pending.pop((resolver, authority), None)
+            if event is not None:
+                event.set()
+
+    def submit(self, resolver: str, authorities: Iterable[str]):
+        if not self.workers:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="favicon_prefetch")
+            for authority in authorities:
+                key = (resolver, authority)
+                if key in self._pending or len(self._pending) >= self.max_pending:
+                    continue
+                self._pending[key] = threading.Event()
+                self._executor.submit(self._fetch, resolver, authority)
+
+    def wait(self, resolver: str, authority: str, timeout: float) -> bool:
+        """Waits max. ``timeout`` seconds for the prefetch of the favicon,
+        returns ``False`` if the favicon is still being fetched."""
+        with self._lock:
+            event = self._pending.get((resolver, authority))
+        if event is None:
+            return True
+        return event.wait(timeout)
+
+
+def _data_url(data: bytes, mime: str) -> str:
+    return f"data:{mime};base64,{str(base64.b64encode(data), 'utf-8')}"
+
+
+def _proxy_url(authority: str) -> str:
+    h = new_hmac(CFG.secret_key, authority.encode())
+    proxy_url = flask.url_for('favicon_proxy')
+    query = urllib.parse.urlencode({"authority": authority, "h": h})
+    return f"{proxy_url}?{query}"
+
+
+def _get_resolver() -> str | None:
+    resolver = sxng_request.preferences.get_value('favicon_resolver')  # type: ignore
+    if not resolver or resolver not in CFG.resolver_map.keys():
+        return None
+    return resolver
+
+
+def favicon_urls(authorities: Iterable[str]) -> dict[str, str]:
+    """Resolves the favicon URLs (see :py:obj:`favicon_url`) of all
+    ``authorities`` of a result page in one batch and memorizes them for
+    :py:obj:`favicon_url` in the request.  This function is called before the
+    result page is rendered:
+
+    - the data URLs are taken from the LRU :py:obj:`DataURLCache`,
+    - the favicons that are not in the LRU are read from the
+      :py:obj:`.cache.FaviconCache` in one query,
+    - the favicons that are not in the cache are fetched in the background
+      (:py:obj:`FaviconPrefetch`), the page gets the route to the
+      :py:obj:`favicon_proxy` for these favicons.
+    """
+    urls: dict[str, str] = {}
+    resolver = _get_resolver()
+    if resolver is None:
+        return urls
+
+    theme = sxng_request.preferences.get_value("theme")  # type: ignore
+    missing: list[str] = []
+    for authority in set(authorities):
+        url = DATA_URLS.get(resolver, authority)
+        if url is None:
+            missing.append(authority)
+        else:
+            urls[authority] = url or CFG.favicon_data_url(theme=theme)
+
+    if missing:
+        found = cache.CACHE.get_many(resolver, missing)
+        not_cached: list[str] = []
+        for authority in missing:
+            data_mime = found.get(authority)
+            if data_mime is None:
+                urls[authority] = _proxy_url(authority)
+                not_cached.append(authority)
+                continue
+            data, mime = data_mime
+            url = "" if data is None else _data_url(data, mime)  # type: ignore
+            DATA_URLS.set(resolver, authority, url)
+            urls[authority] = url or CFG.favicon_data_url(theme=theme)
+        PREFETCH.submit(resolver, not_cached)
+
+    sxng_request.favicon_urls = urls  # pylint: disable=assigning-non-slot
+    return urls
+
+
 def favicon_proxy():
     """REST API of SearXNG's favicon proxy service
 
@@ -143,12 +323,20 @@ def favicon_proxy():
     if not resolver or resolver not in CFG.resolver_map.keys():
         return "", 400
 
+    # the favicon of a result page may already be fetched by the prefetch
+    PREFETCH.wait(resolver, authority, CFG.resolver_timeout)
+
+    blob = cache.CACHE.blob_file(resolver, authority)
+    if blob is not None:
+        return send_blob(*blob)
+
     data, mime = search_favicon(resolver, authority)
 
     if data is not None and mime is not None:
         resp = flask.Response(data, mimetype=mime)  # type: ignore
         resp.headers['Cache-Control'] = f"max-age={CFG.max_age}"
-        return resp
+        resp.set_etag(hashlib.sha256(data).hexdigest())
+        return resp.make_conditional(sxng_request)
 
     # return default favicon from static path
     theme = sxng_request.preferences.get_value("theme")  # type: ignore
@@ -156,6 +344,26 @@ def favicon_proxy():
     return flask.send_from_directory(fav.parent, fav.name, mimetype=mimetype)
 
 
+def send_blob(path: pathlib.Path, mime: str, sha256: str) -> flask.Response:
+    """Sends the favicon file at ``path`` (see :py:obj:`.cache.FaviconCacheFiles`).
+    The sha256 hash value of the favicon is the (strong) ETag of the response, a
+    conditional request is answered with ``304 Not Modified``.  The file is sent
+    by the web server if :py:obj:`FaviconProxyConfig.x_accel_redirect` is set,
+    otherwise by :py:obj:`flask.send_file` (which uses ``X-Sendfile`` if
+    ``USE_X_SENDFILE`` is set in the flask app)."""
+
+    if sxng_request.if_none_match.contains(sha256):
+        resp = flask.Response(status=304)
+    elif CFG.x_accel_redirect:
+        resp = flask.Response(mimetype=mime)
+        resp.headers['X-Accel-Redirect'] = CFG.x_accel_redirect.rstrip("/") + f"/{path.parent.name}/{path.name}"
+    else:
+        resp = flask.send_file(path, mimetype=mime, etag=False, conditional=False)
+    resp.headers['Cache-Control'] = f"max-age={CFG.max_age}"
+    resp.set_etag(sha256)
+    return resp
+
+
 def search_favicon(resolver: str, authority: str) -> tuple[None | bytes, None | str]:
     """Sends the request to the favicon resolver and returns a tuple for the
     favicon.  The tuple consists of ``(data, mime)``, if the resolver has not
@@ -215,23 +423,26 @@ def favicon_url(authority: str) -> str:
 
     """
 
-    resolver = sxng_request.preferences.get_value('favicon_resolver')  # type: ignore
+    url = getattr(sxng_request, "favicon_urls", {}).get(authority)
+    if url is not None:
+        # resolved by favicon_urls() before the page has been rendered
+        return url
+
+    resolver = _get_resolver()
     # if resolver is empty or not valid, just return nothing.
-    if not resolver or resolver not in CFG.resolver_map.keys():
+    if resolver is None:
         return ""
 
-    data_mime = cache.CACHE(resolver, authority)
-
-    if data_mime == (None, None):
-        # we have already checked, the resolver does not have a favicon
-        theme = sxng_request.preferences.get_value("theme")  # type: ignore
-        return CFG.favicon_data_url(theme=theme)
+    theme = sxng_request.preferences.get_value("theme")  # type: ignore
+    url = DATA_URLS.get(resolver, authority)
+    if url is not None:
+        return url or CFG.favicon_data_url(theme=theme)
 
-    if data_mime is not None:
-        data, mime = data_mime
-        return f"data:{mime};base64,{str(base64.b64encode(data), 'utf-8')}"  # type: ignore
+    data_mime = cache.CACHE(resolver, authority)
+    if data_mime is None:
+        return _proxy_url(authority)
 
-    h = new_hmac(CFG.secret_key, authority.encode())
-    proxy_url = flask.url_for('favicon_proxy')
-    query = urllib.parse.urlencode({"authority": authority, "h": h})
-    return f"{proxy_url}?{query}"
+    data, mime = data_mime
+    url = "" if data is None else _data_url(data, mime)  # type: ignore
+    DATA_URLS.set(resolver, authority, url)
+    return url or CFG.favicon_data_url(theme=theme)
@@ -67,6 +67,30 @@ def counter(*args):
     return counter_storage.get(*args)
 
 
+POOL_EVENTS = ('connect', 'discard', 'timeout')
+"""Events of the connection pool of an engine (:py:obj:`searx.enginelib.dbpool`)."""
+
+
+CONNECTIONS = ('warm', 'cold')
+"""Connections of the HTTP requests of an engine (see
+:py:obj:`searx.network.get_connections_for_thread`)."""
+
+
+def configure_pool(engine_name: str):
+    """Configures the counters of the :py:obj:`POOL_EVENTS` of an engine, called
+    by the connection pool of the engine (only the SQL engines have a pool)."""
+    if counter_storage is None or has_pool(engine_name):
+        return
+    for event in POOL_EVENTS:
+        counter_storage.configure('engine', engine_name, 'pool', event)
+
+
+def has_pool(engine_name: str) -> bool:
+    """``True`` if the counters of the connection pool of the engine have been
+    configured (see :py:obj:`configure_pool`)."""
+    return counter_storage is not None and ('engine', engine_name, 'pool', POOL_EVENTS[-1]) in counter_storage.counters
+
+
 def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> None:
     """
     Initialize metrics
@@ -86,6 +110,10 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         if engine_name in engines:
             max_timeout = max(max_timeout, engines[engine_name].timeout)
 
+    # lookups of the DNS cache (searx.network.dns)
+    for event in ('hit', 'miss', 'refresh', 'error'):
+        counter_storage.configure('network', 'dns', event)
+
     # histogram configuration
     histogram_width = 0.1
     histogram_size = int(1.5 * max_timeout / histogram_width)
@@ -97,6 +125,13 @@ def initialize(engine_names: list[str] | None = None, enabled: bool = True) -> N
         counter_storage.configure('engine', engine_name, 'search', 'count', 'successful')
         # global counter of errors
         counter_storage.configure('engine', engine_name, 'search', 'count', 'error')
+        # requests coalesced with an identical request in flight
+        counter_storage.configure('engine', engine_name, 'search', 'count', 'coalesced')
+        # HTTP requests sent on an open connection (warm) or on a new connection
+        # (cold), with outgoing.shared_pools the open connection may have been
+        # opened by an other engine
+        for connection in CONNECTIONS:
+            counter_storage.configure('engine', engine_name, 'http', 'connection', connection)
         # score of the engine
         counter_storage.configure('engine', engine_name, 'score')
         # result count per requests
@@ -158,8 +193,17 @@ def get_reliabilities(engline_name_list):
         reliabilities[engine_name] = {
             'reliability': reliability,
             'sent_count': sent_count,
+            'coalesced_count': counter('engine', engine_name, 'search', 'count', 'coalesced'),
+            'connections': {
+                connection: counter('engine', engine_name, 'http', 'connection', connection)
+                for connection in CONNECTIONS
+            },
             'errors': errors,
         }
+        if has_pool(engine_name):
+            reliabilities[engine_name]['pool'] = {
+                event: counter('engine', engine_name, 'pool', event) for event in POOL_EVENTS
+            }
     return reliabilities
 
 
@@ -241,6 +285,9 @@ def get_engines_stats(engine_name_list: list[str]):
 
 
 def openmetrics(engine_stats, engine_reliabilities):
+    # the counters of the connection pools are only reported for the engines
+    # with a pool (SQL engines)
+    pool_engines = [engine for engine in engine_stats['time'] if 'pool' in engine_reliabilities.get(engine['name'], {})]
     metrics = [
         OpenMetricsFamily(
             key="searxng_engines_response_time_total_seconds",
@@ -280,6 +327,31 @@ def openmetrics(engine_stats, engine_reliabilities):
                 for engine in engine_stats['time']
             ],
         ),
+        OpenMetricsFamily(
+            key="searxng_engines_coalesced_count_total",
+            type_hint="counter",
+            help_hint="The total amount of user requests to this engine coalesced with an identical request",
+            data_info=[{'engine_name': engine['name']} for engine in engine_stats['time']],
+            data=[
+                engine_reliabilities.get(engine['name'], {}).get('coalesced_count', 0) or 0
+                for engine in engine_stats['time']
+            ],
+        ),
+        OpenMetricsFamily(
+            key="searxng_engines_http_connection_count_total",
+            type_hint="counter",
+            help_hint="The total amount of HTTP requests of the engine by connection (warm: open, cold: new)",
+            data_info=[
+                {'engine_name': engine['name'], 'connection': connection}
+                for engine in engine_stats['time']
+                for connection in CONNECTIONS
+            ],
+            data=[
+                engine_reliabilities.get(engine['name'], {}).get('connections', {}).get(connection, 0)
+                for engine in engine_stats['time']
+                for connection in CONNECTIONS
+            ],
+        ),
         OpenMetricsFamily(
             key="searxng_engines_reliability_total",
             type_hint="counter",
@@ -290,5 +362,36 @@ def openmetrics(engine_stats, engine_reliabilities):
                 for engine in engine_stats['time']
             ],
         ),
+        OpenMetricsFamily(
+            key="searxng_network_dns_lookups_total",
+            type_hint="counter",
+            help_hint="The total amount of lookups in the DNS cache by result (hit, miss, refresh, error)",
+            data_info=[{'result': event} for event in ('hit', 'miss', 'refresh', 'error')],
+            data=[counter('network', 'dns', event) for event in ('hit', 'miss', 'refresh', 'error')],
+        ),
     ]
+    if pool_engines:
+        metrics += [
+            OpenMetricsFamily(
+                key="searxng_engines_pool_connect_count_total",
+                type_hint="counter",
+                help_hint="The total amount of DB connections opened by the engine",
+                data_info=[{'engine_name': engine['name']} for engine in pool_engines],
+                data=[engine_reliabilities[engine['name']]['pool']['connect'] for engine in pool_engines],
+            ),
+            OpenMetricsFamily(
+                key="searxng_engines_pool_discard_count_total",
+                type_hint="counter",
+                help_hint="The total amount of broken DB connections discarded by the engine",
+                data_info=[{'engine_name': engine['name']} for engine in pool_engines],
+                data=[engine_reliabilities[engine['name']]['pool']['discard'] for engine in pool_engines],
+            ),
+            OpenMetricsFamily(
+                key="searxng_engines_pool_timeout_count_total",
+                type_hint="counter",
+                help_hint="The total amount of queries of the engine that got no DB connection in time",
+                data_info=[{'engine_name': engine['name']} for engine in pool_engines],
+                data=[engine_reliabilities[engine['name']]['pool']['timeout'] for engine in pool_engines],
+            ),
+        ]
     return "".join([str(metric) for metric in metrics])
@@ -18,7 +18,12 @@ import httpx
 import anyio
 
 from searx.extended_types import SXNG_Response
-from .network import get_network, initialize, check_network_configuration  # pylint:disable=cyclic-import
+from .network import (  # pylint:disable=cyclic-import
+    CONNECTION_EXTENSION,
+    get_network,
+    initialize,
+    check_network_configuration,
+)
 from .client import get_loop
 from .raise_for_httperror import raise_for_httperror
 
@@ -31,6 +36,13 @@ THREADLOCAL = threading.local()
 
 def reset_time_for_thread():
     THREADLOCAL.total_time = 0
+    THREADLOCAL.connections = {'warm': 0, 'cold': 0}
+
+
+def add_time_for_thread(duration: float):
+    """Adds ``duration`` (in sec.) to the thread's total time, used when a part
+    of the HTTP traffic of an engine was sent outside of the thread."""
+    THREADLOCAL.total_time = THREADLOCAL.__dict__.get('total_time', 0) + duration
 
 
 def get_time_for_thread() -> float | None:
@@ -38,6 +50,22 @@ def get_time_for_thread() -> float | None:
     return THREADLOCAL.__dict__.get('total_time')
 
 
+def record_connection_for_thread(response: httpx.Response):
+    """Counts the connection (warm or cold) on which ``response`` was received
+    in the thread's connections (see :py:obj:`get_connections_for_thread`)."""
+    connections = THREADLOCAL.__dict__.get('connections')
+    state = response.extensions.get(CONNECTION_EXTENSION)
+    if connections is not None and state in connections:
+        connections[state] += 1
+
+
+def get_connections_for_thread() -> tuple[int, int]:
+    """Returns the number of HTTP requests of the thread sent on an open
+    connection (warm) and on a new connection (cold)."""
+    connections = THREADLOCAL.__dict__.get('connections') or {}
+    return connections.get('warm', 0), connections.get('cold', 0)
+
+
 def set_timeout_for_thread(timeout: float, start_time: float | None = None):
     THREADLOCAL.timeout = timeout
     THREADLOCAL.start_time = start_time
@@ -70,6 +98,19 @@ def _record_http_time():
             THREADLOCAL.total_time += time_after_request - time_before_request
 
 
+def get_remaining_time_for_thread() -> float | None:
+    """Returns the time (sec.) remaining until the timeout of the thread
+    (:py:obj:`set_timeout_for_thread`) is reached or ``None`` if the thread has
+    no timeout."""
+    timeout = getattr(THREADLOCAL, 'timeout', None)
+    if timeout is None:
+        return None
+    start_time = getattr(THREADLOCAL, 'start_time', None)
+    if start_time:
+        timeout -= default_timer() - start_time
+    return max(timeout, 0.0)
+
+
 def _get_timeout(start_time: float, kwargs: t.Any) -> float:
     # pylint: disable=too-many-branches
 
@@ -103,9 +144,11 @@ def request(method: str, url: str, **kwargs: t.Any) -> SXNG_Response:
             get_loop(),
         )
         try:
-            return future.result(timeout)
+            response = future.result(timeout)
         except concurrent.futures.TimeoutError as e:
             raise httpx.TimeoutException('Timeout', request=None) from e
+        record_connection_for_thread(response)
+        return response
 
 
 def multi_requests(request_list: list["Request"]) -> list[httpx.Response | Exception]:
@@ -126,11 +169,14 @@ def multi_requests(request_list: list["Request"]) -> list[httpx.Response | Excep
         responses = []
         for future, timeout in future_list:
             try:
-                responses.append(future.result(timeout))
+                response = future.result(timeout)
             except concurrent.futures.TimeoutError:
                 responses.append(httpx.TimeoutException('Timeout', request=None))
             except Exception as e:  # pylint: disable=broad-except
                 responses.append(e)
+            else:
+                record_connection_for_thread(response)
+                responses.append(response)
         return responses
 
 
@@ -15,6 +15,7 @@ from httpx_socks import AsyncProxyTransport
 from python_socks import parse_proxy_url, ProxyConnectionError, ProxyTimeoutError, ProxyError
 
 from searx import logger
+from searx.network import dns
 
 CertTypes = str | tuple[str, str] | tuple[str, str, str]
 SslContextKeyType = tuple[str | None, CertTypes | None, bool, bool]
@@ -24,6 +25,14 @@ LOOP: asyncio.AbstractEventLoop = None  # pyright: ignore[reportAssignmentType]
 
 SSLCONTEXTS: dict[SslContextKeyType, SSLContext] = {}
 
+SharedPoolKeyType = tuple[
+    str, str, int | None, bool | str, bool, str | None, str | None, tuple[int | None, int | None, float | None], int
+]
+SHARED_POOLS: dict[SharedPoolKeyType, httpx.AsyncBaseTransport] = {}
+"""Transports shared by the clients of all networks (see
+:py:obj:`SharedPoolTransport`), one transport by ``(scheme, host, port)`` and
+parameters of the transport."""
+
 
 def shuffle_ciphers(ssl_context: SSLContext):
     """Shuffle httpx's default ciphers of a SSL context randomly.
@@ -146,7 +155,7 @@ def get_transport(
     verify: bool, http2: bool, local_address: str, proxy_url: str | None, limit: httpx.Limits, retries: int
 ):
     _verify = get_sslcontexts(None, None, verify, True) if verify is True else verify
-    return httpx.AsyncHTTPTransport(
+    transport = httpx.AsyncHTTPTransport(
         # pylint: disable=protected-access
         verify=_verify,
         http2=http2,
@@ -155,6 +164,80 @@ def get_transport(
         local_address=local_address,
         retries=retries,
     )
+    if dns.CACHE is not None:
+        # the hosts (and the HTTP proxy) are resolved by the DNS cache
+        transport._pool._network_backend = dns.CachingBackend(dns.CACHE)  # pylint: disable=protected-access
+    return transport
+
+
+def new_transport(
+    verify: bool, http2: bool, local_address: str, proxy_url: str | None, limit: httpx.Limits, retries: int
+) -> httpx.AsyncBaseTransport:
+    if proxy_url and (
+        proxy_url.startswith('socks4://') or proxy_url.startswith('socks5://') or proxy_url.startswith('socks5h://')
+    ):
+        return get_transport_for_socks_proxy(verify, http2, local_address, proxy_url, limit, retries)
+    return get_transport(verify, http2, local_address, proxy_url, limit, retries)
+
+
+class SharedPoolTransport(httpx.AsyncBaseTransport):
+    """Transport of a client that sends each request through a transport of
+    :py:obj:`SHARED_POOLS` (:ref:`settings outgoing shared_pools`).
+
+    The shared transport is selected by the ``(scheme, host, port)`` of the
+    request and the parameters of the transport (``verify``, ``http2``,
+    ``local_address``, proxy, pool limits and ``retries``).  The networks with
+    identical parameters use the same connection pool for a host: the TLS
+    handshakes are not repeated for each engine and the HTTP/2 connection to a
+    host is multiplexed.  The pool limits apply per host.
+    """
+
+    def __init__(
+        self, verify: bool, http2: bool, local_address: str, proxy_url: str | None, limit: httpx.Limits, retries: int
+    ):
+        self.verify = verify
+        self.http2 = http2
+        self.local_address = local_address
+        self.proxy_url = proxy_url
+        self.limit = limit
+        self.retries = retries
+
+    def get_pool(self, url: httpx.URL) -> httpx.AsyncBaseTransport:
+        """Returns the shared transport of the host of ``url`` (created on
+        first use)."""
+        limit = (self.limit.max_connections, self.limit.max_keepalive_connections, self.limit.keepalive_expiry)
+        key: SharedPoolKeyType = (
+            url.scheme,
+            url.host,
+            url.port,
+            self.verify,
+            self.http2,
+            self.local_address,
+            self.proxy_url,
+            limit,
+            self.retries,
+        )
+        transport = SHARED_POOLS.get(key)
+        if transport is None:
+            transport = new_transport(
+                self.verify, self.http2, self.local_address, self.proxy_url, self.limit, self.retries
+            )
+            SHARED_POOLS[key] = transport
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.get_pool(request.url).handle_async_request(request)
+
+    async def aclose(self) -> None:
+        # the shared transports are closed by close_shared_pools()
+        pass
+
+
+async def close_shared_pools():
+    """Closes the transports in :py:obj:`SHARED_POOLS`."""
+    transports = list(SHARED_POOLS.values())
+    SHARED_POOLS.clear()
+    await asyncio.gather(*[transport.aclose() for transport in transports], return_exceptions=True)
 
 
 def new_client(
@@ -170,29 +253,26 @@ def new_client(
     retries: int,
     max_redirects: int,
     hook_log_response: t.Callable[..., t.Any] | None,
+    shared_pools: bool = False,
 ) -> httpx.AsyncClient:
     limit = httpx.Limits(
         max_connections=max_connections,
         max_keepalive_connections=max_keepalive_connections,
         keepalive_expiry=keepalive_expiry,
     )
+    transport_factory = SharedPoolTransport if shared_pools else new_transport
     # See https://www.python-httpx.org/advanced/#routing
     mounts = {}
     mounts: None | (dict[str, t.Any | None]) = {}
     for pattern, proxy_url in proxies.items():
         if not enable_http and pattern.startswith('http://'):
             continue
-        if proxy_url.startswith('socks4://') or proxy_url.startswith('socks5://') or proxy_url.startswith('socks5h://'):
-            mounts[pattern] = get_transport_for_socks_proxy(
-                verify, enable_http2, local_address, proxy_url, limit, retries
-            )
-        else:
-            mounts[pattern] = get_transport(verify, enable_http2, local_address, proxy_url, limit, retries)
+        mounts[pattern] = transport_factory(verify, enable_http2, local_address, proxy_url, limit, retries)
 
     if not enable_http:
         mounts['http://'] = AsyncHTTPTransportNoHttp()
 
-    transport = get_transport(verify, enable_http2, local_address, None, limit, retries)
+    transport = transport_factory(verify, enable_http2, local_address, None, limit, retries)
 
     event_hooks = None
     if hook_log_response:
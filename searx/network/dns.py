@@ -0,0 +1,413 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Cache of the DNS answers of the hosts to which the engines connect
+(:ref:`settings outgoing dns_cache`).
+
+:py:obj:`DNSCache`:
+  Resolves the A and AAAA records of a host, the answers are cached by the TTL
+  of the DNS records (limited by ``min_ttl`` and ``max_ttl``).  An answer that
+  is used after :py:obj:`DNSCache.REFRESH_AHEAD` of its TTL is refreshed in the
+  background, the hosts of the engines in use do not expire.
+
+:py:obj:`CachingBackend`:
+  The network backend of the HTTP transports (``httpcore``), the host of a new
+  connection is resolved by the :py:obj:`CACHE` and the connection attempts to
+  the addresses of the host are staggered (*Happy Eyeballs*, :rfc:`8305`).
+
+Without ``nameservers``, the host is resolved by the system resolver
+(``getaddrinfo``), which does not return the TTL of the records: the answer is
+cached for ``min_ttl`` seconds.  The lookups are counted in the
+:py:obj:`searx.metrics` (``network, dns, hit|miss|refresh|error``).
+
+The backend is used by the transports without a proxy and with a HTTP proxy
+(only the host of the proxy is resolved), the transports of the SOCKS proxies
+(``httpx_socks``) connect by their own.  A connection is opened from one
+``local_address`` (the source IP of the request), only the addresses of this IP
+version are raced.
+
+----
+"""
+
+__all__ = ["DNSCache", "CachingBackend", "CACHE", "initialize"]
+
+import typing as t
+
+import asyncio
+import ipaddress
+import random
+import socket
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+import httpcore
+
+from searx import logger
+
+logger = logger.getChild('network.dns')
+
+CACHE: "DNSCache | None" = None
+"""Global :py:obj:`DNSCache`, ``None`` if the DNS cache is not enabled."""
+
+TYPE_A = 1
+TYPE_AAAA = 28
+
+
+class DNSError(Exception):
+    """The DNS query failed or the answer is invalid."""
+
+
+def _count(event: str):
+    # avoid cyclic imports (searx.metrics imports the engines)
+    from searx.metrics import counter_inc  # pylint: disable=import-outside-toplevel
+
+    try:
+        counter_inc('network', 'dns', event)
+    except (AttributeError, KeyError):
+        # the metrics are not initialized
+        pass
+
+
+def build_query(qid: int, host: str, qtype: int) -> bytes:
+    """Returns a DNS query (recursion desired) of the ``qtype`` records of
+    ``host``."""
+    header = struct.pack('!HHHHHH', qid, 0x0100, 1, 0, 0, 0)
+    qname = b''.join(bytes([len(label)]) + label for label in host.encode('idna').split(b'.') if label)
+    return header + qname + b'\0' + struct.pack('!HH', qtype, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            # compressed name (pointer)
+            return offset + 2
+        if length == 0:
+            return offset + 1
+        offset += length + 1
+
+
+def parse_answer(data: bytes, qid: int, qtype: int) -> tuple[list[str], int | None]:
+    """Returns the addresses of the ``qtype`` records in a DNS answer and the
+    lowest TTL of the records of the answer (``None`` if there is no record)."""
+    try:
+        rid, flags, qdcount, ancount, _, _ = struct.unpack_from('!HHHHHH', data)
+        if rid != qid:
+            raise DNSError("answer does not match the query")
+        if flags & 0x0200:
+            raise DNSError("answer is truncated")
+        rcode = flags & 0x000F
+        if rcode == 3:
+            # NXDOMAIN
+            return [], None
+        if rcode != 0:
+            raise DNSError(f"server failure (rcode {rcode})")
+
+        offset = 12
+        for _ in range(qdcount):
+            offset = _skip_name(data, offset) + 4
+
+        addresses: list[str] = []
+        ttl: int | None = None
+        for _ in range(ancount):
+            offset = _skip_name(data, offset)
+            rtype, _, rttl, rdlength = struct.unpack_from('!HHIH', data, offset)
+            offset += 10
+            rdata = data[offset : offset + rdlength]
+            offset += rdlength
+            # the TTL of a CNAME is a TTL of the answer
+            ttl = rttl if ttl is None else min(ttl, rttl)
+            if rtype == qtype == TYPE_A and rdlength == 4:
+                addresses.append(socket.inet_ntop(socket.AF_INET, rdata))
+            elif rtype == qtype == TYPE_AAAA and rdlength == 16:
+                addresses.append(socket.inet_ntop(socket.AF_INET6, rdata))
+        return addresses, ttl
+    except (struct.error, IndexError) as exc:
+        raise DNSError("invalid answer") from exc
+
+
+def parse_nameserver(nameserver: str) -> tuple[str, int]:
+    """Returns address and port of a nameserver (``1.1.1.1``, ``1.1.1.1:53``,
+    ``::1`` or ``[::1]:53``)."""
+    if nameserver.startswith('['):
+        host, _, port = nameserver[1:].partition(']:')
+        return host.rstrip(']'), int(port or 53)
+    if nameserver.count(':') == 1:
+        host, port = nameserver.split(':')
+        return host, int(port)
+    return nameserver, 53
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, future: "asyncio.Future[bytes]"):
+        self.future = future
+
+    def datagram_received(self, data: bytes, addr: t.Any):
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc: Exception):
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def query_nameserver(
+    nameserver: tuple[str, int], host: str, qtype: int, timeout: float
+) -> tuple[list[str], int | None]:
+    """Sends a DNS query (UDP) to the ``nameserver`` and returns the addresses
+    and the TTL of the answer (see :py:func:`parse_answer`)."""
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[bytes]" = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(lambda: _DatagramProtocol(future), remote_addr=nameserver)
+    try:
+        qid = random.randint(0, 0xFFFF)
+        transport.sendto(build_query(qid, host, qtype))
+        data = await asyncio.wait_for(future, timeout)
+        return parse_answer(data, qid, qtype)
+    finally:
+        transport.close()
+
+
+class DNSEntry:  # pylint: disable=too-few-public-methods
+    """Cached answer of a host."""
+
+    __slots__ = ('addresses', 'expires', 'refresh_at', 'refreshing')
+
+    def __init__(self, addresses: list[str], ttl: float, now: float):
+        self.addresses: list[str] = addresses
+        self.expires: float = now + ttl
+        self.refresh_at: float = now + ttl * DNSCache.REFRESH_AHEAD
+        self.refreshing: bool = False
+
+
+class DNSCache:
+    """LRU cache of the addresses (A and AAAA records) of the hosts, the TTL
+    of an answer is limited to ``min_ttl`` and ``max_ttl`` (seconds).  The
+    hosts are resolved by the ``nameservers`` (UDP), by the system resolver if
+    there is no nameserver."""
+
+    REFRESH_AHEAD: float = 0.8
+    """Share of the TTL after which a cached answer is refreshed in the
+    background (when it is used)."""
+
+    def __init__(
+        self,
+        min_ttl: float = 30,
+        max_ttl: float = 600,
+        size: int = 1024,
+        nameservers: list[str] | None = None,
+        timeout: float = 2.0,
+    ):
+        self.min_ttl: float = min_ttl
+        self.max_ttl: float = max_ttl
+        self.size: int = size
+        self.nameservers: list[tuple[str, int]] = [parse_nameserver(ns) for ns in nameservers or []]
+        self.timeout: float = timeout
+        self._entries: OrderedDict[str, DNSEntry] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._lookups: dict[str, asyncio.Future[list[str]]] = {}
+        self._tasks: set[asyncio.Task[t.Any]] = set()
+
+    def get(self, host: str) -> DNSEntry | None:
+        with self._lock:
+            entry = self._entries.get(host)
+            if entry is not None:
+                self._entries.move_to_end(host)
+            return entry
+
+    def set(self, host: str, addresses: list[str], ttl: float):
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        with self._lock:
+            self._entries[host] = DNSEntry(addresses, ttl, time.monotonic())
+            self._entries.move_to_end(host)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    async def resolve(self, host: str) -> list[str]:
+        """Returns the addresses of ``host``, from the cache if the answer has
+        not expired."""
+        now = time.monotonic()
+        entry = self.get(host)
+        if entry is not None and entry.expires > now:
+            _count('hit')
+            if now >= entry.refresh_at and not entry.refreshing:
+                entry.refreshing = True
+                task = asyncio.get_running_loop().create_task(self._refresh(host))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return entry.addresses
+        _count('miss')
+        return await self._lookup(host)
+
+    async def _refresh(self, host: str):
+        _count('refresh')
+        try:
+            await self._lookup(host)
+        except (OSError, DNSError, asyncio.TimeoutError):
+            # the entry is kept until it expires
+            entry = self.get(host)
+            if entry is not None:
+                entry.refreshing = False
+
+    async def _lookup(self, host: str) -> list[str]:
+        # concurrent lookups of a host are coalesced
+        future = self._lookups.get(host)
+        if future is None:
+            future = asyncio.ensure_future(self._query(host))
+            self._lookups[host] = future
+            future.add_done_callback(lambda _: self._lookups.pop(host, None))
+        return await asyncio.shield(future)
+
+    async def _query(self, host: str) -> list[str]:
+        try:
+            addresses, ttl = await self.query(host)
+        except (OSError, DNSError, asyncio.TimeoutError) as exc:
+            _count('error')
+            logger.debug("can't resolve %s: %r", host, exc)
+            raise
+        if not addresses:
+            _count('error')
+            raise DNSError(f"{host} has no address")
+        self.set(host, addresses, ttl)
+        return addresses
+
+    async def query(self, host: str) -> tuple[list[str], float]:
+        """Resolves ``host`` and returns the addresses and the TTL of the
+        answer."""
+        if not self.nameservers:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+            return addresses, self.min_ttl
+
+        error: Exception = DNSError("no nameserver")
+        for nameserver in self.nameservers:
+            try:
+                answers = await asyncio.gather(
+                    query_nameserver(nameserver, host, TYPE_AAAA, self.timeout),
+                    query_nameserver(nameserver, host, TYPE_A, self.timeout),
+                )
+            except (OSError, DNSError, asyncio.TimeoutError) as exc:
+                error = exc
+                continue
+            addresses = [address for answer, _ in answers for address in answer]
+            ttls = [ttl for _, ttl in answers if ttl is not None]
+            return addresses, min(ttls) if ttls else self.min_ttl
+        raise error
+
+
+def _ip_version(address: str | None) -> int | None:
+    if not address:
+        return None
+    try:
+        return ipaddress.ip_address(address).version
+    except ValueError:
+        return None
+
+
+def sort_addresses(addresses: list[str], local_address: str | None) -> list[str]:
+    """Returns the addresses in the order of the connection attempts: the
+    addresses of the IP version of ``local_address``, without a local address
+    the IPv6 and IPv4 addresses are interleaved (IPv6 first)."""
+    local_version = _ip_version(local_address)
+    if local_version is not None:
+        return [address for address in addresses if _ip_version(address) == local_version]
+    ipv6 = [address for address in addresses if _ip_version(address) == 6]
+    ipv4 = [address for address in addresses if _ip_version(address) == 4]
+    result: list[str] = []
+    for i in range(max(len(ipv6), len(ipv4))):
+        result.extend(ipv6[i : i + 1])
+        result.extend(ipv4[i : i + 1])
+    return result
+
+
+class CachingBackend(httpcore.AsyncNetworkBackend):
+    """Network backend (``httpcore``) that resolves the hosts by the
+    :py:obj:`DNSCache`.  A connection attempt to the next address of the host is
+    started when the previous attempt has failed or has not succeeded after
+    ``delay`` seconds, the first established connection is used."""
+
+    def __init__(self, cache: DNSCache, backend: httpcore.AsyncNetworkBackend | None = None, delay: float = 0.25):
+        self.cache: DNSCache = cache
+        self.backend: httpcore.AsyncNetworkBackend = backend or httpcore.AnyIOBackend()
+        self.delay: float = delay
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: t.Iterable[t.Any] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        if _ip_version(host) is not None:
+            return await self.backend.connect_tcp(host, port, timeout, local_address, socket_options)
+        try:
+            addresses = sort_addresses(await self.cache.resolve(host), local_address)
+        except (OSError, DNSError, asyncio.TimeoutError) as exc:
+            raise httpcore.ConnectError(f"{host}: {exc}") from exc
+        if not addresses:
+            raise httpcore.ConnectError(f"{host}: no address for the local address {local_address}")
+
+        async def connect(address: str) -> httpcore.AsyncNetworkStream:
+            return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+
+        if len(addresses) == 1:
+            return await connect(addresses[0])
+        return await self._happy_eyeballs(addresses, connect)
+
+    async def _happy_eyeballs(
+        self, addresses: list[str], connect: t.Callable[[str], t.Awaitable[httpcore.AsyncNetworkStream]]
+    ) -> httpcore.AsyncNetworkStream:
+        remaining = list(addresses)
+        pending: set[asyncio.Future[httpcore.AsyncNetworkStream]] = set()
+        error: BaseException | None = None
+        try:
+            while remaining or pending:
+                if remaining:
+                    pending.add(asyncio.ensure_future(connect(remaining.pop(0))))
+                done, pending = await asyncio.wait(
+                    pending, timeout=self.delay if remaining else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                streams: list[httpcore.AsyncNetworkStream] = []
+                for task in done:
+                    if task.exception() is None:
+                        streams.append(task.result())
+                    else:
+                        error = task.exception()
+                if streams:
+                    for stream in streams[1:]:
+                        await stream.aclose()
+                    return streams[0]
+            raise error  # type: ignore
+        finally:
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, httpcore.AsyncNetworkStream):
+                    await result.aclose()
+
+    async def connect_unix_socket(
+        self, path: str, timeout: float | None = None, socket_options: t.Iterable[t.Any] | None = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def initialize(cfg: dict[str, t.Any]) -> DNSCache | None:
+    """Initialize the global :py:obj:`CACHE` from the :ref:`settings outgoing
+    dns_cache`."""
+    global CACHE  # pylint: disable=global-statement
+
+    CACHE = None
+    if cfg['enabled']:
+        CACHE = DNSCache(
+            min_ttl=cfg['min_ttl'], max_ttl=cfg['max_ttl'], size=cfg['size'], nameservers=cfg['nameservers']
+        )
+    return CACHE
@@ -11,13 +11,15 @@ from collections.abc import Generator
 import atexit
 import asyncio
 import ipaddress
+import time
 from itertools import cycle
 
 import httpx
 
 from searx import logger, sxng_debug
 from searx.extended_types import SXNG_Response
-from .client import new_client, get_loop, AsyncHTTPTransportNoHttp
+from . import dns
+from .client import new_client, get_loop, close_shared_pools, AsyncHTTPTransportNoHttp
 from .raise_for_httperror import raise_for_httperror
 
 
@@ -40,6 +42,16 @@ PROXY_PATTERN_MAPPING = {
 
 ADDRESS_MAPPING = {'ipv4': '0.0.0.0', 'ipv6': '::'}
 
+CONNECTION_EXTENSION = 'searxng_connection'
+"""Key of the response extension that tells if the request was sent on a
+connection that was already open (``warm``) or on a new one (``cold``)."""
+
+
+def get_origin(url: str | httpx.URL) -> str:
+    """Returns the origin (``scheme://host[:port]``) of ``url``."""
+    url = httpx.URL(url)
+    return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
 
 @t.final
 class Network:
@@ -57,6 +69,8 @@ class Network:
         'max_redirects',
         'retries',
         'retry_on_http_error',
+        'shared_pools',
+        'last_use',
         '_local_addresses_cycle',
         '_proxies_cycle',
         '_clients',
@@ -65,8 +79,12 @@ class Network:
 
     _TOR_CHECK_RESULT = {}
 
+    LAST_USE_SIZE = 64
+    """Max. number of origins in :py:obj:`Network.last_use`, the least recently
+    used origin is dropped."""
+
     def __init__(
-        # pylint: disable=too-many-arguments
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
         self,
         enable_http: bool = True,
         verify: bool = True,
@@ -81,6 +99,7 @@ class Network:
         retry_on_http_error: bool = False,
         max_redirects: int = 30,
         logger_name: str = None,  # pyright: ignore[reportArgumentType]
+        shared_pools: bool = False,
     ):
 
         self.enable_http = enable_http
@@ -95,6 +114,8 @@ class Network:
         self.retries = retries
         self.retry_on_http_error = retry_on_http_error
         self.max_redirects = max_redirects
+        self.shared_pools = shared_pools
+        self.last_use: dict[str, float] = {}
         self._local_addresses_cycle = self.get_ipaddress_cycle()
         self._proxies_cycle = self.get_proxy_cycles()
         self._clients = {}
@@ -207,6 +228,8 @@ class Network:
                 0,
                 max_redirects,
                 hook_log_response,
+                # the Tor check needs the transports of the client
+                self.shared_pools and not self.using_tor_proxy,
             )
             if self.using_tor_proxy and not await self.check_tor_proxy(client, proxies):
                 await client.aclose()
@@ -269,11 +292,29 @@ class Network:
             return False
         return True
 
+    def set_last_use(self, origin: str):
+        """Records the time of the last request to ``origin``."""
+        self.last_use.pop(origin, None)
+        self.last_use[origin] = time.monotonic()
+        if len(self.last_use) > self.LAST_USE_SIZE:
+            del self.last_use[next(iter(self.last_use))]
+
     async def call_client(self, stream: bool, method: str, url: str, **kwargs: t.Any) -> SXNG_Response:
         retries = self.retries
         was_disconnected = False
         do_raise_for_httperror = Network.extract_do_raise_for_httperror(kwargs)
+        # the requests of the warm-up (searx.search.warmup) are not a use
+        record_use = kwargs.pop('record_use', True)
         kwargs_clients = Network.extract_kwargs_clients(kwargs)
+        connection = 'warm'
+
+        async def trace(event_name: str, info: dict[str, t.Any]):  # pylint: disable=unused-argument
+            nonlocal connection
+            if event_name.endswith('connect_tcp.started'):
+                connection = 'cold'
+
+        if not stream:
+            kwargs['extensions'] = {**kwargs.get('extensions', {}), 'trace': trace}
         while retries >= 0:  # pragma: no cover
             client = await self.get_client(**kwargs_clients)
             cookies = kwargs.pop("cookies", None)
@@ -283,6 +324,9 @@ class Network:
                     return client.stream(method, url, **kwargs)
 
                 response = await client.request(method, url, **kwargs)
+                response.extensions[CONNECTION_EXTENSION] = connection
+                if record_use:
+                    self.set_last_use(get_origin(url))
                 if self.is_valid_response(response) or retries <= 0:
                     return self.patch_response(response, do_raise_for_httperror)
             except httpx.RemoteProtocolError as e:
@@ -309,6 +353,7 @@ class Network:
     @classmethod
     async def aclose_all(cls):
         await asyncio.gather(*[network.aclose() for network in NETWORKS.values()], return_exceptions=False)
+        await close_shared_pools()
 
 
 def get_network(name: str | None = None) -> "Network":
@@ -333,12 +378,59 @@ def check_network_configuration():
         raise RuntimeError("Invalid network configuration")
 
 
+DEFAULT_PARAMS: dict[str, t.Any] = {}
+"""Default parameters of a :py:obj:`Network`, set by :py:func:`initialize` from
+the ``outgoing`` settings."""
+
+
+def new_network(params: dict[str, t.Any], logger_name: str | None = None) -> Network:
+    result: dict[str, t.Any] = {}
+    result.update(DEFAULT_PARAMS)
+    result.update(params)
+    if logger_name:
+        result['logger_name'] = logger_name
+    return Network(**result)
+
+
+def new_engine_network(engine_name: str, engine: t.Any, network: dict[str, t.Any] | None) -> Network:
+    """Returns the network of an engine from the ``network`` (settings) of the
+    engine, or from the network attributes of the engine if the engine does not
+    have a ``network``."""
+    if network is None:
+        network = {}
+        for attribute_name, attribute_value in DEFAULT_PARAMS.items():
+            if hasattr(engine, attribute_name):
+                network[attribute_name] = getattr(engine, attribute_name)
+            else:
+                network[attribute_name] = attribute_value
+    return new_network(network, logger_name=engine_name)
+
+
+def add_engine_network(engine_name: str, engine: t.Any):
+    """Defines the network of an engine that has been loaded after the networks
+    were initialized (see :py:obj:`searx.engines.LazyEngine`)."""
+    # pylint: disable=import-outside-toplevel
+    from searx.engines import engines, resolve_engine
+
+    network = getattr(engine, 'network', None)
+    if not isinstance(network, str):
+        NETWORKS[engine_name] = new_engine_network(engine_name, engine, network)
+        return
+    if network not in NETWORKS and network in engines:
+        # the referenced network is the network of an engine that is not loaded
+        resolve_engine(engines[network])
+    if network not in NETWORKS:
+        logger.error("engine %s: network %s does not exists", engine_name, network)
+        network = DEFAULT_NAME
+    NETWORKS[engine_name] = NETWORKS[network]
+
+
 def initialize(
     settings_engines: list[dict[str, t.Any]] = None,  # pyright: ignore[reportArgumentType]
     settings_outgoing: dict[str, t.Any] = None,  # pyright: ignore[reportArgumentType]
 ) -> None:
     # pylint: disable=import-outside-toplevel)
-    from searx.engines import engines
+    from searx.engines import engines, resolve_engine, LazyEngine
     from searx import settings
 
     # pylint: enable=import-outside-toplevel)
@@ -348,36 +440,33 @@ def initialize(
 
     # default parameters for AsyncHTTPTransport
     # see https://github.com/encode/httpx/blob/e05a5372eb6172287458b37447c30f650047e1b8/httpx/_transports/default.py#L108-L121  # pylint: disable=line-too-long
-    default_params: dict[str, t.Any] = {
-        'enable_http': False,
-        'verify': settings_outgoing['verify'],
-        'enable_http2': settings_outgoing['enable_http2'],
-        'max_connections': settings_outgoing['pool_connections'],
-        'max_keepalive_connections': settings_outgoing['pool_maxsize'],
-        'keepalive_expiry': settings_outgoing['keepalive_expiry'],
-        'local_addresses': settings_outgoing['source_ips'],
-        'using_tor_proxy': settings_outgoing['using_tor_proxy'],
-        'proxies': settings_outgoing['proxies'],
-        'max_redirects': settings_outgoing['max_redirects'],
-        'retries': settings_outgoing['retries'],
-        'retry_on_http_error': False,
-    }
-
-    def new_network(params: dict[str, t.Any], logger_name: str | None = None):
-        nonlocal default_params
-        result = {}
-        result.update(default_params)  # pyright: ignore[reportUnknownMemberType]
-        result.update(params)  # pyright: ignore[reportUnknownMemberType]
-        if logger_name:
-            result['logger_name'] = logger_name
-        return Network(**result)  # type: ignore
+    DEFAULT_PARAMS.clear()
+    DEFAULT_PARAMS.update(
+        {
+            'enable_http': False,
+            'verify': settings_outgoing['verify'],
+            'enable_http2': settings_outgoing['enable_http2'],
+            'max_connections': settings_outgoing['pool_connections'],
+            'max_keepalive_connections': settings_outgoing['pool_maxsize'],
+            'keepalive_expiry': settings_outgoing['keepalive_expiry'],
+            'local_addresses': settings_outgoing['source_ips'],
+            'using_tor_proxy': settings_outgoing['using_tor_proxy'],
+            'proxies': settings_outgoing['proxies'],
+            'max_redirects': settings_outgoing['max_redirects'],
+            'retries': settings_outgoing['retries'],
+            'retry_on_http_error': False,
+            'shared_pools': settings_outgoing['shared_pools'],
+        }
+    )
 
     def iter_networks():
         nonlocal settings_engines
         for engine_spec in settings_engines:
             engine_name = engine_spec['name']
             engine = engines.get(engine_name)
-            if engine is None:
+            if engine is None or isinstance(engine, LazyEngine):
+                # the network of a lazy engine is defined when the engine is
+                # loaded (add_engine_network)
                 continue
             network = getattr(engine, 'network', None)
             yield engine_name, engine, network
@@ -385,6 +474,7 @@ def initialize(
     if NETWORKS:
         done()
     NETWORKS.clear()
+    dns.initialize(settings_outgoing['dns_cache'])
     NETWORKS[DEFAULT_NAME] = new_network({}, logger_name='default')
     NETWORKS['ipv4'] = new_network({'local_addresses': '0.0.0.0'}, logger_name='ipv4')
     NETWORKS['ipv6'] = new_network({'local_addresses': '::'}, logger_name='ipv6')
@@ -395,27 +485,21 @@ def initialize(
 
     # define networks from engines.[i].network (except references)
     for engine_name, engine, network in iter_networks():
-        if network is None:
-            network = {}
-            for attribute_name, attribute_value in default_params.items():
-                if hasattr(engine, attribute_name):
-                    network[attribute_name] = getattr(engine, attribute_name)
-                else:
-                    network[attribute_name] = attribute_value
-            NETWORKS[engine_name] = new_network(network, logger_name=engine_name)
-        elif isinstance(network, dict):
-            NETWORKS[engine_name] = new_network(network, logger_name=engine_name)
+        if network is None or isinstance(network, dict):
+            NETWORKS[engine_name] = new_engine_network(engine_name, engine, network)
 
     # define networks from engines.[i].network (references)
     for engine_name, engine, network in iter_networks():
         if isinstance(network, str):
+            if network not in NETWORKS and isinstance(engines.get(network), LazyEngine):
+                resolve_engine(engines[network])
             NETWORKS[engine_name] = NETWORKS[network]
 
     # the /image_proxy endpoint has a dedicated network.
     # same parameters than the default network, but HTTP/2 is disabled.
     # It decreases the CPU load average, and the total time is more or less the same
     if 'image_proxy' not in NETWORKS:
-        image_proxy_params = default_params.copy()
+        image_proxy_params = DEFAULT_PARAMS.copy()
         image_proxy_params['enable_http2'] = False
         NETWORKS['image_proxy'] = new_network(image_proxy_params, logger_name='image_proxy')
 
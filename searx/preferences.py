@@ -5,6 +5,8 @@
 
 import typing as t
 
+import hashlib
+import threading
 from base64 import urlsafe_b64encode, urlsafe_b64decode
 from zlib import compress, decompress
 from urllib.parse import parse_qs, urlencode
@@ -14,6 +16,7 @@ from collections.abc import Iterable
 import flask
 import babel
 import babel.core
+from typing_extensions import Self
 
 import searx.plugins
 
@@ -41,6 +44,13 @@ MAP_STR2BOOL: dict[str, bool] = OrderedDict(
 )
 
 
+def _copy(obj: t.Any) -> t.Any:
+    """Shallow copy of an object (without the overhead of :py:obj:`copy.copy`)."""
+    other = object.__new__(type(obj))
+    other.__dict__.update(obj.__dict__)
+    return other
+
+
 class ValidationException(Exception):
     """Exption from ``cls.__init__`` when configuration value is invalid."""
 
@@ -67,6 +77,13 @@ class Setting:
         """
         return self.value
 
+    def copy(self) -> Self:
+        """Returns a copy of the setting, a (mutable) value is copied."""
+        other = _copy(self)
+        if isinstance(self.value, (list, set, dict)):
+            other.value = type(self.value)(self.value)
+        return other
+
     def save(self, name: str, resp: flask.Response):
         """Save cookie ``name`` in the HTTP response object
 
@@ -146,6 +163,11 @@ class SetSetting(Setting):
         """Returns a string with comma separated values."""
         return ','.join(self.values)
 
+    def copy(self) -> Self:
+        other = super().copy()
+        other.values = set(self.values)
+        return other
+
     def parse(self, data: str):
         """Parse and validate ``data`` and store the result at ``self.value``"""
         if data == '':
@@ -299,6 +321,13 @@ class BooleanChoices:
     def get_enabled(self):
         return self.transform_values(list(self.enabled))
 
+    def copy(self) -> Self:
+        """Returns a copy, the choices of the copy can be changed without
+        affecting this object."""
+        other = _copy(self)
+        other.choices = dict(self.choices)
+        return other
+
 
 class EnginesSetting(BooleanChoices):
     """Engine settings"""
@@ -496,6 +525,18 @@ class Preferences:
         self.tokens = SetSetting('tokens')
         self.client = client or ClientPref()
 
+    def copy(self) -> "Preferences":
+        """Returns a copy of the preferences, the copy can be parsed (and
+        changed) without affecting this object.  A copy is much cheaper than
+        building new preferences, the engines and plugins are not iterated
+        (compare :py:obj:`PreferencesCache`)."""
+        other = _copy(self)
+        other.key_value_settings = {name: setting.copy() for name, setting in self.key_value_settings.items()}
+        other.engines = self.engines.copy()
+        other.plugins = self.plugins.copy()
+        other.tokens = self.tokens.copy()
+        return other
+
     def get_as_url_params(self):
         """Return preferences as URL parameters"""
         settings_kv = {}
@@ -599,6 +640,86 @@ class Preferences:
         return valid
 
 
+class PreferencesCache:
+    """Bounded cache of the :py:obj:`Preferences` parsed from the cookies of a
+    request.
+
+    Building the preferences iterates over all engines and plugins, parsing
+    the cookies (and the base64 / zlib encoded ``preferences`` of a request)
+    is repeated on every request, although most requests of a client send the
+    same cookies.  The cache holds a default :py:obj:`template
+    <PreferencesCache.template>` and the preferences parsed from the last
+    ``size`` cookie-sets (mapped by a digest of the cookies).  A request gets
+    a :py:obj:`copy <Preferences.copy>` of the cached preferences, a route that
+    only reads a few values (e.g. ``/autocompleter``) can use the cached
+    preferences without a copy (``readonly``).
+
+    The template is built on first use, :py:obj:`clear` has to be called when
+    the engines or plugins are (re-) loaded.
+    """
+
+    def __init__(self, factory: t.Callable[[], Preferences], size: int = 1024):
+        self.factory: t.Callable[[], Preferences] = factory
+        self.size: int = size
+        self._template: Preferences | None = None
+        self._items: OrderedDict[bytes, Preferences] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def template(self) -> Preferences:
+        """Returns the default preferences, the template must not be changed
+        (use a :py:obj:`copy <Preferences.copy>`)."""
+        template = self._template
+        if template is None:
+            template = self._template = self.factory()
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._template = None
+            self._items.clear()
+
+    @staticmethod
+    def key(cookies: t.Mapping[str, str], encoded_data: str = "") -> bytes:
+        data = repr((sorted(cookies.items()), encoded_data)).encode()
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def get(
+        self, cookies: t.Mapping[str, str], encoded_data: str = "", readonly: bool = False
+    ) -> tuple[Preferences, Exception | None]:
+        """Returns the preferences parsed from ``cookies`` and the (optional)
+        ``encoded_data`` (:py:obj:`Preferences.parse_encoded_data`).  With
+        ``readonly`` the cached preferences are returned, not a copy: they are
+        shared by all requests with these cookies and must not be changed.
+
+        The second item is the exception raised when parsing the cookies
+        (``None`` if the cookies are valid), the preferences then contain the
+        settings of the cookies up to the invalid setting.  Preferences of
+        invalid cookies are not cached.  An exception raised when parsing the
+        ``encoded_data`` is not caught."""
+        key = self.key(cookies, encoded_data)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+        if cached is not None:
+            return (cached if readonly else cached.copy()), None
+
+        preferences = self.template().copy()
+        error: Exception | None = None
+        try:
+            preferences.parse_dict(dict(cookies))
+        except Exception as e:  # pylint: disable=broad-except
+            error = e
+        if encoded_data:
+            preferences.parse_encoded_data(encoded_data)
+        if error is None:
+            with self._lock:
+                self._items[key] = preferences if readonly else preferences.copy()
+                while len(self._items) > self.size:
+                    self._items.popitem(last=False)
+        return preferences, error
+
+
 def is_locked(setting_name: str):
     """Checks if a given setting name is locked by settings.yml"""
     if 'preferences' not in settings:
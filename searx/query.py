@@ -149,6 +149,11 @@ class LanguageParser(QueryPartParser):
 
 
 class ExternalBangParser(QueryPartParser):
+
+    autocomplete_limit: int | None = None
+    """Max. number of external bangs (top ranked) in the autocomplete list,
+    ``None`` lists all bangs starting with the typed prefix."""
+
     @staticmethod
     def check(raw_value):
         return raw_value.startswith('!!') and len(raw_value) > 2
@@ -162,7 +167,7 @@ class ExternalBangParser(QueryPartParser):
 
     def _parse(self, value):
         found = False
-        bang_definition, bang_ac_list = get_bang_definition_and_autocomplete(value)
+        bang_definition, bang_ac_list = get_bang_definition_and_autocomplete(value, limit=self.autocomplete_limit)
         if bang_definition is not None:
             self.raw_text_query.external_bang = value
             found = True
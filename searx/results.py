@@ -19,17 +19,21 @@ def calculate_score(
     priority: MainResult.PriorityType,
 ) -> float:
     weight = 1.0
+    engine_props = searx.engines.engine_props
 
     for result_engine in result['engines']:
-        if hasattr(searx.engines.engines.get(result_engine), 'weight'):
-            weight *= float(searx.engines.engines[result_engine].weight)
+        props = engine_props.get(result_engine)
+        if props is not None:
+            weight *= props.weight
 
-    weight *= len(result['positions'])
+    positions = result['positions']
+    weight *= len(positions)
     score = 0
 
-    for position in result['positions']:
-        if priority == 'low':
-            continue
+    if priority == 'low':
+        return score
+
+    for position in positions:
         if priority == 'high':
             score += weight
         else:
@@ -42,6 +46,8 @@ class Timing(t.NamedTuple):
     engine: str
     total: float
     load: float
+    warm: int = 0
+    cold: int = 0
 
 
 class UnresponsiveEngine(t.NamedTuple):
@@ -77,7 +83,17 @@ class ResultContainer:
         self.timings: list[Timing] = []
         self.redirect_url: str | None = None
         self.on_result: t.Callable[[Result | LegacyResult], bool] = lambda _: True
+        self.on_extend: t.Callable[[str | None, list[Result | LegacyResult]], None] | None = None
+        """Called with the (not yet merged) results of an engine, before the
+        results are passed to :py:obj:`on_result`."""
+        self.on_merged: t.Callable[[str | None, list[MainResult | LegacyResult]], None] | None = None
+        """Called with the main results of an engine that have been merged into
+        the container (e.g. to stream the results of an engine).  The callback
+        is called while the container is locked, the results must not be kept
+        for later use."""
         self._lock: RLock = RLock()
+        self._late_containers: dict[str, ResultContainer] = {}
+        self._claimed_engines: set[str] = set()
         self._main_results_sorted: list[MainResult | LegacyResult] = None  # type: ignore
 
     def extend(
@@ -86,7 +102,10 @@ class ResultContainer:
         if self._closed:
             log.debug("container is closed, ignoring results: %s", results)
             return
+        if self.on_extend is not None:
+            self.on_extend(engine_name, results)
         main_count = 0
+        merged_results: list[MainResult | LegacyResult] = []
 
         for result in list(results):
 
@@ -101,6 +120,7 @@ class ResultContainer:
                 elif isinstance(result, MainResult):
                     main_count += 1
                     self._merge_main_result(result, main_count)
+                    merged_results.append(result)
                 else:
                     # more types need to be implemented in the future ..
                     raise NotImplementedError(f"no handler implemented to process the result of type {result}")
@@ -149,12 +169,18 @@ class ResultContainer:
                 if self.on_result(result):
                     main_count += 1
                     self._merge_main_result(result, main_count)
+                    merged_results.append(result)
                     continue
 
-        if engine_name in searx.engines.engines:
-            eng = searx.engines.engines[engine_name]
-            histogram_observe(main_count, "engine", eng.name, "result", "count")
-            if not self.paging and eng.paging:
+        on_merged = self.on_merged
+        if on_merged is not None and merged_results:
+            with self._lock:
+                on_merged(engine_name, merged_results)  # pylint: disable=not-callable
+
+        props = searx.engines.engine_props.get(engine_name or "")
+        if props is not None:
+            histogram_observe(main_count, "engine", engine_name, "result", "count")
+            if not self.paging and props.paging:
                 self.paging = True
 
     def _merge_infobox(self, new_infobox: LegacyResult):
@@ -179,18 +205,21 @@ class ResultContainer:
             if not merged:
                 # if there is no duplicate in the merged results, append result
                 result.positions = [position]
+                result.score = calculate_score(result, result.priority)
                 self.main_results_map[result_hash] = result
                 return
 
             merge_two_main_results(merged, result)
-            # add the new position
+            # add the new position and update the score of the merged result
             merged.positions.append(position)
+            merged.score = calculate_score(merged, merged.priority)
 
     def close(self):
         self._closed = True
 
+        # the scores are up to date, they are calculated when a result is
+        # merged into the container (see _merge_main_result)
         for result in self.main_results_map.values():
-            result.score = calculate_score(result, result.priority)
             for eng_name in result.engines:
                 counter_add(result.score, 'engine', eng_name, 'score')
 
@@ -207,47 +236,43 @@ class ResultContainer:
         # first pass, sort results by "score" (descanding)
         results = sorted(self.main_results_map.values(), key=lambda x: x.score, reverse=True)
 
-        # pass 2 : group results by category and template
-        gresults: list[MainResult | LegacyResult] = []
-        categoryPositions: dict[str, t.Any] = {}
+        # pass 2 : group results by category and template, the groups are
+        # segments of the ordered list (a result is added to the end of its
+        # segment), the ordered list is the concatenation of the segments
+        segments: list[list[MainResult | LegacyResult]] = []
+        categoryGroups: dict[str, list[int]] = {}  # category --> [segment, count]
         max_count = 8
         max_distance = 20
+        engine_props = searx.engines.engine_props
 
         for res in results:
             # do we need to handle more than one category per engine?
-            engine = searx.engines.engines.get(res.engine or "")
-            if engine:
-                res.category = engine.categories[0] if len(engine.categories) > 0 else ""
+            props = engine_props.get(res.engine or "")
+            if props is not None:
+                res.category = props.category
 
             # do we need to handle more than one category per engine?
             category = f"{res.category}:{res.template}:{'img_src' if (res.thumbnail or res.img_src) else ''}"
-            grp = categoryPositions.get(category)
+            grp = categoryGroups.get(category)
 
             # group with previous results using the same category, if the group
             # can accept more result and is not too far from the current
-            # position
-
-            if (grp is not None) and (grp["count"] > 0) and (len(gresults) - grp["index"] < max_distance):
-                # group with the previous results using the same category with
-                # this one
-                index = grp["index"]
-                gresults.insert(index, res)
-
-                # update every index after the current one (including the
-                # current one)
-                for item in categoryPositions.values():
-                    v = item["index"]
-                    if v >= index:
-                        item["index"] = v + 1
+            # position: the distance is the number of results in the segments
+            # behind the group, each segment contains at least one result.
+
+            if (grp is not None) and (grp[1] > 0) and (len(segments) - grp[0] <= max_distance):
+                distance = sum(len(seg) for seg in segments[grp[0] + 1 :])
+                if distance < max_distance:
+                    # group with the previous results using the same category
+                    # with this one
+                    segments[grp[0]].append(res)
+                    grp[1] -= 1
+                    continue
 
-                # update this category
-                grp["count"] -= 1
+            segments.append([res])
+            categoryGroups[category] = [len(segments) - 1, max_count]
 
-            else:
-                gresults.append(res)
-                # update categoryIndex
-                categoryPositions[category] = {"index": len(gresults), "count": max_count}
-                continue
+        gresults: list[MainResult | LegacyResult] = [res for seg in segments for res in seg]
 
         self._main_results_sorted = gresults
         return self._main_results_sorted
@@ -279,12 +304,37 @@ class ResultContainer:
             if searx.engines.engines[engine_name].display_error_messages:
                 self.unresponsive_engines.add(UnresponsiveEngine(engine_name, error_type, suspended))
 
-    def add_timing(self, engine_name: str, engine_time: float, page_load_time: float):
+    def claim(self, engine_name: str) -> "ResultContainer":
+        """Returns the container to which the engine adds its results (and
+        errors): this container or, if the engine has been moved by
+        :py:obj:`ResultContainer.move_late_engines`, the late container.  Once
+        an engine has claimed this container, it is no longer moved."""
+        with self._lock:
+            late_container = self._late_containers.get(engine_name)
+            if late_container is not None:
+                return late_container
+            self._claimed_engines.add(engine_name)
+            return self
+
+    def move_late_engines(self, engine_names: list[str], late_container: "ResultContainer") -> list[str]:
+        """Moves the engines that have not yet claimed this container (see
+        :py:obj:`ResultContainer.claim`) to the ``late_container`` and returns
+        their names.  The caller has to wait for the other engines, they are
+        adding their results to this container."""
+        with self._lock:
+            moved = [engine_name for engine_name in engine_names if engine_name not in self._claimed_engines]
+            for engine_name in moved:
+                self._late_containers[engine_name] = late_container
+            return moved
+
+    def add_timing(  # pylint: disable=too-many-arguments, too-many-positional-arguments
+        self, engine_name: str, engine_time: float, page_load_time: float, warm: int = 0, cold: int = 0
+    ):
         with self._lock:
             if self._closed:
                 log.error("call to ResultContainer.add_timing after ResultContainer.close")
                 return
-            self.timings.append(Timing(engine_name, total=engine_time, load=page_load_time))
+            self.timings.append(Timing(engine_name, total=engine_time, load=page_load_time, warm=warm, cold=cold))
 
     def get_timings(self) -> list[Timing]:
         with self._lock:
@@ -297,8 +347,8 @@ class ResultContainer:
 def merge_two_infoboxes(origin: LegacyResult, other: LegacyResult):
     """Merges the values from ``other`` into ``origin``."""
     # pylint: disable=too-many-branches
-    weight1 = getattr(searx.engines.engines[origin.engine], "weight", 1)
-    weight2 = getattr(searx.engines.engines[other.engine], "weight", 1)
+    weight1 = searx.engines.engine_props[origin.engine].weight
+    weight2 = searx.engines.engine_props[other.engine].weight
 
     if weight2 > weight1:
         origin.engine = other.engine
@@ -5,7 +5,10 @@ __all__ = ["SearchWithPlugins"]
 
 import typing as t
 
+import asyncio
+import functools
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from timeit import default_timer
 from uuid import uuid4
 
@@ -18,10 +21,11 @@ import searx.plugins
 from searx.engines import load_engines
 from searx.external_bang import get_bang_url
 from searx.metrics import initialize as initialize_metrics, counter_inc
-from searx.network import initialize as initialize_network, check_network_configuration
+from searx.network import initialize as initialize_network, check_network_configuration, get_loop
 from searx.results import ResultContainer
+from searx.search import parse_executor, result_cache, singleflight, warmup
 from searx.search.processors import PROCESSORS
-from searx.search.processors.abstract import RequestParams
+from searx.search.processors.abstract import EngineProcessor, EngineDeadline, RequestParams
 
 if t.TYPE_CHECKING:
     from .models import SearchQuery
@@ -29,6 +33,23 @@ if t.TYPE_CHECKING:
 
 logger = logger.getChild('search')
 
+_EXECUTOR: ThreadPoolExecutor | None = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Returns the pool of worker threads used by the ``asyncio`` executor
+    (:ref:`settings search executor`), the pool is created on demand."""
+    global _EXECUTOR  # pylint: disable=global-statement
+
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(
+                max_workers=settings['search']['executor_workers'],
+                thread_name_prefix='search_worker',
+            )
+    return _EXECUTOR
+
 
 def initialize(
     settings_engines: list[dict[str, t.Any]] = None,  # pyright: ignore[reportArgumentType]
@@ -42,6 +63,10 @@ def initialize(
         check_network_configuration()
     initialize_metrics([engine['name'] for engine in settings_engines], enable_metrics)
     PROCESSORS.init(settings_engines)
+    result_cache.initialize()
+    singleflight.initialize()
+    parse_executor.initialize()
+    warmup.initialize()
 
 
 class Search:
@@ -82,6 +107,13 @@ class Search:
         # max of all selected engine timeout
         default_timeout = 0
 
+        # a disabled engine is initialized on first use (lazy_engines), the
+        # engines that are not initialized in time are skipped in this search
+        init_wait = PROCESSORS.init_wait
+        if self.search_query.timeout_limit:
+            init_wait = min(init_wait, self.search_query.timeout_limit / 2)
+        PROCESSORS.wait_pending([engineref.name for engineref in self.search_query.engineref_list], init_wait)
+
         # start search-request for all selected engines
         for engineref in self.search_query.engineref_list:
             processor = PROCESSORS.get(engineref.name)
@@ -133,39 +165,212 @@ class Search:
 
         return requests, actual_timeout
 
+    def get_soft_deadline(self) -> float | None:
+        """Returns the time (:py:obj:`timeit.default_timer`) of the soft
+        deadline of the search or ``None`` if the :ref:`soft deadline <settings
+        search soft_deadline>` is not enabled.  The soft deadline is never after
+        the (hard) timeout of the search."""
+        cfg = settings['search']['soft_deadline']
+        if not cfg['enabled']:
+            return None
+        return self.start_time + min(cfg['timeout'], self.actual_timeout)  # type: ignore
+
+    def has_enough_responses(self, responded: list[str], engine_names: list[str]) -> bool:
+        """``True`` if the engines in ``responded`` have the configured share
+        (:ref:`ratio <settings search soft_deadline>`) of the weight of all
+        engines of the search."""
+
+        def weight(engine_name: str) -> float:
+            return float(getattr(PROCESSORS[engine_name].engine, 'weight', 1) or 1)
+
+        total = sum(weight(name) for name in engine_names)
+        return sum(weight(name) for name in responded) >= settings['search']['soft_deadline']['ratio'] * total
+
+    def is_soft_timeout(self, responded: list[str], engine_names: list[str]) -> bool:
+        """``True`` if the search does not wait for the engines that have not
+        yet responded: there are enough responses or the soft deadline has been
+        reached before the (hard) timeout of the search."""
+        if self.has_enough_responses(responded, engine_names):
+            return True
+        return self.get_soft_deadline() < self.start_time + self.actual_timeout  # type: ignore
+
+    def mark_late_engines(self, engine_names: list[str]) -> tuple[list[str], ResultContainer]:
+        """The search is rendered without the results of the engines in
+        ``engine_names`` (soft deadline), the engines are reported as
+        unresponsive (``soft_timeout``).  An engine that is already adding its
+        results to the container of the search is not late (see
+        :py:obj:`searx.results.ResultContainer.move_late_engines`).
+
+        Returns the late engines and the container for their late results, if
+        configured, the late results are added to the :py:obj:`result cache
+        <searx.search.result_cache>`."""
+        late_container = ResultContainer()
+        cache = result_cache.CACHE
+        if cache is not None and settings['search']['soft_deadline']['cache_late_results']:
+            late_container.on_extend = functools.partial(cache.add_late, self.search_query)
+        late_engines = self.result_container.move_late_engines(engine_names, late_container)
+        for engine_name in late_engines:
+            self.result_container.add_unresponsive_engine(engine_name, 'soft_timeout')
+            PROCESSORS[engine_name].logger.debug('engine missed the soft deadline')
+        return late_engines, late_container
+
     def search_multiple_requests(self, requests: list[tuple[str, str, RequestParams]]):
         # pylint: disable=protected-access
         search_id = str(uuid4())
+        threads: list[threading.Thread] = []
+        responded: list[str] = []
+        finished = threading.Semaphore(0)
+
+        def run_engine(engine_name: str, _search: t.Callable[..., None], *args: t.Any):
+            try:
+                _search(*args)
+            finally:
+                responded.append(engine_name)
+                finished.release()
 
         for engine_name, query, request_params in requests:
             _search = copy_current_request_context(PROCESSORS[engine_name].search)
             th = threading.Thread(  # pylint: disable=invalid-name
-                target=_search,
-                args=(query, request_params, self.result_container, self.start_time, self.actual_timeout),
+                target=run_engine,
+                args=(
+                    engine_name,
+                    _search,
+                    query,
+                    request_params,
+                    self.result_container,
+                    self.start_time,
+                    self.actual_timeout,
+                ),
                 name=search_id,
             )
             th._timeout = False
+            th._late = False
             th._engine_name = engine_name
             th.start()
-
-        for th in threading.enumerate():  # pylint: disable=invalid-name
-            if th.name == search_id:
-                remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
-                th.join(remaining_time)
-                if th.is_alive():
-                    th._timeout = True
-                    self.result_container.add_unresponsive_engine(th._engine_name, 'timeout')
-                    PROCESSORS[th._engine_name].logger.error('engine timeout')
+            threads.append(th)
+
+        soft_deadline = self.get_soft_deadline()
+        if soft_deadline is not None:
+            engine_names = [th._engine_name for th in threads]
+            while len(responded) < len(threads) and not self.has_enough_responses(responded, engine_names):
+                remaining_time = soft_deadline - default_timer()
+                if remaining_time <= 0:
+                    break
+                finished.acquire(timeout=remaining_time)  # pylint: disable=consider-using-with
+
+            late = [th._engine_name for th in threads if th._engine_name not in responded]
+            if late and self.is_soft_timeout(responded, engine_names):
+                late, _ = self.mark_late_engines(late)
+                for th in threads:  # pylint: disable=invalid-name
+                    th._late = th._engine_name in late
+
+        for th in threads:  # pylint: disable=invalid-name
+            if th._late:
+                continue
+            remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
+            th.join(remaining_time)
+            if th.is_alive():
+                th._timeout = True
+                self.result_container.add_unresponsive_engine(th._engine_name, 'timeout')
+                PROCESSORS[th._engine_name].logger.error('engine timeout')
+
+    def search_multiple_requests_aio(self, requests: list[tuple[str, str, RequestParams]]):
+        """Counterpart of :py:obj:`Search.search_multiple_requests` for the
+        ``asyncio`` executor: the engines are coroutines on the network loop
+        (:py:obj:`EngineProcessor.search_async`) with the remaining time of the
+        search as deadline."""
+
+        loop = get_loop()
+        executor = get_executor()
+        deadlines = {engine_name: EngineDeadline() for engine_name, _, _ in requests}
+
+        async def engine_search(engine_name: str, query: str, request_params: RequestParams, call_in_worker):
+            processor = PROCESSORS[engine_name]
+            deadline = deadlines[engine_name]
+
+            async def run_in_worker(func, *args):
+                return await loop.run_in_executor(executor, call_in_worker, deadline, func, *args)
+
+            remaining_time = max(0.0, self.actual_timeout - (default_timer() - self.start_time))
+            try:
+                await asyncio.wait_for(
+                    processor.search_async(
+                        query,
+                        request_params,
+                        self.result_container,
+                        self.start_time,
+                        self.actual_timeout,
+                        run_in_worker,
+                    ),
+                    remaining_time,
+                )
+            except asyncio.TimeoutError:
+                deadline.timed_out.set()
+                if deadline.late_container is None:
+                    self.result_container.add_unresponsive_engine(engine_name, 'timeout')
+                    processor.logger.error('engine timeout')
+
+        # the flask request context has to be copied in the thread of the
+        # request, not in the thread of the network loop
+        coros = {
+            request[0]: engine_search(*request, copy_current_request_context(EngineProcessor.call_in_worker))
+            for request in requests
+        }
+        soft_deadline = self.get_soft_deadline()
+
+        async def search_all():
+            tasks = {asyncio.ensure_future(coro): engine_name for engine_name, coro in coros.items()}
+            pending = set(tasks)
+            if soft_deadline is not None:
+                engine_names = list(tasks.values())
+                responded: list[str] = []
+                while pending and not self.has_enough_responses(responded, engine_names):
+                    remaining_time = soft_deadline - default_timer()
+                    if remaining_time <= 0:
+                        break
+                    done, pending = await asyncio.wait(
+                        pending, timeout=remaining_time, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    responded.extend(tasks[task] for task in done)
+
+                if pending and self.is_soft_timeout(responded, engine_names):
+                    # the late engines go on running on the loop until their
+                    # (hard) timeout
+                    late, late_container = self.mark_late_engines([tasks[task] for task in pending])
+                    for engine_name in late:
+                        deadlines[engine_name].late_container = late_container
+                    pending = {task for task in pending if tasks[task] not in late}
+            await asyncio.gather(*pending)
+
+        future = asyncio.run_coroutine_threadsafe(search_all(), loop)
+        future.result()
 
     def search_standard(self):
         """
         Update self.result_container, self.actual_timeout
         """
+        cache = result_cache.CACHE
+        if cache is not None and cache.replay(self.search_query, self.result_container):
+            return True
+
         requests, self.actual_timeout = self._get_requests()
 
+        recorder = None
+        if cache is not None:
+            recorder = result_cache.ResultRecorder()
+            self.result_container.on_extend = recorder
+
         # send all search-request
         if requests:
-            self.search_multiple_requests(requests)
+            if settings['search']['executor'] == 'asyncio':
+                self.search_multiple_requests_aio(requests)
+            else:
+                self.search_multiple_requests(requests)
+
+        if recorder is not None:
+            # late results of timed out engines are not recorded
+            self.result_container.on_extend = None
+            cache.store(self.search_query, self.result_container, recorder)  # type: ignore
 
         # return results, suggestions, answers and infoboxes
         return True
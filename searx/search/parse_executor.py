@@ -0,0 +1,216 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Process pool in which the responses of the engines are parsed
+(:ref:`settings search parse_executor`).
+
+:py:obj:`ParseExecutor`:
+  Calls the ``response`` function of an engine in a worker process.
+
+Parsing a HTML response (``lxml.html.fromstring`` and the XPath expressions) or
+a large JSON document is CPU bound, in the threads of a search the engines
+contend for the GIL of the process.  The engines that are configured with
+``offload_parsing: true`` (:ref:`settings engines`) send the (raw) response and
+the ``search_params`` of the request to a worker process, the ``response``
+function of the engine is called in the worker and the (pickled) results are
+returned to the search.
+
+The results are returned by :py:mod:`pickle` (the serialization of
+:py:obj:`concurrent.futures.ProcessPoolExecutor`), not as msgspec encoded
+:py:obj:`Result <searx.result_types.Result>` structs: msgspec's typed decoder
+does not support the field types of some result types (e.g. the unions
+``dict | OrderedDict`` of :py:obj:`KeyValue <searx.result_types.KeyValue>` or
+``list | set`` of :py:obj:`Paper <searx.result_types.Paper>`) and without a
+type the values of the legacy (``dict``) results are not restored (a
+``datetime`` is decoded as a string, a ``set`` as a list).  Pickle restores the
+results as they are returned by the engine.
+
+The worker processes load the engines from the ``settings.yml``, the
+``response`` function of an offloaded engine must not depend on a state of the
+engine that is set up at runtime (e.g. by the ``init`` function) and must not
+send HTTP requests.
+
+----
+"""
+
+__all__ = ["ParseExecutor", "EXECUTOR", "initialize"]
+
+import typing as t
+
+import multiprocessing
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import httpx
+
+from searx import logger
+from searx import settings
+import searx.engines
+
+if t.TYPE_CHECKING:
+    from searx.extended_types import SXNG_Response
+    from searx.result_types import EngineResults
+
+logger = logger.getChild('search.parse_executor')
+
+EXECUTOR: "ParseExecutor | None" = None
+"""Global :py:obj:`ParseExecutor`, ``None`` if no engine parses its responses
+in a worker process."""
+
+
+class ResponseData(t.NamedTuple):
+    """The parts of a :py:obj:`SXNG_Response
+    <searx.extended_types.SXNG_Response>` that are sent to the worker
+    process."""
+
+    method: str
+    url: str
+    status_code: int
+    headers: list[tuple[bytes, bytes]]
+    content: bytes
+    encoding: str | None
+
+    @classmethod
+    def from_response(cls, response: "SXNG_Response") -> "ResponseData":
+        return cls(
+            method=response.request.method,
+            url=str(response.url),
+            status_code=response.status_code,
+            headers=response.headers.raw,
+            content=response.content,
+            encoding=response.encoding,
+        )
+
+    def to_response(self) -> "SXNG_Response":
+        response: "SXNG_Response" = httpx.Response(  # type: ignore
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=httpx.Request(self.method, self.url),
+        )
+        if self.encoding:
+            response.encoding = self.encoding
+        response.ok = not response.is_error
+        return response
+
+
+class RemoteTraceback(Exception):
+    """Traceback of an exception raised in the worker process, set as the
+    ``__cause__`` of the exception re-raised in the search."""
+
+    def __init__(self, formatted: str):
+        super().__init__(formatted)
+        self.formatted: str = formatted
+
+    def __str__(self):
+        return self.formatted
+
+
+def _dump_exception(exc: Exception) -> tuple[type[Exception], tuple[t.Any, ...], dict[str, t.Any], str]:
+    # The SearXNG exceptions can't be pickled (their __init__ arguments differ
+    # from the args), the exception is rebuilt from its class, args and
+    # attributes.
+    tb = "".join(traceback.format_exception(exc))
+    return type(exc), exc.args, dict(exc.__dict__), tb
+
+
+def _load_exception(data: tuple[type[Exception], tuple[t.Any, ...], dict[str, t.Any], str]) -> Exception:
+    exc_type, args, attrs, tb = data
+    exc = exc_type.__new__(exc_type, *args)
+    exc.args = args
+    exc.__dict__.update(attrs)
+    exc.__cause__ = RemoteTraceback(tb)
+    return exc
+
+
+def _init_worker(engine_list: list[dict[str, t.Any]]):
+    searx.engines.load_engines(engine_list)
+
+
+def _parse_in_worker(engine_name: str, data: ResponseData, params: dict[str, t.Any]) -> tuple[bool, t.Any]:
+    try:
+        response = data.to_response()
+        response.search_params = params  # type: ignore
+        return True, searx.engines.engines[engine_name].response(response)  # type: ignore
+    except Exception as exc:  # pylint: disable=broad-except
+        return False, _dump_exception(exc)
+
+
+class ParseExecutor:
+    """Pool of worker processes that call the ``response`` function of the
+    engines in ``engine_list`` (the settings of the engines).
+
+    The workers are started by ``forkserver`` (``spawn`` where ``forkserver``
+    is not available), a worker is not a fork of a SearXNG process with its
+    threads, locks and network connections.  A pool that is broken (a worker
+    process died) is replaced by a new pool.
+    """
+
+    def __init__(self, workers: int, engine_list: list[dict[str, t.Any]]):
+        self.workers: int = workers
+        self.engine_list: list[dict[str, t.Any]] = engine_list
+        self.engine_names: set[str] = {engine["name"] for engine in engine_list}
+        self._lock: threading.Lock = threading.Lock()
+        self.pool: ProcessPoolExecutor = self._new_pool()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        methods = multiprocessing.get_all_start_methods()
+        ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=ctx, initializer=_init_worker, initargs=(self.engine_list,)
+        )
+
+    def _renew_pool(self, pool: ProcessPoolExecutor):
+        # several threads of a search see the same broken pool, only the first
+        # one replaces it
+        with self._lock:
+            if self.pool is not pool:
+                return
+            logger.error("process pool is broken, start a new pool")
+            self.pool = self._new_pool()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def parse(self, engine_name: str, response: "SXNG_Response", timeout: float) -> "EngineResults | list[t.Any]":
+        """Calls the ``response`` function of the engine in a worker process
+        and returns the results.  An exception of the engine is re-raised,
+        :py:obj:`TimeoutError` is raised when the results are not available
+        after ``timeout`` seconds (the parsing is canceled if it has not yet
+        been started by a worker)."""
+        params = dict(response.search_params)
+        pool = self.pool
+        try:
+            future = pool.submit(_parse_in_worker, engine_name, ResponseData.from_response(response), params)
+            ok, value = future.result(timeout=timeout)
+        except BrokenProcessPool:
+            self._renew_pool(pool)
+            raise
+        except TimeoutError:
+            future.cancel()
+            raise
+        if not ok:
+            raise _load_exception(value)
+        return value
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def initialize() -> ParseExecutor | None:
+    """Initialize the global :py:obj:`EXECUTOR` from the :ref:`settings search
+    parse_executor` and the engines with ``offload_parsing: true``."""
+    global EXECUTOR  # pylint: disable=global-statement
+
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown()
+    EXECUTOR = None
+
+    workers = settings['search']['parse_executor']['workers']
+    engine_list = [
+        engine_settings
+        for engine_settings in settings['engines']
+        if engine_settings.get('offload_parsing') and engine_settings['name'] in searx.engines.engines
+    ]
+    if workers and engine_list:
+        logger.info("parse the responses of %s engines in %s worker processes", len(engine_list), workers)
+        EXECUTOR = ParseExecutor(workers, engine_list)
+    return EXECUTOR
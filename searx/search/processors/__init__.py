@@ -15,8 +15,12 @@ __all__ = [
 
 import typing as t
 
+import threading
+from timeit import default_timer
+
 from searx import logger
 from searx import engines
+from searx import settings
 
 from .abstract import EngineProcessor, RequestParams
 from .offline import OfflineProcessor
@@ -44,29 +48,106 @@ class ProcessorMap(dict[str, EngineProcessor]):
         OnlineUrlSearchProcessor.engine_type: OnlineUrlSearchProcessor,
     }
 
+    def __init__(self):
+        super().__init__()
+        self.pending: dict[str, threading.Event | None] = {}
+        """Disabled engines that are initialized on first use
+        (:ref:`settings search lazy_engines`), the value is set when the
+        initialization has been started."""
+        self._lock = threading.Lock()
+
+    init_wait: float = 1.0
+    """Max. seconds a search waits for the initialization of the pending
+    engines it uses (see :py:obj:`ProcessorMap.wait_pending`)."""
+
     def init(self, engine_list: list[dict[str, t.Any]]):
-        """Initialize all engines and registers a processor for each engine."""
+        """Initialize all engines and registers a processor for each engine.
+        With :ref:`settings search lazy_engines`, the initialization of the
+        disabled engines is deferred (:py:obj:`ProcessorMap.wait_pending`)."""
 
+        lazy = settings['search']['lazy_engines']
+        self.pending.clear()
         for eng_settings in engine_list:
             eng_name: str = eng_settings["name"]
 
             if eng_settings.get("inactive", False) is True:
                 continue
 
-            eng_obj = engines.engines.get(eng_name)
-            if eng_obj is None:
-                logger.warning("Engine of name '%s' does not exists.", eng_name)
-                continue
-
-            eng_type = getattr(eng_obj, "engine_type", "online")
-            proc_cls = self.processor_types.get(eng_type)
-            if proc_cls is None:
-                logger.error("Engine '%s' is of unknown engine_type: %s", eng_type)
+            if lazy and eng_settings.get("disabled", False) is True and eng_name in engines.engines:
+                self.pending[eng_name] = None
                 continue
 
-            # initialize (and register) the engine
-            eng_proc = proc_cls(eng_obj)
-            eng_proc.initialize(self.register_processor)
+            eng_proc = self.new_processor(eng_name)
+            if eng_proc is not None:
+                # initialize (and register) the engine
+                eng_proc.initialize(self.register_processor)
+
+    def new_processor(self, eng_name: str) -> EngineProcessor | None:
+        """Returns a new (not initialized) processor of the engine."""
+
+        eng_obj = engines.engines.get(eng_name)
+        if eng_obj is None:
+            logger.warning("Engine of name '%s' does not exists.", eng_name)
+            return None
+        eng_obj = engines.resolve_engine(eng_obj)
+        if eng_obj is None:
+            return None
+
+        eng_type = getattr(eng_obj, "engine_type", "online")
+        proc_cls = self.processor_types.get(eng_type)
+        if proc_cls is None:
+            logger.error("Engine '%s' is of unknown engine_type: %s", eng_type)
+            return None
+        return proc_cls(eng_obj)
+
+    def get_or_init(self, eng_name: str, timeout: float) -> EngineProcessor | None:
+        """Returns the processor of the engine, a pending engine is initialized
+        on the first call.  The call waits at most ``timeout`` seconds for the
+        initialization (which continues in the background).  ``None`` is
+        returned if the engine is unknown, not yet initialized or if the
+        initialization has failed (the result of the initialization is kept, a
+        failed engine is not initialized again)."""
+
+        self.wait_pending([eng_name], timeout)
+        return self.get(eng_name)
+
+    def wait_pending(self, eng_names: list[str], timeout: float):
+        """Starts the initialization of the pending engines in ``eng_names``
+        (all at once, each in a thread) and waits at most ``timeout`` seconds
+        (in total) for them.  An engine that is not initialized in this time
+        continues to be initialized in the background."""
+
+        events: list[threading.Event] = []
+        with self._lock:
+            for eng_name in eng_names:
+                if eng_name not in self.pending:
+                    continue
+                event = self.pending[eng_name]
+                if event is None:
+                    event = self.pending[eng_name] = threading.Event()
+                    threading.Thread(target=self._init_pending, args=(eng_name, event), daemon=True).start()
+                events.append(event)
+
+        end_time = default_timer() + timeout
+        for event in events:
+            event.wait(max(end_time - default_timer(), 0))
+
+    def _init_pending(self, eng_name: str, event: threading.Event):
+
+        def callback(eng_proc: EngineProcessor, eng_proc_ok: bool) -> bool:
+            try:
+                return self.register_processor(eng_proc, eng_proc_ok)
+            finally:
+                self.pending.pop(eng_name, None)
+                event.set()
+
+        logger.debug("initialize engine %s on first use", eng_name)
+        eng_proc = self.new_processor(eng_name)
+        if eng_proc is None:
+            self.pending.pop(eng_name, None)
+            event.set()
+            return
+        eng_proc.initialize(callback)
 
     def register_processor(self, eng_proc: EngineProcessor, eng_proc_ok: bool) -> bool:
         """Register the :py:obj:`EngineProcessor`.
@@ -76,10 +157,13 @@ class ProcessorMap(dict[str, EngineProcessor]):
 
         The value (true/false) passed in ``eng_proc_ok`` indicates whether the
         initialization of the :py:obj:`EngineProcessor` was successful; if this
-        is not the case, the processor is not registered.
+        is not the case, the processor is not registered.  The ``init``
+        function of the engine may have changed the attributes of the engine,
+        the :py:obj:`searx.engines.engine_props` of the engine are updated.
         """
 
         if eng_proc_ok:
+            engines.update_engine_props(eng_proc.engine.name)
             self[eng_proc.engine.name] = eng_proc
             # logger.debug("registered engine processor: %s", eng_proc.engine.name)
         else:
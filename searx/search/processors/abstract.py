@@ -11,8 +11,8 @@ from timeit import default_timer
 from searx import get_setting
 from searx import logger
 from searx.engines import engines
-from searx.network import get_time_for_thread, get_network
-from searx.metrics import histogram_observe, counter_inc, count_exception, count_error
+from searx.network import get_time_for_thread, get_connections_for_thread, get_network
+from searx.metrics import histogram_observe, counter_inc, counter_add, count_exception, count_error
 from searx.exceptions import SearxEngineAccessDeniedException
 from searx.utils import get_engine_from_settings
 
@@ -27,6 +27,32 @@ if t.TYPE_CHECKING:
 logger = logger.getChild("searx.search.processor")
 SUSPENDED_STATUS: dict[int | str, "SuspendedStatus"] = {}
 
+WORKER_LOCAL = threading.local()
+"""Thread-local data of the worker threads used by the ``asyncio`` executor
+(see :py:obj:`EngineProcessor.call_in_worker`)."""
+
+
+class EngineDeadline:  # pylint: disable=too-few-public-methods
+    """Deadline of an engine in a search, shared between the caller of the
+    search and the threads working on the engine's request (see
+    :py:obj:`EngineProcessor.call_in_worker`)."""
+
+    def __init__(self):
+        self.timed_out: threading.Event = threading.Event()
+        """Is set once the (hard) timeout of the engine has been reached."""
+
+        self.late_container: "ResultContainer | None" = None
+        """Is set once the search has been rendered without this engine (soft
+        deadline, see :ref:`settings search soft_deadline`); later results and
+        errors of the engine are added to this container (see
+        :py:obj:`searx.results.ResultContainer.claim`)."""
+
+
+RunInWorker: t.TypeAlias = t.Callable[..., t.Awaitable[t.Any]]
+"""Coroutine function ``run_in_worker(func, *args)`` that calls ``func(*args)``
+in a worker thread and returns its result (see
+:py:obj:`EngineProcessor.search_async`)."""
+
 
 class RequestParams(t.TypedDict):
     """Basic quantity of the Request parameters of all engine types."""
@@ -168,6 +194,7 @@ class EngineProcessor(ABC):
         exception_or_message: BaseException | str,
         suspend: bool = False,
     ):
+        result_container = result_container.claim(self.engine.name)
         # update result_container
         if isinstance(exception_or_message, BaseException):
             exception_class = exception_or_message.__class__
@@ -200,20 +227,38 @@ class EngineProcessor(ABC):
         result_container.extend(self.engine.name, search_results)
         engine_time = default_timer() - start_time
         page_load_time = get_time_for_thread()
-        result_container.add_timing(self.engine.name, engine_time, page_load_time)
+        warm, cold = get_connections_for_thread()
+        result_container.add_timing(self.engine.name, engine_time, page_load_time, warm, cold)
         # metrics
         counter_inc('engine', self.engine.name, 'search', 'count', 'successful')
+        counter_add(warm, 'engine', self.engine.name, 'http', 'connection', 'warm')
+        counter_add(cold, 'engine', self.engine.name, 'http', 'connection', 'cold')
         histogram_observe(engine_time, 'engine', self.engine.name, 'time', 'total')
         if page_load_time is not None:
             histogram_observe(page_load_time, 'engine', self.engine.name, 'time', 'http')
 
+    def is_timed_out(self) -> bool:
+        """``True`` if the caller of the search is not waiting for the results
+        of this engine anymore (engine timeout)."""
+        if getattr(threading.current_thread(), '_timeout', False):
+            return True
+        deadline: EngineDeadline | None = getattr(WORKER_LOCAL, 'deadline', None)
+        return deadline is not None and deadline.timed_out.is_set()
+
     def extend_container(
         self,
         result_container: "ResultContainer",
         start_time: float,
         search_results: "list[Result | LegacyResult]|None",
     ):
-        if getattr(threading.current_thread(), '_timeout', False):
+        # the container of the search or the late container, if the search has
+        # been rendered without the results of this engine (soft deadline)
+        late_container = result_container.claim(self.engine.name)
+        if late_container is not result_container:
+            if search_results is not None:
+                self._extend_container_basic(late_container, start_time, search_results)
+            self.suspended_status.resume()
+        elif self.is_timed_out():
             # the main thread is not waiting anymore
             self.handle_exception(result_container, 'timeout', False)
         else:
@@ -289,6 +334,34 @@ class EngineProcessor(ABC):
     ):
         pass
 
+    async def search_async(
+        self,
+        query: str,
+        params: RequestParams,
+        result_container: "ResultContainer",
+        start_time: float,
+        timeout_limit: float,
+        run_in_worker: RunInWorker,
+    ):
+        """Coroutine used by the ``asyncio`` executor of the search (instead of
+        :py:obj:`EngineProcessor.search`).  The default implementation runs
+        :py:obj:`EngineProcessor.search` in a worker thread, processors with
+        I/O on the network loop overwrite this method."""
+        await run_in_worker(self.search, query, params, result_container, start_time, timeout_limit)
+
+    @staticmethod
+    def call_in_worker(deadline: EngineDeadline, func: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+        """Calls ``func(*args)`` in a worker thread of the ``asyncio`` executor.
+        The caller sets ``deadline.timed_out`` once the deadline of the engine
+        has been reached, results which arrive later are not added to the
+        result container (see :py:obj:`EngineProcessor.is_timed_out` and
+        :py:obj:`searx.results.ResultContainer.claim`)."""
+        WORKER_LOCAL.deadline = deadline
+        try:
+            return func(*args)
+        finally:
+            WORKER_LOCAL.deadline = None
+
     def get_tests(self):
         # deprecated!
         return {}
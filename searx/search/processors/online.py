@@ -11,16 +11,19 @@ import ssl
 import httpx
 
 import searx.network
+from searx.search import parse_executor, singleflight
 from searx.utils import gen_useragent
 from searx.exceptions import (
     SearxEngineAccessDeniedException,
     SearxEngineCaptchaException,
     SearxEngineTooManyRequestsException,
 )
+from searx.metrics import counter_inc
 from searx.metrics.error_recorder import count_error
-from .abstract import EngineProcessor, RequestParams
+from .abstract import EngineProcessor, RequestParams, RunInWorker
 
 if t.TYPE_CHECKING:
+    from searx.extended_types import SXNG_Response
     from searx.search.models import SearchQuery
     from searx.results import ResultContainer
     from searx.result_types import EngineResults
@@ -161,7 +164,9 @@ class OnlineProcessor(EngineProcessor):
 
         return params
 
-    def _send_http_request(self, params: OnlineParams):
+    def _get_request_args(self, params: OnlineParams) -> tuple[str, dict[str, t.Any]]:
+        """Returns the HTTP method and the keyword arguments of the HTTP request
+        described by ``params``."""
 
         # create dictionary which contain all information about the request
         request_args: dict[str, t.Any] = {
@@ -183,28 +188,24 @@ class OnlineProcessor(EngineProcessor):
         if "allow_redirects" in params:
             request_args["allow_redirects"] = params["allow_redirects"]
 
-        # soft_max_redirects
-        soft_max_redirects: int = params.get("soft_max_redirects", max_redirects or 0)
-
         # raise_for_status
         request_args["raise_for_httperror"] = params.get("raise_for_httperror", True)
 
         # specific type of request (GET or POST)
         if params["method"] == "GET":
-            req = searx.network.get
-        else:
-            req = searx.network.post
-            if params["data"]:
-                request_args["data"] = params["data"]
-            if params["json"]:
-                request_args["json"] = params["json"]
-            if params["content"]:
-                request_args["content"] = params["content"]
+            return "GET", request_args
 
-        # send the request
-        response = req(params["url"], **request_args)  # pyright: ignore[reportArgumentType]
+        if params["data"]:
+            request_args["data"] = params["data"]
+        if params["json"]:
+            request_args["json"] = params["json"]
+        if params["content"]:
+            request_args["content"] = params["content"]
+        return "POST", request_args
 
+    def _check_redirects(self, params: OnlineParams, response: "SXNG_Response"):
         # check soft limit of the redirect count
+        soft_max_redirects: int = params.get("soft_max_redirects", params.get("max_redirects") or 0)
         if len(response.history) > soft_max_redirects:
             # unexpected redirect : record an error
             # but the engine might still return valid results.
@@ -218,6 +219,29 @@ class OnlineProcessor(EngineProcessor):
                 secondary=True,
             )
 
+    def _send_http_request(self, params: OnlineParams):
+
+        method, request_args = self._get_request_args(params)
+        if method == "GET":
+            req = searx.network.get
+        else:
+            req = searx.network.post
+
+        # send the request
+        response = req(params["url"], **request_args)  # pyright: ignore[reportArgumentType]
+        self._check_redirects(params, response)
+        return response
+
+    async def _send_http_request_async(self, params: OnlineParams, timeout_limit: float) -> "SXNG_Response":
+        """Coroutine of :py:obj:`OnlineProcessor._send_http_request`, the
+        request is sent on the network loop and not in the thread of the
+        engine."""
+
+        method, request_args = self._get_request_args(params)
+        request_args["timeout"] = timeout_limit
+        network = searx.network.get_network(self.engine.name) or searx.network.get_network()
+        response = await network.request(method, params["url"], **request_args)  # pyright: ignore[reportArgumentType]
+        self._check_redirects(params, response)
         return response
 
     def _search_basic(self, query: str, params: OnlineParams) -> "EngineResults|None":
@@ -229,13 +253,66 @@ class OnlineProcessor(EngineProcessor):
         if not params["url"]:
             return None
 
+        flights = singleflight.FLIGHTS
+        if flights is not None:
+            return self._search_coalesced(flights, params)
+
         # send request
         response = self._send_http_request(params)
 
         # parse the response
+        return self._parse_response(response, params)
+
+    def _parse_response(self, response: "SXNG_Response", params: OnlineParams) -> "EngineResults|None":
+        """Calls the engine's ``response`` method, in a worker process of the
+        :py:obj:`parse executor <searx.search.parse_executor>` when the engine
+        is configured with ``offload_parsing``."""
         response.search_params = params
+        executor = parse_executor.EXECUTOR
+        if executor is not None and self.engine.name in executor.engine_names:
+            timeout = searx.network.get_remaining_time_for_thread()
+            if timeout is None:
+                timeout = self.engine.timeout
+            return executor.parse(self.engine.name, response, max(timeout, 0.0))  # type: ignore
         return self.engine.response(response)
 
+    def flight_key(self, params: OnlineParams) -> str:
+        """Key of the :py:obj:`singleflight <searx.search.singleflight>`: two
+        requests of the engine are identical if all the arguments of the HTTP
+        request are equal (method, URL, headers, cookies, body, auth and the
+        network options).  The ``User-Agent`` header is not part of the key, it
+        is randomized for each request (:py:obj:`searx.utils.gen_useragent`).
+
+        The engines put the preferences of the user (e.g. safesearch, region or
+        language) in the URL, the headers or the cookies, requests with other
+        preferences are not coalesced."""
+        method, request_args = self._get_request_args(params)
+        headers = sorted(
+            (name.lower(), str(value))
+            for name, value in (request_args.pop("headers") or {}).items()
+            if name.lower() != "user-agent"
+        )
+        cookies = sorted((request_args.pop("cookies") or {}).items())
+        return repr((self.engine.name, method, params["url"], headers, cookies, sorted(request_args.items())))
+
+    def _search_coalesced(self, flights: singleflight.SingleFlight, params: OnlineParams) -> "EngineResults|None":
+
+        def send_and_parse():
+            response = self._send_http_request(params)
+            return self._parse_response(response, params)
+
+        time_before_request = default_timer()
+        timeout = searx.network.get_remaining_time_for_thread()
+        if timeout is None:
+            timeout = self.engine.timeout
+        search_results, coalesced = flights.call(self.flight_key(params), send_and_parse, timeout)
+        if coalesced:
+            # the time waiting for the results of the leader is the HTTP time
+            # of this request
+            searx.network.add_time_for_thread(default_timer() - time_before_request)
+            counter_inc("engine", self.engine.name, "search", "count", "coalesced")
+        return search_results
+
     def search(  # pyright: ignore[reportIncompatibleMethodOverride]
         self,
         query: str,
@@ -250,33 +327,119 @@ class OnlineProcessor(EngineProcessor):
             # send requests and parse the results
             search_results = self._search_basic(query, params)
             self.extend_container(result_container, start_time, search_results)
-        except ssl.SSLError as e:
+        except Exception as e:  # pylint: disable=broad-except
+            self.handle_search_exception(result_container, e, start_time, timeout_limit)
+
+    async def search_async(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self,
+        query: str,
+        params: OnlineParams,
+        result_container: "ResultContainer",
+        start_time: float,
+        timeout_limit: float,
+        run_in_worker: RunInWorker,
+    ):
+        """The engine's ``request`` and ``response`` methods are called in a
+        worker thread, the HTTP request is awaited on the network loop."""
+
+        try:
+            load_time: float = await run_in_worker(self._request_in_worker, query, params, start_time, timeout_limit)
+            response = None
+            # ignoring empty urls
+            if params["url"]:
+                time_before_request = default_timer()
+                try:
+                    response = await self._send_http_request_coalesced(params, timeout_limit)
+                finally:
+                    load_time += default_timer() - time_before_request
+            await run_in_worker(
+                self._response_in_worker, response, params, result_container, start_time, timeout_limit, load_time
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            self.handle_search_exception(result_container, e, start_time, timeout_limit)
+
+    async def _send_http_request_coalesced(self, params: OnlineParams, timeout_limit: float) -> "SXNG_Response":
+        """Coroutine of :py:obj:`OnlineProcessor._send_http_request_async`, the
+        identical requests in flight are coalesced (:py:obj:`singleflight
+        <searx.search.singleflight>`).  The response is shared, each search
+        parses its own copy of the response."""
+
+        flights = singleflight.FLIGHTS
+        if flights is None:
+            return await self._send_http_request_async(params, timeout_limit)
+
+        response, coalesced = await flights.call_async(
+            self.flight_key(params),
+            lambda: self._send_http_request_async(params, timeout_limit),
+            lambda response: parse_executor.ResponseData.from_response(response).to_response(),
+            timeout_limit,
+        )
+        if coalesced:
+            counter_inc("engine", self.engine.name, "search", "count", "coalesced")
+        return response
+
+    def _request_in_worker(self, query: str, params: OnlineParams, start_time: float, timeout_limit: float) -> float:
+        self.init_network_in_thread(start_time, timeout_limit)
+        self.engine.request(query, params)
+        return searx.network.get_time_for_thread() or 0.0
+
+    def _response_in_worker(
+        self,
+        response: "SXNG_Response | None",
+        params: OnlineParams,
+        result_container: "ResultContainer",
+        start_time: float,
+        timeout_limit: float,
+        load_time: float,
+    ):
+        self.init_network_in_thread(start_time, timeout_limit)
+        searx.network.add_time_for_thread(load_time)
+        search_results = None
+        if response is not None:
+            searx.network.record_connection_for_thread(response)
+            search_results = self._parse_response(response, params)
+        self.extend_container(result_container, start_time, search_results)
+
+    def handle_search_exception(
+        self,
+        result_container: "ResultContainer",
+        exc: Exception,
+        start_time: float,
+        timeout_limit: float,
+    ):
+        """Records an exception raised while the engine was searching."""
+
+        if isinstance(exc, ssl.SSLError):
             # requests timeout (connect or read)
-            self.handle_exception(result_container, e, suspend=True)
-            self.logger.error("SSLError {}, verify={}".format(e, searx.network.get_network(self.engine.name).verify))
-        except (httpx.TimeoutException, asyncio.TimeoutError) as e:
+            self.handle_exception(result_container, exc, suspend=True)
+            self.logger.error("SSLError {}, verify={}".format(exc, searx.network.get_network(self.engine.name).verify))
+        elif isinstance(exc, (httpx.TimeoutException, asyncio.TimeoutError, TimeoutError)):
             # requests timeout (connect or read)
-            self.handle_exception(result_container, e, suspend=True)
+            self.handle_exception(result_container, exc, suspend=True)
             self.logger.error(
                 "HTTP requests timeout (search duration : {0} s, timeout: {1} s) : {2}".format(
-                    default_timer() - start_time, timeout_limit, e.__class__.__name__
+                    default_timer() - start_time, timeout_limit, exc.__class__.__name__
                 )
             )
-        except (httpx.HTTPError, httpx.StreamError) as e:
+        elif isinstance(exc, (httpx.HTTPError, httpx.StreamError)):
             # other requests exception
-            self.handle_exception(result_container, e, suspend=True)
-            self.logger.exception(
+            self.handle_exception(result_container, exc, suspend=True)
+            self.logger.error(
                 "requests exception (search duration : {0} s, timeout: {1} s) : {2}".format(
-                    default_timer() - start_time, timeout_limit, e
-                )
+                    default_timer() - start_time, timeout_limit, exc
+                ),
+                exc_info=exc,
             )
-        except (
-            SearxEngineCaptchaException,
-            SearxEngineTooManyRequestsException,
-            SearxEngineAccessDeniedException,
-        ) as e:
-            self.handle_exception(result_container, e, suspend=True)
-            self.logger.exception(e.message)
-        except Exception as e:  # pylint: disable=broad-except
-            self.handle_exception(result_container, e)
-            self.logger.exception("exception : {0}".format(e))
+        elif isinstance(
+            exc,
+            (
+                SearxEngineCaptchaException,
+                SearxEngineTooManyRequestsException,
+                SearxEngineAccessDeniedException,
+            ),
+        ):
+            self.handle_exception(result_container, exc, suspend=True)
+            self.logger.error(exc.message, exc_info=exc)
+        else:
+            self.handle_exception(result_container, exc)
+            self.logger.error("exception : {0}".format(exc), exc_info=exc)
@@ -0,0 +1,223 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Short-TTL cache of the engine results of a search (:ref:`settings search
+result_cache`).
+
+:py:obj:`ResultCache`:
+  Cache that maps a normalized :py:obj:`SearchQuery
+  <searx.search.models.SearchQuery>` to the results of the engines.
+
+:py:obj:`ResultRecorder`:
+  Records the results passed to :py:obj:`ResultContainer.extend
+  <searx.results.ResultContainer.extend>` for the cache.
+
+The cache stores the results of the engines *before* they have been merged by
+the :py:obj:`ResultContainer <searx.results.ResultContainer>` and before the
+plugins have seen them.  A cache hit replays the results into the container of
+the request, the plugins (:py:obj:`on_result
+<searx.plugins.Plugin.on_result>`) are called per request as if the results
+came from the engines.
+
+----
+"""
+
+__all__ = ["ResultCache", "ResultRecorder", "CACHE", "initialize"]
+
+import typing as t
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from searx import logger
+from searx import settings
+from searx import valkeydb
+from searx.valkeylib import secret_hash
+
+if t.TYPE_CHECKING:
+    from searx.search.models import SearchQuery
+    from searx.results import ResultContainer
+    from searx.result_types import Result, LegacyResult
+
+logger = logger.getChild('search.result_cache')
+
+CACHE: "ResultCache | None" = None
+"""Global result cache, ``None`` if the cache is not enabled."""
+
+
+class ResultRecorder:  # pylint: disable=too-few-public-methods
+    """Records the result lists of the engines (hooked into
+    :py:obj:`ResultContainer.on_extend
+    <searx.results.ResultContainer.on_extend>`).  The results are serialized
+    when they are passed to the container, the container modifies the result
+    objects when it merges them."""
+
+    def __init__(self):
+        self.batches: list[tuple[str | None, bytes]] = []
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, engine_name: str | None, results: "list[Result | LegacyResult]"):
+        data = pickle.dumps(list(results))
+        with self._lock:
+            self.batches.append((engine_name, data))
+
+
+class ResultCache:
+    """Cache of the engine results by the normalized search query, the values
+    are stored in a process-local LRU (``storage: memory``) or in the Valkey DB
+    shared by all workers (``storage: valkey``)."""
+
+    VALKEY_PREFIX: str = "SearXNG_result_cache_"
+
+    UNRESPONSIVE_TTL: int = 10
+    """TTL in seconds of an entry with unresponsive engines: a transient error
+    (timeout, CAPTCHA, ..) is not replayed for the whole :py:obj:`ttl
+    <ResultCache.ttl>` and the engine is asked again soon."""
+
+    def __init__(self, ttl: int, size: int, storage: t.Literal["memory", "valkey"] = "memory"):
+        self.ttl: int = ttl
+        self.size: int = size
+        self.storage: t.Literal["memory", "valkey"] = storage
+        self._items: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._late_lock: threading.Lock = threading.Lock()
+        self._late_batches: OrderedDict[str, tuple[float, list[tuple[str | None, bytes]]]] = OrderedDict()
+
+    @staticmethod
+    def key(search_query: "SearchQuery") -> str:
+        """Returns the key of the normalized ``search_query``.  The key is
+        built from the search terms, the engines (and their categories), the
+        language, safe-search, page number, time range and the engine data (e.g.
+        paging tokens).  The key is a secret hash, the search terms are not
+        readable in the storage."""
+        normalized = (
+            search_query.query,
+            sorted((ref.name, ref.category) for ref in search_query.engineref_list),
+            search_query.lang,
+            search_query.safesearch,
+            search_query.pageno,
+            search_query.time_range,
+            sorted((name, sorted(data.items())) for name, data in search_query.engine_data.items()),
+        )
+        return secret_hash(repr(normalized))
+
+    def get(self, search_query: "SearchQuery") -> dict[str, t.Any] | None:
+        """Returns the cached entry of ``search_query`` or ``None``."""
+        key = self.key(search_query)
+        data: bytes | None = None
+        valkey_client = valkeydb.client() if self.storage == "valkey" else None
+        if valkey_client is not None:
+            data = valkey_client.get(self.VALKEY_PREFIX + key)  # type: ignore
+        else:
+            with self._lock:
+                item = self._items.get(key)
+                if item is not None:
+                    if item[0] > time.time():
+                        self._items.move_to_end(key)
+                        data = item[1]
+                    else:
+                        del self._items[key]
+        if data is None:
+            return None
+        return pickle.loads(data)
+
+    def entry_ttl(self, entry: dict[str, t.Any]) -> int:
+        """Returns the TTL of ``entry``: :py:obj:`ttl <ResultCache.ttl>` or
+        :py:obj:`UNRESPONSIVE_TTL <ResultCache.UNRESPONSIVE_TTL>` if an engine
+        of the entry is unresponsive."""
+        if entry["unresponsive"]:
+            return min(self.ttl, self.UNRESPONSIVE_TTL)
+        return self.ttl
+
+    def set(self, search_query: "SearchQuery", entry: dict[str, t.Any]):
+        """Stores ``entry`` for ``search_query`` for the next :py:obj:`entry_ttl
+        <ResultCache.entry_ttl>` seconds."""
+        key = self.key(search_query)
+        data = pickle.dumps(entry)
+        ttl = self.entry_ttl(entry)
+        valkey_client = valkeydb.client() if self.storage == "valkey" else None
+        if valkey_client is not None:
+            valkey_client.set(self.VALKEY_PREFIX + key, data, ex=ttl)
+            return
+        with self._lock:
+            self._items[key] = (time.time() + ttl, data)
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def replay(self, search_query: "SearchQuery", result_container: "ResultContainer") -> bool:
+        """Extends ``result_container`` by the cached results of
+        ``search_query``.  Returns ``False`` if there is no entry in the
+        cache."""
+        entry = self.get(search_query)
+        if entry is None:
+            return False
+        for engine_name, data in entry["batches"]:
+            result_container.extend(engine_name, pickle.loads(data))
+        for engine_name, error_type, suspended in entry["unresponsive"]:
+            result_container.add_unresponsive_engine(engine_name, error_type, suspended)
+        logger.debug("cache hit: %s", search_query)
+        return True
+
+    def add_late(self, search_query: "SearchQuery", engine_name: str | None, results: "list[Result | LegacyResult]"):
+        """Adds the results of an engine that arrived after the search has
+        been rendered (:ref:`soft deadline <settings search soft_deadline>`) to
+        the cached entry of ``search_query``, the engine is no longer reported
+        as unresponsive by the cached entry (once all engines have answered,
+        the entry is kept for the full :py:obj:`ttl <ResultCache.ttl>`).
+
+        Late results that arrive before the search has been :py:obj:`stored
+        <ResultCache.store>` are buffered and added to the entry by
+        :py:obj:`ResultCache.store`."""
+        data = pickle.dumps(list(results))
+        with self._late_lock:
+            entry = self.get(search_query)
+            if entry is None:
+                key = self.key(search_query)
+                expire, batches = self._late_batches.get(key, (time.time() + self.ttl, []))
+                batches.append((engine_name, data))
+                self._late_batches[key] = (expire, batches)
+                self._late_batches.move_to_end(key)
+                while len(self._late_batches) > self.size:
+                    self._late_batches.popitem(last=False)
+                return
+            self._add_batches(entry, [(engine_name, data)])
+            self.set(search_query, entry)
+
+    @staticmethod
+    def _add_batches(entry: dict[str, t.Any], batches: list[tuple[str | None, bytes]]):
+        for engine_name, data in batches:
+            entry["batches"].append((engine_name, data))
+            entry["unresponsive"] = [e for e in entry["unresponsive"] if e[0] != engine_name]
+
+    def store(self, search_query: "SearchQuery", result_container: "ResultContainer", recorder: ResultRecorder):
+        """Stores the results recorded by ``recorder`` for ``search_query``.
+        Nothing is stored when not a single engine has answered, an entry with
+        unresponsive engines expires after :py:obj:`UNRESPONSIVE_TTL
+        <ResultCache.UNRESPONSIVE_TTL>` seconds.  The late results buffered by
+        :py:obj:`ResultCache.add_late` are added to the entry."""
+        entry = {
+            "batches": list(recorder.batches),
+            "unresponsive": [tuple(e) for e in result_container.unresponsive_engines],
+        }
+        with self._late_lock:
+            expire, batches = self._late_batches.pop(self.key(search_query), (0.0, []))
+            if expire > time.time():
+                self._add_batches(entry, batches)
+            if not entry["batches"]:
+                return
+            self.set(search_query, entry)
+
+
+def initialize() -> ResultCache | None:
+    """Initialize the global :py:obj:`CACHE` from the :ref:`settings search
+    result_cache`."""
+    global CACHE  # pylint: disable=global-statement
+
+    cfg = settings['search']['result_cache']
+    CACHE = None
+    if cfg['enabled']:
+        if cfg['storage'] == 'valkey' and valkeydb.client() is None:
+            logger.warning("result cache: no Valkey DB configured, fall back to storage in memory")
+        CACHE = ResultCache(ttl=cfg['ttl'], size=cfg['size'], storage=cfg['storage'])
+    return CACHE
@@ -0,0 +1,204 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Coalescing of identical engine requests in flight (:ref:`settings search
+singleflight`).
+
+:py:obj:`SingleFlight`:
+  Calls a function only once for concurrent callers with the same key, the
+  callers that have been coalesced share the result of the first caller.
+
+When the same query hits several threads or workers at once, only one of them
+sends the request to the engine and parses the response, the others wait for
+the results.  In a process the flights are coordinated by a lock, between
+processes (``storage: valkey``) by a lock in the Valkey DB.  With the
+``asyncio`` :ref:`executor <settings search executor>` the HTTP requests are
+coalesced in the event loop of the process (:py:obj:`SingleFlight.call_async`),
+the ``valkey`` storage is not used.
+
+----
+"""
+
+__all__ = ["SingleFlight", "FLIGHTS", "initialize"]
+
+import typing as t
+
+import asyncio
+import pickle
+import threading
+import time
+import uuid
+
+from searx import logger
+from searx import settings
+from searx import valkeydb
+from searx.valkeylib import secret_hash
+
+logger = logger.getChild('search.singleflight')
+
+T = t.TypeVar("T")
+
+FLIGHTS: "SingleFlight | None" = None
+"""Global :py:obj:`SingleFlight`, ``None`` if coalescing is not enabled."""
+
+
+class Flight:  # pylint: disable=too-few-public-methods
+    """A call in flight, the followers wait for the :py:obj:`done` event."""
+
+    __slots__ = ("done", "followers", "data", "error")
+
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+        self.followers: int = 0
+        self.data: bytes | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:  # pylint: disable=too-few-public-methods
+    """Coalesces concurrent calls with the same key.
+
+    The value of the first caller (the leader) is serialized once and each
+    follower gets its own copy of the value; the value can be modified by the
+    callers (e.g. results are modified when they are merged into the result
+    container).  An exception raised by the leader is raised in the followers.
+    If the value cannot be serialized, the followers call the function
+    themselves.
+    """
+
+    VALKEY_PREFIX: str = "SearXNG_singleflight_"
+
+    POLL_INTERVAL: float = 0.05
+    """Interval (sec.) in which a follower in another process polls the Valkey
+    DB for the value of the leader."""
+
+    VALUE_TTL: int = 5
+    """Time (sec.) the value of the leader is kept in the Valkey DB for the
+    followers in other processes."""
+
+    def __init__(self, storage: t.Literal["memory", "valkey"] = "memory"):
+        self.storage: t.Literal["memory", "valkey"] = storage
+        self._flights: dict[str, Flight] = {}
+        self._lock: threading.Lock = threading.Lock()
+        self._async_flights: dict[str, asyncio.Future[t.Any]] = {}
+
+    def call(self, key: str, func: t.Callable[[], T], timeout: float) -> tuple[T, bool]:
+        """Calls ``func`` or waits (max. ``timeout`` sec.) for the value of a
+        call with the same ``key`` in flight.  Returns a tuple of the value and
+        a flag that is ``True`` if the call has been coalesced.
+
+        A follower that has not received a value after ``timeout`` seconds
+        raises a :py:obj:`TimeoutError`.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = Flight()
+            else:
+                flight.followers += 1
+
+        if not leader:
+            if not flight.done.wait(timeout):
+                raise TimeoutError(f"singleflight: no value after {timeout:.2f} sec")
+            if flight.error is not None:
+                raise flight.error
+            if flight.data is not None:
+                return pickle.loads(flight.data), True
+            return func(), False
+
+        try:
+            value, coalesced = self._do_valkey(key, func, timeout)
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            if flight.followers and flight.error is None:
+                try:
+                    flight.data = pickle.dumps(value)  # pyright: ignore[reportPossiblyUnboundVariable]
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logger.debug("can't share value of flight: %s", exc)
+            flight.done.set()
+        return value, coalesced
+
+    async def call_async(
+        self,
+        key: str,
+        func: t.Callable[[], t.Awaitable[T]],
+        copy: t.Callable[[T], T],
+        timeout: float,
+    ) -> tuple[T, bool]:
+        """Coroutine of :py:obj:`call`, the flights are coordinated in the
+        event loop of the process (the ``valkey`` storage is not used).  A
+        follower gets a ``copy`` of the value of the leader; if the leader has
+        been canceled, the follower awaits ``func`` itself.
+        """
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            try:
+                value = await asyncio.wait_for(asyncio.shield(flight), timeout)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                return await func(), False
+            return copy(value), True
+
+        flight = self._async_flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await func()
+        except Exception as exc:
+            flight.set_exception(exc)
+            # the exception is retrieved, no warning if there is no follower
+            flight.exception()
+            raise
+        except BaseException:
+            flight.cancel()
+            raise
+        finally:
+            del self._async_flights[key]
+        flight.set_result(value)
+        return value, False
+
+    def _do_valkey(self, key: str, func: t.Callable[[], T], timeout: float) -> tuple[T, bool]:
+        valkey_client = valkeydb.client() if self.storage == "valkey" else None
+        if valkey_client is None:
+            return func(), False
+
+        v_key = self.VALKEY_PREFIX + secret_hash(key)
+        lock_time = max(int(timeout * 1000), 1)
+        if valkey_client.set(v_key + "_lock", uuid.uuid4().hex, nx=True, px=lock_time):
+            try:
+                value = func()
+                try:
+                    valkey_client.set(v_key + "_value", pickle.dumps(value), ex=self.VALUE_TTL)
+                except Exception as exc:  # pylint: disable=broad-exception-caught
+                    logger.debug("can't share value of flight: %s", exc)
+                return value, False
+            finally:
+                valkey_client.delete(v_key + "_lock")
+
+        # another process is the leader
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            data = valkey_client.get(v_key + "_value")
+            if data is not None:
+                return pickle.loads(data), True  # type: ignore
+            if not valkey_client.exists(v_key + "_lock"):
+                break
+            time.sleep(self.POLL_INTERVAL)
+        return func(), False
+
+
+def initialize() -> SingleFlight | None:
+    """Initialize the global :py:obj:`FLIGHTS` from the :ref:`settings search
+    singleflight`."""
+    global FLIGHTS  # pylint: disable=global-statement
+
+    cfg = settings['search']['singleflight']
+    FLIGHTS = None
+    if cfg['enabled']:
+        if cfg['storage'] == 'valkey' and valkeydb.client() is None:
+            logger.warning("singleflight: no Valkey DB configured, requests are coalesced per process")
+        if cfg['storage'] == 'valkey' and settings['search']['executor'] == 'asyncio':
+            logger.warning("singleflight: the asyncio executor coalesces the requests per process")
+        FLIGHTS = SingleFlight(storage=cfg['storage'])
+    return FLIGHTS
@@ -0,0 +1,239 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Pre-warming of the connections to the engines (:ref:`settings outgoing
+warmup`).
+
+:py:obj:`Warmup`:
+  Opens and keeps alive the connections to the hosts of the enabled engines.
+
+The first request of an engine to a host opens a new connection: DNS lookup,
+TCP and TLS handshakes (a *cold* connection).  The connections are kept in the
+pool of the engine's network for ``keepalive_expiry`` seconds, a request on a
+connection that is already open (a *warm* connection) only costs a round trip.
+The warm-up sends a ``HEAD`` request to each host (origin) of an engine at
+startup.  Afterwards only the hosts an engine has sent a request to in the last
+``interval`` seconds (the warm-up requests do not count) are kept warm: the
+connection is refreshed shortly before it expires (the ``keepalive_expiry`` of
+the network of the engine), a connection that could not be opened (or has
+expired) is tried again after ``interval`` seconds.  An idle instance does not
+send warm-up requests.
+
+The requests are sent by the network of the engine (proxies, Tor, source IPs
+and the shared pools apply), the engines that are suspended (e.g. by a CAPTCHA
+or a *too many requests* response) are not warmed up.  Which connections have
+been warm or cold in a search is reported per engine in the ``Server-Timing``
+header of the response (``conn_<n>_<engine>;desc="warm"``).
+
+----
+"""
+
+__all__ = ["Warmup", "WARMUP", "initialize"]
+
+import typing as t
+
+import asyncio
+import time
+
+import httpx
+
+from searx import logger
+from searx import settings
+from searx.network import get_network
+from searx.network.client import get_loop
+from searx.network.network import get_origin
+from searx.search.processors import PROCESSORS
+from searx.search.processors.online import OnlineProcessor
+from searx.utils import gen_useragent
+
+if t.TYPE_CHECKING:
+    import concurrent.futures
+    from searx.network.network import Network
+
+logger = logger.getChild('search.warmup')
+
+WARMUP: "Warmup | None" = None
+"""Global :py:obj:`Warmup`, ``None`` if the warm-up is not enabled."""
+
+
+def engine_origins(engine: t.Any) -> set[str]:
+    """Returns the origins of the URLs of an engine (the attributes of the
+    engine with a name ending in ``url``), URLs with a placeholder in the host
+    are ignored."""
+    origins: set[str] = set()
+    for name, value in vars(engine).items():
+        if not name.endswith('url'):
+            continue
+        urls = [value] if isinstance(value, str) else value
+        if not isinstance(urls, (list, tuple)):
+            continue
+        for url in urls:
+            if not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+                continue
+            try:
+                origin = get_origin(url)
+            except (httpx.InvalidURL, UnicodeError):
+                continue
+            if '{' not in origin and '%' not in origin:
+                origins.add(origin)
+    return origins
+
+
+class Warmup:
+    """Keeps the connections of the enabled online engines warm: the connection
+    to an origin that has been used in the last ``interval`` seconds is
+    refreshed :py:obj:`margin` seconds before it expires (see
+    :py:obj:`is_due`).  ``concurrency`` is the maximum number of warm-up
+    requests in flight."""
+
+    margin: float = 1.0
+    """Seconds before the expiry of a connection in which the connection is
+    refreshed (max. half of the ``keepalive_expiry``)."""
+
+    min_sleep: float = 0.5
+    """Min. seconds between two rounds of the warm-up."""
+
+    def __init__(self, interval: float, concurrency: int = 8):
+        self.interval: float = interval
+        self.concurrency: int = concurrency
+        self.future: "concurrent.futures.Future[None] | None" = None
+        self.last_try: dict[tuple[int, str], float] = {}
+        """Time of the last warm-up request of a (network, origin) pair."""
+        self.last_warm: dict[tuple[int, str], float] = {}
+        """Time of the last successful warm-up request of a (network, origin)
+        pair (the warm-up requests do not update ``Network.last_use``)."""
+
+    def targets(self) -> dict[tuple[int, str], tuple[str, "Network"]]:
+        """Returns the (network, origin) pairs to warm up with the name of the
+        engine.  The origins are the URLs of the engine and the hosts to which
+        the network has already sent requests."""
+        targets: dict[tuple[int, str], tuple[str, "Network"]] = {}
+        for name, processor in PROCESSORS.items():
+            engine = processor.engine
+            if not isinstance(processor, OnlineProcessor) or getattr(engine, 'disabled', False):
+                continue
+            if processor.suspended_status.is_suspended:
+                continue
+            network = get_network(name)
+            if network is None:
+                continue
+            for origin in engine_origins(engine) | set(network.last_use):
+                targets.setdefault((id(network), origin), (name, network))
+        return targets
+
+    def is_active(self, network: "Network", origin: str, now: float) -> bool:
+        """``True`` if the network has sent a request (not a warm-up request)
+        to ``origin`` in the last ``interval`` seconds."""
+        last_use = network.last_use.get(origin)
+        return last_use is not None and now - last_use <= self.interval
+
+    def refresh_time(self, key: tuple[int, str], network: "Network") -> tuple[float, float] | None:
+        """Returns the time when the connection to the origin has to be
+        refreshed and the time when it expires, ``None`` if the network has not
+        yet sent a request to the origin."""
+        last_use = max(network.last_use.get(key[1], float('-inf')), self.last_warm.get(key, float('-inf')))
+        if last_use == float('-inf'):
+            return None
+        keepalive_expiry = network.keepalive_expiry or 5.0
+        expire = last_use + keepalive_expiry
+        return expire - min(self.margin, keepalive_expiry / 2), expire
+
+    def is_due(self, key: tuple[int, str], network: "Network", now: float) -> bool:
+        """``True`` if a warm-up request has to be sent to the origin now:
+
+        - the origin has not yet been warmed up (startup),
+        - the origin is active (:py:obj:`is_active`) and its connection expires
+          in the next :py:obj:`margin` seconds,
+        - the origin is active, its connection is cold and the last warm-up
+          request has been sent more than ``interval`` seconds ago.
+        """
+        last_try = self.last_try.get(key)
+        if last_try is None:
+            return True
+        if not self.is_active(network, key[1], now):
+            return False
+        times = self.refresh_time(key, network)
+        if times is not None and now < times[1]:
+            return now >= times[0]
+        return now - last_try >= self.interval
+
+    def next_round(self, now: float) -> float:
+        """Seconds until the next connection has to be refreshed, max.
+        ``interval`` and min. :py:obj:`min_sleep` seconds."""
+        next_time = now + self.interval
+        for key, (_, network) in self.targets().items():
+            if not self.is_active(network, key[1], now):
+                continue
+            times = self.refresh_time(key, network)
+            if times is not None and now < times[0]:
+                next_time = min(next_time, times[0])
+        return max(next_time - now, self.min_sleep)
+
+    async def warm_up(self) -> int:
+        """Sends a ``HEAD`` request to each origin that is due (see
+        :py:obj:`is_due`), returns the number of requests sent."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        timeout = settings['outgoing']['request_timeout']
+        now = time.monotonic()
+
+        async def warm_up_origin(key: tuple[int, str], name: str, network: "Network"):
+            origin = key[1]
+            async with semaphore:
+                try:
+                    await network.request(
+                        'HEAD',
+                        origin + '/',
+                        headers={'User-Agent': gen_useragent()},
+                        timeout=timeout,
+                        raise_for_httperror=False,
+                        record_use=False,
+                    )
+                    self.last_warm[key] = time.monotonic()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    logger.debug('%s: warm-up of %s failed: %s', name, origin, e)
+
+        targets = self.targets()
+        self.last_try = {key: last_try for key, last_try in self.last_try.items() if key in targets}
+        self.last_warm = {key: last_warm for key, last_warm in self.last_warm.items() if key in targets}
+        requests = []
+        for key, (name, network) in targets.items():
+            if self.is_due(key, network, now):
+                self.last_try[key] = now
+                requests.append(warm_up_origin(key, name, network))
+        await asyncio.gather(*requests, return_exceptions=True)
+        return len(requests)
+
+    async def run(self):
+        while True:
+            try:
+                count = await self.warm_up()
+                logger.debug('%s connections warmed up', count)
+                sleep = self.next_round(time.monotonic())
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception('warm-up failed')
+                sleep = self.interval
+            await asyncio.sleep(sleep)
+
+    def start(self):
+        """Runs the warm-up in the loop of the network."""
+        if self.future is None:
+            self.future = asyncio.run_coroutine_threadsafe(self.run(), get_loop())
+
+    def stop(self):
+        if self.future is not None:
+            self.future.cancel()
+            self.future = None
+
+
+def initialize() -> Warmup | None:
+    """Initialize and start the global :py:obj:`WARMUP` from the
+    :ref:`settings outgoing warmup`."""
+    global WARMUP  # pylint: disable=global-statement
+
+    if WARMUP is not None:
+        WARMUP.stop()
+    WARMUP = None
+
+    cfg = settings['outgoing']['warmup']
+    if cfg['enabled']:
+        WARMUP = Warmup(cfg['interval'])
+        WARMUP.start()
+    return WARMUP
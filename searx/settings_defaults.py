@@ -19,7 +19,7 @@ from .sxng_locales import sxng_locales
 searx_dir = abspath(dirname(__file__))
 
 logger = logging.getLogger('searx')
-OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss']
+OUTPUT_FORMATS = ['html', 'csv', 'json', 'rss', 'ndjson', 'sse']
 SXNG_LOCALE_TAGS = ['all', 'auto'] + list(l[0] for l in sxng_locales)
 SIMPLE_STYLE = ('auto', 'light', 'dark', 'black')
 CATEGORIES_AS_TABS: dict[str, dict[str, t.Any]] = {
@@ -191,6 +191,13 @@ SCHEMA: dict[str, t.Any] = {
         'safe_search': SettingsValue((0, 1, 2), 0),
         'autocomplete': SettingsValue(str, ''),
         'autocomplete_min': SettingsValue(int, 4),
+        'autocomplete_cache': {
+            'enabled': SettingsValue(bool, False),
+            'ttl': SettingsValue(int, 600),
+            'size': SettingsValue(int, 4096),
+            'storage': SettingsValue(('memory', 'valkey'), 'memory'),
+        },
+        'autocomplete_race': SettingsValue(str, ''),
         'favicon_resolver': SettingsValue(str, ''),
         'default_lang': SettingsValue(tuple(SXNG_LOCALE_TAGS + ['']), ''),
         'languages': SettingSublistValue(SXNG_LOCALE_TAGS, SXNG_LOCALE_TAGS),  # type: ignore
@@ -206,6 +213,28 @@ SCHEMA: dict[str, t.Any] = {
         },
         'formats': SettingsValue(list, OUTPUT_FORMATS),
         'max_page': SettingsValue(int, 0),
+        'executor': SettingsValue(('threads', 'asyncio'), 'threads'),
+        'executor_workers': SettingsValue(int, 16),
+        'result_cache': {
+            'enabled': SettingsValue(bool, False),
+            'ttl': SettingsValue(int, 60),
+            'size': SettingsValue(int, 512),
+            'storage': SettingsValue(('memory', 'valkey'), 'memory'),
+        },
+        'soft_deadline': {
+            'enabled': SettingsValue(bool, False),
+            'timeout': SettingsValue(numbers.Real, 1.5),
+            'ratio': SettingsValue(numbers.Real, 0.8),
+            'cache_late_results': SettingsValue(bool, True),
+        },
+        'singleflight': {
+            'enabled': SettingsValue(bool, False),
+            'storage': SettingsValue(('memory', 'valkey'), 'memory'),
+        },
+        'parse_executor': {
+            'workers': SettingsValue(int, 0),
+        },
+        'lazy_engines': SettingsValue(bool, False),
     },
     'server': {
         'port': SettingsValue((int, str), 8888, 'SEARXNG_PORT'),
@@ -255,6 +284,18 @@ SCHEMA: dict[str, t.Any] = {
         'pool_connections': SettingsValue(int, 100),
         'pool_maxsize': SettingsValue(int, 10),
         'keepalive_expiry': SettingsValue(numbers.Real, 5.0),
+        'shared_pools': SettingsValue(bool, False),
+        'dns_cache': {
+            'enabled': SettingsValue(bool, False),
+            'min_ttl': SettingsValue(numbers.Real, 30),
+            'max_ttl': SettingsValue(numbers.Real, 600),
+            'size': SettingsValue(int, 1024),
+            'nameservers': SettingsValue(list, []),
+        },
+        'warmup': {
+            'enabled': SettingsValue(bool, False),
+            'interval': SettingsValue(numbers.Real, 60),
+        },
         # default maximum redirect
         # from https://github.com/psf/requests/blob/8c211a96cdbe9fe320d63d9e1ae15c5c07e179f8/requests/models.py#L55
         'max_redirects': SettingsValue(int, 30),
@@ -7,6 +7,10 @@
 :py:obj:`SQLiteProperties`:
   Class to manage properties stored in a database.
 
+:py:obj:`MaintenanceScheduler`:
+  Runs the maintenance of the :py:obj:`SQLiteAppl` applications in a
+  background thread (:py:obj:`SCHEDULER`).
+
 Examplarical implementations based on :py:obj:`SQLiteAppl`:
 
 :py:obj:`searx.cache.ExpireCacheSQLite` :
@@ -22,12 +26,17 @@ Examplarical implementations based on :py:obj:`SQLiteAppl`:
 
 import typing as t
 import abc
+import dataclasses
 import datetime
+import json
+import os
 import re
 import sqlite3
 import sys
 import threading
+import time
 import uuid
+import weakref
 
 from searx import logger
 
@@ -344,6 +353,46 @@ class SQLiteAppl(abc.ABC):
 
         return True
 
+    def maintenance(self, force: bool = False) -> t.Any:
+        """Performs the maintenance of the DB application (e.g. drop expired
+        rows, vacuuming the WALs).  The default implementation does nothing,
+        subclasses implement their maintenance jobs here.
+
+        ``force``:
+          Maintenance should be carried out even if the maintenance interval
+          has not yet been reached.
+
+        Implementations should :py:obj:`record their statistics
+        <SQLiteAppl.record_maintenance>`.
+        """
+
+    def schedule_maintenance(self):
+        """Hands the :py:obj:`maintenance <SQLiteAppl.maintenance>` of this DB
+        application over to the :py:obj:`SCHEDULER`.  The maintenance is never
+        carried out in the thread of the caller, it is cheap to call this method
+        on the request path (e.g. each time a value is read from a cache)."""
+        SCHEDULER.register(self)
+
+    def record_maintenance(self, start_time: float, rows_removed: int):
+        """Stores the :py:obj:`MaintenanceStats` of a maintenance run that was
+        started at ``start_time`` in the property ``MAINTENANCE_STATS``."""
+        stats = MaintenanceStats(
+            last_run=int(start_time),
+            duration=time.time() - start_time,
+            rows_removed=rows_removed,
+            leader=SCHEDULER.token,
+        )
+        self.properties.set("MAINTENANCE_STATS", json.dumps(dataclasses.asdict(stats)))
+        logger.debug("%s(%s) maintenance: %s", self.__class__.__name__, self.db_url, stats)
+
+    def maintenance_stats(self) -> "MaintenanceStats":
+        """Returns the :py:obj:`MaintenanceStats` of the last maintenance run
+        (no matter which process did the maintenance)."""
+        value = self.properties("MAINTENANCE_STATS")
+        if not value:
+            return MaintenanceStats()
+        return MaintenanceStats(**json.loads(value))
+
     def create_schema(self, conn: sqlite3.Connection):
 
         logger.debug("create schema ..")
@@ -387,6 +436,12 @@ CREATE TABLE IF NOT EXISTS properties (
         "    ON CONFLICT(name) DO UPDATE"
         "   SET value=excluded.value, m_time=strftime('%s', 'now')"
     )
+    SQL_CLAIM: str = (
+        "INSERT INTO properties (name, value) VALUES (?, ?)"
+        "    ON CONFLICT(name) DO UPDATE"
+        "   SET value=excluded.value, m_time=strftime('%s', 'now')"
+        " WHERE value = excluded.value OR m_time < strftime('%s', 'now') - ?"
+    )
     SQL_DELETE: str = "DELETE FROM properties WHERE name = ?"
     SQL_TABLE_EXISTS: str = (
         "SELECT name FROM sqlite_master"
@@ -429,6 +484,17 @@ CREATE TABLE IF NOT EXISTS properties (
         with self.DB:
             self.DB.execute(self.SQL_SET, (name, value))
 
+    def claim(self, name: str, value: str, lease_time: int) -> bool:
+        """Atomically set ``value`` of property ``name`` if the property does
+        not exist, already has this ``value`` or has not been modified for
+        ``lease_time`` seconds.  Returns ``True`` if the property has been set
+        (the lease has been claimed or renewed).  Can be used as a lease shared
+        by all processes that use the DB."""
+
+        with self.DB:
+            cur = self.DB.execute(self.SQL_CLAIM, (name, value, lease_time))
+        return cur.rowcount == 1
+
     def delete(self, name: str) -> int:
         """Delete of property ``name`` from DB."""
         with self.DB:
@@ -466,3 +532,100 @@ CREATE TABLE IF NOT EXISTS properties (
             m_time = datetime.datetime.fromtimestamp(m_time).strftime("%Y-%m-%d %H:%M:%S")
             lines.append(f"[last modified: {m_time}] {name:20s}: {value}")
         return "\n".join(lines)
+
+
+@dataclasses.dataclass
+class MaintenanceStats:
+    """Dataclass with the statistics of the last maintenance run of a
+    :py:obj:`SQLiteAppl`, see :py:obj:`SQLiteAppl.maintenance_stats`."""
+
+    last_run: int = 0
+    """Start (unix epoch) time of the last maintenance, ``0`` if the
+    maintenance has not yet been carried out."""
+
+    duration: float = 0.0
+    """Duration (sec.) of the last maintenance."""
+
+    rows_removed: int = 0
+    """Number of rows removed from the DB in the last maintenance."""
+
+    leader: str = ""
+    """Token (``<pid>:<id>``) of the scheduler that carried out the last
+    maintenance."""
+
+    def report(self) -> str:
+        if not self.last_run:
+            return "last maintenance: --"
+        last_run = datetime.datetime.fromtimestamp(self.last_run).strftime("%Y-%m-%d %H:%M:%S")
+        return (
+            f"last maintenance: {last_run} (duration: {self.duration:.3f} sec)"
+            f" // rows removed: {self.rows_removed} // leader: {self.leader}"
+        )
+
+
+class MaintenanceScheduler:
+    """Runs the :py:obj:`maintenance <SQLiteAppl.maintenance>` of the DB
+    applications in a daemon thread, off the request path.  A DB application
+    registers itself by calling :py:obj:`SQLiteAppl.schedule_maintenance`.
+
+    Every :py:obj:`INTERVAL` seconds the thread claims (or renews) the
+    ``MAINTENANCE_LEADER`` :py:obj:`lease <SQLiteProperties.claim>` of each
+    registered DB.  Only the leader calls the maintenance of the DB application,
+    the maintenance itself decides if the maintenance period has been reached.
+    In a multi process environment (e.g. uWSGI or granian workers) there is
+    one scheduler per process, but only one of them is the leader of a DB.  If
+    the leader dies, its lease runs out after :py:obj:`LEASE_TIME` seconds and
+    another process takes over.
+
+    The scheduler is fork-safe: if the process has been forked after the thread
+    was started, the thread is restarted in the child process by the next
+    registration.
+    """
+
+    INTERVAL: int = 60
+    """Time (sec.) between two runs of the scheduler."""
+
+    LEASE_TIME: int = 3 * INTERVAL
+    """Time (sec.) after which the lease of a leader who does not renew its
+    lease expires."""
+
+    def __init__(self):
+        self.token: str = ""
+        self._pid: int = 0
+        self._apps: weakref.WeakSet[SQLiteAppl] = weakref.WeakSet()
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def register(self, app: SQLiteAppl):
+        """Registers ``app`` and starts the thread of the scheduler if not
+        already done (in this process)."""
+        if self._pid == os.getpid() and app in self._apps:
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # new process (or forked process): start a new thread
+                self._pid = os.getpid()
+                self.token = f"{self._pid}:{uuid.uuid4().hex[:8]}"
+                self._thread = threading.Thread(target=self._run, name="sqlitedb_maintenance", daemon=True)
+                self._thread.start()
+            self._apps.add(app)
+
+    def _run(self):
+        while True:
+            time.sleep(self.INTERVAL)
+            self.run_pending()
+
+    def run_pending(self):
+        """Calls the maintenance of those DB applications whose leader is this
+        scheduler."""
+        for app in list(self._apps):
+            try:
+                if not app.properties.claim("MAINTENANCE_LEADER", self.token, self.LEASE_TIME):
+                    continue
+                app.maintenance()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                logger.error("%s(%s) maintenance failed: %s", app.__class__.__name__, app.db_url, exc, exc_info=exc)
+
+
+SCHEDULER = MaintenanceScheduler()
+"""Global :py:obj:`MaintenanceScheduler` of the process."""
@@ -7,6 +7,8 @@ import json
 import os
 import sys
 import base64
+import queue
+import threading
 
 from timeit import default_timer
 from html import escape
@@ -36,6 +38,8 @@ from flask import (
     make_response,
     redirect,
     send_from_directory,
+    stream_with_context,
+    copy_current_request_context,
 )
 from flask.wrappers import Response
 from flask.json import jsonify
@@ -91,6 +95,7 @@ from searx.query import RawTextQuery
 from searx.plugins.oa_doi_rewrite import get_doi_resolver
 from searx.preferences import (
     Preferences,
+    PreferencesCache,
     ClientPref,
     ValidationException,
 )
@@ -111,7 +116,11 @@ from searx.locales import (
 )
 
 # renaming names from searx imports ...
-from searx.autocomplete import search_autocomplete, backends as autocomplete_backends
+from searx.autocomplete import (
+    search_autocomplete,
+    backends as autocomplete_backends,
+    initialize as autocomplete_initialize,
+)
 from searx import favicons
 
 from searx.valkeydb import initialize as valkey_initialize
@@ -134,6 +143,18 @@ templates_path = settings['ui']['templates_path']
 themes = get_themes(templates_path)
 result_templates = get_result_templates(templates_path)
 
+PREFERENCES_CACHE = PreferencesCache(
+    lambda: Preferences(themes, list(categories.keys()), engines, searx.plugins.STORAGE)
+)
+"""Preferences parsed from the cookies of the requests (the template is built
+on first use, the engines and plugins are loaded in :py:obj:`init`)."""
+
+LIGHT_ENDPOINTS = {'autocompleter', 'favicon_proxy'}
+"""Endpoints that only read a few preferences, a request of these endpoints
+uses the cached preferences of its cookies without a copy (see
+:py:obj:`get_light_preferences`).  The static files are served by WhiteNoise,
+they do not pass :py:obj:`pre_request`."""
+
 STATS_SORT_PARAMETERS = {
     'name': (False, 'name', ''),
     'score': (True, 'score_per_result', 0),
@@ -456,6 +477,25 @@ def render(template_name: str, **kwargs):
     return result
 
 
+def get_light_preferences(encoded_data: str) -> Preferences | None:
+    """Returns the (read-only) cached preferences of the cookies for a request
+    of the :py:obj:`LIGHT_ENDPOINTS`, the preferences are not copied and not
+    completed by the form, the headers of the browser (the UI locale) and the
+    client (``preferences.client``).  Returns ``None`` if the request needs the
+    full preferences: the request has preferences in its form, the cookies are
+    invalid or the search language is taken from the browser."""
+    if sxng_request.endpoint not in LIGHT_ENDPOINTS or encoded_data:
+        return None
+    # pylint: disable=redefined-outer-name
+    preferences, error = PREFERENCES_CACHE.get(sxng_request.cookies, readonly=True)
+    if error is not None or not preferences.get_value("language"):
+        return None
+    form_names = set(preferences.key_value_settings) | {'disabled_engines', 'disabled_plugins', 'tokens'}
+    if not form_names.isdisjoint(sxng_request.form):
+        return None
+    return preferences
+
+
 @app.before_request
 def pre_request():
     sxng_request.start_time = default_timer()  # pylint: disable=assigning-non-slot
@@ -463,22 +503,6 @@ def pre_request():
     sxng_request.timings = []  # pylint: disable=assigning-non-slot
     sxng_request.errors = []  # pylint: disable=assigning-non-slot
 
-    client_pref = ClientPref.from_http_request(sxng_request)
-    # pylint: disable=redefined-outer-name
-    preferences = Preferences(themes, list(categories.keys()), engines, searx.plugins.STORAGE, client_pref)
-
-    user_agent = sxng_request.headers.get('User-Agent', '').lower()
-    if 'webkit' in user_agent and 'android' in user_agent:
-        preferences.key_value_settings['method'].value = 'GET'
-    sxng_request.preferences = preferences  # pylint: disable=assigning-non-slot
-
-    try:
-        preferences.parse_dict(sxng_request.cookies)
-
-    except Exception as e:  # pylint: disable=broad-except
-        logger.exception(e, exc_info=True)
-        sxng_request.errors.append(gettext('Invalid settings, please edit your preferences'))
-
     # merge GET, POST vars
     # HINT request.form is of type werkzeug.datastructures.ImmutableMultiDict
     sxng_request.form = dict(sxng_request.form.items())  # type: ignore
@@ -486,9 +510,30 @@ def pre_request():
         if k not in sxng_request.form:
             sxng_request.form[k] = v
 
-    if sxng_request.form.get('preferences'):
-        preferences.parse_encoded_data(sxng_request.form['preferences'])
-    else:
+    encoded_data = sxng_request.form.get('preferences', '')
+    # pylint: disable=redefined-outer-name
+    preferences = get_light_preferences(encoded_data)
+    if preferences is not None:
+        sxng_request.preferences = preferences  # pylint: disable=assigning-non-slot
+        sxng_request.user_plugins = []  # pylint: disable=assigning-non-slot
+        return
+
+    preferences, error = PREFERENCES_CACHE.get(sxng_request.cookies, encoded_data)
+    preferences.client = ClientPref.from_http_request(sxng_request)
+    sxng_request.preferences = preferences  # pylint: disable=assigning-non-slot
+    if error is not None:
+        logger.exception(error, exc_info=error)
+        sxng_request.errors.append(gettext('Invalid settings, please edit your preferences'))
+
+    user_agent = sxng_request.headers.get('User-Agent', '').lower()
+    if 'webkit' in user_agent and 'android' in user_agent:
+        # default method of these clients is GET, unless the method is set by
+        # the cookies or the encoded preferences
+        method = preferences.key_value_settings['method']
+        if method.locked or not ('method' in sxng_request.cookies or encoded_data):
+            method.value = 'GET'
+
+    if not encoded_data:
         try:
             preferences.parse_dict(sxng_request.form)
         except Exception as e:  # pylint: disable=broad-except
@@ -545,7 +590,13 @@ def post_request(response: flask.Response):
             for i, t in enumerate(timings)
             if t.load
         ]
-        timings_all = timings_all + timings_total + timings_load
+        # a cold engine opened (at least) one new connection
+        timings_conn = [
+            'conn_' + str(i) + '_' + t.engine + ';desc="' + ('cold' if t.cold else 'warm') + '"'
+            for i, t in enumerate(timings)
+            if t.warm or t.cold
+        ]
+        timings_all = timings_all + timings_total + timings_load + timings_conn
     response.headers.add('Server-Timing', ', '.join(timings_all))
     return response
 
@@ -559,6 +610,10 @@ def index_error(output_format: str, error_message: str):
         response.headers.add('Content-Disposition', cont_disp)
         return response
 
+    if output_format in webutils.STREAM_FORMATS:
+        response = webutils.get_stream_event(output_format, 'error', {'error': error_message})
+        return Response(response, mimetype=webutils.STREAM_FORMATS[output_format])
+
     if output_format == 'rss':
         response_rss = render(
             'opensearch_response_rss.xml',
@@ -616,11 +671,57 @@ def rss_xsl():
     )
 
 
+def stream_search(search_obj: searx.search.SearchWithPlugins, output_format: str) -> Response:
+    """Streams the results of ``search_obj`` in one of the
+    :py:obj:`searx.webutils.STREAM_FORMATS`.
+
+    The search runs in a thread, the main results of each engine are sent as
+    ``results`` event as soon as they have been merged into the result
+    container.  The final ``summary`` event contains the ordered (scored)
+    results, the answers, infoboxes etc. (the same data as the ``json``
+    format).
+    """
+    events: queue.SimpleQueue[str | None] = queue.SimpleQueue()
+
+    def on_merged(engine_name: str | None, results: list[typing.Any]):
+        data = {'engine': engine_name, 'results': [_.as_dict() for _ in results]}
+        events.put(webutils.get_stream_event(output_format, 'results', data))
+
+    search_obj.result_container.on_merged = on_merged
+
+    @copy_current_request_context
+    def run_search():
+        try:
+            result_container = search_obj.search()
+            if result_container.redirect_url:
+                data = {'redirect_url': result_container.redirect_url}
+            else:
+                data = webutils.get_json_data(search_obj.search_query, result_container)
+            events.put(webutils.get_stream_event(output_format, 'summary', data))
+        except Exception as e:  # pylint: disable=broad-except
+            logger.exception(e, exc_info=True)
+            events.put(webutils.get_stream_event(output_format, 'error', {'error': gettext('search error')}))
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run_search, name='search_stream', daemon=True).start()
+
+    def generate():
+        while (event := events.get()) is not None:
+            yield event
+
+    response = Response(stream_with_context(generate()), mimetype=webutils.STREAM_FORMATS[output_format])
+    response.headers['Cache-Control'] = 'no-cache'
+    # don't buffer the stream in a reverse proxy (nginx)
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
 @app.route('/search', methods=['GET', 'POST'])
 def search():
     """Search query in q and return results.
 
-    Supported outputs: html, json, csv, rss.
+    Supported outputs: html, json, csv, rss, ndjson, sse.
     """
     # pylint: disable=too-many-locals, too-many-return-statements, too-many-branches
     # pylint: disable=too-many-statements
@@ -653,6 +754,8 @@ def search():
             sxng_request.preferences, sxng_request.form
         )
         search_obj = searx.search.SearchWithPlugins(search_query, sxng_request, sxng_request.user_plugins)
+        if output_format in webutils.STREAM_FORMATS:
+            return stream_search(search_obj, output_format)
         result_container = search_obj.search()
 
     except SearxParameterException as e:
@@ -750,6 +853,11 @@ def search():
     max_response_time = engine_timings[0].total if engine_timings else None
     engine_timings_pairs = [(timing.engine, timing.total) for timing in engine_timings]
 
+    # resolve the favicons of all results in one batch (not one by one while rendering)
+    favicons.favicon_urls(
+        result.parsed_url.netloc for result in results if getattr(result, 'parsed_url', None)  # type: ignore
+    )
+
     # search_query.lang contains the user choice (all, auto, en, ...)
     # when the user choice is "auto", search.search_query.lang contains the detected language
     # otherwise it is equals to search_query.lang
@@ -1352,10 +1460,12 @@ def init():
 
     locales_initialize()
     valkey_initialize()
+    autocomplete_initialize()
     searx.plugins.initialize(app)
 
     metrics: bool = get_setting("general.enable_metrics")  # type: ignore
     searx.search.initialize(check_network=True, enable_metrics=metrics)
+    PREFERENCES_CACHE.clear()
 
     limiter.initialize(app, settings)
     favicons.init()
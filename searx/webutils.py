@@ -11,7 +11,7 @@ import re
 import itertools
 import json
 from datetime import datetime, timedelta
-from typing import Iterable, List, Tuple, TYPE_CHECKING
+from typing import Any, Iterable, List, Tuple, TYPE_CHECKING
 
 from io import StringIO
 from codecs import getincrementalencoder
@@ -41,6 +41,7 @@ ssl_cert_error_text = gettext("SSL error: certificate validation has failed")
 exception_classname_to_text = {
     None: gettext('unexpected crash'),
     'timeout': timeout_text,
+    'soft_timeout': gettext('slow response'),
     'asyncio.TimeoutError': timeout_text,
     'httpx.TimeoutException': timeout_text,
     'httpx.ConnectTimeout': timeout_text,
@@ -159,9 +160,10 @@ class JSONEncoder(json.JSONEncoder):  # pylint: disable=missing-class-docstring
         return super().default(o)
 
 
-def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
-    """Returns the JSON string of the results to a query (``application/json``)"""
-    data = {
+def get_json_data(sq: "SearchQuery", rc: "ResultContainer") -> dict[str, Any]:
+    """Returns the data of the JSON response to a query (see
+    :py:obj:`get_json_response`)."""
+    return {
         'query': sq.query,
         'number_of_results': rc.number_of_results,
         'results': [_.as_dict() for _ in rc.get_ordered_results()],
@@ -171,10 +173,39 @@ def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
         'suggestions': list(rc.suggestions),
         'unresponsive_engines': get_translated_errors(rc.unresponsive_engines),
     }
-    response = json.dumps(data, cls=JSONEncoder)
+
+
+def get_json_response(sq: "SearchQuery", rc: "ResultContainer") -> str:
+    """Returns the JSON string of the results to a query (``application/json``)"""
+    response = json.dumps(get_json_data(sq, rc), cls=JSONEncoder)
     return response
 
 
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'sse': 'text/event-stream',
+}
+"""Streaming output formats of a search and their mime-types."""
+
+
+def get_stream_event(output_format: str, event: str, data: dict[str, Any]) -> str:
+    """Returns the ``event`` with ``data`` in the streaming ``output_format``:
+
+    ``ndjson``:
+      One JSON object per line, the name of the event is in the ``event`` field
+      of the object.
+
+    ``sse``:
+      A `server-sent event`_, the data of the event is a JSON object.
+
+    .. _server-sent event:
+       https://html.spec.whatwg.org/multipage/server-sent-events.html
+    """
+    if output_format == 'sse':
+        return f"event: {event}\ndata: {json.dumps(data, cls=JSONEncoder)}\n\n"
+    return json.dumps({'event': event, **data}, cls=JSONEncoder) + "\n"
+
+
 def get_themes(templates_path):
     """Returns available themes list."""
     return os.listdir(templates_path)
@@ -0,0 +1,22 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Micro-benchmarks of SearXNG's hot paths.  The benchmarks are not part of the
+unit tests, run a benchmark module directly, e.g.::
+
+    $ python -m tests.benchmark.tracker_patterns
+
+"""
+
+import timeit
+import typing as t
+
+
+def measure(func: t.Callable[[], t.Any], number: int = 1, repeat: int = 5) -> float:
+    """Returns the best time (in sec.) of ``repeat`` runs of ``number`` calls to
+    ``func``, divided by ``number``."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(title: str, before: float, after: float, unit: str = "µs", scale: float = 1e6):
+    """Prints one line of a benchmark with the times *before* and *after*."""
+    speedup = before / after if after else float("inf")
+    print(f"{title:40s} before: {before * scale:12.2f} {unit}   after: {after * scale:12.2f} {unit}   x{speedup:.1f}")
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of :py:obj:`searx.autocomplete.search_autocomplete` with a
+simulated backend (fixed latency, at most 10 suggestions).  A user types the
+queries letter by letter, *before* sends every keystroke to the backend,
+*after* uses the :py:obj:`AutocompleteCache
+<searx.autocomplete.AutocompleteCache>` (in memory).
+
+::
+
+    $ python -m tests.benchmark.autocomplete [LATENCY_MS]
+
+"""
+# pylint: disable=missing-function-docstring
+
+import random
+import sys
+import time
+
+from searx import autocomplete
+
+from . import measure, report
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 50) / 1000
+    rnd = random.Random(0)
+    words: list[str] = sorted(
+        {"".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=rnd.randint(4, 10))) for _ in range(50_000)}
+    )
+    keystrokes: list[str] = []
+    for word in words[:: len(words) // 20]:
+        keystrokes.extend(word[:i] for i in range(1, len(word) + 1))
+    backend_requests: list[str] = []
+
+    def backend(query: str, _sxng_locale: str) -> list[str]:
+        backend_requests.append(query)
+        time.sleep(latency)
+        return [w for w in words if w.startswith(query)][:10]
+
+    autocomplete.backends["bench"] = backend
+
+    def typing():
+        for query in keystrokes:
+            autocomplete.search_autocomplete("bench", query, "en")
+
+    autocomplete.CACHE = None
+    before = measure(typing, repeat=1) / len(keystrokes)
+    n_before = len(backend_requests)
+
+    def typing_cached():
+        autocomplete.CACHE = autocomplete.AutocompleteCache(ttl=600, size=4096)
+        backend_requests.clear()
+        typing()
+
+    after = measure(typing_cached, repeat=3) / len(keystrokes)
+    print(f"{len(keystrokes)} keystrokes, backend requests before: {n_before} after: {len(backend_requests)}")
+    report("keystroke, cold cache", before, after, unit="ms", scale=1e3)
+
+    after = measure(typing, repeat=3) / len(keystrokes)
+    report("keystroke, warm cache", before, after, unit="ms", scale=1e3)
+
+
+if __name__ == "__main__":
+    main()
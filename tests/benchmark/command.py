@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the :py:obj:`searx.engines.command` engine with a tool that
+has a startup time of 50ms, *before* starts the command for each search,
+*after* sends the queries to a co-process.
+
+::
+
+    $ python -m tests.benchmark.command
+
+"""
+# pylint: disable=missing-function-docstring
+
+import sys
+
+from searx import metrics
+from searx.engines import command as command_engine
+
+from . import measure, report
+
+STARTUP = "import time; time.sleep(0.05)\n"
+
+ONE_SHOT = (
+    STARTUP
+    + """
+import sys
+for i in range(int(sys.argv[1])):
+    print(f"line {i}")
+"""
+)
+
+COPROCESS = (
+    STARTUP
+    + """
+import sys
+for line in sys.stdin:
+    for i in range(int(line)):
+        print(f"line {i}")
+    print("", flush=True)
+"""
+)
+
+SETTINGS = {'name': 'command benchmark', 'delimiter': {'chars': ' ', 'keys': ['line']}}
+
+
+def main():
+    metrics.initialize([SETTINGS['name']])
+    engine = command_engine
+    engine.timeout = 5.0
+
+    engine.coprocess = False
+    engine.init({**SETTINGS, 'command': [sys.executable, '-c', ONE_SHOT, '{{QUERY}}']})
+    before_results = [r.kvmap for r in engine.search('100', {'pageno': 1})]
+    before = measure(lambda: engine.search('100', {'pageno': 1}), number=10)
+
+    engine.coprocess = True
+    engine.init({**SETTINGS, 'command': [sys.executable, '-c', COPROCESS]})
+    assert [r.kvmap for r in engine.search('100', {'pageno': 1})] == before_results
+    after = measure(lambda: engine.search('100', {'pageno': 1}), number=10)
+    engine._coprocess_pool.close()  # pylint: disable=protected-access
+
+    report("search (page 1 of 100 results)", before, after, unit="ms", scale=1e3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the host lookups of new connections, *before* the hosts are
+resolved by a (local) DNS server on each connection, *after* the hosts are
+resolved by the :py:obj:`DNSCache <searx.network.dns.DNSCache>`.  A local DNS
+server is the best case of a lookup without cache.
+
+::
+
+    $ python -m tests.benchmark.dns
+
+"""
+# pylint: disable=missing-function-docstring
+
+import asyncio
+
+from searx.network import dns
+from tests.unit.network.test_dns import StubResolver
+
+from . import measure, report
+
+HOSTS = [f"www.engine{i}.example.org" for i in range(50)]
+
+
+def main():
+    loop = asyncio.new_event_loop()
+    resolver = StubResolver({host: ['192.0.2.1', '2001:db8::1'] for host in HOSTS})
+    loop.run_until_complete(loop.create_datagram_endpoint(lambda: resolver, local_addr=('127.0.0.1', 0)))
+    cache = dns.DNSCache(nameservers=[resolver.nameserver])
+
+    async def uncached():
+        for host in HOSTS:
+            await cache.query(host)
+
+    async def cached():
+        for host in HOSTS:
+            await cache.resolve(host)
+
+    try:
+        before = measure(lambda: loop.run_until_complete(uncached()), number=5)
+        after = measure(lambda: loop.run_until_complete(cached()), number=5)
+        report(f"lookup of {len(HOSTS)} hosts", before, after)
+    finally:
+        resolver.transport.close()
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the external bangs, *before* is the trie of nested dicts from
+``external_bangs.json``, *after* is the memory-mapped
+:py:obj:`searx.data.external_bangs.ExternalBangsIndex`.
+
+::
+
+    $ python -m tests.benchmark.external_bangs
+
+"""
+# pylint: disable=missing-function-docstring
+
+import json
+import random
+import typing as t
+import tempfile
+import pathlib
+import tracemalloc
+
+from searx.data.external_bangs import ExternalBangsIndex, flatten_trie
+from searx.external_bang import get_bang_definition_and_ac, get_bang_definition_and_autocomplete
+
+from . import measure, report
+
+
+def heap_size(func) -> tuple[int, t.Any]:
+    tracemalloc.start()
+    obj = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, obj
+
+
+def main():
+    json_file = ExternalBangsIndex.json_file
+
+    def load_trie():
+        with open(json_file, encoding="utf-8") as f:
+            return json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = ExternalBangsIndex(pathlib.Path(tmp_dir) / "bangs.idx")
+        index.build()
+
+        trie_size, trie = heap_size(load_trie)
+        index_size, _ = heap_size(index.init)
+        print(f"trie (json.load): {trie_size / 1024:8.0f} kB heap per worker")
+        print(
+            f"index (mmap):     {index_size / 1024:8.0f} kB heap per worker"
+            f" + {index.idx_file.stat().st_size / 1024:.0f} kB file (shared page cache)"
+        )
+
+        bangs = sorted(flatten_trie(trie["trie"]))
+        rnd = random.Random(0)
+        sample = rnd.sample(bangs, 1000)
+        prefixes = [name[: rnd.randint(1, 3)] for name in sample]  # pylint: disable=unsubscriptable-object
+
+        for bang in sample:
+            assert get_bang_definition_and_ac(trie, bang)[0] == index.get(bang)
+        for prefix in prefixes[:100]:
+            _, ac_list = get_bang_definition_and_autocomplete(prefix, external_bangs_db=trie, limit=10)
+            assert ac_list == index.complete(prefix, 10)
+
+        before = measure(lambda: [get_bang_definition_and_ac(trie, b) for b in sample]) / len(sample)
+        after = measure(lambda: [index.get(b) for b in sample]) / len(sample)
+        report("resolve bang (per bang)", before, after)
+
+        few_prefixes = prefixes[:100]
+        before = measure(
+            lambda: [get_bang_definition_and_autocomplete(p, trie, 10) for p in few_prefixes], repeat=3
+        ) / len(few_prefixes)
+        after = measure(lambda: [index.complete(p, 10) for p in prefixes]) / len(prefixes)
+        report("top-10 completion of 1-3 chars", before, after)
+
+
+if __name__ == "__main__":
+    main()
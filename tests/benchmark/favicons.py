@@ -0,0 +1,68 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the favicon URLs of a result page with 30 results, *before*
+resolves each favicon while the page is rendered (two queries in the
+:py:obj:`searx.favicons.cache.FaviconCacheSQLite` and the base64 encoding per
+result), *after* resolves the favicons of the page in one batch
+(:py:obj:`searx.favicons.proxy.favicon_urls`).
+
+::
+
+    $ python -m tests.benchmark.favicons
+
+"""
+# pylint: disable=missing-function-docstring
+
+import base64
+import pathlib
+import tempfile
+
+import flask
+from mock import Mock
+
+from searx.favicons import cache, proxy
+
+from . import measure, report
+
+
+def favicon_url_before(authority: str) -> str:
+    # the former implementation of favicon_url(), without the fallbacks
+    data, mime = cache.CACHE("ddg", authority)  # type: ignore
+    return f"data:{mime};base64,{str(base64.b64encode(data), 'utf-8')}"  # type: ignore
+
+
+def main():
+    app = flask.Flask(__name__)
+    app.add_url_rule('/favicon_proxy', endpoint="favicon_proxy")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_url = str(pathlib.Path(tmp_dir) / "faviconcache.db")
+        cache.CACHE = cache.FaviconCacheSQLite(cache.FaviconCacheConfig(db_url=db_url, MAINTENANCE_MODE="off"))
+        authorities = [f"www.example{i}.org" for i in range(1000)]
+        for i, authority in enumerate(authorities):
+            cache.CACHE.set("ddg", authority, "image/png", i.to_bytes(4, "big") * 256)
+
+        proxy.CFG = proxy.FaviconProxyConfig(resolver_map={"ddg": "x.ddg"})
+        proxy.PREFETCH = proxy.FaviconPrefetch(0)
+        page = authorities[:30]
+
+        with app.test_request_context():
+            flask.request.preferences = Mock(get_value={"favicon_resolver": "ddg", "theme": "simple"}.get)
+
+            def page_after():
+                proxy.favicon_urls(page)
+                return [proxy.favicon_url(a) for a in page]
+
+            proxy.DATA_URLS = proxy.DataURLCache(0, 3600)
+            assert page_after() == [favicon_url_before(a) for a in page]
+
+            before = measure(lambda: [favicon_url_before(a) for a in page], number=100)
+            after = measure(page_after, number=100)
+            report("result page, LRU miss", before, after)
+
+            proxy.DATA_URLS = proxy.DataURLCache(4096, 3600)
+            after = measure(page_after, number=100)
+            report("result page, LRU hit", before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the engines of the ``settings.yml`` at the start of a worker,
+*before* loads all engines, *after* registers the disabled engines as
+:py:obj:`searx.engines.LazyEngine` stubs (:ref:`settings search lazy_engines`).
+The engines with an ``init`` function that is called at startup are counted.
+
+::
+
+    $ python -m tests.benchmark.lazy_engines
+
+"""
+# pylint: disable=missing-function-docstring
+
+from unittest.mock import patch
+
+from searx import settings
+import searx.engines
+
+from . import measure, report
+
+
+def main():
+    engine_list = settings['engines']
+
+    def load():
+        searx.engines.load_engines(engine_list)
+
+    def count():
+        loaded = [e for e in searx.engines.engines.values() if not isinstance(e, searx.engines.LazyEngine)]
+        with_init = [e for e in loaded if hasattr(e, 'init') and not (lazy and e.disabled)]
+        return len(loaded), len(with_init)
+
+    lazy = False
+    before = measure(load, repeat=3)
+    n_before = count()
+    with patch.dict(settings['search'], {'lazy_engines': True}):
+        lazy = True
+        after = measure(load, repeat=3)
+        n_after = count()
+
+    print(f"engine modules loaded before: {n_before[0]} after: {n_after[0]}")
+    print(f"init functions called at startup before: {n_before[1]} after: {n_after[1]}")
+    report("load_engines", before, after, unit="ms", scale=1e3)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the :py:obj:`searx.search.parse_executor`: 15 XPath engines
+parse a HTML response (200 results) in the threads of one search, *before* the
+responses are parsed in the threads, *after* in a pool of worker processes
+(one per CPU core).
+
+::
+
+    $ python -m tests.benchmark.parse_executor
+
+"""
+# pylint: disable=missing-function-docstring
+
+import os
+import threading
+
+import httpx
+
+import searx.engines
+from searx.search.parse_executor import ParseExecutor
+
+from . import measure, report
+
+ENGINE_LIST = [
+    {
+        'name': f'xpath {i}',
+        'engine': 'xpath',
+        'shortcut': f'xp{i}',
+        'search_url': 'https://example.org/?q={query}',
+        'results_xpath': '//div[@class="result"]',
+        'url_xpath': './h3/a/@href',
+        'title_xpath': './h3/a',
+        'content_xpath': './p',
+    }
+    for i in range(15)
+]
+
+HTML = "<html><body>{}</body></html>".format(
+    "".join(
+        f'<div class="result"><h3><a href="/r/{i}">result <b>{i}</b></a></h3>'
+        f'<p>{"lorem ipsum dolor sit amet " * 20}<span>{i}</span></p></div>'
+        for i in range(200)
+    )
+)
+
+
+def main():
+    searx.engines.load_engines(ENGINE_LIST)
+    workers = os.cpu_count() or 1
+    executor = ParseExecutor(workers, ENGINE_LIST)
+
+    def new_response():
+        response = httpx.Response(
+            200,
+            content=HTML.encode(),
+            headers={'Content-Type': 'text/html; charset=utf-8'},
+            request=httpx.Request('GET', 'https://example.org/?q=test'),
+        )
+        response.search_params = {'query': 'test', 'pageno': 1}  # type: ignore
+        return response
+
+    def search(parse):
+        threads = [threading.Thread(target=parse, args=(engine['name'],)) for engine in ENGINE_LIST]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def parse_before(engine_name: str):
+        assert len(searx.engines.engines[engine_name].response(new_response())) == 200  # type: ignore
+
+    def parse_after(engine_name: str):
+        assert len(executor.parse(engine_name, new_response(), timeout=60)) == 200  # type: ignore
+
+    search(parse_after)  # start the worker processes
+    try:
+        before = measure(lambda: search(parse_before), repeat=5)
+        after = measure(lambda: search(parse_after), repeat=5)
+        report(f"search, 15 engines ({workers} workers)", before, after, unit="ms", scale=1e3)
+    finally:
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the preferences of a request with 250 (synthetic) engines,
+*before* builds the :py:obj:`searx.preferences.Preferences` and parses the
+cookies (and the encoded preferences) on every request, *after* gets a copy from
+the :py:obj:`searx.preferences.PreferencesCache`.
+
+::
+
+    $ python -m tests.benchmark.preferences
+
+"""
+# pylint: disable=missing-function-docstring
+
+import random
+import types
+
+import searx.plugins
+from searx import favicons
+from searx.locales import locales_initialize
+from searx.preferences import Preferences, PreferencesCache
+
+from . import measure, report
+
+CATEGORIES = ["general", "images", "videos", "news", "map", "music", "it", "science", "files", "social media"]
+
+ENGINES = {
+    f"engine{i}": types.SimpleNamespace(
+        name=f"engine{i}",
+        categories=random.sample(CATEGORIES, 2),
+        disabled=random.random() < 0.3,
+    )
+    for i in range(250)
+}
+
+
+def main():
+    locales_initialize()
+    favicons.init()
+
+    def factory() -> Preferences:
+        return Preferences(["simple"], CATEGORIES, ENGINES, searx.plugins.STORAGE)  # type: ignore
+
+    cookies = {
+        "safesearch": "1",
+        "language": "de-DE",
+        "locale": "de",
+        "categories": "general,news",
+        "disabled_engines": "engine1__general,engine7__news,engine9__images",
+        "enabled_engines": "engine3__general",
+        "tokens": "",
+    }
+
+    def request_before(encoded_data: str = ""):
+        preferences = factory()
+        preferences.parse_dict(cookies)
+        if encoded_data:
+            preferences.parse_encoded_data(encoded_data)
+        return preferences
+
+    cache = PreferencesCache(factory)
+
+    def request_after(encoded_data: str = ""):
+        return cache.get(cookies, encoded_data)[0]
+
+    before = measure(lambda: request_before(), number=200)  # pylint: disable=unnecessary-lambda
+    after = measure(lambda: request_after(), number=200)  # pylint: disable=unnecessary-lambda
+    report("preferences from cookies", before, after)
+
+    encoded_data = request_before().get_as_url_params()
+    before = measure(lambda: request_before(encoded_data), number=200)
+    after = measure(lambda: request_after(encoded_data), number=200)
+    report("preferences from encoded data", before, after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the :py:obj:`searx.results.ResultContainer` with 1k - 10k
+synthetic results from engines of different categories, *before* is the former
+implementation which calculates the scores when the container is closed and
+groups the results by ``list.insert``.
+
+::
+
+    $ python -m tests.benchmark.results
+
+"""
+# pylint: disable=missing-function-docstring,missing-class-docstring,invalid-name
+
+import random
+import types
+import typing as t
+
+import searx.engines
+from searx import metrics
+from searx.metrics import counter_add
+from searx.result_types import MainResult, LegacyResult
+from searx.results import ResultContainer, calculate_score, merge_two_main_results
+
+from . import measure, report
+
+ENGINES = {
+    f"engine{i}": types.SimpleNamespace(
+        name=f"engine{i}",
+        weight=random.choice([0.5, 1.0, 1.0, 2.0]),
+        categories=[random.choice(["general", "images", "videos", "news"])],
+        paging=True,
+        display_error_messages=True,
+        timeout=3.0,
+    )
+    for i in range(40)
+}
+
+
+class ResultContainerBefore(ResultContainer):
+    """The result container before the incremental scoring and the linear
+    grouping."""
+
+    def _merge_main_result(self, result: MainResult | LegacyResult, position: int):
+        result_hash = hash(result)
+        with self._lock:
+            merged = self.main_results_map.get(result_hash)
+            if not merged:
+                result.positions = [position]
+                self.main_results_map[result_hash] = result
+                return
+            merge_two_main_results(merged, result)
+            merged.positions.append(position)
+
+    def close(self):
+        self._closed = True
+        for result in self.main_results_map.values():
+            result.score = calculate_score(result, result.priority)
+            for eng_name in result.engines:
+                counter_add(result.score, 'engine', eng_name, 'score')
+
+    def get_ordered_results(self) -> list[MainResult | LegacyResult]:
+        if not self._closed:
+            self.close()
+        if self._main_results_sorted:
+            return self._main_results_sorted
+
+        results = sorted(self.main_results_map.values(), key=lambda x: x.score, reverse=True)
+        gresults: list[MainResult | LegacyResult] = []
+        categoryPositions: dict[str, t.Any] = {}
+        max_count = 8
+        max_distance = 20
+        for res in results:
+            engine = searx.engines.engines.get(res.engine or "")
+            if engine:
+                res.category = engine.categories[0] if len(engine.categories) > 0 else ""
+            category = f"{res.category}:{res.template}:{'img_src' if (res.thumbnail or res.img_src) else ''}"
+            grp = categoryPositions.get(category)
+            if (grp is not None) and (grp["count"] > 0) and (len(gresults) - grp["index"] < max_distance):
+                index = grp["index"]
+                gresults.insert(index, res)
+                for item in categoryPositions.values():
+                    v = item["index"]
+                    if v >= index:
+                        item["index"] = v + 1
+                grp["count"] -= 1
+            else:
+                gresults.append(res)
+                categoryPositions[category] = {"index": len(gresults), "count": max_count}
+        self._main_results_sorted = gresults
+        return self._main_results_sorted
+
+
+def result_lists(count: int) -> dict[str, list[dict[str, t.Any]]]:
+    """Returns the result lists of the engines, ``count`` results in total,
+    about one third of the URLs are returned by more than one engine."""
+    rnd = random.Random(count)
+    lists: dict[str, list[dict[str, t.Any]]] = {name: [] for name in ENGINES}
+    for i in range(count):
+        name = rnd.choice(list(ENGINES))
+        url_id = i if rnd.random() > 0.3 else rnd.randrange(count)
+        result = {"url": f"https://example.org/{url_id}", "title": f"title {i}", "content": "lorem ipsum"}
+        if ENGINES[name].categories[0] in ("images", "videos"):
+            result["template"] = f"{ENGINES[name].categories[0]}.html"
+            result["img_src"] = f"https://example.org/{url_id}.jpg"
+        lists[name].append(result)
+    return lists
+
+
+def merged_container(container_class: type[ResultContainer], lists: dict[str, list[dict[str, t.Any]]]):
+    container = container_class()
+    for name, results in lists.items():
+        container.extend(name, [dict(r, engine=name) for r in results])
+    return container
+
+
+def close_and_order(container: ResultContainer) -> list[str]:
+    container._closed = False  # pylint: disable=protected-access
+    container._main_results_sorted = None  # type: ignore # pylint: disable=protected-access
+    container.close()
+    return [r.url for r in container.get_ordered_results()]  # type: ignore
+
+
+def main():
+    engines_before = searx.engines.engines
+    searx.engines.engines = ENGINES  # type: ignore
+    searx.engines.update_engine_props()
+    metrics.initialize(list(ENGINES), enabled=False)
+    try:
+        for count in (1000, 2000, 5000, 10000):
+            lists = result_lists(count)
+            container_before = merged_container(ResultContainerBefore, lists)
+            container_after = merged_container(ResultContainer, lists)
+            assert close_and_order(container_before) == close_and_order(container_after)
+
+            before = measure(lambda: merged_container(ResultContainerBefore, lists), repeat=3)  # pylint: disable=W0640
+            after = measure(lambda: merged_container(ResultContainer, lists), repeat=3)  # pylint: disable=W0640
+            report(f"merge {count} results", before, after, unit="ms", scale=1e3)
+
+            before = measure(lambda: close_and_order(container_before))  # pylint: disable=W0640
+            after = measure(lambda: close_and_order(container_after))  # pylint: disable=W0640
+            report(f"close & order {count} results", before, after, unit="ms", scale=1e3)
+    finally:
+        searx.engines.engines = engines_before
+        searx.engines.update_engine_props()
+
+
+if __name__ == "__main__":
+    main()
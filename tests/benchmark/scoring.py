@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of :py:obj:`searx.results.calculate_score` per result, *before* is
+the former implementation which looks up the ``weight`` attribute of the engine
+modules (:py:obj:`searx.engines.engines`) for every engine of a result, *after*
+uses the lookup table :py:obj:`searx.engines.engine_props`.
+
+::
+
+    $ python -m tests.benchmark.scoring
+
+"""
+# pylint: disable=missing-function-docstring
+
+import random
+import types
+
+import searx.engines
+from searx.result_types import MainResult, LegacyResult
+from searx.results import calculate_score
+
+from . import measure, report
+
+ENGINES = {
+    f"engine{i}": types.SimpleNamespace(
+        name=f"engine{i}",
+        weight=random.choice([0.5, 1.0, 1.0, 2.0]),
+        categories=[random.choice(["general", "images", "videos", "news"])],
+        paging=True,
+    )
+    for i in range(40)
+}
+
+
+def calculate_score_before(result: MainResult | LegacyResult, priority: MainResult.PriorityType) -> float:
+    """Implementation of ``calculate_score`` before the lookup table."""
+    weight = 1.0
+    for result_engine in result['engines']:
+        if hasattr(searx.engines.engines.get(result_engine), 'weight'):
+            weight *= float(searx.engines.engines[result_engine].weight)
+    weight *= len(result['positions'])
+    score = 0
+    for position in result['positions']:
+        if priority == 'low':
+            continue
+        if priority == 'high':
+            score += weight
+        else:
+            score += weight / position
+    return score
+
+
+def result_corpus(count: int = 5000) -> list[MainResult]:
+    """Returns ``count`` merged results, found by one to five engines."""
+    rnd = random.Random(count)
+    results: list[MainResult] = []
+    for i in range(count):
+        engines = rnd.sample(list(ENGINES), rnd.randint(1, 5))
+        result = MainResult(url=f"https://example.org/{i}", engine=engines[0])
+        result.engines = set(engines)
+        result.positions = [rnd.randint(1, 20) for _ in engines]
+        results.append(result)
+    return results
+
+
+def main():
+    engines_before = searx.engines.engines
+    searx.engines.engines = ENGINES  # type: ignore
+    searx.engines.update_engine_props()
+    try:
+        results = result_corpus()
+        for result in results:
+            assert calculate_score_before(result, result.priority) == calculate_score(result, result.priority)
+
+        before = measure(lambda: [calculate_score_before(r, r.priority) for r in results]) / len(results)
+        after = measure(lambda: [calculate_score(r, r.priority) for r in results]) / len(results)
+        report(f"calculate_score ({len(results)} results, per result)", before, after)
+    finally:
+        searx.engines.engines = engines_before
+        searx.engines.update_engine_props()
+
+
+if __name__ == "__main__":
+    main()
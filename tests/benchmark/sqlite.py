@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the :py:obj:`searx.engines.sqlite` engine on a synthetic DB,
+*before* is a new connection per query and a ``LIKE :wildcard`` query, *after*
+is a pooled (memory mapped) connection and a query on the FTS5 index.
+
+::
+
+    $ python -m tests.benchmark.sqlite [ROWS]
+
+"""
+# pylint: disable=missing-function-docstring
+
+import contextlib
+import pathlib
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+from searx import metrics
+from searx.engines import sqlite as sqlite_engine
+
+from . import measure, report
+
+ENGINE_NAME = "sqlite benchmark"
+
+
+def create_db(db_file: str, rows: int, words: list[str]):
+    rnd = random.Random(0)
+    with contextlib.closing(sqlite3.connect(db_file)) as conn:
+        with conn:
+            conn.execute("CREATE TABLE doc (title TEXT, url TEXT, description TEXT)")
+            conn.executemany(
+                "INSERT INTO doc VALUES (?, ?, ?)",
+                (
+                    (
+                        " ".join(rnd.choices(words, k=4)),
+                        f"https://example.org/{i}",
+                        " ".join(rnd.choices(words, k=40)),
+                    )
+                    for i in range(rows)
+                ),
+            )
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    rnd = random.Random(1)
+    words = ["".join(rnd.choices("abcdefghijklmnopqrstuvwxyz", k=rnd.randint(4, 9))) for _ in range(20_000)]
+    queries = rnd.sample(words, 20)
+
+    metrics.initialize([ENGINE_NAME])
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_file = str(pathlib.Path(tmp_dir) / "bench.db")
+        start = time.perf_counter()
+        create_db(db_file, rows, words)
+        sqlite_engine.create_fts_index(db_file, "doc_fts", "doc", ["title", "description"])
+        print(f"{rows} rows, DB and FTS5 index built in {time.perf_counter() - start:.1f} sec")
+
+        sqlite_engine.database = db_file
+        sqlite_engine.timeout = 10.0  # type: ignore
+        sqlite_engine.limit = 10
+        sqlite_engine.init({'name': ENGINE_NAME, 'query_str': 'SELECT 1'})  # creates the pool
+
+        like_query = (
+            "SELECT url FROM doc WHERE title LIKE :wildcard OR description LIKE :wildcard LIMIT :limit OFFSET :offset"
+        )
+
+        def search_before(query: str) -> list[str]:
+            # former implementation: a new connection per query
+            uri = 'file:' + db_file + '?mode=ro'
+            with contextlib.closing(sqlite3.connect(uri, uri=True)) as conn:
+                params = {'wildcard': '%' + query.replace(' ', '%') + '%', 'limit': 10, 'offset': 0}
+                return [url for (url,) in conn.execute(like_query, params)]
+
+        sqlite_engine.fts_table, sqlite_engine.fts_source = "doc_fts", "doc"
+        sqlite_engine.query_str = sqlite_engine.fts_query_str()
+
+        def search_after(query: str) -> list[str]:
+            return [r.kvmap['url'] for r in sqlite_engine.search(query, {'pageno': 1})]  # type: ignore
+
+        with contextlib.closing(sqlite3.connect(db_file)) as conn:
+            for query in queries:
+                # the FTS5 results are a subset of the (substring) LIKE matches
+                like_hits = {
+                    url for (url,) in conn.execute(like_query, {'wildcard': f'%{query}%', 'limit': -1, 'offset': 0})
+                }
+                after = search_after(query)
+                assert after and set(after) <= like_hits
+
+        before = measure(lambda: [search_before(q) for q in queries], repeat=3) / len(queries)
+        after = measure(lambda: [search_after(q) for q in queries]) / len(queries)
+        report("query, frequent term", before, after, unit="ms", scale=1e3)
+
+        # a term that is not in the DB: LIKE scans the whole table
+        missing = ["zzz" + q for q in queries[:5]]
+        before = measure(lambda: [search_before(q) for q in missing], repeat=3) / len(missing)
+        after = measure(lambda: [search_after(q) for q in missing]) / len(missing)
+        report("query, term not in the DB", before, after, unit="ms", scale=1e3)
+
+
+if __name__ == "__main__":
+    main()
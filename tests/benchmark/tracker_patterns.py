@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of :py:obj:`searx.data.tracker_patterns.TrackerPatternsDB.clean_url`
+over a corpus of URLs from result lists, *before* is the former implementation
+which tests all (uncompiled) rules from the cache.
+
+::
+
+    $ python -m tests.benchmark.tracker_patterns
+
+"""
+# pylint: disable=missing-function-docstring
+
+import random
+import re
+import tempfile
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+from searx.cache import ExpireCacheCfg, ExpireCacheSQLite
+from searx.data.tracker_patterns import TrackerPatternsDB
+
+from . import measure, report
+
+# a subset of the ClearURLs providers (https://docs.clearurls.xyz/)
+PROVIDERS = {
+    "globalRules": (
+        ".*",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?matrix\.org\/_matrix\/.*", r"^https?:\/\/(?:[a-z0-9-]+\.)*?prismic\.io\/.*"],
+        [
+            "(?:%3F)?utm(?:_[a-z_]*)?",
+            "(?:%3F)?ga_[a-z_]+",
+            "(?:%3F)?yclid",
+            "(?:%3F)?_openstat",
+            "(?:%3F)?fb_action_(?:types|ids)",
+            "(?:%3F)?fb_(?:source|ref)",
+            "(?:%3F)?fbclid",
+            "(?:%3F)?gclid",
+            "(?:%3F)?dclid",
+            "(?:%3F)?msclkid",
+            "(?:%3F)?mc_(?:eid|cid|tc)",
+            "(?:%3F)?_hsenc",
+            "(?:%3F)?srsltid",
+        ],
+    ),
+    "amazon": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}\/gp\/.*?(?:redirector.html|cart\/ajax-update.html)"],
+        ["p[fd]_rd_[a-z]*", "qid", "sr", "srs", "__mk_[a-z]{1,3}_[a-z]{1,3}", "ref_?", "th", "sprefix", "crid", "s"],
+    ),
+    "google": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?google(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/mail\.google\.com\/mail\/u\/", r"^https?:\/\/(?:docs|accounts)\.google(?:\.[a-z]{2,}){1,}"],
+        ["ved", "bi[a-z]*", "gfe_[a-z]*", "ei", "source", "gs_[a-z]*", "site", "oq", "esrc", "uact", "cd", "sa"],
+    ),
+    "youtube": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?youtube\.com",
+        [],
+        ["feature", "gclid", "kw", "si", "pp"],
+    ),
+    "bing": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?bing(?:\.[a-z]{2,}){1,}",
+        [],
+        ["cvid", "form", "sk", "sp", "sc", "qs", "qp"],
+    ),
+    "twitter": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?(?:x|twitter)\.com",
+        [],
+        ["(?:ref_?)?src", "s", "cn", "ref_url", "t"],
+    ),
+    "reddit": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?reddit\.com",
+        [],
+        ["%24deep_link", "\\$deep_link", "correlation_id", "ref_campaign", "ref_source", "%243p", "\\$3p", "share_id"],
+    ),
+    "aliexpress": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?aliexpress(?:\.[a-z]{2,}){1,}",
+        [],
+        ["ws_ab_test", "btsid", "algo_expid", "algo_pvid", "gps-id", "scm[_a-z-]*", "cv", "af", "mall_affr", "sk"],
+    ),
+    "ebay": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?ebay(?:\.[a-z]{2,}){1,}",
+        [],
+        ["_trkparms", "_trksid", "_from", "hash", "amdata"],
+    ),
+    "linkedin": (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?linkedin\.com",
+        [],
+        ["refId", "trk", "li[a-z]{2}", "trackingId"],
+    ),
+}
+
+HOSTS = [
+    "en.wikipedia.org",
+    "www.amazon.de",
+    "www.google.com",
+    "www.youtube.com",
+    "github.com",
+    "stackoverflow.com",
+    "www.reddit.com",
+    "www.bing.com",
+    "docs.python.org",
+    "www.ebay.co.uk",
+    "news.ycombinator.com",
+    "www.linkedin.com",
+    "medium.com",
+    "www.bbc.co.uk",
+    "x.com",
+]
+ARGS = ["q=searxng", "id=42", "page=2", "utm_source=feed", "utm_medium=rss", "fbclid=abc", "ref_=nav", "ved=0ah"]
+
+
+def url_corpus(size: int = 3000) -> list[str]:
+    rnd = random.Random(42)
+    urls = []
+    for _ in range(size):
+        path = rnd.choice(['wiki', 'dp', 'watch', 'questions', 'p'])
+        url = f"https://{rnd.choice(HOSTS)}/{path}/{rnd.randint(1, 10**6)}"
+        # about half of the URLs in result lists do not have a query string
+        if rnd.random() < 0.5:
+            url += "?" + "&".join(rnd.sample(ARGS, rnd.randint(1, 3)))
+        urls.append(url)
+    return urls
+
+
+def clean_url_before(tracker_patterns: TrackerPatternsDB, url: str) -> bool | str:
+    """Implementation of ``clean_url`` before the compiled rules."""
+    # pylint: disable=too-many-branches
+    new_url = url
+    parsed_new_url = urlparse(url=new_url)
+    for rule in tracker_patterns.rules():
+        query_str: str = parsed_new_url.query
+        if not query_str:
+            break
+        if not re.match(rule[0], new_url):
+            continue
+        if any(re.match(pattern, new_url) for pattern in rule[1]):
+            continue
+        query_args: list[tuple[str, str]] = list(parse_qsl(parsed_new_url.query))
+        if query_args:
+            for name, val in query_args.copy():
+                if any(re.match(pattern, name) for pattern in rule[2]):
+                    query_args.remove((name, val))
+            parsed_new_url = parsed_new_url._replace(query=urlencode(query_args))
+            new_url = urlunparse(parsed_new_url)
+        else:
+            if any(re.match(pattern, query_str) for pattern in rule[2]):
+                parsed_new_url = parsed_new_url._replace(query="")
+                new_url = urlunparse(parsed_new_url)
+    if new_url != url:
+        return new_url
+    return True
+
+
+def main():
+    with tempfile.NamedTemporaryFile(suffix=".db") as db_file:
+        db = TrackerPatternsDB()
+        db.cache = ExpireCacheSQLite.build_cache(ExpireCacheCfg(name="BENCH_TRACKER_PATTERNS", db_url=db_file.name))
+        db.cache.properties.set("tracker_patterns loaded", "OK")
+        for rule in PROVIDERS.values():
+            db.add(rule)
+
+        urls = url_corpus()
+        for url in urls:
+            assert clean_url_before(db, url) == db.clean_url(url), url
+
+        before = measure(lambda: [clean_url_before(db, url) for url in urls], repeat=3) / len(urls)
+        after = measure(lambda: [db.clean_url(url) for url in urls], repeat=3) / len(urls)
+        report(f"clean_url ({len(urls)} URLs, per URL)", before, after)
+
+
+if __name__ == "__main__":
+    main()
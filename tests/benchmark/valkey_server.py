@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+"""Benchmark of the key scan of the :py:obj:`searx.engines.valkey_server`
+engine, *before* is the former implementation (``TYPE`` and ``HGETALL`` /
+``LRANGE`` per key), *after* the batched implementation (pipeline and Lua).
+
+The benchmark needs a Valkey server, the keys are written to (and removed
+from) the given DB::
+
+    $ python -m tests.benchmark.valkey_server [valkey://127.0.0.1:6379/15]
+
+"""
+# pylint: disable=missing-function-docstring
+
+import sys
+
+import valkey  # pylint: disable=import-error
+
+from searx.engines import valkey_server
+
+from . import measure, report
+
+PREFIX = "sxng_bench:"
+
+
+def search_keys_before(client, query) -> list[dict]:
+    ret = []
+    for key in client.scan_iter(match='*{}*'.format(query)):
+        key_type = client.type(key)
+        res = None
+        if key_type == 'hash':
+            res = client.hgetall(key)
+        elif key_type == 'list':
+            res = dict(enumerate(client.lrange(key, 0, -1)))
+        if res:
+            res['valkey_key'] = key
+            ret.append(res)
+    return ret
+
+
+def main():
+    url = sys.argv[1] if len(sys.argv) > 1 else "valkey://127.0.0.1:6379/15"
+    client = valkey.StrictValkey.from_url(url, decode_responses=True)
+    keys = 100_000
+
+    pipe = client.pipeline(transaction=False)
+    for i in range(keys):
+        pipe.hset(f"{PREFIX}user:{i}", mapping={"name": f"user {i}", "id": str(i)})
+        if i % 1000 == 999:
+            pipe.execute()
+    pipe.execute()
+
+    try:
+        valkey_server._valkey_client = client  # pylint: disable=protected-access
+        print(f"{keys} keys, query '{PREFIX}user:1' matches {len(search_keys_before(client, PREFIX + 'user:1'))} keys")
+
+        before = measure(lambda: search_keys_before(client, PREFIX + "user:1"), repeat=3)
+        valkey_server.use_lua = False
+        after = measure(lambda: valkey_server.search_keys(PREFIX + "user:1"))
+        report("key scan, pipeline", before, after, unit="ms", scale=1e3)
+        valkey_server.use_lua = True
+        after = measure(lambda: valkey_server.search_keys(PREFIX + "user:1"))
+        report("key scan, Lua", before, after, unit="ms", scale=1e3)
+    finally:
+        for key in client.scan_iter(match=PREFIX + "*", count=1000):
+            client.unlink(key)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,25 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import sys
+import time
+
+from searx import metrics
 from searx.engines import command as command_engine
 from searx.result_types import KeyValue
 
 from tests import SearxTestCase
 
+COPROCESS = """
+import sys, time
+for line in sys.stdin:
+    if line.strip() == "sleep":
+        time.sleep(10)
+    for i in range(int(line)):
+        print(f"line {i}")
+    print("", flush=True)
+"""
+
 
 class TestCommandEngine(SearxTestCase):
 
@@ -216,3 +230,43 @@ commit '''
         ]
         for forbidden in forbidden_queries:
             self.assertRaises(ValueError, echo_engine.search, forbidden, {'pageno': 1})
+
+    def test_coprocess(self):
+        engine = command_engine
+        metrics.initialize(['coprocess'])
+        settings = {
+            'name': 'coprocess',
+            'command': [sys.executable, '-c', COPROCESS],
+            'delimiter': {'chars': ' ', 'keys': ['line']},
+        }
+        engine.result_separator = '\n'
+        engine.query_type = ''
+        engine.coprocess = True
+        timeout, engine.timeout = engine.timeout, 2.0
+        try:
+            engine.init(settings)
+            results = engine.search('25', {'pageno': 1})
+            self.assertEqual([r.kvmap['line'] for r in results], [f'line {i}' for i in range(10)])
+            results = engine.search('25', {'pageno': 3})
+            self.assertEqual([r.kvmap['line'] for r in results], [f'line {i}' for i in range(20, 25)])
+            # the process is reused
+            self.assertEqual(metrics.counter('engine', 'coprocess', 'pool', 'connect'), 1)
+
+            engine.timeout = 0.5
+            with self.assertRaises(TimeoutError):
+                engine.search('sleep', {'pageno': 1})
+            self.assertEqual(metrics.counter('engine', 'coprocess', 'pool', 'discard'), 1)
+            engine.timeout = 2.0
+            self.assertEqual(len(engine.search('3', {'pageno': 1})), 3)
+
+            # the reader of a killed process does not block on a full queue
+            proc = engine.CoProcess()
+            proc.process.stdin.write(b'2000\n')  # type: ignore
+            proc.process.stdin.flush()  # type: ignore
+            while not proc.results.full():
+                time.sleep(0.01)
+            proc.close()
+            self.assertFalse(proc.reader.is_alive())
+        finally:
+            engine.coprocess, engine.timeout = False, timeout
+            engine._coprocess_pool.close()  # pylint: disable=protected-access
@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import contextlib
+import pathlib
+import sqlite3
+import tempfile
+
+from searx import metrics
+from searx.engines import sqlite as sqlite_engine
+
+from tests import SearxTestCase
+
+ENGINE_NAME = "sqlite engine"
+
+ROWS = [
+    ("apple", "An apple a day keeps the doctor away."),
+    ("banana", "The banana is an elongated, edible fruit."),
+    ("cherry", "A cherry is the fruit of many plants, an apple is not."),
+]
+
+
+class TestSQLiteEngine(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.initialize([ENGINE_NAME])
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.db_file = str(pathlib.Path(self.tmp_dir.name) / "test.db")
+        with contextlib.closing(sqlite3.connect(self.db_file)) as conn:
+            with conn:
+                conn.execute("CREATE TABLE fruit (name TEXT, description TEXT)")
+                conn.executemany("INSERT INTO fruit VALUES (?, ?)", ROWS)
+
+        self.engine_attrs = {
+            name: getattr(sqlite_engine, name) for name in ("database", "query_str", "fts_table", "fts_source")
+        }
+        sqlite_engine.database = self.db_file
+        sqlite_engine.timeout = 1.0  # type: ignore
+
+    def tearDown(self):
+        for name, value in self.engine_attrs.items():
+            setattr(sqlite_engine, name, value)
+        self.tmp_dir.cleanup()
+
+    def search(self, query: str) -> list[dict[str, str]]:
+        return [r.kvmap for r in sqlite_engine.search(query, {'pageno': 1})]  # type: ignore
+
+    def test_wildcard(self):
+        sqlite_engine.query_str = "SELECT name FROM fruit WHERE description LIKE :wildcard"
+        sqlite_engine.init({'name': ENGINE_NAME, 'query_str': sqlite_engine.query_str})
+        self.assertEqual(self.search("fruit"), [{'name': 'banana'}, {'name': 'cherry'}])
+        self.assertEqual(self.search("fruit"), [{'name': 'banana'}, {'name': 'cherry'}])
+        # the connection has been reused
+        self.assertEqual(metrics.counter('engine', ENGINE_NAME, 'pool', 'connect'), 1)
+
+    def test_fts(self):
+        sqlite_engine.create_fts_index(self.db_file, "fruit_fts", "fruit", ["name", "description"])
+        sqlite_engine.fts_table = "fruit_fts"
+        sqlite_engine.fts_source = "fruit"
+        sqlite_engine.init({'name': ENGINE_NAME})
+
+        results = self.search("apple")
+        self.assertEqual([r['name'] for r in results], ["apple", "cherry"])
+        self.assertEqual(self.search("doctor")[0]['content'], "An apple a day keeps the doctor away.")
+        # FTS5 syntax in the search query is not evaluated
+        self.assertEqual(self.search('apple NOT "doctor'), [])
+
+        # the triggers maintain the index
+        with contextlib.closing(sqlite3.connect(self.db_file)) as conn:
+            with conn:
+                conn.execute("INSERT INTO fruit VALUES (?, ?)", ("durian", "The durian is a fruit."))
+                conn.execute("DELETE FROM fruit WHERE name = 'banana'")
+        self.assertEqual(sorted(r['name'] for r in self.search("fruit")), ["cherry", "durian"])
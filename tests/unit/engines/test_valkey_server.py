@@ -0,0 +1,86 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import fnmatch
+
+from searx.engines import valkey_server
+
+from tests import SearxTestCase
+
+
+class FakePipeline:
+
+    def __init__(self, client: "FakeValkey"):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+
+        return command
+
+    def execute(self):
+        self.client.round_trips += 1
+        commands, self.commands = self.commands, []
+        return [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class FakeValkey:
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.round_trips = 0
+
+    def scan_iter(self, match: str, count: int):
+        keys = [key for key in self.data if fnmatch.fnmatchcase(key, match)]
+        for i in range(0, len(keys), count):
+            self.round_trips += 1
+            yield from keys[i : i + count]
+
+    def type(self, key: str) -> str:
+        value = self.data.get(key)
+        return {dict: 'hash', list: 'list', str: 'string'}.get(type(value), 'none')  # type: ignore
+
+    def hscan(self, key: str, cursor: int, count: int):  # pylint: disable=unused-argument
+        return 0, dict(list(self.data[key].items())[:count])
+
+    def lrange(self, key: str, start: int, end: int):
+        return self.data[key][start : end + 1]
+
+    def pipeline(self, transaction: bool = True):  # pylint: disable=unused-argument
+        return FakePipeline(self)
+
+
+class TestValkeyServerEngine(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        data: dict = {f"user:{i}": {"name": f"user {i}", "id": str(i)} for i in range(500)}
+        data.update({f"list:user:{i}": [f"item {n}" for n in range(200)] for i in range(5)})
+        data["string:user"] = "no hash, no list"
+        self.client = FakeValkey(data)
+        self.engine_attrs = {name: getattr(valkey_server, name) for name in ("_valkey_client", "limit", "max_bytes")}
+        valkey_server._valkey_client = self.client  # pylint: disable=protected-access
+
+    def tearDown(self):
+        for name, value in self.engine_attrs.items():
+            setattr(valkey_server, name, value)
+
+    def test_search_keys(self):
+        results = valkey_server.search_keys("user:1")
+        self.assertEqual(len(results), valkey_server.limit)
+        self.assertEqual(results[0], {"name": "user 1", "id": "1", "valkey_key": "user:1"})
+        # one SCAN and two pipelines (TYPE, values)
+        self.assertEqual(self.client.round_trips, 3)
+
+    def test_search_keys_caps(self):
+        valkey_server.limit = 1000
+        results = valkey_server.search_keys("list:")
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len(results[0]), valkey_server.max_items + 1)
+        self.assertNotIn("string:user", [r['valkey_key'] for r in valkey_server.search_keys("string")])
+
+        valkey_server.max_bytes = 100
+        # 8 hashes of 13 bytes
+        self.assertEqual(len(valkey_server.search_keys("user:")), 8)
@@ -0,0 +1,210 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import asyncio
+import socket
+import struct
+
+import httpcore
+import httpx
+
+from searx import metrics
+from searx.network import client, dns
+
+from tests import SearxTestCase
+
+
+class StubResolver(asyncio.DatagramProtocol):
+    """Local DNS server that answers the A and AAAA queries from ``records``
+    (host -> list of addresses)."""
+
+    def __init__(self, records: dict[str, list[str]], ttl: int = 300):
+        self.records = records
+        self.ttl = ttl
+        self.queries: list[tuple[str, int]] = []
+        self.transport: asyncio.DatagramTransport = None  # type: ignore
+
+    def connection_made(self, transport):
+        self.transport = transport  # type: ignore
+
+    def datagram_received(self, data: bytes, addr):
+        qid = struct.unpack_from('!H', data)[0]
+        offset, labels = 12, []
+        while data[offset]:
+            labels.append(data[offset + 1 : offset + 1 + data[offset]].decode())
+            offset += data[offset] + 1
+        question = data[12 : offset + 5]
+        host = '.'.join(labels)
+        qtype = struct.unpack_from('!H', data, offset + 1)[0]
+        self.queries.append((host, qtype))
+
+        family = socket.AF_INET if qtype == dns.TYPE_A else socket.AF_INET6
+        answers = b''
+        count = 0
+        for address in self.records.get(host, []):
+            if (':' in address) != (family == socket.AF_INET6):
+                continue
+            rdata = socket.inet_pton(family, address)
+            answers += b'\xc0\x0c' + struct.pack('!HHIH', qtype, 1, self.ttl, len(rdata)) + rdata
+            count += 1
+        rcode = 0 if host in self.records else 3
+        header = struct.pack('!HHHHHH', qid, 0x8180 | rcode, 1, count, 0, 0)
+        self.transport.sendto(header + question + answers, addr)
+
+    @property
+    def nameserver(self) -> str:
+        return '127.0.0.1:{}'.format(self.transport.get_extra_info('sockname')[1])
+
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=('127.0.0.1', 0))
+        return self
+
+    async def __aexit__(self, *args):
+        self.transport.close()
+
+
+class TestDNSCache(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.resolver = StubResolver({'example.org': ['192.0.2.1', '2001:db8::1'], 'example.com': ['192.0.2.2']})
+
+    def new_cache(self, **kwargs) -> dns.DNSCache:
+        return dns.DNSCache(nameservers=[self.resolver.nameserver], timeout=1, **kwargs)
+
+    async def test_resolve(self):
+        hits = metrics.counter('network', 'dns', 'hit')
+        misses = metrics.counter('network', 'dns', 'miss')
+
+        async with self.resolver:
+            cache = self.new_cache()
+            self.assertEqual(await cache.resolve('example.org'), ['2001:db8::1', '192.0.2.1'])
+            self.assertEqual(await cache.resolve('example.org'), ['2001:db8::1', '192.0.2.1'])
+            self.assertEqual(await cache.resolve('example.com'), ['192.0.2.2'])
+            self.assertEqual(len(self.resolver.queries), 4)
+            self.assertEqual(metrics.counter('network', 'dns', 'hit'), hits + 1)
+            self.assertEqual(metrics.counter('network', 'dns', 'miss'), misses + 2)
+
+            # unknown host (NXDOMAIN): the error is not cached
+            with self.assertRaises(dns.DNSError):
+                await cache.resolve('unknown.example.org')
+            with self.assertRaises(dns.DNSError):
+                await cache.resolve('unknown.example.org')
+            self.assertEqual(len(self.resolver.queries), 8)
+
+    async def test_ttl(self):
+        self.resolver.ttl = 5
+        async with self.resolver:
+            cache = self.new_cache(min_ttl=60)
+            await cache.resolve('example.org')
+            entry = cache.get('example.org')
+            assert entry is not None
+            # the TTL of the answer is raised to min_ttl
+            self.assertAlmostEqual(entry.expires - entry.refresh_at, 60 * (1 - dns.DNSCache.REFRESH_AHEAD), places=1)
+
+            # an expired answer is resolved again
+            entry.expires = entry.refresh_at = 0
+            self.resolver.records['example.org'] = ['192.0.2.3']
+            self.assertEqual(await cache.resolve('example.org'), ['192.0.2.3'])
+
+    async def test_refresh(self):
+        async with self.resolver:
+            cache = self.new_cache()
+            await cache.resolve('example.org')
+            entry = cache.get('example.org')
+            assert entry is not None
+            entry.refresh_at = 0
+
+            # the cached answer is returned and refreshed in the background
+            self.resolver.records['example.org'] = ['192.0.2.3']
+            self.assertEqual(await cache.resolve('example.org'), ['2001:db8::1', '192.0.2.1'])
+            await asyncio.gather(*cache._tasks)  # pylint: disable=protected-access
+            self.assertEqual(await cache.resolve('example.org'), ['192.0.2.3'])
+            self.assertEqual(len(self.resolver.queries), 4)
+
+    async def test_lru(self):
+        async with self.resolver:
+            cache = self.new_cache(size=1)
+            await cache.resolve('example.org')
+            await cache.resolve('example.com')
+            self.assertIsNone(cache.get('example.org'))
+            self.assertIsNotNone(cache.get('example.com'))
+
+
+class FakeStream(httpcore.AsyncNetworkStream):  # pylint: disable=abstract-method
+
+    def __init__(self, address: str):
+        self.address = address
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeBackend(httpcore.AsyncNetworkBackend):  # pylint: disable=abstract-method
+    """Backend that fails to connect to the ``failing`` addresses and connects
+    to the ``slow`` addresses after 1 sec."""
+
+    def __init__(self, failing: set[str], slow: set[str]):
+        self.failing = failing
+        self.slow = slow
+        self.attempts: list[str] = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.attempts.append(host)
+        if host in self.failing:
+            raise httpcore.ConnectError(f"can't connect to {host}")
+        if host in self.slow:
+            await asyncio.sleep(1)
+        return FakeStream(host)
+
+
+class TestCachingBackend(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = dns.DNSCache()
+        self.cache.set('example.org', ['192.0.2.1', '192.0.2.2', '2001:db8::1'], 60)
+
+    def test_sort_addresses(self):
+        addresses = ['192.0.2.1', '192.0.2.2', '2001:db8::1']
+        self.assertEqual(dns.sort_addresses(addresses, None), ['2001:db8::1', '192.0.2.1', '192.0.2.2'])
+        self.assertEqual(dns.sort_addresses(addresses, '0.0.0.0'), ['192.0.2.1', '192.0.2.2'])
+        self.assertEqual(dns.sort_addresses(addresses, '::'), ['2001:db8::1'])
+
+    async def test_failing_address(self):
+        fake = FakeBackend(failing={'2001:db8::1'}, slow=set())
+        backend = dns.CachingBackend(self.cache, fake, delay=0.5)
+        stream = await backend.connect_tcp('example.org', 443)
+        self.assertEqual(stream.address, '192.0.2.1')  # type: ignore
+        self.assertEqual(fake.attempts, ['2001:db8::1', '192.0.2.1'])
+
+    async def test_slow_address(self):
+        fake = FakeBackend(failing=set(), slow={'2001:db8::1'})
+        backend = dns.CachingBackend(self.cache, fake, delay=0.05)
+        stream = await backend.connect_tcp('example.org', 443)
+        self.assertEqual(stream.address, '192.0.2.1')  # type: ignore
+        self.assertEqual(fake.attempts, ['2001:db8::1', '192.0.2.1'])
+
+    async def test_local_address(self):
+        fake = FakeBackend(failing={'192.0.2.1', '192.0.2.2'}, slow=set())
+        backend = dns.CachingBackend(self.cache, fake)
+        with self.assertRaises(httpcore.ConnectError):
+            await backend.connect_tcp('example.org', 443, local_address='0.0.0.0')
+        self.assertEqual(fake.attempts, ['192.0.2.1', '192.0.2.2'])
+
+        # IP addresses are not resolved
+        stream = await backend.connect_tcp('192.0.2.5', 443)
+        self.assertEqual(stream.address, '192.0.2.5')  # type: ignore
+
+    def test_transport(self):
+        # pylint: disable=protected-access
+        limit = httpx.Limits()
+        transport = client.get_transport(True, False, '', None, limit, 0)
+        self.assertNotIsInstance(transport._pool._network_backend, dns.CachingBackend)
+
+        self.setattr4test(dns, 'CACHE', self.cache)
+        transport = client.get_transport(True, False, '', None, limit, 0)
+        self.assertIsInstance(transport._pool._network_backend, dns.CachingBackend)
+        self.assertIs(transport._pool._network_backend.cache, self.cache)
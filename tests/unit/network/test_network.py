@@ -4,7 +4,8 @@
 import httpx
 from mock import patch
 
-from searx.network.network import Network, NETWORKS
+from searx.network import client
+from searx.network.network import CONNECTION_EXTENSION, Network, NETWORKS
 from tests import SearxTestCase
 
 
@@ -120,6 +121,92 @@ class TestNetwork(SearxTestCase):
             await network.aclose()
 
 
+class TestNetworkSharedPools(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.hosts: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            self.hosts.append(request.url.host)
+            return httpx.Response(status_code=200, text='Lorem Ipsum')
+
+        def new_transport(*args, **kwargs):  # pylint: disable=unused-argument
+            return httpx.MockTransport(handler)
+
+        self.new_transport = new_transport
+        client.SHARED_POOLS.clear()
+
+    async def test_shared_pools(self):
+        with patch.object(client, 'new_transport', side_effect=self.new_transport) as new_transport:
+            google = Network(shared_pools=True, logger_name='google')
+            google_images = Network(shared_pools=True, logger_name='google images')
+            no_verify = Network(shared_pools=True, verify=False)
+            not_shared = Network()
+
+            for network in (google, google_images):
+                response = await network.request('GET', 'https://www.google.com/search')
+                self.assertEqual(response.text, 'Lorem Ipsum')
+            self.assertEqual(new_transport.call_count, 1)
+
+            # an other host or other parameters: an other pool
+            await google.request('GET', 'https://www.startpage.com/')
+            await no_verify.request('GET', 'https://www.google.com/search')
+            self.assertEqual(new_transport.call_count, 3)
+            self.assertEqual(len(client.SHARED_POOLS), 3)
+            self.assertEqual(self.hosts, ['www.google.com'] * 2 + ['www.startpage.com', 'www.google.com'])
+
+            # closing the client of a network does not close the shared pools
+            await google.aclose()
+            self.assertEqual(len(client.SHARED_POOLS), 3)
+
+            client_ = await not_shared.get_client()
+            self.assertNotIsInstance(client_._transport, client.SharedPoolTransport)  # pylint: disable=protected-access
+            for network in (google_images, no_verify, not_shared):
+                await network.aclose()
+
+        await client.close_shared_pools()
+        self.assertEqual(client.SHARED_POOLS, {})
+
+
+class TestNetworkConnections(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.hosts: set[str] = set()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            # a new connection is opened on the first request to a host
+            if request.url.host not in self.hosts:
+                self.hosts.add(request.url.host)
+                await request.extensions['trace']('connection.connect_tcp.started', {})
+            return httpx.Response(status_code=200)
+
+        self.setattr4test(client, 'new_transport', lambda *args, **kwargs: httpx.MockTransport(handler))
+
+    async def test_warm_cold(self):
+        network = Network()
+        response = await network.request('GET', 'https://example.org/search')
+        self.assertEqual(response.extensions[CONNECTION_EXTENSION], 'cold')
+        response = await network.request('GET', 'https://example.org/')
+        self.assertEqual(response.extensions[CONNECTION_EXTENSION], 'warm')
+        response = await network.request('GET', 'https://example.com:8443/')
+        self.assertEqual(response.extensions[CONNECTION_EXTENSION], 'cold')
+        self.assertEqual(set(network.last_use), {'https://example.org', 'https://example.com:8443'})
+        await network.aclose()
+
+    def test_last_use_size(self):
+        network = Network()
+        for i in range(Network.LAST_USE_SIZE + 1):
+            network.set_last_use(f'https://{i}.example.org')
+        network.set_last_use('https://1.example.org')
+        network.set_last_use('https://example.org')
+        self.assertEqual(len(network.last_use), Network.LAST_USE_SIZE)
+        self.assertNotIn('https://0.example.org', network.last_use)
+        self.assertNotIn('https://2.example.org', network.last_use)
+        self.assertIn('https://1.example.org', network.last_use)
+
+
 class TestNetworkRequestRetries(SearxTestCase):
 
     TEXT = 'Lorem Ipsum'
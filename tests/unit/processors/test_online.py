@@ -1,9 +1,24 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import asyncio
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from timeit import default_timer
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+
 from searx.search.models import EngineRef, SearchQuery
 from searx.search.processors import online
-from searx import engines
+from searx.search.processors.abstract import EngineDeadline
+from searx.search.singleflight import SingleFlight
+from searx.search.parse_executor import ParseExecutor
+from searx.exceptions import SearxEngineAccessDeniedException
+from searx.network.network import Network, CONNECTION_EXTENSION
+from searx.results import ResultContainer
+from searx import engines, metrics
 
 from tests import SearxTestCase
 
@@ -36,3 +51,260 @@ class TestOnlineProcessor(SearxTestCase):
         search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
         params = self._get_params(online_processor, search_query, 'general')
         self.assertIn('User-Agent', params['headers'])
+
+    async def test_search_async(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+        result_container = ResultContainer()
+        deadline = EngineDeadline()
+
+        def request(query, params):
+            params['url'] = 'https://example.org/?q=' + query
+
+        def response(resp):
+            return [{'url': 'https://example.org/result', 'title': resp.text, 'content': ''}]
+
+        async def run_in_worker(func, *args):
+            return online_processor.call_in_worker(deadline, func, *args)
+
+        http_response = httpx.Response(200, text='lorem', request=httpx.Request('GET', 'https://example.org/?q=test'))
+        with (
+            patch.object(engine, 'request', request, create=True),
+            patch.object(engine, 'response', response, create=True),
+            patch.object(Network, 'request', AsyncMock(return_value=http_response)) as network_request,
+        ):
+            await online_processor.search_async('test', params, result_container, 0.0, 3.0, run_in_worker)
+
+        network_request.assert_awaited_once()
+        self.assertEqual(network_request.await_args.args[:2], ('GET', 'https://example.org/?q=test'))
+        self.assertEqual(network_request.await_args.kwargs['timeout'], 3.0)
+        self.assertEqual([r.title for r in result_container.get_ordered_results()], ['lorem'])
+        self.assertEqual([t.engine for t in result_container.get_timings()], [TEST_ENGINE_NAME])
+
+    async def test_search_async_connections(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+        deadline = EngineDeadline()
+        metrics.initialize([TEST_ENGINE_NAME])
+
+        def request(query, params):
+            params['url'] = 'https://example.org/?q=' + query
+
+        async def run_in_worker(func, *args):
+            return online_processor.call_in_worker(deadline, func, *args)
+
+        for connection in ('cold', 'warm', 'warm'):
+            http_response = httpx.Response(200, text='', request=httpx.Request('GET', 'https://example.org/?q=test'))
+            http_response.extensions[CONNECTION_EXTENSION] = connection
+            with (
+                patch.object(engine, 'request', request, create=True),
+                patch.object(engine, 'response', lambda resp: [], create=True),
+                patch.object(Network, 'request', AsyncMock(return_value=http_response)),
+            ):
+                await online_processor.search_async('test', params, ResultContainer(), 0.0, 3.0, run_in_worker)
+            metrics.counter_inc('engine', TEST_ENGINE_NAME, 'search', 'count', 'sent')
+
+        # the connections are counted per engine (shared pools: an engine may
+        # reuse the connection opened by an other engine)
+        reliabilities = metrics.get_reliabilities([TEST_ENGINE_NAME])
+        self.assertEqual(reliabilities[TEST_ENGINE_NAME]['connections'], {'warm': 2, 'cold': 1})
+        engine_stats = metrics.get_engines_stats([TEST_ENGINE_NAME])
+        self.assertIn(
+            f'searxng_engines_http_connection_count_total{{engine_name="{TEST_ENGINE_NAME}",connection="warm"}} 2',
+            metrics.openmetrics(engine_stats, reliabilities),
+        )
+
+    async def test_search_async_timed_out(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+        result_container = ResultContainer()
+        deadline = EngineDeadline()
+        deadline.timed_out.set()
+
+        def request(query, params):  # pylint: disable=unused-argument
+            params['url'] = ''
+
+        async def run_in_worker(func, *args):
+            return online_processor.call_in_worker(deadline, func, *args)
+
+        with patch.object(engine, 'request', request, create=True):
+            await online_processor.search_async('test', params, result_container, 0.0, 3.0, run_in_worker)
+
+        self.assertEqual([e.error_type for e in result_container.unresponsive_engines], ['timeout'])
+
+    async def test_search_async_coalesced(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        deadline = EngineDeadline()
+        http_requests = []
+
+        def request(query, params):
+            params['url'] = 'https://example.org/?q=' + query
+
+        def response(resp):
+            return [{'url': 'https://example.org/result', 'title': resp.text, 'content': ''}]
+
+        async def network_request(network, method, url, **kwargs):  # pylint: disable=unused-argument
+            http_requests.append(url)
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, text='lorem', request=httpx.Request(method, url))
+
+        async def run_in_worker(func, *args):
+            return online_processor.call_in_worker(deadline, func, *args)
+
+        result_containers = [ResultContainer(), ResultContainer()]
+
+        async def search(result_container):
+            params = self._get_params(online_processor, search_query, 'general')
+            await online_processor.search_async('test', params, result_container, 0.0, 3.0, run_in_worker)
+
+        with (
+            patch.object(engine, 'request', request, create=True),
+            patch.object(engine, 'response', response, create=True),
+            patch.object(Network, 'request', network_request),
+            patch.object(online.singleflight, 'FLIGHTS', SingleFlight()),
+            patch.object(online, 'counter_inc') as counter_inc,
+        ):
+            await asyncio.gather(*(search(result_container) for result_container in result_containers))
+
+        self.assertEqual(http_requests, ['https://example.org/?q=test'])
+        counter_inc.assert_called_once_with('engine', TEST_ENGINE_NAME, 'search', 'count', 'coalesced')
+        for result_container in result_containers:
+            self.assertEqual([r.title for r in result_container.get_ordered_results()], ['lorem'])
+            self.assertFalse(result_container.unresponsive_engines)
+
+    def test_search_coalesced(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        http_requests = []
+        in_flight = threading.Event()
+
+        def request(query, params):
+            params['url'] = 'https://example.org/?q=' + query
+
+        def response(resp):
+            return [{'url': 'https://example.org/result', 'title': resp.text, 'content': ''}]
+
+        def send_http_request(params):
+            http_requests.append(params['url'])
+            in_flight.set()
+            time.sleep(0.2)
+            return httpx.Response(200, text='lorem', request=httpx.Request('GET', params['url']))
+
+        result_containers = [ResultContainer(), ResultContainer()]
+
+        def search(result_container):
+            params = self._get_params(online_processor, search_query, 'general')
+            online_processor.search('test', params, result_container, default_timer(), 3.0)
+
+        with (
+            patch.object(engine, 'request', request, create=True),
+            patch.object(engine, 'response', response, create=True),
+            patch.object(online_processor, '_send_http_request', send_http_request),
+            patch.object(online.singleflight, 'FLIGHTS', SingleFlight()),
+        ):
+            leader = threading.Thread(target=search, args=(result_containers[0],))
+            leader.start()
+            in_flight.wait(1)
+            search(result_containers[1])
+            leader.join()
+
+        self.assertEqual(http_requests, ['https://example.org/?q=test'])
+        for result_container in result_containers:
+            self.assertEqual([r.title for r in result_container.get_ordered_results()], ['lorem'])
+            self.assertFalse(result_container.unresponsive_engines)
+
+    def test_flight_key(self):
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+
+        def new_params(safesearch: str):
+            params = self._get_params(online_processor, search_query, 'general')
+            params['url'] = 'https://example.org/?q=test'
+            params['cookies']['safesearch'] = safesearch
+            return params
+
+        # the random User-Agent is not part of the key
+        self.assertEqual(
+            online_processor.flight_key(new_params('strict')), online_processor.flight_key(new_params('strict'))
+        )
+        # requests that differ only in a cookie are not coalesced
+        self.assertNotEqual(
+            online_processor.flight_key(new_params('strict')), online_processor.flight_key(new_params('off'))
+        )
+
+    def test_parse_executor(self):
+        # in the worker process the "dummy engine" is a XPath engine
+        executor = ParseExecutor(
+            1,
+            [
+                {
+                    'name': TEST_ENGINE_NAME,
+                    'engine': 'xpath',
+                    'shortcut': 'dxp',
+                    'search_url': 'https://example.org/?q={query}',
+                    'results_xpath': '//div',
+                    'url_xpath': './a/@href',
+                    'title_xpath': './a',
+                    'content_xpath': './p',
+                }
+            ],
+        )
+        self.addCleanup(executor.shutdown)
+        engine = engines.engines[TEST_ENGINE_NAME]
+        online_processor = online.OnlineProcessor(engine)
+        search_query = SearchQuery('test', [EngineRef(TEST_ENGINE_NAME, 'general')], 'all', 0, 1, None, None, None)
+        params = self._get_params(online_processor, search_query, 'general')
+
+        html = '<div><a href="/a">lörem</a><p>ipsum</p></div>'.encode('latin-1')
+        http_response = httpx.Response(
+            200,
+            content=html,
+            headers={'Content-Type': 'text/html; charset=latin-1'},
+            request=httpx.Request('GET', 'https://example.org/?q=test'),
+        )
+        with patch.object(online.parse_executor, 'EXECUTOR', executor):
+            results = online_processor._parse_response(http_response, params)  # pylint: disable=protected-access
+        results = [(r['url'], r['title'], r['content']) for r in results]  # type: ignore
+        self.assertEqual(results, [('https://example.org/a', 'lörem', 'ipsum')])
+
+        # the exception of the engine is raised in the search thread
+        http_response = httpx.Response(403, request=httpx.Request('GET', 'https://example.org/?q=test'))
+        http_response.search_params = params  # type: ignore
+        with self.assertRaises(SearxEngineAccessDeniedException) as ctx:
+            executor.parse(TEST_ENGINE_NAME, http_response, timeout=30)  # type: ignore
+        self.assertEqual(ctx.exception.suspended_time, SearxEngineAccessDeniedException().suspended_time)
+        self.assertIn('raise_for_httperror', str(ctx.exception.__cause__))
+
+        # a broken pool is replaced by a new pool
+        http_response = httpx.Response(200, content=html, request=httpx.Request('GET', 'https://example.org/?q=test'))
+        http_response.search_params = params  # type: ignore
+        broken_pool = executor.pool
+        for process in list(broken_pool._processes.values()):  # pylint: disable=protected-access
+            process.kill()
+            process.join()
+        with self.assertRaises(BrokenProcessPool):
+            executor.parse(TEST_ENGINE_NAME, http_response, timeout=30)  # type: ignore
+        self.assertIsNot(executor.pool, broken_pool)
+        results = executor.parse(TEST_ENGINE_NAME, http_response, timeout=30)  # type: ignore
+        self.assertEqual([r['url'] for r in results], ['https://example.org/a'])  # type: ignore
+
+    def test_parse_executor_timeout(self):
+        executor = ParseExecutor(1, [])
+        self.addCleanup(executor.shutdown)
+        future = Mock(result=Mock(side_effect=TimeoutError))
+        self.setattr4test(executor, 'pool', Mock(submit=Mock(return_value=future)))
+        http_response = httpx.Response(200, request=httpx.Request('GET', 'https://example.org/?q=test'))
+        http_response.search_params = {}  # type: ignore
+        with self.assertRaises(TimeoutError):
+            executor.parse(TEST_ENGINE_NAME, http_response, timeout=0.1)  # type: ignore
+        future.cancel.assert_called_once_with()
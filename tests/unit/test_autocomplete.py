@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from httpx import HTTPError
+
+from searx import autocomplete, settings
+
+from tests import SearxTestCase
+
+
+class FakeBackend:  # pylint: disable=too-few-public-methods
+
+    def __init__(self, suggestions: list[str], wait: threading.Event | None = None, fail: bool = False):
+        self.suggestions = suggestions
+        self.wait = wait
+        self.fail = fail
+        self.queries: list[str] = []
+
+    def __call__(self, query: str, _sxng_locale: str) -> list[str]:
+        self.queries.append(query)
+        if self.wait is not None:
+            self.wait.wait(5)
+        if self.fail:
+            raise HTTPError("backend failed")
+        return [s for s in self.suggestions if s.startswith(query)][:4]
+
+
+class TestAutocompleteCache(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.cache = autocomplete.AutocompleteCache(ttl=60, size=100)
+        self.backend = FakeBackend(["sea", "sea lion", "search", "searxng", "season", "seattle"])
+        self.setattr4test(autocomplete, "CACHE", self.cache)
+        self.setattr4test(autocomplete, "backends", {"fake": self.backend})
+
+    def test_cache(self):
+        self.assertEqual(autocomplete.search_autocomplete("fake", "se", "en"), ["sea", "sea lion", "search", "searxng"])
+        self.assertEqual(autocomplete.search_autocomplete("fake", "se", "en"), ["sea", "sea lion", "search", "searxng"])
+        self.assertEqual(self.backend.queries, ["se"])
+
+        # the locale is part of the key
+        autocomplete.search_autocomplete("fake", "se", "de")
+        self.assertEqual(self.backend.queries, ["se", "se"])
+
+    def test_prefix(self):
+        # "se" returns the maximum number of suggestions (4): not all
+        # completions, "sea" is sent to the backend
+        autocomplete.search_autocomplete("fake", "se", "en")
+        self.assertEqual(
+            autocomplete.search_autocomplete("fake", "sea", "en"), ["sea", "sea lion", "search", "searxng"]
+        )
+        self.assertEqual(autocomplete.search_autocomplete("fake", "sear", "en"), ["search", "searxng"])
+        self.assertEqual(self.backend.queries, ["se", "sea", "sear"])
+
+        # "sear" returned less than 4 suggestions, the longer queries are
+        # filtered from the cached suggestions of "sear"
+        self.assertEqual(autocomplete.search_autocomplete("fake", "searx", "en"), ["searxng"])
+        self.assertEqual(autocomplete.search_autocomplete("fake", "searc", "en"), ["search"])
+        self.assertEqual(autocomplete.search_autocomplete("fake", "searz", "en"), [])
+        self.assertEqual(self.backend.queries, ["se", "sea", "sear"])
+
+    def test_prefix_not_complete(self):
+        # a suggestion that does not start with the query (e.g. a spelling
+        # correction): the suggestions are not all completions of the query
+        self.backend.suggestions = ["searxng"]
+        self.cache.set("fake", "en", "se", ["sea", "see"])
+        self.cache.set("fake", "en", "sea", ["sea", "search", "seattle", "sear"])
+        self.cache.set("fake", "en", "sear", ["search", "searxng", "seer"])
+        self.assertEqual(autocomplete.search_autocomplete("fake", "searx", "en"), ["searxng"])
+        self.assertEqual(self.backend.queries, ["searx"])
+
+    def test_errors_not_cached(self):
+        self.backend.fail = True
+        self.assertEqual(autocomplete.search_autocomplete("fake", "se", "en"), [])
+        self.backend.fail = False
+        self.assertEqual(autocomplete.search_autocomplete("fake", "se", "en"), ["sea", "sea lion", "search", "searxng"])
+        self.assertEqual(self.backend.queries, ["se", "se"])
+
+    def test_lru(self):
+        cache = autocomplete.AutocompleteCache(ttl=60, size=2)
+        for query in ("a", "b", "c"):
+            cache.set("fake", "en", query, [query + "1", query + "2"])
+        self.assertIsNone(cache.get("fake", "en", "a"))
+        self.assertEqual(cache.get("fake", "en", "c"), ["c1", "c2"])
+
+
+class TestAutocompleteRace(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.release = threading.Event()
+        self.slow = FakeBackend(["s slow"], wait=self.release)
+        self.fast = FakeBackend(["s fast", "f fast"])
+        self.executor = ThreadPoolExecutor()
+        self.setattr4test(autocomplete, "CACHE", autocomplete.AutocompleteCache(ttl=60, size=100))
+        self.setattr4test(autocomplete, "RACE_EXECUTOR", self.executor)
+        self.setattr4test(autocomplete, "backends", {"slow": self.slow, "fast": self.fast})
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown(wait=True)
+        super().tearDown()
+
+    def test_race(self):
+        with patch.dict(settings['search'], {'autocomplete_race': 'fast'}):
+            self.assertEqual(autocomplete.search_autocomplete("slow", "s", "en"), ["s fast"])
+            self.assertEqual(autocomplete.search_autocomplete("slow", "f", "en"), ["f fast"])
+            self.assertEqual(autocomplete.search_autocomplete("slow", "s", "en"), ["s fast"])
+            self.assertEqual(self.fast.queries, ["s", "f"])
+
+            # the answer of the loser is cached
+            self.release.set()
+            self.executor.shutdown(wait=True)
+            self.assertEqual(autocomplete.CACHE.get("slow", "en", "s"), ["s slow"])  # type: ignore
+            self.assertEqual(autocomplete.search_autocomplete("slow", "s", "en"), ["s slow"])
+
+        # race is off
+        self.assertEqual(autocomplete.search_autocomplete("fast", "x", "en"), [])
+        self.assertEqual(self.fast.queries, ["s", "f", "x"])
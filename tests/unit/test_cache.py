@@ -0,0 +1,142 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import tempfile
+import time
+from unittest.mock import patch, PropertyMock
+
+from searx import sqlitedb
+from searx.cache import ExpireCacheCfg, ExpireCacheSQLite, ExpireCacheMemoryTier
+
+from tests import SearxTestCase
+
+
+class ExpireCacheMemoryTierTestCase(SearxTestCase):
+
+    def test_lru(self):
+        memory = ExpireCacheMemoryTier(size=2, ttl=5)
+        expire = int(time.time()) + 60
+        memory.set("tbl", "a", 1, expire)
+        memory.set("tbl", "b", 2, expire)
+        self.assertEqual(memory.get("tbl", "a").value, 1)  # type: ignore
+        memory.set("tbl", "c", 3, expire)
+        self.assertIsNone(memory.get("tbl", "b"))
+        self.assertEqual(memory.get("tbl", "a").value, 1)  # type: ignore
+        self.assertEqual(memory.get("tbl", "c").value, 3)  # type: ignore
+
+    def test_expire(self):
+        memory = ExpireCacheMemoryTier(size=2, ttl=5)
+        memory.set("tbl", "a", 1, int(time.time()) - 1)
+        self.assertIsNone(memory.get("tbl", "a"))
+
+
+class ExpireCacheSQLiteTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db")  # pylint: disable=consider-using-with
+        self.addCleanup(self.db_file.close)
+
+    def build_cache(self, **kwargs) -> ExpireCacheSQLite:
+        return ExpireCacheSQLite.build_cache(ExpireCacheCfg(name="TEST_CACHE", db_url=self.db_file.name, **kwargs))
+
+    def test_get_set(self):
+        cache = self.build_cache()
+        self.assertIsNone(cache.get("foo", ctx="tbl"))
+        self.assertTrue(cache.set("foo", {"bar": 1}, expire=None, ctx="tbl"))
+        self.assertEqual(cache.get("foo", ctx="tbl"), {"bar": 1})
+        self.assertEqual(cache.get("unknown", default=42, ctx="tbl"), 42)
+        self.assertTrue(cache.has_table("tbl"))
+        self.assertFalse(cache.has_table("unknown"))
+
+    def test_memory_hit(self):
+        cache = self.build_cache(MEMORY_SIZE=10)
+        cache.set("foo", "bar", expire=None, ctx="tbl")
+        with patch.object(ExpireCacheSQLite, "DB", new_callable=PropertyMock) as db:
+            self.assertEqual(cache.get("foo", ctx="tbl"), "bar")
+            db.assert_not_called()
+
+    def test_memory_revalidate(self):
+        cache = self.build_cache(MEMORY_SIZE=10, MEMORY_TTL=0)
+        other_process = self.build_cache()
+
+        cache.set("foo", "bar", expire=60, ctx="tbl")
+        self.assertEqual(cache.get("foo", ctx="tbl"), "bar")
+
+        other_process.set("foo", "baz", expire=120, ctx="tbl")
+        self.assertEqual(cache.get("foo", ctx="tbl"), "baz")
+
+        other_process.truncate_tables(["tbl"])
+        self.assertIsNone(cache.get("foo", ctx="tbl"))
+
+    def test_memory_copy(self):
+        cache = self.build_cache(MEMORY_SIZE=10)
+        cache.set("foo", {"bar": [1]}, expire=None, ctx="tbl")
+        value = cache.get("foo", ctx="tbl")
+        value["bar"].append(2)
+        self.assertEqual(cache.get("foo", ctx="tbl"), {"bar": [1]})
+
+    def test_memory_revalidate_same_expire(self):
+        cache = self.build_cache(MEMORY_SIZE=10, MEMORY_TTL=0)
+        other_process = self.build_cache()
+
+        with patch("time.time", return_value=time.time()):
+            cache.set("foo", "bar", expire=60, ctx="tbl")
+            other_process.set("foo", "baz", expire=60, ctx="tbl")
+        self.assertEqual(cache.get("foo", ctx="tbl"), "baz")
+
+    def test_maintenance_memorized(self):
+        cache = self.build_cache()
+        cache.get("foo", ctx="tbl")
+        with patch.object(ExpireCacheSQLite, "next_maintenance_time", new_callable=PropertyMock) as next_time:
+            self.assertFalse(cache.maintenance())
+            next_time.assert_not_called()
+
+    def test_maintenance_scheduled(self):
+        cache = self.build_cache()
+        cache.set("foo", "bar", expire=None, ctx="tbl")
+        with patch.object(ExpireCacheSQLite, "maintenance") as maintenance:
+            cache.set("foo", "bar", expire=None, ctx="tbl")
+            cache.get("foo", ctx="tbl")
+            maintenance.assert_not_called()
+
+    def test_maintenance_stats(self):
+        cache = self.build_cache()
+        cache.set("foo", "bar", expire=None, ctx="tbl")
+        cache.DB.execute("UPDATE tbl SET expire = 0")
+        cache.DB.commit()
+        self.assertEqual(cache.maintenance_stats().last_run, 0)
+        self.assertTrue(cache.maintenance(force=True))
+        stats = cache.maintenance_stats()
+        self.assertEqual(stats.rows_removed, 1)
+        self.assertGreater(stats.last_run, 0)
+
+
+class MaintenanceSchedulerTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db")  # pylint: disable=consider-using-with
+        self.addCleanup(self.db_file.close)
+
+    def test_single_leader(self):
+        cfg = ExpireCacheCfg(name="TEST_CACHE", db_url=self.db_file.name)
+        worker_a, worker_b = ExpireCacheSQLite(cfg), ExpireCacheSQLite(cfg)
+        scheduler_a, scheduler_b = sqlitedb.MaintenanceScheduler(), sqlitedb.MaintenanceScheduler()
+        scheduler_a.token, scheduler_b.token = "1:a", "2:b"
+
+        with patch.object(scheduler_a, "_apps", [worker_a]), patch.object(scheduler_b, "_apps", [worker_b]):
+            with patch.object(ExpireCacheSQLite, "maintenance") as maintenance:
+                scheduler_a.run_pending()
+                scheduler_b.run_pending()
+                scheduler_a.run_pending()
+                self.assertEqual(maintenance.call_count, 2)
+
+            # the lease of the leader ran out, another worker takes over
+            worker_a.DB.execute("UPDATE properties SET m_time = 0 WHERE name = 'MAINTENANCE_LEADER'")
+            worker_a.DB.commit()
+            with patch.object(ExpireCacheSQLite, "maintenance") as maintenance:
+                scheduler_b.run_pending()
+                scheduler_a.run_pending()
+                self.assertEqual(maintenance.call_count, 1)
+        self.assertEqual(worker_a.properties("MAINTENANCE_LEADER"), "2:b")
@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import json
+import pathlib
+import tempfile
+
+from searx.data.compiled import CompiledData, DataNode, compile_json
+from searx.external_bang import get_bang_definition_and_autocomplete, LEAF_KEY
+
+from tests import SearxTestCase
+
+TEST_DATA = {
+    "trie": {
+        "sea": {
+            LEAF_KEY: "sea" + chr(2) + chr(1) + "0",
+            "rch": {LEAF_KEY: "search" + chr(2) + chr(1) + "0", "ing": "searching" + chr(2) + chr(1) + "0"},
+        },
+        "exam": "//example.com/" + chr(2) + chr(1) + "0",
+    },
+    "version": 42,
+    "list": [1, "two", {"three": 3}],
+}
+
+
+class CompiledDataTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.json_file = pathlib.Path(self.tmp_dir.name) / "test.json"
+        self.json_file.write_text(json.dumps(TEST_DATA), encoding="utf-8")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def compiled(self, depth: int | None = None) -> DataNode:
+        db_file = self.json_file.with_suffix(".db")
+        compile_json(self.json_file, db_file, depth)
+        return CompiledData("TEST", db_file).root
+
+    def test_mapping(self):
+        root = self.compiled()
+
+        self.assertIsInstance(root["trie"], DataNode)
+        self.assertEqual(root["version"], 42)
+        self.assertEqual(root["list"], [1, "two", {"three": 3}])
+        self.assertEqual(list(root), ["trie", "version", "list"])
+        self.assertEqual(len(root["trie"]["sea"]), 2)
+        self.assertIn("exam", root["trie"])
+        self.assertNotIn("foo", root["trie"])
+        self.assertIsNone(root.get("foo"))
+        with self.assertRaises(KeyError):
+            root["trie"]["foo"]  # pylint: disable=pointless-statement
+        self.assertEqual(root.to_dict(), TEST_DATA)
+        self.assertEqual(root["trie"]["sea"], TEST_DATA["trie"]["sea"])
+
+    def test_depth(self):
+        root = self.compiled(depth=1)
+        self.assertIsInstance(root["trie"], dict)
+        self.assertEqual(root.to_dict(), TEST_DATA)
+
+    def test_up_to_date(self):
+        db_file = self.json_file.with_suffix(".db")
+        data = CompiledData("TEST", db_file)
+        self.assertFalse(data.is_up_to_date(CompiledData.source_signature(self.json_file, None)))
+
+        compile_json(self.json_file, db_file)
+        self.assertTrue(data.is_up_to_date(CompiledData.source_signature(self.json_file, None)))
+        self.assertFalse(data.is_up_to_date(CompiledData.source_signature(self.json_file, 1)))
+
+    def test_external_bangs(self):
+        root = self.compiled()
+        bang_definition, autocomplete = get_bang_definition_and_autocomplete("se", external_bangs_db=root)
+        self.assertIsNone(bang_definition)
+        self.assertEqual(autocomplete, ["sea", "search", "searching"])
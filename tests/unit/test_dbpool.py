@@ -0,0 +1,111 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+from searx import metrics
+from searx.enginelib.dbpool import ConnectionPool
+from searx.metrics import counter
+
+from tests import SearxTestCase
+
+ENGINE_NAME = "dbpool engine"
+
+
+class DroppedError(Exception):
+    pass
+
+
+class FakeConnection:  # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.initialize([ENGINE_NAME])
+        self.connections: list[FakeConnection] = []
+
+    def connect(self) -> FakeConnection:
+        conn = FakeConnection()
+        self.connections.append(conn)
+        return conn
+
+    def pool(self, **kwargs) -> ConnectionPool[FakeConnection]:
+        return ConnectionPool(ENGINE_NAME, connect=self.connect, **kwargs)
+
+    def test_reuse(self):
+        pool = self.pool(size=2)
+        self.assertIs(pool.call(lambda c: c, timeout=1), pool.call(lambda c: c, timeout=1))
+        self.assertEqual(len(self.connections), 1)
+        self.assertEqual(counter('engine', ENGINE_NAME, 'pool', 'connect'), 1)
+
+    def test_bounded(self):
+        pool = self.pool(size=2)
+        conn1, _ = pool.acquire(timeout=1)
+        pool.acquire(timeout=1)
+        with self.assertRaises(TimeoutError):
+            pool.acquire(timeout=0.01)
+        self.assertEqual(counter('engine', ENGINE_NAME, 'pool', 'timeout'), 1)
+
+        pool.release(conn1)
+        self.assertEqual(pool.acquire(timeout=0.01), (conn1, True))
+
+    def test_discard_on_error(self):
+        pool = self.pool()
+
+        def fail(conn):
+            raise ValueError(conn)
+
+        with self.assertRaises(ValueError):
+            pool.call(fail, timeout=1)
+        self.assertTrue(self.connections[0].closed)
+        self.assertEqual(counter('engine', ENGINE_NAME, 'pool', 'discard'), 1)
+        self.assertIsNot(pool.call(lambda c: c, timeout=1), self.connections[0])
+
+    def test_reconnect(self):
+        pool = self.pool(reconnect_errors=(DroppedError,))
+        dropped = pool.call(lambda c: c, timeout=1)
+
+        def query(conn):
+            if conn is dropped:
+                raise DroppedError()
+            return "result"
+
+        self.assertEqual(pool.call(query, timeout=1), "result")
+        self.assertTrue(dropped.closed)
+        self.assertEqual(len(self.connections), 2)
+
+        # a new connection is not retried
+        def fail(conn):
+            raise DroppedError(conn)
+
+        pool.close()
+        with self.assertRaises(DroppedError):
+            pool.call(fail, timeout=1)
+        self.assertEqual(len(self.connections), 3)
+
+    def test_check(self):
+        pool = self.pool(check=lambda c: c.healthy)
+        pool.check_interval = 0
+        conn = pool.call(lambda c: c, timeout=1)
+        self.assertIs(pool.call(lambda c: c, timeout=1), conn)
+
+        conn.healthy = False
+        self.assertIsNot(pool.call(lambda c: c, timeout=1), conn)
+        self.assertTrue(conn.closed)
+
+    def test_metrics(self):
+        metrics.initialize([ENGINE_NAME, "other engine"])
+        self.assertFalse(metrics.has_pool(ENGINE_NAME))
+        self.pool().call(lambda c: c, timeout=1)
+
+        # only the engines with a connection pool report the pool counters
+        reliabilities = metrics.get_reliabilities([ENGINE_NAME, "other engine"])
+        self.assertEqual(reliabilities[ENGINE_NAME]['pool'], {'connect': 1, 'discard': 0, 'timeout': 0})
+        self.assertNotIn('pool', reliabilities["other engine"])
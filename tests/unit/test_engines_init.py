@@ -1,7 +1,12 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import threading
+from timeit import default_timer
+from unittest.mock import patch
+
 from searx import settings, engines
+from searx.search.processors import ProcessorMap
 from tests import SearxTestCase
 
 
@@ -18,6 +23,29 @@ class TestEnginesInit(SearxTestCase):
         self.assertIn('engine1', engines.engines)
         self.assertIn('engine2', engines.engines)
 
+    def test_engine_props(self):
+        engine_list = [
+            {'engine': 'dummy', 'name': 'engine1', 'shortcut': 'e1', 'categories': 'images', 'weight': 2},
+            {'engine': 'dummy', 'name': 'engine2', 'shortcut': 'e2', 'paging': True},
+        ]
+
+        engines.load_engines(engine_list)
+        self.assertEqual(engines.engine_props['engine1'], engines.EngineProps(2.0, 'images', False))
+        self.assertEqual(engines.engine_props['engine2'], engines.EngineProps(1.0, 'general', True))
+
+        engines.engines['engine2'].weight = 0.5
+        engines.update_engine_props()
+        self.assertEqual(engines.engine_props['engine2'].weight, 0.5)
+
+        # the init function of an engine changes its attributes
+        engines.engines['engine1'].weight = 3
+        processors = ProcessorMap()
+        processors.register_processor(processors.new_processor('engine1'), True)  # type: ignore
+        self.assertEqual(engines.engine_props['engine1'].weight, 3.0)
+
+        engines.load_engines(engine_list[:1])
+        self.assertEqual(list(engines.engine_props), ['engine1'])
+
     def test_initialize_engines_exclude_onions(self):
         settings['outgoing']['using_tor_proxy'] = False
         engine_list = [
@@ -74,3 +102,119 @@ class TestEnginesInit(SearxTestCase):
             self.assertEqual(
                 cm.output[0], 'ERROR:searx.engines:The "engine" field is missing for the engine named "engine2"'
             )
+
+
+class TestLazyEngines(SearxTestCase):
+
+    engine_list = [
+        {'engine': 'dummy', 'name': 'engine1', 'shortcut': 'e1', 'categories': 'images'},
+        {'engine': 'dummy', 'name': 'engine2', 'shortcut': 'e2', 'categories': 'images', 'disabled': True},
+        # no categories in the settings: the module is loaded
+        {'engine': 'dummy', 'name': 'engine3', 'shortcut': 'e3', 'disabled': True},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.dict(settings['search'], {'lazy_engines': True})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_stub(self):
+        engines.load_engines(self.engine_list)
+        stub = engines.engines['engine2']
+        self.assertIsInstance(stub, engines.LazyEngine)
+        self.assertNotIsInstance(engines.engines['engine3'], engines.LazyEngine)
+        self.assertEqual(engines.engine_shortcuts['e2'], 'engine2')
+        self.assertIn(stub, engines.categories['images'])
+        self.assertNotIn('engine2', engines.engine_props)
+
+        # attributes from the settings do not load the module
+        self.assertEqual(stub.categories, ['images'])
+        self.assertTrue(stub.disabled)
+        self.assertIsNone(stub.__dict__['_lazy_engine'])
+
+        # the read-only attributes shown in the preferences are answered by
+        # the stub
+        self.assertEqual(stub.engine_type, 'online')
+        self.assertFalse(stub.paging)
+        self.assertFalse(stub.language_support)
+        self.assertEqual(stub.traits.languages, {})
+        self.assertEqual(stub.about['results'], 'empty array')
+        with self.assertRaises(AttributeError):
+            _ = stub.private
+        self.assertIsNone(stub.__dict__['_lazy_engine'])
+
+        # any other attribute loads the module
+        self.assertTrue(callable(stub.response))
+        engine = engines.engines['engine2']
+        self.assertNotIsInstance(engine, engines.LazyEngine)
+        self.assertIs(engines.resolve_engine(stub), engine)
+        self.assertEqual(engines.categories['images'], [engines.engines['engine1'], engine])
+        self.assertEqual(engines.engine_props['engine2'], engines.EngineProps(1.0, 'images', False))
+        self.assertTrue(stub.about)
+
+    def test_stub_load_failed(self):
+        engine_list = [{'engine': 'dummy', 'name': 'engine1', 'shortcut': 'e1', 'categories': 'images'}]
+        engine_list.append(
+            {'engine': 'dummy', 'name': 'engine2', 'shortcut': 'e2', 'categories': 'images', 'disabled': True}
+        )
+        engine_list[1]['api_key'] = None  # missing required attribute
+        engines.load_engines(engine_list)
+        stub = engines.engines['engine2']
+        with self.assertLogs('searx.engines', level='ERROR'):
+            self.assertIsNone(engines.resolve_engine(stub))
+        self.assertNotIn('engine2', engines.engines)
+        self.assertNotIn('e2', engines.engine_shortcuts)
+        self.assertEqual(engines.categories['images'], [engines.engines['engine1']])
+        self.assertTrue(engine_list[1]['inactive'])
+        with self.assertRaises(AttributeError):
+            _ = stub.paging
+
+    def test_init_on_first_use(self):
+        engines.load_engines(self.engine_list)
+        processors = ProcessorMap()
+        processors.init(self.engine_list)
+        self.assertEqual(list(processors), ['engine1'])
+        self.assertEqual(set(processors.pending), {'engine2', 'engine3'})
+
+        calls = []
+        engine = engines.resolve_engine(engines.engines['engine2'])
+        engine.init = calls.append  # type: ignore
+
+        processor = processors.get_or_init('engine2', timeout=5)
+        self.assertIsNotNone(processor)
+        self.assertIs(processors.get_or_init('engine2', timeout=5), processor)
+        self.assertEqual(len(calls), 1)
+        self.assertNotIn('engine2', processors.pending)
+
+        # the result of a failed init is kept
+        engine = engines.engines['engine3']
+        engine.init = lambda engine_settings: calls.append(engine_settings) or False  # type: ignore
+        with self.assertLogs('searx.search.processors', level='ERROR'):
+            self.assertIsNone(processors.get_or_init('engine3', timeout=5))
+        self.assertIsNone(processors.get_or_init('engine3', timeout=5))
+        self.assertEqual(len(calls), 2)
+        self.assertIsNone(processors.get_or_init('unknown', timeout=5))
+
+    def test_wait_pending(self):
+        engines.load_engines(self.engine_list)
+        processors = ProcessorMap()
+        processors.init(self.engine_list)
+
+        release = threading.Event()
+        for name in ('engine2', 'engine3'):
+            engine = engines.resolve_engine(engines.engines[name])
+            engine.init = lambda engine_settings: release.wait(5)  # type: ignore
+
+        # the engines are initialized at the same time in the background, the
+        # call does not wait longer than the timeout
+        start = default_timer()
+        processors.wait_pending(['engine1', 'engine2', 'engine3'], 0.1)
+        self.assertLess(default_timer() - start, 1)
+        self.assertEqual(list(processors), ['engine1'])
+        self.assertEqual(set(processors.pending), {'engine2', 'engine3'})
+
+        release.set()
+        processors.wait_pending(['engine2', 'engine3'], 5)
+        self.assertEqual(set(processors), {'engine1', 'engine2', 'engine3'})
+        self.assertEqual(processors.pending, {})
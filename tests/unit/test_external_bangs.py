@@ -1,6 +1,10 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import pathlib
+import tempfile
+
+from searx.data.external_bangs import ExternalBangsIndex, build_index, flatten_trie
 from searx.external_bang import (
     get_node,
     resolve_bang_definition,
@@ -124,3 +128,34 @@ class TestExternalBangJson(SearxTestCase):
     def test_actual_data(self):
         google_url = get_bang_url(SearchQuery('test', engineref_list=[], external_bang='g'))
         self.assertEqual(google_url, 'https://www.google.com/search?q=test')
+
+
+class TestExternalBangsIndex(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.index = ExternalBangsIndex(pathlib.Path(self.tmp_dir.name) / "bangs.idx")
+        build_index(flatten_trie(TEST_DB['trie']), self.index.idx_file)
+        self.index.open()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get(self):
+        self.assertEqual(len(self.index), 7)
+        self.assertEqual(self.index.get('exam'), TEST_DB['trie']['exam'][LEAF_KEY])
+        self.assertEqual(self.index.get('example'), TEST_DB['trie']['exam']['ple'])
+        self.assertIsNone(self.index.get('examp'))
+        self.assertIsNone(self.index.get('error'))
+
+    def test_complete(self):
+        for prefix in ['e', 'exam', 'examp', 'example', 's', 'sea', 'seas', 'x']:
+            _, ac_list = get_bang_definition_and_autocomplete(prefix, external_bangs_db=TEST_DB)
+            self.assertEqual(self.index.complete(prefix), ac_list, prefix)
+        self.assertEqual(self.index.complete('sea', limit=2), ['search', 'searching'])
+
+    def test_actual_data(self):
+        bang_definition, new_autocomplete = get_bang_definition_and_autocomplete('duckduckg', limit=3)
+        self.assertIsNone(bang_definition)
+        self.assertEqual(new_autocomplete, ['duckduckgo'])
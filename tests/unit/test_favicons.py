@@ -0,0 +1,172 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import os
+import pathlib
+import tempfile
+import threading
+import time
+
+import flask
+from mock import Mock, patch
+
+from searx.favicons import cache, proxy
+
+from tests import SearxTestCase
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+class FaviconCacheTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        db_url = str(pathlib.Path(self.tmp_dir.name) / "faviconcache.db")
+        self.cache = cache.FaviconCacheSQLite(cache.FaviconCacheConfig(db_url=db_url, MAINTENANCE_MODE="off"))
+        self.cache.set("ddg", "example.org", "image/png", PNG)
+        self.cache.set("ddg", "example.com", None, None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_many(self):
+        authorities = ["example.org", "example.com", "example.net"]
+        found = self.cache.get_many("ddg", authorities)
+        self.assertEqual(found, {"example.org": (PNG, "image/png"), "example.com": (None, None)})
+        for authority in authorities:
+            self.assertEqual(found.get(authority), self.cache("ddg", authority))
+        self.assertEqual(self.cache.get_many("other", authorities), {})
+
+    def test_favicon_urls(self):
+        app = flask.Flask(__name__)
+        app.add_url_rule('/favicon_proxy', endpoint="favicon_proxy")
+
+        self.setattr4test(cache, "CACHE", self.cache)
+        self.setattr4test(proxy, "CFG", proxy.FaviconProxyConfig(resolver_map={"ddg": "x.ddg"}))
+        self.setattr4test(proxy, "DATA_URLS", proxy.DataURLCache(10, 3600))
+        prefetch = Mock()
+        self.setattr4test(proxy, "PREFETCH", prefetch)
+
+        with app.test_request_context():
+            flask.request.preferences = Mock(get_value={"favicon_resolver": "ddg", "theme": "simple"}.get)
+            urls = proxy.favicon_urls(["example.org", "example.com", "example.net"])
+
+            self.assertTrue(urls["example.org"].startswith("data:image/png;base64,"))
+            self.assertEqual(urls["example.com"], proxy.CFG.favicon_data_url(theme="simple"))
+            self.assertTrue(urls["example.net"].startswith("/favicon_proxy?authority=example.net"))
+            prefetch.submit.assert_called_once_with("ddg", ["example.net"])
+            for authority, url in urls.items():
+                self.assertEqual(proxy.favicon_url(authority), url)
+
+            # the favicons in the cache are served from the LRU
+            self.setattr4test(cache, "CACHE", Mock(get_many=Mock(return_value={})))
+            urls2 = proxy.favicon_urls(["example.org", "example.com"])
+            self.assertEqual(urls2, {"example.org": urls["example.org"], "example.com": urls["example.com"]})
+            cache.CACHE.get_many.assert_not_called()  # type: ignore
+
+    def test_data_url_cache(self):
+        lru = proxy.DataURLCache(2, 3600)
+        lru.set("ddg", "a", "url a")
+        lru.set("ddg", "b", "url b")
+        lru.get("ddg", "a")
+        lru.set("ddg", "c", "url c")
+        self.assertIsNone(lru.get("ddg", "b"))
+        self.assertEqual(lru.get("ddg", "a"), "url a")
+
+    def test_data_url_cache_ttl(self):
+        lru = proxy.DataURLCache(2, 60)
+        lru.set("ddg", "a", "")
+        self.assertEqual(lru.get("ddg", "a"), "")
+        with patch("time.monotonic", return_value=time.monotonic() + 61):
+            self.assertIsNone(lru.get("ddg", "a"))
+
+    def test_prefetch_wait(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def search_favicon(resolver, authority):  # pylint: disable=unused-argument
+            started.set()
+            release.wait(5)
+
+        self.setattr4test(proxy, "search_favicon", search_favicon)
+        prefetch = proxy.FaviconPrefetch(1)
+        self.assertTrue(prefetch.wait("ddg", "example.org", 0))
+        prefetch.submit("ddg", ["example.org"])
+        started.wait(5)
+        self.assertFalse(prefetch.wait("ddg", "example.org", 0.01))
+        release.set()
+        self.assertTrue(prefetch.wait("ddg", "example.org", 5))
+        self.assertTrue(prefetch.wait("ddg", "example.org", 0))
+
+
+class FaviconCacheFilesTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        tmp = pathlib.Path(self.tmp_dir.name)
+        self.cache = cache.FaviconCacheFiles(
+            cache.FaviconCacheConfig(
+                db_type="files",
+                db_url=str(tmp / "faviconcache.db"),
+                blob_dir=str(tmp / "blobs"),
+                MAINTENANCE_MODE="off",
+            )
+        )
+        self.cache.set("ddg", "example.org", "image/png", PNG)
+        self.cache.set("ddg", "example.com", None, None)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_files(self):
+        path, mime, sha256 = self.cache.blob_file("ddg", "example.org")  # type: ignore
+        self.assertEqual((path.read_bytes(), mime), (PNG, "image/png"))
+        self.assertIsNone(self.cache.blob_file("ddg", "example.com"))
+        self.assertEqual(self.cache("ddg", "example.org"), (PNG, "image/png"))
+        self.assertEqual(self.cache("ddg", "example.com"), (None, None))
+        self.assertIsNone(self.cache("ddg", "example.net"))
+        self.assertEqual(self.cache.state().bytes, len(PNG))
+
+        # the maintenance removes the files that are no longer in the index,
+        # except the recently modified files
+        with self.cache.connect() as conn:
+            conn.execute("DELETE FROM blobs WHERE sha256 = ?", (sha256,))
+        self.cache.maintenance(force=True)
+        self.assertTrue(path.exists())
+        old = time.time() - self.cache.BLOB_FILE_GRACE - 1
+        os.utime(path, (old, old))
+        self.cache.maintenance(force=True)
+        self.assertFalse(path.exists())
+
+    def test_missing_file(self):
+        path, _, _ = self.cache.blob_file("ddg", "example.org")  # type: ignore
+        path.unlink()
+        self.assertIsNone(self.cache.blob_file("ddg", "example.org"))
+        self.assertEqual(self.cache.get_many("ddg", ["example.org", "example.com"]), {"example.com": (None, None)})
+        self.assertIsNone(self.cache("ddg", "example.org"))
+
+        # set() writes the file again
+        self.cache.set("ddg", "example.org", "image/png", PNG)
+        self.assertEqual(self.cache("ddg", "example.org"), (PNG, "image/png"))
+
+    def test_send_blob(self):
+        app = flask.Flask(__name__)
+        self.setattr4test(proxy, "CFG", proxy.FaviconProxyConfig())
+        blob = self.cache.blob_file("ddg", "example.org")
+        assert blob is not None
+
+        with app.test_request_context():
+            resp = proxy.send_blob(*blob)
+            resp.direct_passthrough = False
+            self.assertEqual((resp.status_code, resp.get_data()), (200, PNG))
+            self.assertEqual(resp.get_etag(), (blob[2], False))
+
+        with app.test_request_context(headers={"If-None-Match": f'"{blob[2]}"'}):
+            self.assertEqual(proxy.send_blob(*blob).status_code, 304)
+
+        self.setattr4test(proxy, "CFG", proxy.FaviconProxyConfig(x_accel_redirect="/favicons/"))
+        with app.test_request_context():
+            resp = proxy.send_blob(*blob)
+            self.assertEqual(resp.headers["X-Accel-Redirect"], f"/favicons/{blob[2][:2]}/{blob[2]}")
@@ -13,6 +13,7 @@ from searx.preferences import (
     SearchLanguageSetting,
     MultipleChoiceSetting,
     PluginsSetting,
+    PreferencesCache,
     ValidationException,
 )
 import searx.plugins
@@ -211,3 +212,64 @@ class TestPreferences(SearxTestCase):
         }
         self.preferences.save(response_mock)
         self.assertNotIn(setting_key, cookie_callback)
+
+
+class TestPreferencesCache(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+
+        storage = searx.plugins.PluginStorage()
+        storage.register(PluginMock("plg001", "first plugin", True))
+        self.built = 0
+
+        def factory() -> Preferences:
+            self.built += 1
+            return Preferences(['simple'], ['general'], {}, storage)
+
+        self.cache = PreferencesCache(factory, size=2)
+
+    def test_copy(self):
+        preferences, _ = self.cache.get({'tokens': 'a', 'safesearch': '2'})
+        other = preferences.copy()
+        other.parse_dict({'tokens': 'b', 'safesearch': '0', 'disabled_plugins': 'plg001', 'categories': 'none'})
+        self.assertEqual(preferences.tokens.values, {'a'})
+        self.assertEqual(preferences.get_value('safesearch'), 2)
+        self.assertEqual(preferences.get_value('categories'), ['general'])
+        self.assertEqual(preferences.plugins.get_enabled(), ['plg001'])
+        self.assertEqual(other.tokens.values, {'a', 'b'})
+        self.assertEqual(other.plugins.get_enabled(), [])
+
+    def test_cache(self):
+        cookies = {'safesearch': '2', 'theme': 'simple'}
+        preferences, error = self.cache.get(cookies)
+        self.assertIsNone(error)
+        self.assertEqual(preferences.get_value('safesearch'), 2)
+
+        # a request changes its copy, not the cached preferences
+        preferences.parse_dict({'safesearch': '0'})
+        preferences, _ = self.cache.get(dict(reversed(cookies.items())))
+        self.assertEqual(preferences.get_value('safesearch'), 2)
+
+        self.assertEqual(self.cache.get({})[0].get_value('safesearch'), 0)
+        self.assertEqual(self.built, 1)
+
+        self.cache.get({'safesearch': '1'})
+        self.assertEqual(len(self.cache._items), 2)  # pylint: disable=protected-access
+
+    def test_readonly(self):
+        cookies = {'safesearch': '2'}
+        preferences, _ = self.cache.get(cookies, readonly=True)
+        self.assertIs(self.cache.get(cookies, readonly=True)[0], preferences)
+        self.assertIsNot(self.cache.get(cookies)[0], preferences)
+        self.assertEqual(self.cache.get(cookies)[0].get_value('safesearch'), 2)
+
+    def test_invalid_cookies(self):
+        preferences, error = self.cache.get({'safesearch': '1', 'theme': 'invalid'})
+        self.assertIsInstance(error, ValidationException)
+        self.assertEqual(preferences.get_value('safesearch'), 1)
+        self.assertEqual(len(self.cache._items), 0)  # pylint: disable=protected-access
+
+        url_params = Preferences(['simple'], ['general'], {}, searx.plugins.PluginStorage()).get_as_url_params()
+        preferences, error = self.cache.get({'safesearch': '1'}, url_params)
+        self.assertEqual(preferences.get_value('safesearch'), 0)
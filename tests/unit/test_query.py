@@ -1,8 +1,11 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+from unittest.mock import patch
+
 from parameterized.parameterized import parameterized
-from searx.query import RawTextQuery
+from searx.external_bang import get_bang_definition_and_autocomplete
+from searx.query import RawTextQuery, ExternalBangParser
 from tests import SearxTestCase
 
 
@@ -202,6 +205,15 @@ class TestExternalBangParser(SearxTestCase):
         a = query.autocomplete_list[0]
         self.assertEqual(query.get_autocomplete_full_query(a), a + ' the query')
 
+    def test_external_bang_autocomplete_all(self):
+        _, bang_ac_list = get_bang_definition_and_autocomplete('dd')
+        query = RawTextQuery('!!dd', [])
+        self.assertEqual(query.autocomplete_list, ['!!' + bang for bang in bang_ac_list])
+
+        with patch.object(ExternalBangParser, 'autocomplete_limit', 2):
+            query = RawTextQuery('!!dd', [])
+        self.assertEqual(query.autocomplete_list, ['!!' + bang for bang in bang_ac_list[:2]])
+
 
 class TestBang(SearxTestCase):
 
@@ -16,6 +16,16 @@ class ResultContainerTestCase(SearxTestCase):
         container = ResultContainer()
         self.assertEqual(container.get_ordered_results(), [])
 
+    def test_move_late_engines(self):
+        container = ResultContainer()
+        late_container = ResultContainer()
+
+        # an engine that is already adding its results is not moved
+        self.assertIs(container.claim("engine a"), container)
+        self.assertEqual(container.move_late_engines(["engine a", "engine b"], late_container), ["engine b"])
+        self.assertIs(container.claim("engine a"), container)
+        self.assertIs(container.claim("engine b"), late_container)
+
     def test_one_result(self):
         result = dict(url="https://example.org", title="title ..", content="Lorem ..")
 
@@ -58,3 +68,35 @@ class ResultContainerTestCase(SearxTestCase):
         self.assertIn(result, result_list)
         self.assertEqual(result_list[0].title, result.title)
         self.assertEqual(result_list[0].content, result.content)
+
+    def test_score_on_merge(self):
+        eng1 = dict(url="https://example.org", title="title", content="lorem ipsum", engine="google")
+        eng2 = dict(url="https://example.org", title="title", content="lorem ipsum", engine="duckduckgo")
+
+        container = ResultContainer()
+        container.extend("google", [eng1])
+        result = list(container.main_results_map.values())[0]
+        self.assertEqual(result.score, 1.0)
+
+        # the score is updated when a duplicate is merged (before close)
+        container.extend("duckduckgo", [dict(url="https://example.org/other"), eng2])
+        self.assertEqual(result.positions, [1, 2])
+        self.assertEqual(result.score, 2 * (1 + 1 / 2))
+
+    def test_group_results(self):
+        results = []
+        for i in range(1, 21):
+            result = dict(url=f"https://example.org/{i}", title=f"title {i}", content="lorem ipsum", engine="google")
+            if i % 2:
+                result.update(template="images.html", img_src=f"https://example.org/{i}.jpg")
+            results.append(result)
+
+        container = ResultContainer()
+        container.extend("google", results)
+        container.close()
+
+        # a group takes max. 8 results in addition to the first one
+        expected = list(range(1, 18, 2)) + list(range(2, 19, 2)) + [19, 20]
+        self.assertEqual(
+            [r.url for r in container.get_ordered_results()], [f"https://example.org/{i}" for i in expected]
+        )
@@ -1,9 +1,22 @@
 # SPDX-License-Identifier: AGPL-3.0-or-later
 # pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
 
+import pickle
+import time
 from copy import copy
+from timeit import default_timer
+from unittest.mock import patch
+
+import httpx
 
 import searx.search
+from searx import engines
+from searx.network import client
+from searx.network.network import Network
+from searx.search import result_cache, warmup
+from searx.search.processors import PROCESSORS
+from searx.search.processors.abstract import SuspendedStatus
+from searx.search.processors.online import OnlineProcessor
 from searx.search.models import SearchQuery, EngineRef
 from searx import settings
 from tests import SearxTestCase
@@ -12,6 +25,7 @@ from tests import SearxTestCase
 SAFESEARCH = 0
 PAGENO = 1
 PUBLIC_ENGINE_NAME = "dummy engine"  # from the ./settings/test_settings.yml
+SLOW_ENGINE_NAME = "dummy private engine"  # from the ./settings/test_settings.yml
 
 
 class SearchQueryTestCase(SearxTestCase):
@@ -118,3 +132,238 @@ class SearchTestCase(SearxTestCase):
             results = search.search()
         # This should not redirect
         self.assertIsNone(results.redirect_url)
+
+    def test_executor_asyncio(self):
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+
+        settings['search']['executor'] = 'threads'
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            expected = search.search().get_ordered_results()
+
+        settings['search']['executor'] = 'asyncio'
+        self.addCleanup(settings['search'].__setitem__, 'executor', 'threads')
+        search = searx.search.Search(search_query)
+        with self.app.test_request_context('/search'):
+            results = search.search().get_ordered_results()
+
+        self.assertTrue(expected)
+        self.assertEqual([r.template for r in expected], [r.template for r in results])
+        self.assertEqual([t.engine for t in search.result_container.get_timings()], [PUBLIC_ENGINE_NAME])
+        self.assertFalse(search.result_container.unresponsive_engines)
+
+    def test_result_cache(self):
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+        cache = result_cache.ResultCache(ttl=60, size=10)
+        with patch.object(result_cache, 'CACHE', cache):
+            search = searx.search.Search(search_query)
+            with self.app.test_request_context('/search'):
+                expected = search.search().get_ordered_results()
+
+            on_result = []
+            search = searx.search.Search(search_query)
+            search.result_container.on_result = lambda result: on_result.append(result) or True
+            with patch.object(PROCESSORS[PUBLIC_ENGINE_NAME], 'search') as engine_search:
+                with self.app.test_request_context('/search'):
+                    results = search.search().get_ordered_results()
+                engine_search.assert_not_called()
+
+        self.assertTrue(expected)
+        self.assertEqual([r.url for r in expected], [r.url for r in results])
+        self.assertGreaterEqual(len(on_result), len(results))
+
+        other = SearchQuery('test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, 2, None, None)
+        self.assertIsNone(cache.get(other))
+
+    def test_result_cache_unresponsive(self):
+        search_query = SearchQuery(
+            'test', [EngineRef(PUBLIC_ENGINE_NAME, 'general')], 'en-US', SAFESEARCH, PAGENO, None, None
+        )
+        cache = result_cache.ResultCache(ttl=60, size=10)
+        now = time.time()
+        with patch('time.time', return_value=now):
+            cache.set(search_query, {'batches': [], 'unresponsive': [(PUBLIC_ENGINE_NAME, 'timeout', False)]})
+        with patch('time.time', return_value=now + cache.UNRESPONSIVE_TTL + 1):
+            # a transient error is not replayed for the whole TTL
+            self.assertIsNone(cache.get(search_query))
+
+        with patch('time.time', return_value=now):
+            cache.set(search_query, {'batches': [], 'unresponsive': [(PUBLIC_ENGINE_NAME, 'timeout', False)]})
+            cache.add_late(search_query, PUBLIC_ENGINE_NAME, [])
+        with patch('time.time', return_value=now + cache.UNRESPONSIVE_TTL + 1):
+            # all engines have answered: the entry is kept for the whole TTL
+            self.assertEqual(
+                cache.get(search_query), {'batches': [(PUBLIC_ENGINE_NAME, pickle.dumps([]))], 'unresponsive': []}
+            )
+
+    def test_result_cache_late_before_store(self):
+        search_query = SearchQuery(
+            'test',
+            [EngineRef(PUBLIC_ENGINE_NAME, 'general'), EngineRef(SLOW_ENGINE_NAME, 'general')],
+            'en-US',
+            SAFESEARCH,
+            PAGENO,
+            None,
+            None,
+        )
+        cache = result_cache.ResultCache(ttl=60, size=10)
+        search = searx.search.Search(search_query)
+        search.result_container.add_unresponsive_engine(SLOW_ENGINE_NAME, 'soft_timeout')
+        recorder = result_cache.ResultRecorder()
+        recorder(PUBLIC_ENGINE_NAME, [])
+
+        # the late results arrive before the search is stored
+        cache.add_late(search_query, SLOW_ENGINE_NAME, [])
+        self.assertIsNone(cache.get(search_query))
+        cache.store(search_query, search.result_container, recorder)
+
+        entry = cache.get(search_query)
+        self.assertEqual(
+            [engine_name for engine_name, _ in entry['batches']],  # type: ignore
+            [PUBLIC_ENGINE_NAME, SLOW_ENGINE_NAME],
+        )
+        self.assertEqual(entry['unresponsive'], [])  # type: ignore
+
+    def test_soft_deadline(self):
+        search_query = SearchQuery(
+            'test',
+            [EngineRef(PUBLIC_ENGINE_NAME, 'general'), EngineRef(SLOW_ENGINE_NAME, 'general')],
+            'en-US',
+            SAFESEARCH,
+            PAGENO,
+            None,
+            None,
+        )
+        slow_engine = PROCESSORS[SLOW_ENGINE_NAME].engine
+        engine_search = slow_engine.search
+
+        def slow_search(query, params):
+            time.sleep(0.5)
+            return engine_search(query, params)
+
+        soft_deadline = {'enabled': True, 'timeout': 2.0, 'ratio': 0.5, 'cache_late_results': True}
+        for executor in ('threads', 'asyncio'):
+            cache = result_cache.ResultCache(ttl=60, size=10)
+            with (
+                self.subTest(executor=executor),
+                patch.dict(settings['search'], {'executor': executor, 'soft_deadline': soft_deadline}),
+                patch.object(result_cache, 'CACHE', cache),
+                patch.object(slow_engine, 'search', slow_search),
+            ):
+                search = searx.search.Search(search_query)
+                with self.app.test_request_context('/search'):
+                    results = search.search().get_ordered_results()
+                self.assertLess(default_timer() - search.start_time, 0.5)  # type: ignore
+                self.assertTrue(results)
+                self.assertEqual(
+                    [(e.engine, e.error_type) for e in search.result_container.unresponsive_engines],
+                    [(SLOW_ENGINE_NAME, 'soft_timeout')],
+                )
+
+                # the late results are added to the result cache
+                time.sleep(0.7)
+                entry = cache.get(search_query)
+                self.assertEqual(
+                    sorted(engine_name for engine_name, _ in entry['batches']),  # type: ignore
+                    sorted([PUBLIC_ENGINE_NAME, SLOW_ENGINE_NAME]),
+                )
+                self.assertEqual(entry['unresponsive'], [])  # type: ignore
+
+
+class WarmupTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.requests: list[tuple[str, str]] = []
+        self.error: Exception | None = None
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if self.error is not None:
+                raise self.error
+            self.requests.append((request.method, str(request.url)))
+            return httpx.Response(status_code=200)
+
+        engine = engines.engines[PUBLIC_ENGINE_NAME]
+        engine.search_url = 'https://example.org/search?q={query}'
+        engine.api_url = ['https://{lang}.example.com/api', 'https://api.example.com/v1']
+        self.addCleanup(delattr, engine, 'search_url')
+        self.addCleanup(delattr, engine, 'api_url')
+        self.setattr4test(engine, 'disabled', False)
+        self.processor = OnlineProcessor(engine)
+        self.processor.suspended_status = SuspendedStatus()
+        self.network = Network(keepalive_expiry=5.0)
+        self.setattr4test(warmup, 'get_network', lambda name: self.network)
+        self.setattr4test(client, 'new_transport', lambda *args, **kwargs: httpx.MockTransport(handler))
+
+    def test_engine_origins(self):
+        self.assertEqual(
+            warmup.engine_origins(self.processor.engine), {'https://example.org', 'https://api.example.com'}
+        )
+
+    async def test_warm_up(self):
+        with patch.dict(PROCESSORS, {PUBLIC_ENGINE_NAME: self.processor}, clear=True):
+            self.network.last_use['https://other.example.org'] = 0
+            self.assertEqual(await warmup.Warmup(interval=60).warm_up(), 3)
+            self.assertEqual(
+                sorted(self.requests),
+                [
+                    ('HEAD', 'https://api.example.com/'),
+                    ('HEAD', 'https://example.org/'),
+                    ('HEAD', 'https://other.example.org/'),
+                ],
+            )
+
+            # the warm-up requests are not a use of the connections, the
+            # origins without a search request are not warmed up again
+            wu = warmup.Warmup(interval=60)
+            self.assertEqual(await wu.warm_up(), 3)
+            self.assertEqual(self.network.last_use, {'https://other.example.org': 0})
+            self.assertEqual(await wu.warm_up(), 0)
+
+            # a suspended engine is not warmed up
+            self.processor.suspended_status.suspend(60, 'too many requests')
+            self.assertEqual(await warmup.Warmup(interval=60).warm_up(), 0)
+        await self.network.aclose()
+
+    async def test_schedule(self):
+        with patch.dict(PROCESSORS, {PUBLIC_ENGINE_NAME: self.processor}, clear=True):
+            wu = warmup.Warmup(interval=60)
+            self.assertEqual(await wu.warm_up(), 2)
+            key = (id(self.network), 'https://example.org')
+            now = time.monotonic()
+            wu.last_try[key] = wu.last_warm[key] = now
+            self.network.last_use['https://example.org'] = now
+
+            # with the default keepalive_expiry (5s) the connection of an
+            # origin in use is refreshed one second before it expires
+            self.assertFalse(wu.is_due(key, self.network, now + 3.9))
+            self.assertTrue(wu.is_due(key, self.network, now + 4.1))
+            self.assertAlmostEqual(wu.next_round(now), 4, delta=0.1)
+
+            # the warm-up refreshes the connection, but is not a use: after
+            # interval seconds without a search request the origin is idle
+            wu.last_try[key] = wu.last_warm[key] = now + 56
+            self.assertFalse(wu.is_due(key, self.network, now + 59))
+            self.assertTrue(wu.is_due(key, self.network, now + 60))
+            self.assertFalse(wu.is_due(key, self.network, now + 61))
+            self.assertFalse(wu.is_due(key, self.network, now + 600))
+            self.assertEqual(wu.next_round(now + 61), 60)
+
+            # a cold connection of an origin in use is tried again after the
+            # interval
+            self.network.last_use['https://example.org'] = now + 600
+            wu.last_try[key] = now + 580
+            self.assertFalse(wu.is_due(key, self.network, now + 610))
+            self.assertTrue(wu.is_due(key, self.network, now + 640))
+        await self.network.aclose()
+
+    async def test_failed_request(self):
+        # an error of a request does not stop the round
+        self.error = httpx.InvalidURL('invalid URL')
+        with patch.dict(PROCESSORS, {PUBLIC_ENGINE_NAME: self.processor}, clear=True):
+            self.assertEqual(await warmup.Warmup(interval=60).warm_up(), 2)
+        await self.network.aclose()
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: AGPL-3.0-or-later
+# pylint: disable=missing-module-docstring,disable=missing-class-docstring,invalid-name
+
+import tempfile
+
+from searx.cache import ExpireCacheCfg, ExpireCacheSQLite
+from searx.data.tracker_patterns import TrackerPatternsDB, CompiledRules, host_label_prefix
+
+from tests import SearxTestCase
+
+
+RULES = [
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?amazon(?:\.[a-z]{2,}){1,}\/gp\/.*?(?:redirector.html|cart\/ajax-update.html)"],
+        ["p[fd]_rd_[a-z]*", "qid", "sr", "ref_?", "crid"],
+    ),
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?google(?:\.[a-z]{2,}){1,}",
+        [],
+        ["ved", "ei", "gs_[a-z]*"],
+    ),
+    (
+        r"^https?:\/\/(?:[a-z0-9-]+\.)*?example\.org",
+        [],
+        [r"\/foo"],
+    ),
+    (
+        ".*",
+        [r"^https?:\/\/(?:[a-z0-9-]+\.)*?matrix\.org\/_matrix\/.*"],
+        ["(?:%3F)?utm(?:_[a-z_]*)?", "(?:%3F)?fbclid"],
+    ),
+]
+
+
+class TrackerPatternsTestCase(SearxTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.db_file = tempfile.NamedTemporaryFile(suffix=".db")  # pylint: disable=consider-using-with
+        self.addCleanup(self.db_file.close)
+        self.tracker_patterns = TrackerPatternsDB()
+        self.tracker_patterns.cache = ExpireCacheSQLite.build_cache(
+            ExpireCacheCfg(name="TEST_TRACKER_PATTERNS", db_url=self.db_file.name)
+        )
+        self.tracker_patterns.cache.properties.set("tracker_patterns loaded", "OK")
+        for rule in RULES:
+            self.tracker_patterns.add(rule)
+
+    def test_host_label_prefix(self):
+        self.assertEqual(host_label_prefix(RULES[0][0]), "amazon")
+        self.assertEqual(host_label_prefix(RULES[2][0]), "example")
+        self.assertEqual(host_label_prefix(r"^https?:\/\/(?:[a-z0-9-]+\.)*?ab?c"), "a")
+        self.assertIsNone(host_label_prefix(".*"))
+        self.assertIsNone(host_label_prefix(r"^https?:\/\/(?:[a-z0-9-]+\.)*?abc|.*"))
+
+    def test_candidates(self):
+        rules = CompiledRules(RULES)
+        self.assertEqual(len(rules.candidates("www.amazon.de")), 2)
+        self.assertEqual(len(rules.candidates("user@amazon.x:8080")), 2)
+        self.assertEqual(len(rules.candidates("example.com")), 2)
+        self.assertEqual(len(rules.candidates("searxng.org")), 1)
+
+    def test_clean_url(self):
+        clean_url = self.tracker_patterns.clean_url
+        self.assertIs(clean_url("https://www.amazon.de/dp/B000"), True)
+        self.assertEqual(
+            clean_url("https://www.amazon.de/dp/B000?qid=1&keywords=foo&ref_=nav"),
+            "https://www.amazon.de/dp/B000?keywords=foo",
+        )
+        self.assertEqual(clean_url("https://www.amazon.de/dp/B000?utm_source=x&sr=8"), "https://www.amazon.de/dp/B000")
+        self.assertIs(clean_url("https://www.amazon.de/gp/cart/ajax-update.html?qid=1"), True)
+        self.assertEqual(
+            clean_url("https://www.google.com/search?q=foo&ved=1&gs_lcp=2"), "https://www.google.com/search?q=foo"
+        )
+        self.assertEqual(clean_url("https://example.org/?/foo/bar"), "https://example.org/")
+        self.assertEqual(clean_url("https://searxng.org/?fbclid=1&q=a+b"), "https://searxng.org/?q=a+b")
+        self.assertIs(clean_url("https://matrix.org/_matrix/?utm_source=x"), True)
+
+    def test_rebuild(self):
+        compiled = self.tracker_patterns.compiled_rules()
+        self.assertIs(compiled, self.tracker_patterns.compiled_rules())
+
+        self.tracker_patterns.add((r"^https?:\/\/(?:[a-z0-9-]+\.)*?searxng\.org", [], ["q"]))
+        self.assertIsNot(compiled, self.tracker_patterns.compiled_rules())
+        self.assertEqual(self.tracker_patterns.clean_url("https://searxng.org/?q=a"), "https://searxng.org/")
+
+    def test_inline_flags(self):
+        # a global inline flag is only valid at the start of an expression
+        rules = CompiledRules([(r"^https?:\/\/(?:[a-z0-9-]+\.)*?example\.com", [r"(?i).*\/KEEP"], ["(?i)ref", "id"])])
+        self.assertEqual(len(rules.rules), 1)
+        rule = rules.rules[0]
+        self.assertTrue(rule.del_args.match("REF"))  # type: ignore
+        self.assertTrue(rule.del_args.match("id"))  # type: ignore
+        self.assertFalse(rule.del_args.match("ID"))  # type: ignore
+        self.assertTrue(rule.url_ignore.match("https://example.com/keep"))  # type: ignore
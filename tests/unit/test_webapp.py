@@ -44,8 +44,8 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
         for r in test_results:
             r.normalize_result_fields()
         timings = [
-            Timing(engine='startpage', total=0.8, load=0.7),
-            Timing(engine='youtube', total=0.9, load=0.6),
+            Timing(engine='startpage', total=0.8, load=0.7, warm=1, cold=1),
+            Timing(engine='youtube', total=0.9, load=0.6, warm=2),
         ]
 
         def search_mock(search_self, *args):  # pylint: disable=unused-argument
@@ -126,6 +126,14 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
             result.data,
         )
 
+    def test_search_server_timing(self):
+        result = self.client.post('/search', data={'q': 'test'})
+        server_timing = result.headers['Server-Timing'].split(', ')
+        self.assertIn('total_0_startpage;dur=800.0', server_timing)
+        self.assertIn('load_1_youtube;dur=600.0', server_timing)
+        self.assertIn('conn_0_startpage;desc="cold"', server_timing)
+        self.assertIn('conn_1_youtube;desc="warm"', server_timing)
+
     def test_index_json(self):
         result = self.client.post('/', data={'q': 'test', 'format': 'json'})
         self.assertEqual(result.status_code, 308)
@@ -169,6 +177,24 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
 
         self.assertIn(b'<description>first test content</description>', result.data)
 
+    def test_search_ndjson(self):
+        result = self.client.post('/search', data={'q': 'test', 'format': 'ndjson'})
+        self.assertEqual(result.mimetype, 'application/x-ndjson')
+
+        events = [json.loads(line) for line in result.data.decode().splitlines()]
+        self.assertEqual(events[-1]['event'], 'summary')
+        self.assertEqual('test', events[-1]['query'])
+        self.assertEqual(len(events[-1]['results']), 2)
+        self.assertEqual(events[-1]['results'][0]['url'], 'http://first.test.xyz')
+
+    def test_search_sse(self):
+        result = self.client.post('/search', data={'q': 'test', 'format': 'sse'})
+        self.assertEqual(result.mimetype, 'text/event-stream')
+
+        event, data = result.data.decode().split('\n\n')[-2].split('\n')
+        self.assertEqual(event, 'event: summary')
+        self.assertEqual(len(json.loads(data.removeprefix('data: '))['results']), 2)
+
     def test_redirect_about(self):
         result = self.client.get('/about')
         self.assertEqual(result.status_code, 302)
@@ -235,6 +261,22 @@ class ViewsTestCase(SearxTestCase):  # pylint: disable=too-many-public-methods
             b'<Description>SearXNG is a metasearch engine that respects your privacy.</Description>', result.data
         )
 
+    def test_light_preferences(self):
+        def request_preferences(path: str) -> Preferences:
+            with self.app.test_request_context(path):
+                searx.webapp.pre_request()
+                return searx.webapp.sxng_request.preferences
+
+        # the autocompleter uses the cached preferences without a copy
+        preferences = request_preferences('/autocompleter?q=the')
+        self.assertIs(request_preferences('/autocompleter?q=query'), preferences)
+
+        # preferences in the form are applied to a copy
+        other = request_preferences('/autocompleter?q=the&safesearch=2')
+        self.assertIsNot(other, preferences)
+        self.assertEqual(other.get_value('safesearch'), 2)
+        self.assertIsNot(request_preferences('/search?q=the'), preferences)
+
     def test_favicon(self):
         result = self.client.get('/favicon.ico')
         result.close()
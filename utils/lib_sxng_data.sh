@@ -10,6 +10,7 @@ data.:
   gsa_useragents: update searx/data/gsa_useragents.txt with compatible useragents
   locales       : update searx/data/locales.json from babel
   currencies    : update searx/data/currencies.json from wikidata
+  compile       : compile the large datasets of searx/data/* into the compact store
 EOF
 }
 
@@ -35,9 +36,20 @@ data.all() {
         python searxng_extra/update/update_external_bangs.py
         build_msg DATA "update searx/data/engine_descriptions.json"
         python searxng_extra/update/update_engine_descriptions.py
+        data.compile
     )
 }
 
+data.compile() {
+    (
+        set -e
+        pyenv.activate
+        build_msg DATA "compile searx/data/*.json"
+        python -m searx.data compile
+    )
+    dump_return $?
+}
+
 data.traits() {
     (
         set -e